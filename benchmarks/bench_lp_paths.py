@@ -0,0 +1,55 @@
+"""Compare build and solve times of the schedule solver paths by horizon length.
+
+Usage: python benchmarks/bench_lp_paths.py [T ...]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from hydrogen_factory.services.dispatch_solver import solve_dispatch
+from hydrogen_factory.services.matrix_lp import build_schedule_lp
+from hydrogen_factory.services.model_templates import ScheduleModelTemplate
+from scipy.optimize import linprog
+
+P_MAX, ETA, S_MAX, DT = 300.0, 0.02, 50.0, 0.25
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run(T: int, repeat: int = 3) -> dict:
+    rng = np.random.default_rng(T)
+    prices = rng.uniform(0.03, 0.10, T).round(3).tolist()
+    demand = rng.uniform(0.2, 1.2, T).round(2).tolist()
+    rows = {}
+
+    for _ in range(repeat):
+        template, build = timed(ScheduleModelTemplate, P_MAX, ETA, S_MAX, T, DT)
+        (power, _, _), solve = timed(template.solve, prices, demand)
+        rows.setdefault("pulp_cbc", []).append((build, solve, np.dot(prices, power) * DT))
+
+        (c, A_eq, b_eq, bounds), build = timed(build_schedule_lp, prices, demand, P_MAX, ETA, S_MAX, dt=DT)
+        result, solve = timed(linprog, c, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method="highs")
+        rows.setdefault("matrix_highs", []).append((build, solve, result.fun))
+
+        (power, _, _), solve = timed(solve_dispatch, prices, demand, P_MAX, ETA, S_MAX, dt=DT)
+        rows.setdefault("dispatch", []).append((0.0, solve, np.dot(prices, power) * DT))
+
+    return {path: tuple(float(np.median(column)) for column in zip(*samples)) for path, samples in rows.items()}
+
+
+def main(horizons: list[int]):
+    print(f"{'T':>6} {'path':<14} {'build ms':>10} {'solve ms':>10} {'cost':>12}")
+    for T in horizons:
+        for path, (build, solve, cost) in run(T).items():
+            print(f"{T:>6} {path:<14} {build * 1e3:>10.2f} {solve * 1e3:>10.2f} {cost:>12.4f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [24, 96, 672, 2688])
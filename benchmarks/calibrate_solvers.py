@@ -0,0 +1,140 @@
+"""Calibrate the solver selection thresholds by timing every available backend by problem class and size.
+
+Usage:
+    python benchmarks/calibrate_solvers.py [--quick] [--output FILE]
+
+Each problem class ('lp': one constant-efficiency electrolyzer, 'milp': a part-load electrolyzer
+with minimum load and start-up cost, 'fleet': the joint fleet LP) is solved end to end through the
+services with every backend, at growing sizes (time steps times assets). For each class the
+threshold is the smallest size from which a subprocess solver is faster than in-process HiGHS by
+at least MARGIN, at every larger measured size as well; null if it never is. The thresholds and
+the median latencies (s) they were derived from are written to FILE (default: the
+solver_thresholds.json the selector reads).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from suite import sample, schedule_input
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import FleetOptimizationInput
+from hydrogen_factory.services.optimization_service import OptimizationService
+from hydrogen_factory.services.fleet_service import FleetOptimizationService
+from hydrogen_factory.services.solver_backends import BACKENDS
+from hydrogen_factory.services.solver_selector import DEFAULT_THRESHOLDS, SolverSelector
+
+TIME_LIMIT = 60.0
+# A subprocess solver must beat HiGHS by this factor, so that noise does not move the thresholds.
+MARGIN = 0.9
+
+
+class Assets:
+    """Stand-in for the electrolyzer and storage services, returning fixed configs."""
+
+    def __init__(self, electrolyzer: ElectrolyzerConfig, storage: StorageConfig):
+        self.electrolyzer = electrolyzer
+        self.storage = storage
+
+    def get_config(self, asset_id: str):
+        return self.electrolyzer if asset_id == self.electrolyzer.electrolyzer_id else self.storage
+
+
+def schedule_cases(solvers: list[str], sizes: list[int], electrolyzer: ElectrolyzerConfig, repeat: int) -> dict:
+    """Median optimize() latency per size and solver for one electrolyzer."""
+    assets = Assets(electrolyzer, StorageConfig(storage_id="S1", max_capacity=200.0))
+    results = {}
+    for T in sizes:
+        input = schedule_input(T)
+        for solver in solvers:
+            service = OptimizationService(assets, assets, selector=SolverSelector(solver, use_dispatch=False))
+            results.setdefault(T, {})[solver] = float(np.median(
+                sample(lambda: service.optimize(input, time_limit=TIME_LIMIT), repeat)
+            ))
+    return results
+
+
+def fleet_cases(solvers: list[str], fleet_sizes: list[int], repeat: int, T: int = 24) -> dict:
+    """Median joint fleet LP latency per size (time steps times electrolyzers) and solver."""
+    results = {}
+    for n in fleet_sizes:
+        rng = np.random.default_rng(n)
+        # Distinct efficiencies keep the electrolyzers from being merged into fewer units.
+        electrolyzers = [
+            ElectrolyzerConfig(electrolyzer_id=f"E{i}", type=ElectrolyzerType.PEM, capacity=1000.0,
+                               efficiency=0.017 + 0.004 * i / n)
+            for i in range(n)
+        ]
+        storages = {f"S{j}": StorageConfig(storage_id=f"S{j}", max_capacity=200.0) for j in range(max(n // 8, 1))}
+        input = FleetOptimizationInput(
+            assignments=[{"electrolyzer_id": e.electrolyzer_id, "storage_id": f"S{i % len(storages)}"}
+                         for i, e in enumerate(electrolyzers)],
+            electricity_prices=rng.uniform(0.03, 0.10, T).round(3).tolist(),
+            hydrogen_demand={s: (rng.uniform(0.2, 0.4, T) * 8 * 20.0).round(2).tolist() for s in storages},
+            power_limit=0.6 * 1000.0 * n,
+        )
+        for solver in solvers:
+            service = FleetOptimizationService(None, None, selector=SolverSelector(solver))
+            results.setdefault(T * n, {})[solver] = float(np.median(
+                sample(lambda: service.solve(input, electrolyzers, storages, TIME_LIMIT), repeat)
+            ))
+    return results
+
+
+def threshold(medians: dict) -> dict:
+    """Smallest size from which a subprocess solver beats HiGHS (by MARGIN) at every larger measured size."""
+    rule = {"solver": None, "min_size": None}
+    for size in sorted(medians, reverse=True):
+        timings = dict(medians[size])
+        highs = timings.pop("highs")
+        fastest = min(timings, key=timings.get, default=None)
+        if fastest is None or timings[fastest] > MARGIN * highs:
+            break
+        if rule["solver"] is not None and fastest != rule["solver"]:
+            break
+        rule = {"solver": fastest, "min_size": size}
+    return rule
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="fewer sizes and repetitions")
+    parser.add_argument("--output", default=DEFAULT_THRESHOLDS)
+    args = parser.parse_args()
+    solvers = [name for name, backend in BACKENDS.items() if backend.available()]
+    repeat = 3 if args.quick else 7
+    part_load = ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0,
+                                   type_curve=True, min_load=0.2, startup_cost=50.0)
+    measurements = {
+        "lp": schedule_cases(
+            solvers, [24, 168, 672] if args.quick else [24, 168, 672, 2688, 8760],
+            ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0), repeat,
+        ),
+        "milp": schedule_cases(solvers, [24, 96] if args.quick else [24, 96, 168, 336], part_load, repeat),
+        "fleet": fleet_cases(solvers, [8, 64] if args.quick else [8, 64, 256, 1024], repeat),
+    }
+    for kind, medians in measurements.items():
+        for size, timings in medians.items():
+            print(f"{kind:6} size={size:<6} " + "  ".join(f"{s}={t * 1e3:8.1f} ms" for s, t in timings.items()))
+    document = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": f"{platform.system()} {platform.machine()}, Python {platform.python_version()}",
+        "thresholds": {kind: threshold(medians) for kind, medians in measurements.items()},
+        "measurements": {
+            kind: {str(size): timings for size, timings in medians.items()} for kind, medians in measurements.items()
+        },
+    }
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+    print(json.dumps(document["thresholds"]))
+
+
+if __name__ == "__main__":
+    main()
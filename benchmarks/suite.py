@@ -0,0 +1,297 @@
+"""Benchmark suite for the optimizer, the config services and the HTTP layer, with JSON baselines.
+
+Usage:
+    python benchmarks/suite.py run [--quick] [--output FILE] [--only GROUP ...]
+    python benchmarks/suite.py compare BASELINE CURRENT [--threshold 0.25] [--min-delta-ms 0.5]
+
+`run` writes the median, minimum and sample count of every case to FILE (default
+benchmarks/baselines/latest.json). `compare` prints the ratio of the current to the baseline
+median for every case in both files and exits with status 1 if any case slowed down by more
+than the threshold (relative) and the minimum delta (absolute).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import bench_lp_paths
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import FleetOptimizationInput, OptimizationInput
+from hydrogen_factory.services.config_repository import ConfigRepository
+from hydrogen_factory.services.sqlite_repository import SqliteConfigRepository
+from hydrogen_factory.services.electrolyzer_service import ElectrolyzerService
+from hydrogen_factory.services.storage_service import StorageService
+from hydrogen_factory.services.optimization_service import OptimizationService
+from hydrogen_factory.services.fleet_service import FleetOptimizationService
+from hydrogen_factory.services.telemetry_service import TelemetryService
+from hydrogen_factory.api.encoding import TELEMETRY, decode_telemetry, encode_telemetry_frame
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "baselines", "latest.json")
+CONFIGURE_BATCH = 100
+TELEMETRY_BATCH = 100_000
+
+
+def sample(fn, repeat: int, warmup: int = 1) -> list[float]:
+    """Return the wall-clock duration (s) of each of repeat calls of fn, after warmup calls."""
+    for _ in range(warmup):
+        fn()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def schedule_input(T: int, seed: int = 0, electrolyzer_id: str = "E1", storage_id: str = "S1") -> OptimizationInput:
+    rng = np.random.default_rng(seed)
+    return OptimizationInput(
+        electrolyzer_id=electrolyzer_id,
+        storage_id=storage_id,
+        electricity_prices=rng.uniform(0.03, 0.10, T).round(3).tolist(),
+        hydrogen_demand=rng.uniform(1.0, 5.0, T).round(2).tolist(),
+    )
+
+
+def bench_optimize(workdir: str, quick: bool) -> dict:
+    """OptimizationService.optimize latency by solver path and horizon length."""
+    repository = ConfigRepository(os.path.join(workdir, "optimize.json"))
+    electrolyzers = ElectrolyzerService(repository)
+    storages = StorageService(repository)
+    electrolyzers.configure(ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0))
+    storages.configure(StorageConfig(storage_id="S1", max_capacity=200.0))
+    services = {
+        "dispatch": OptimizationService(electrolyzers, storages),
+        "highs": OptimizationService(electrolyzers, storages, use_dispatch=False, lp_solver="highs"),
+        "cbc": OptimizationService(electrolyzers, storages, use_dispatch=False, lp_solver="cbc"),
+    }
+    results = {}
+    for T in ([24, 168] if quick else [24, 168, 672, 2688]):
+        input = schedule_input(T)
+        for path, service in services.items():
+            if path == "cbc" and T > 672:
+                continue
+            results[f"optimize/{path}/T={T}"] = sample(lambda: service.optimize(input), 5 if quick else 15)
+    return results
+
+
+def bench_build_vs_solve(workdir: str, quick: bool) -> dict:
+    """Model build time compared with solve time for each LP path (see bench_lp_paths.py)."""
+    results = {}
+    for T in ([96] if quick else [96, 672, 2688]):
+        for path, (build, solve, _) in bench_lp_paths.run(T).items():
+            if path != "dispatch":
+                results[f"lp/{path}/build/T={T}"] = [build]
+            results[f"lp/{path}/solve/T={T}"] = [solve]
+    return results
+
+
+def bench_fleet(workdir: str, quick: bool) -> dict:
+    """FleetOptimizationService.solve latency by fleet size (electrolyzers x storages)."""
+    results = {}
+    service = FleetOptimizationService(None, None)
+    for n_electrolyzers, n_storages in ([(8, 2), (64, 8)] if quick else [(8, 2), (64, 8), (256, 32)]):
+        rng = np.random.default_rng(n_electrolyzers)
+        T = 24
+        electrolyzers = [
+            ElectrolyzerConfig(
+                electrolyzer_id=f"E{i}", type=ElectrolyzerType.PEM,
+                capacity=float(rng.choice([500.0, 1000.0])), efficiency=float(rng.uniform(0.017, 0.021)),
+            )
+            for i in range(n_electrolyzers)
+        ]
+        storages = {
+            f"S{j}": StorageConfig(storage_id=f"S{j}", max_capacity=float(rng.uniform(50.0, 200.0)))
+            for j in range(n_storages)
+        }
+        demand = {}
+        for j in range(n_storages):
+            production = sum(e.capacity * e.efficiency for e in electrolyzers[j::n_storages])
+            demand[f"S{j}"] = (rng.uniform(0.2, 0.4, T) * production).round(2).tolist()
+        for method in ("joint", "decomposition"):
+            input = FleetOptimizationInput(
+                assignments=[
+                    {"electrolyzer_id": e.electrolyzer_id, "storage_id": f"S{i % n_storages}"}
+                    for i, e in enumerate(electrolyzers)
+                ],
+                electricity_prices=rng.uniform(0.03, 0.10, T).round(3).tolist(),
+                hydrogen_demand=demand,
+                power_limit=0.6 * sum(e.capacity for e in electrolyzers),
+                method=method,
+            )
+            results[f"fleet/{method}/N={n_electrolyzers}xM={n_storages}"] = sample(
+                lambda: service.solve(input, electrolyzers, storages), 1 if quick else 3
+            )
+    service.shutdown()
+    return results
+
+
+def bench_configure(workdir: str, quick: bool) -> dict:
+    """Latency of single configure calls once the repository already holds N assets."""
+    results = {}
+    backends = {
+        "json": lambda name: ConfigRepository(os.path.join(workdir, f"{name}.json"), fsync=True),
+        "sqlite": lambda name: SqliteConfigRepository(os.path.join(workdir, f"{name}.db")),
+    }
+    for backend, make_repository in backends.items():
+        for N in ([100, 1000] if quick else [100, 1000, 10000]):
+            service = ElectrolyzerService(make_repository(f"configure-{backend}-{N}"))
+            service.configure_bulk([
+                ElectrolyzerConfig(electrolyzer_id=f"F{i}", type=ElectrolyzerType.PEM, capacity=1000.0)
+                for i in range(N)
+            ])
+            configs = iter(
+                ElectrolyzerConfig(electrolyzer_id=f"N{i}", type=ElectrolyzerType.PEM, capacity=1000.0)
+                for i in range(CONFIGURE_BATCH + 1)
+            )
+            results[f"configure/{backend}/N={N}"] = sample(lambda: service.configure(next(configs)), CONFIGURE_BATCH)
+    return results
+
+
+def bench_http(workdir: str, quick: bool) -> dict:
+    """End-to-end request latency through the FastAPI app and TestClient."""
+    os.environ.setdefault("HF_CONFIG_FILE", os.path.join(workdir, "http.json"))
+    os.environ.setdefault("HF_RESULT_CACHE_ENTRIES", "0")
+    from fastapi.testclient import TestClient
+    from hydrogen_factory.main import app
+
+    results = {}
+    with TestClient(app) as client:
+        client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "H1", "type": "PEM", "capacity": 1000.0})
+        client.post("/api/storage/configure", json={"storage_id": "H1", "max_capacity": 200.0})
+        ids = iter(range(10**6))
+        results["http/electrolyzer/configure"] = sample(
+            lambda: client.post("/api/electrolyzer/configure", json={
+                "electrolyzer_id": f"HC{next(ids)}", "type": "PEM", "capacity": 1000.0,
+            }),
+            20 if quick else 100,
+        )
+        for T in ([24] if quick else [24, 672]):
+            payload = schedule_input(T, electrolyzer_id="H1", storage_id="H1").model_dump(exclude_none=True)
+            results[f"http/schedule/optimize/T={T}"] = sample(
+                lambda: client.post("/api/schedule/optimize", json=payload), 10 if quick else 30
+            )
+    return results
+
+
+def bench_telemetry(workdir: str, quick: bool) -> dict:
+    """Decode and ingest time of one batch of TELEMETRY_BATCH samples (the target is under 1 s each)."""
+    service = ElectrolyzerService(ConfigRepository(os.path.join(workdir, "telemetry.json"), fsync=False))
+    service.configure(ElectrolyzerConfig(electrolyzer_id="T1", type=ElectrolyzerType.PEM, capacity=1000.0))
+    telemetry = TelemetryService(service, os.path.join(workdir, "telemetry"), flush_samples=TELEMETRY_BATCH)
+    rng = np.random.default_rng(0)
+    power = rng.uniform(0.0, 1000.0, TELEMETRY_BATCH)
+    hydrogen = 0.02 * power
+    batches = iter(range(10**6))
+
+    def times() -> np.ndarray:
+        return 1767225600.0 + next(batches) * TELEMETRY_BATCH * 0.01 + np.arange(TELEMETRY_BATCH) * 0.01
+
+    ndjson = lambda t: "\n".join(
+        json.dumps({"electrolyzer_id": "T1", "time": t[i:i + 1000].tolist(), "power": power[i:i + 1000].tolist(),
+                    "hydrogen": hydrogen[i:i + 1000].tolist()})
+        for i in range(0, TELEMETRY_BATCH, 1000)
+    ).encode()
+    repeat = 5 if quick else 20
+    # Bodies are popped from the end, so they are built in reverse and ingested in time order.
+    bodies = [encode_telemetry_frame("T1", times(), power, hydrogen) for _ in range(repeat + 1)][::-1]
+    results = {"telemetry/ingest/binary": sample(lambda: telemetry.ingest(decode_telemetry(bodies.pop(), TELEMETRY)), repeat)}
+    bodies = [ndjson(times()) for _ in range(repeat + 1)][::-1]
+    results["telemetry/ingest/ndjson"] = sample(lambda: telemetry.ingest(decode_telemetry(bodies.pop())), repeat)
+    return results
+
+
+BENCHMARKS = {
+    "optimize": bench_optimize,
+    "lp": bench_build_vs_solve,
+    "fleet": bench_fleet,
+    "configure": bench_configure,
+    "http": bench_http,
+    "telemetry": bench_telemetry,
+}
+
+
+def run(quick: bool, only: list[str] = None) -> dict:
+    """Run the selected benchmark groups and return the baseline document."""
+    cases = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for group, bench in BENCHMARKS.items():
+            if only and group not in only:
+                continue
+            print(f"running {group} ...", file=sys.stderr)
+            cases.update(bench(workdir, quick))
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": quick,
+        },
+        "cases": {
+            name: {"median_s": float(np.median(samples)), "min_s": float(np.min(samples)), "samples": len(samples)}
+            for name, samples in cases.items()
+        },
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta: float) -> list[str]:
+    """Print a comparison table and return the names of the cases that regressed."""
+    regressions = []
+    print(f"{'case':<42} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for name in sorted(set(baseline["cases"]) & set(current["cases"])):
+        before = baseline["cases"][name]["median_s"]
+        after = current["cases"][name]["median_s"]
+        ratio = after / before if before > 0 else float("inf")
+        slower = ratio > 1.0 + threshold and after - before > min_delta
+        if slower:
+            regressions.append(name)
+        print(f"{name:<42} {before * 1e3:>12.3f} {after * 1e3:>12.3f} {ratio:>7.2f}{'  SLOWER' if slower else ''}")
+    for name in sorted(set(baseline["cases"]) ^ set(current["cases"])):
+        print(f"{name:<42} only in {'baseline' if name in baseline['cases'] else 'current'}")
+    return regressions
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks and write a JSON baseline")
+    run_parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer repetitions")
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    run_parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS))
+    compare_parser = commands.add_parser("compare", help="compare two baselines and flag slowdowns")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown to flag")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=0.5, help="absolute slowdown to flag")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        document = run(args.quick, args.only)
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"wrote {len(document['cases'])} cases to {args.output}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold, args.min_delta_ms / 1e3)
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
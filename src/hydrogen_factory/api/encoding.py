@@ -0,0 +1,215 @@
+import json
+import struct
+import numpy as np
+from fastapi.responses import Response
+from hydrogen_factory.core.metrics import stage
+from hydrogen_factory.models.columnar import ColumnarModel
+
+JSON = "application/json"
+COLUMNAR = "application/vnd.hydrogen-factory.columnar"
+COLUMNAR_MAGIC = b"HFC1"
+COLUMNAR_DTYPES = {"float64": "<f8", "float32": "<f4"}
+NDJSON = "application/x-ndjson"
+TELEMETRY = "application/vnd.hydrogen-factory.telemetry"
+TELEMETRY_MAGIC = b"HFT1"
+TELEMETRY_COLUMNS = ("time", "power", "hydrogen")
+ACCEPT_DESCRIPTION = (
+    f"Response format: {JSON} (default) or {COLUMNAR}[;dtype=float64|float32] (binary columnar arrays)"
+)
+
+
+def negotiate(accept: str = None) -> tuple[str, dict]:
+    """Pick the response format from an Accept header.
+
+    Media ranges are tried by descending quality (q parameter), ties in header order; anything
+    unsupported, */* and a missing header mean the default JSON, so existing clients are unaffected.
+
+    Args:
+    - accept (str): Value of the Accept header.
+
+    Returns:
+    - tuple[str, dict]: The chosen media type and its parameters (other than q).
+    """
+    ranges = []
+    for position, part in enumerate((accept or "").split(",")):
+        media_type, *params = (item.strip() for item in part.split(";"))
+        options = {}
+        for param in params:
+            name, _, value = param.partition("=")
+            options[name.strip().lower()] = value.strip().strip('"')
+        try:
+            quality = float(options.pop("q", 1.0))
+        except ValueError:
+            quality = 0.0
+        ranges.append((-quality, position, media_type.lower(), options))
+    for quality, _, media_type, options in sorted(ranges):
+        if quality < 0 and media_type in (JSON, COLUMNAR):
+            return media_type, options
+    return JSON, {}
+
+
+def encode_output(output: ColumnarModel, accept: str = None):
+    """Encode a schedule output (or other columnar response) in the format requested by the Accept header.
+
+    Args:
+    - output (ColumnarModel): The schedule (OptimizationOutput or a subclass such as ReplanOutput),
+      or storage levels.
+    - accept (str): Value of the Accept header.
+
+    Returns:
+    - ColumnarModel | Response: The output itself for the default JSON, so that FastAPI
+      serializes it through the response model, or an encoded Response.
+
+    Raises:
+    - ValueError: If the columnar dtype is not float64 or float32.
+    """
+    media_type, options = negotiate(accept)
+    if media_type == JSON:
+        return output
+    dtype = options.get("dtype", "float64")
+    if dtype not in COLUMNAR_DTYPES:
+        raise ValueError(f"Unsupported columnar dtype: {dtype}")
+    with stage("serialize"):
+        return Response(encode_columnar(output, dtype), media_type=f"{COLUMNAR}; dtype={dtype}")
+
+
+def encode_columnar(output: ColumnarModel, dtype: str = "float64") -> bytes:
+    """Encode the output as little-endian arrays behind a small header.
+
+    Layout: the 4-byte magic b"HFC1", the header length as a little-endian uint32, a UTF-8 JSON
+    header padded with spaces so that the arrays start at a multiple of 8 bytes, then one array
+    per column of header["length"] values each, in header["columns"] order. The header also holds
+    the dtype ("<f8" or "<f4") and the scalar fields (total_cost, ...). float64 arrays attached to
+    the output by the solver (or mapped from the level history) are written from their buffers
+    without a conversion.
+
+    Args:
+    - output (ColumnarModel): The schedule or storage levels.
+    - dtype (str): "float64" or "float32".
+
+    Returns:
+    - bytes: The encoded body.
+    """
+    columns = output.columns()
+    scalars = {name: value for name, value in output if name not in columns and name not in output.SERIES}
+    header = json.dumps({
+        "columns": list(columns),
+        "length": len(next(iter(columns.values()), ())),
+        "dtype": COLUMNAR_DTYPES[dtype],
+        "fields": scalars,
+    }, separators=(",", ":")).encode()
+    header += b" " * (-(len(header) + 8) % 8)
+    target = np.dtype(COLUMNAR_DTYPES[dtype])
+    buffers = [np.ascontiguousarray(array, dtype=target).data for array in columns.values()]
+    return b"".join([COLUMNAR_MAGIC, struct.pack("<I", len(header)), header, *buffers])
+
+
+def decode_columnar(body: bytes) -> dict:
+    """Decode a columnar body into its scalar fields plus one NumPy array per column (views on body)."""
+    if body[:4] != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar schedule body")
+    (size,) = struct.unpack_from("<I", body, 4)
+    header = json.loads(body[8:8 + size])
+    decoded = dict(header["fields"])
+    dtype = np.dtype(header["dtype"])
+    offset = 8 + size
+    for name in header["columns"]:
+        decoded[name] = np.frombuffer(body, dtype=dtype, count=header["length"], offset=offset)
+        offset += header["length"] * dtype.itemsize
+    return decoded
+
+
+def encode_telemetry_frame(electrolyzer_id: str, time, power, hydrogen) -> bytes:
+    """Encode the samples of one electrolyzer as a binary telemetry frame.
+
+    Layout, as for columnar schedules: the magic b"HFT1", the header length as a little-endian
+    uint32, a JSON header {"electrolyzer_id", "length"} padded to a multiple of 8 bytes, then the
+    time (Unix time, s), power (kW) and hydrogen (kg/h) columns as little-endian float64. A body
+    may hold any number of frames one after another.
+    """
+    columns = [np.ascontiguousarray(column, dtype="<f8") for column in (time, power, hydrogen)]
+    header = json.dumps({"electrolyzer_id": electrolyzer_id, "length": len(columns[0])}, separators=(",", ":")).encode()
+    header += b" " * (-(len(header) + 8) % 8)
+    return b"".join([TELEMETRY_MAGIC, struct.pack("<I", len(header)), header, *(column.data for column in columns)])
+
+
+def decode_telemetry(body: bytes, content_type: str = None) -> dict:
+    """Decode a telemetry body into (time, power, hydrogen) float64 arrays per electrolyzer ID.
+
+    Binary frames (see encode_telemetry_frame) are decoded without copies. NDJSON lines
+    ({"electrolyzer_id", "time", "power", "hydrogen"}) hold one sample each, or one batch with
+    lists as values; the body is parsed in a single json.loads call.
+
+    Args:
+    - body (bytes): Request body.
+    - content_type (str): Value of the Content-Type header; NDJSON by default.
+
+    Raises:
+    - ValueError: If the format is unsupported or the body is malformed.
+    """
+    media_type = (content_type or NDJSON).split(";")[0].strip().lower()
+    parts = {}
+    if media_type == TELEMETRY:
+        offset = 0
+        while offset < len(body):
+            if body[offset:offset + 4] != TELEMETRY_MAGIC or offset + 8 > len(body):
+                raise ValueError("Invalid telemetry frame")
+            (size,) = struct.unpack_from("<I", body, offset + 4)
+            try:
+                header = json.loads(body[offset + 8:offset + 8 + size])
+                electrolyzer_id, length = str(header["electrolyzer_id"]), int(header["length"])
+            except (ValueError, KeyError, TypeError):
+                raise ValueError("Invalid telemetry frame header")
+            offset += 8 + size
+            if length < 0 or offset + 24 * length > len(body):
+                raise ValueError("Truncated telemetry frame")
+            columns = parts.setdefault(electrolyzer_id, tuple([] for _ in TELEMETRY_COLUMNS))
+            for column in columns:
+                column.append(np.frombuffer(body, dtype="<f8", count=length, offset=offset))
+                offset += 8 * length
+        return {
+            electrolyzer_id: tuple(column[0] if len(column) == 1 else np.concatenate(column) for column in columns)
+            for electrolyzer_id, columns in parts.items()
+        }
+    if media_type not in (NDJSON, JSON):
+        raise ValueError(f"Unsupported telemetry format: {media_type}")
+
+    lines = [line for line in body.split(b"\n") if line.strip()]
+    try:
+        for record in json.loads(b"[" + b",".join(lines) + b"]"):
+            columns = parts.setdefault(str(record["electrolyzer_id"]), tuple([] for _ in TELEMETRY_COLUMNS))
+            for column, name in zip(columns, TELEMETRY_COLUMNS):
+                value = record[name]
+                if isinstance(value, list):
+                    column.extend(value)
+                else:
+                    column.append(value)
+        decoded = {
+            electrolyzer_id: tuple(np.asarray(column, dtype=float) for column in columns)
+            for electrolyzer_id, columns in parts.items()
+        }
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid telemetry line: {str(e)}")
+    if any(len({len(column) for column in columns}) != 1 for columns in decoded.values()):
+        raise ValueError("time, power and hydrogen must have the same length")
+    return decoded
+
+
+def conditional_json(body: bytes, etag: str, if_none_match: str = None) -> Response:
+    """Send pre-encoded JSON with its ETag, or an empty 304 if the client already has that version.
+
+    Args:
+    - body (bytes): JSON body.
+    - etag (str): Quoted entity tag of body.
+    - if_none_match (str): Value of the If-None-Match header; '*' or any listed tag (weak or
+      strong) equal to etag means the client's copy is current.
+
+    Returns:
+    - Response: 200 with the body, or 304 without one; both carry the ETag.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(body, media_type=JSON, headers=headers)
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
-from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from hydrogen_factory.api.encoding import conditional_json
+from hydrogen_factory.api.timing import TimedRoute
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerPage, ElectrolyzerType
 from hydrogen_factory.services.electrolyzer_service import ElectrolyzerService
 from hydrogen_factory.core.config import get_electrolyzer_service
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/configure", response_model=ElectrolyzerConfig)
 async def configure_electrolyzer(
@@ -14,4 +17,38 @@ async def configure_electrolyzer(
         service.configure(config)
         return config
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/configure/bulk", response_model=list[ElectrolyzerConfig])
+async def configure_electrolyzer_bulk(
+    configs: list[ElectrolyzerConfig],
+    service: ElectrolyzerService = Depends(get_electrolyzer_service)
+):
+    try:
+        service.configure_bulk(configs)
+        return configs
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("", response_model=ElectrolyzerPage, responses={304: {"description": "Not modified"}})
+async def list_electrolyzers(
+    type: Optional[ElectrolyzerType] = Query(None, description="Only list electrolyzers of this type"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of electrolyzers per page"),
+    if_none_match: Optional[str] = Header(None),
+    service: ElectrolyzerService = Depends(get_electrolyzer_service)
+):
+    body, etag = service.list_json(type, cursor, limit)
+    return conditional_json(body, etag, if_none_match)
+
+@router.get("/{electrolyzer_id}", response_model=ElectrolyzerConfig, responses={304: {"description": "Not modified"}})
+async def get_electrolyzer(
+    electrolyzer_id: str,
+    if_none_match: Optional[str] = Header(None),
+    service: ElectrolyzerService = Depends(get_electrolyzer_service)
+):
+    try:
+        body, etag = service.get_json(electrolyzer_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return conditional_json(body, etag, if_none_match)
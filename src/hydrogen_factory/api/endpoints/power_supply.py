@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException
+from hydrogen_factory.api.timing import TimedRoute
+from hydrogen_factory.models.power_supply import PowerSupplyConfig
+from hydrogen_factory.services.power_supply_service import PowerSupplyService
+from hydrogen_factory.core.config import get_power_supply_service
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.post("/configure", response_model=PowerSupplyConfig)
+async def configure_power_supply(
+    config: PowerSupplyConfig,
+    service: PowerSupplyService = Depends(get_power_supply_service)
+):
+    try:
+        service.configure(config)
+        return config
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/configure/bulk", response_model=list[PowerSupplyConfig])
+async def configure_power_supply_bulk(
+    configs: list[PowerSupplyConfig],
+    service: PowerSupplyService = Depends(get_power_supply_service)
+):
+    try:
+        service.configure_bulk(configs)
+        return configs
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,17 +1,168 @@
-from fastapi import APIRouter, Depends, HTTPException
-from hydrogen_factory.models.schedule import OptimizationInput, OptimizationOutput
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from hydrogen_factory.api.encoding import ACCEPT_DESCRIPTION, COLUMNAR, encode_output
+from hydrogen_factory.api.timing import TimedRoute
+from hydrogen_factory.models.schedule import (
+    OptimizationInput, OptimizationOutput, FleetOptimizationInput, FleetOptimizationOutput, ReplanInput, ReplanOutput,
+    ScenarioInput, ScenarioOutput, SweepInput, SweepOutput, JobInfo
+)
 from hydrogen_factory.services.optimization_service import OptimizationService
-from hydrogen_factory.core.config import get_optimization_service
+from hydrogen_factory.services.fleet_service import FleetOptimizationService
+from hydrogen_factory.services.rolling_horizon import RollingHorizonService
+from hydrogen_factory.services.scenario_service import ScenarioService
+from hydrogen_factory.services.sweep_service import SizingSweepService
+from hydrogen_factory.services.job_service import JobService
+from hydrogen_factory.core.config import (
+    get_optimization_service, get_fleet_service, get_rolling_horizon_service, get_scenario_service,
+    get_sweep_service, get_job_service
+)
+from hydrogen_factory.core.exceptions import SolverPoolFullError, SolverTimeoutError
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
-@router.post("/optimize", response_model=OptimizationOutput)
+SCHEDULE_FORMATS = {200: {"content": {COLUMNAR: {}}}}
+
+@router.post("/optimize", response_model=OptimizationOutput, responses=SCHEDULE_FORMATS)
 async def optimize_schedule(
     input: OptimizationInput, 
+    service: OptimizationService = Depends(get_optimization_service),
+    accept: Optional[str] = Header(None, description=ACCEPT_DESCRIPTION)
+):
+    try:
+        result = await service.optimize_async(input)
+        return encode_output(result, accept)
+    except SolverPoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SolverTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/optimize/fleet", response_model=FleetOptimizationOutput)
+async def optimize_fleet_schedule(
+    input: FleetOptimizationInput,
+    service: FleetOptimizationService = Depends(get_fleet_service)
+):
+    try:
+        return await service.optimize_async(input)
+    except SolverPoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SolverTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/replan", response_model=ReplanOutput, responses=SCHEDULE_FORMATS)
+async def replan_schedule(
+    input: ReplanInput,
+    service: RollingHorizonService = Depends(get_rolling_horizon_service),
+    accept: Optional[str] = Header(None, description=ACCEPT_DESCRIPTION)
+):
+    try:
+        return encode_output(await service.replan(input), accept)
+    except SolverPoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SolverTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/scenarios", response_model=ScenarioOutput)
+async def evaluate_scenarios(
+    input: ScenarioInput,
+    service: ScenarioService = Depends(get_scenario_service)
+):
+    try:
+        return await service.evaluate(input)
+    except SolverPoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SolverTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/sweep", response_model=SweepOutput)
+async def sweep_sizing(
+    input: SweepInput,
+    service: SizingSweepService = Depends(get_sweep_service)
+):
+    try:
+        return await service.sweep(input)
+    except SolverPoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SolverTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/cache")
+async def get_cache_stats(service: OptimizationService = Depends(get_optimization_service)):
+    if service.result_cache is None:
+        raise HTTPException(status_code=404, detail="Result cache is disabled")
+    return service.result_cache.stats()
+
+@router.post("/optimize/batch", response_class=StreamingResponse)
+async def optimize_schedule_batch(
+    items: list[dict] = Body(..., description="List of OptimizationInput items"),
     service: OptimizationService = Depends(get_optimization_service)
 ):
+    async def stream():
+        async for item in service.optimize_batch(items):
+            yield item.model_dump_json(exclude_none=True) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/jobs", response_model=JobInfo, status_code=202)
+async def submit_optimization_job(
+    input: OptimizationInput,
+    service: JobService = Depends(get_job_service)
+):
+    try:
+        return service.submit(input)
+    except SolverPoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/jobs/fleet", response_model=JobInfo, status_code=202)
+async def submit_fleet_job(
+    input: FleetOptimizationInput,
+    service: JobService = Depends(get_job_service)
+):
+    try:
+        return service.submit_fleet(input)
+    except SolverPoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/jobs/{job_id}", response_model=JobInfo)
+async def get_job(job_id: str, service: JobService = Depends(get_job_service)):
+    try:
+        return service.get(job_id).info()
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.delete("/jobs/{job_id}", response_model=JobInfo)
+async def cancel_job(job_id: str, service: JobService = Depends(get_job_service)):
     try:
-        result = service.optimize(input)
-        return result
+        return service.cancel(job_id)
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/jobs/{job_id}/events", response_class=StreamingResponse)
+async def stream_job_events(job_id: str, service: JobService = Depends(get_job_service)):
+    try:
+        job = service.get(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    async def stream():
+        async for event in job.stream():
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {event.event}\ndata: {event.model_dump_json()}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
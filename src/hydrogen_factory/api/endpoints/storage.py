@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-from hydrogen_factory.models.storage import StorageConfig
+import time
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from hydrogen_factory.api.encoding import ACCEPT_DESCRIPTION, COLUMNAR, conditional_json, encode_output
+from hydrogen_factory.api.timing import TimedRoute
+from hydrogen_factory.models.storage import StorageConfig, StorageLevel, StorageLevels, StoragePage
 from hydrogen_factory.services.storage_service import StorageService
-from hydrogen_factory.core.config import get_storage_service
+from hydrogen_factory.services.level_store import StorageLevelStore
+from hydrogen_factory.core.config import get_level_store, get_storage_service
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/configure", response_model=StorageConfig)
 async def configure_storage(
@@ -14,4 +19,90 @@ async def configure_storage(
         service.configure(config)
         return config
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/configure/bulk", response_model=list[StorageConfig])
+async def configure_storage_bulk(
+    configs: list[StorageConfig],
+    service: StorageService = Depends(get_storage_service)
+):
+    try:
+        service.configure_bulk(configs)
+        return configs
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("", response_model=StoragePage, responses={304: {"description": "Not modified"}})
+async def list_storages(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of storage units per page"),
+    if_none_match: Optional[str] = Header(None),
+    service: StorageService = Depends(get_storage_service)
+):
+    body, etag = service.list_json(cursor, limit)
+    return conditional_json(body, etag, if_none_match)
+
+@router.get("/{storage_id}", response_model=StorageConfig, responses={304: {"description": "Not modified"}})
+async def get_storage(
+    storage_id: str,
+    if_none_match: Optional[str] = Header(None),
+    service: StorageService = Depends(get_storage_service)
+):
+    try:
+        body, etag = service.get_json(storage_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return conditional_json(body, etag, if_none_match)
+
+def level_store_for(storage_id: str, service: StorageService, store: StorageLevelStore) -> StorageLevelStore:
+    """Return the level history after checking that the storage exists (404) and the history is enabled (400)."""
+    try:
+        service.get_config(storage_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if store is None:
+        raise HTTPException(status_code=400, detail="Storage level history is disabled")
+    return store
+
+@router.post("/{storage_id}/levels", status_code=204)
+async def record_storage_levels(
+    storage_id: str,
+    levels: StorageLevels,
+    service: StorageService = Depends(get_storage_service),
+    store: Optional[StorageLevelStore] = Depends(get_level_store)
+):
+    store = level_store_for(storage_id, service, store)
+    try:
+        store.record(storage_id, levels.kind, levels.times, levels.levels)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(status_code=204)
+
+@router.get("/{storage_id}/levels", response_model=StorageLevels, responses={200: {"content": {COLUMNAR: {}}}})
+async def read_storage_levels(
+    storage_id: str,
+    kind: Literal["planned", "measured"] = Query("measured", description="Series to read"),
+    start: Optional[float] = Query(None, description="First Unix time (s) to include"),
+    end: Optional[float] = Query(None, description="Unix time (s) up to which levels are included (exclusive)"),
+    accept: Optional[str] = Header(None, description=ACCEPT_DESCRIPTION),
+    service: StorageService = Depends(get_storage_service),
+    store: Optional[StorageLevelStore] = Depends(get_level_store)
+):
+    times, levels = level_store_for(storage_id, service, store).read(storage_id, kind, start, end)
+    result = StorageLevels(kind=kind, times=times.tolist(), levels=levels.tolist())
+    try:
+        return encode_output(result.attach_columns(times=times, levels=levels), accept)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{storage_id}/levels/latest", response_model=StorageLevel)
+async def latest_storage_level(
+    storage_id: str,
+    at: Optional[float] = Query(None, description="Unix time (s) at or before which the level was recorded; defaults to now"),
+    service: StorageService = Depends(get_storage_service),
+    store: Optional[StorageLevelStore] = Depends(get_level_store)
+):
+    latest = level_store_for(storage_id, service, store).latest(storage_id, time.time() if at is None else at)
+    if latest is None:
+        raise HTTPException(status_code=404, detail="No storage level recorded")
+    return StorageLevel(time=latest[0], level=latest[1], kind=latest[2])
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from hydrogen_factory.api.encoding import NDJSON, TELEMETRY, decode_telemetry
+from hydrogen_factory.api.timing import TimedRoute
+from hydrogen_factory.models.telemetry import (
+    TelemetryIngestResult, TelemetryAggregates, CalibrationInput, CalibrationResult
+)
+from hydrogen_factory.services.telemetry_service import TelemetryService
+from hydrogen_factory.core.config import get_telemetry_service
+
+router = APIRouter(route_class=TimedRoute)
+
+def ingest_body(service: TelemetryService, body: bytes, content_type: str) -> TelemetryIngestResult:
+    accepted, dropped = service.ingest(decode_telemetry(body, content_type))
+    return TelemetryIngestResult(accepted=accepted, dropped=dropped)
+
+@router.post(
+    "/ingest", response_model=TelemetryIngestResult, status_code=202,
+    openapi_extra={"requestBody": {"content": {NDJSON: {}, TELEMETRY: {}}}},
+)
+async def ingest_telemetry(
+    request: Request,
+    content_type: Optional[str] = Header(None, description=f"{NDJSON} (default) or {TELEMETRY} frames"),
+    service: TelemetryService = Depends(get_telemetry_service)
+):
+    body = await request.body()
+    try:
+        # Decoding and buffering run on a worker thread, so large batches do not block the event loop.
+        return await asyncio.to_thread(ingest_body, service, body, content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{electrolyzer_id}/aggregates", response_model=TelemetryAggregates)
+async def telemetry_aggregates(
+    electrolyzer_id: str,
+    resolution: Literal["minute", "hour"] = Query("minute", description="Width of the aggregation buckets"),
+    start: Optional[float] = Query(None, description="First Unix time (s) to include"),
+    end: Optional[float] = Query(None, description="Unix time (s) up to which buckets are included (exclusive)"),
+    service: TelemetryService = Depends(get_telemetry_service)
+):
+    try:
+        return service.aggregated(electrolyzer_id, resolution, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.post("/calibrate", response_model=list[CalibrationResult])
+async def calibrate_efficiency(
+    input: CalibrationInput,
+    service: TelemetryService = Depends(get_telemetry_service)
+):
+    try:
+        return await asyncio.to_thread(service.calibrate_many, input)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
-from hydrogen_factory.api.endpoints import electrolyzer, storage, schedule
+from hydrogen_factory.api.endpoints import electrolyzer, storage, power_supply, schedule, telemetry
 
 api_router = APIRouter()
 api_router.include_router(electrolyzer.router, prefix="/electrolyzer", tags=["Electrolyzer"])
 api_router.include_router(storage.router, prefix="/storage", tags=["Storage"])
-api_router.include_router(schedule.router, prefix="/schedule", tags=["Schedule"])
\ No newline at end of file
+api_router.include_router(power_supply.router, prefix="/power-supply", tags=["Power Supply"])
+api_router.include_router(schedule.router, prefix="/schedule", tags=["Schedule"])
+api_router.include_router(telemetry.router, prefix="/telemetry", tags=["Telemetry"])
\ No newline at end of file
@@ -0,0 +1,98 @@
+import asyncio
+import functools
+from contextvars import ContextVar
+from time import perf_counter
+from fastapi.routing import APIRoute
+from hydrogen_factory.core.metrics import (
+    METRICS, REQUEST_SECONDS, begin_request, end_request, record_stage, server_timing
+)
+
+# Start of the route handler and end of the endpoint function, for the request being routed.
+_route_marks: ContextVar = ContextVar("route_marks", default=None)
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that records how long request validation and response serialization take.
+
+    'validate' covers reading the body and resolving the endpoint's parameters and dependencies
+    (pydantic validation); 'serialize' covers the response model validation and JSON encoding
+    after the endpoint returns.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            if not METRICS.enabled:
+                return await handler(request)
+            marks = {"start": perf_counter()}
+            token = _route_marks.set(marks)
+            try:
+                response = await handler(request)
+            finally:
+                _route_marks.reset(token)
+            if "end" in marks:
+                record_stage("serialize", perf_counter() - marks["end"])
+            return response
+
+        return timed_handler
+
+
+def _timed_endpoint(endpoint):
+    """Wrap an async endpoint so that its start and end are marked; the signature is preserved."""
+    if not asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def timed_endpoint(*args, **kwargs):
+        marks = _route_marks.get()
+        if marks is None:
+            return await endpoint(*args, **kwargs)
+        start = perf_counter()
+        record_stage("validate", start - marks["start"])
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            marks["end"] = perf_counter()
+            record_stage("endpoint", marks["end"] - start)
+
+    return timed_endpoint
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app):
+        """ASGI middleware that times every HTTP request and reports its stages in a Server-Timing header.
+
+        Stages recorded while the request is handled (see core.metrics.stage) are collected in a
+        per-request context variable; the header is added when the response starts. The request
+        duration is also observed in hf_request_seconds, labelled by the matched route's name
+        (the endpoint function name), which keeps the label set bounded.
+
+        Args:
+        - app: The wrapped ASGI application.
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS.enabled:
+            await self.app(scope, receive, send)
+            return
+        token, timings = begin_request()
+        start = perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total = perf_counter() - start
+                handler = getattr(scope.get("route"), "name", "unmatched")
+                REQUEST_SECONDS.observe(total, scope["method"], handler, str(message["status"]))
+                headers = [*message.get("headers", []), (b"server-timing", server_timing(timings, total).encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request(token)
@@ -1,17 +1,193 @@
-from fastapi import Depends
+import functools
+import os
+import threading
 from hydrogen_factory.services.electrolyzer_service import ElectrolyzerService
 from hydrogen_factory.services.storage_service import StorageService
+from hydrogen_factory.services.power_supply_service import PowerSupplyService
 from hydrogen_factory.services.optimization_service import OptimizationService
+from hydrogen_factory.services.fleet_service import FleetOptimizationService
+from hydrogen_factory.services.rolling_horizon import RollingHorizonService
+from hydrogen_factory.services.scenario_service import ScenarioService
+from hydrogen_factory.services.sweep_service import SizingSweepService
+from hydrogen_factory.services.job_service import JobService
+from hydrogen_factory.services.solver_pool import SolverPool
+from hydrogen_factory.services.result_cache import ResultCache
+from hydrogen_factory.services.solver_selector import SolverSelector, load_thresholds
+from hydrogen_factory.services.level_store import StorageLevelStore
+from hydrogen_factory.services.telemetry_service import TelemetryService
+from hydrogen_factory.services.config_repository import ConfigRepository
+from hydrogen_factory.services.sqlite_repository import SqliteConfigRepository
+from hydrogen_factory.core.metrics import METRICS
 
-_electrolyzer_service = ElectrolyzerService()
-_storage_service = StorageService()
-_optimization_service = OptimizationService(_electrolyzer_service, _storage_service)
+CONFIG_BACKEND = os.getenv("HF_CONFIG_BACKEND", "json")
+CONFIG_DB = os.getenv("HF_CONFIG_DB", "config.db")
+CONFIG_FILE = os.getenv("HF_CONFIG_FILE", "config.json")
+CONFIG_COMPACT_EVERY = int(os.getenv("HF_CONFIG_COMPACT_EVERY", "1000"))
+CONFIG_FSYNC = os.getenv("HF_CONFIG_FSYNC", "1") == "1"
+ASSET_CACHE_ENTRIES = int(os.getenv("HF_ASSET_CACHE_ENTRIES", "10000"))
+LP_SOLVER = os.getenv("HF_LP_SOLVER", "auto")
+SOLVER_THRESHOLDS = os.getenv("HF_SOLVER_THRESHOLDS") or None
+SOLVER_EXECUTOR = os.getenv("HF_SOLVER_EXECUTOR", "thread")
+SOLVER_WORKERS = int(os.getenv("HF_SOLVER_WORKERS", "0")) or os.cpu_count() or 1
+SOLVER_QUEUE_SIZE = int(os.getenv("HF_SOLVER_QUEUE_SIZE", "32"))
+SOLVER_TIME_LIMIT = float(os.getenv("HF_SOLVER_TIME_LIMIT", "30"))
+FLEET_WORKERS = int(os.getenv("HF_FLEET_WORKERS", "1"))
+RESULT_CACHE_ENTRIES = int(os.getenv("HF_RESULT_CACHE_ENTRIES", "1024"))
+RESULT_CACHE_MB = float(os.getenv("HF_RESULT_CACHE_MB", "64"))
+RESULT_CACHE_TTL = float(os.getenv("HF_RESULT_CACHE_TTL", "300"))
+REPLAN_MAX_PLANS = int(os.getenv("HF_REPLAN_MAX_PLANS", "1024"))
+JOB_WORKERS = int(os.getenv("HF_JOB_WORKERS", "0")) or SOLVER_WORKERS
+JOB_QUEUE_SIZE = int(os.getenv("HF_JOB_QUEUE_SIZE", "32"))
+JOB_TIME_LIMIT = float(os.getenv("HF_JOB_TIME_LIMIT", "600"))
+JOB_TTL = float(os.getenv("HF_JOB_TTL", "3600"))
+JOB_MAX_STORED = int(os.getenv("HF_JOB_MAX_STORED", "1024"))
+JOB_START_METHOD = os.getenv("HF_JOB_START_METHOD") or None
+LEVEL_STORE_DIR = os.getenv("HF_LEVEL_STORE_DIR", "levels")
+TELEMETRY_DIR = os.getenv("HF_TELEMETRY_DIR", "telemetry")
+TELEMETRY_FLUSH_SAMPLES = int(os.getenv("HF_TELEMETRY_FLUSH_SAMPLES", "100000"))
+TELEMETRY_FLUSH_INTERVAL = float(os.getenv("HF_TELEMETRY_FLUSH_INTERVAL", "5"))
 
+_lock = threading.RLock()
+
+
+def _shared(factory):
+    """Build the instance returned by factory on first use and return the same instance afterwards.
+
+    Services are created lazily so that importing the application does not read the configuration
+    or start solver workers; every getter shares the services it depends on (one configuration
+    repository for all of them). Construction is guarded by a lock because FastAPI resolves sync
+    dependencies on worker threads.
+
+    Args:
+    - factory (Callable): Function that builds the instance.
+
+    Returns:
+    - Callable: Getter with a built() method telling whether the instance exists yet.
+    """
+    instance = None
+
+    @functools.wraps(factory)
+    def get():
+        nonlocal instance
+        if instance is None:
+            with _lock:
+                if instance is None:
+                    instance = factory()
+        return instance
+
+    get.built = lambda: instance is not None
+    return get
+
+
+@_shared
+def get_config_repository():
+    if CONFIG_BACKEND == "sqlite":
+        return SqliteConfigRepository(CONFIG_DB)
+    return ConfigRepository(CONFIG_FILE, compact_every=CONFIG_COMPACT_EVERY, fsync=CONFIG_FSYNC)
+
+@_shared
 def get_electrolyzer_service() -> ElectrolyzerService:
-    return _electrolyzer_service
+    return ElectrolyzerService(get_config_repository(), cache_entries=ASSET_CACHE_ENTRIES)
 
+@_shared
 def get_storage_service() -> StorageService:
-    return _storage_service
+    return StorageService(get_config_repository(), cache_entries=ASSET_CACHE_ENTRIES)
+
+@_shared
+def get_power_supply_service() -> PowerSupplyService:
+    return PowerSupplyService(get_config_repository())
+
+@_shared
+def get_solver_pool() -> SolverPool:
+    return SolverPool(
+        max_workers=SOLVER_WORKERS,
+        max_queue=SOLVER_QUEUE_SIZE,
+        time_limit=SOLVER_TIME_LIMIT,
+        use_processes=SOLVER_EXECUTOR == "process",
+    )
 
+@_shared
+def get_result_cache() -> ResultCache:
+    return ResultCache(
+        max_entries=RESULT_CACHE_ENTRIES,
+        max_bytes=int(RESULT_CACHE_MB * 1024 * 1024),
+        ttl=RESULT_CACHE_TTL,
+    )
+
+@_shared
+def get_solver_selector() -> SolverSelector:
+    thresholds = load_thresholds(SOLVER_THRESHOLDS) if SOLVER_THRESHOLDS else None
+    return SolverSelector(LP_SOLVER, thresholds=thresholds)
+
+@_shared
+def get_level_store() -> StorageLevelStore:
+    return StorageLevelStore(LEVEL_STORE_DIR) if LEVEL_STORE_DIR else None
+
+@_shared
+def get_telemetry_service() -> TelemetryService:
+    return TelemetryService(
+        get_electrolyzer_service(), TELEMETRY_DIR, flush_samples=TELEMETRY_FLUSH_SAMPLES,
+        flush_interval=TELEMETRY_FLUSH_INTERVAL,
+    )
+
+@_shared
 def get_optimization_service() -> OptimizationService:
-    return _optimization_service
\ No newline at end of file
+    return OptimizationService(
+        get_electrolyzer_service(), get_storage_service(), solver_pool=get_solver_pool(),
+        result_cache=get_result_cache(), power_supply_service=get_power_supply_service(),
+        selector=get_solver_selector(), level_store=get_level_store(),
+    )
+
+@_shared
+def get_fleet_service() -> FleetOptimizationService:
+    return FleetOptimizationService(
+        get_electrolyzer_service(), get_storage_service(), solver_pool=get_solver_pool(),
+        subproblem_workers=FLEET_WORKERS, selector=get_solver_selector(),
+    )
+
+@_shared
+def get_rolling_horizon_service() -> RollingHorizonService:
+    return RollingHorizonService(get_optimization_service(), max_plans=REPLAN_MAX_PLANS)
+
+@_shared
+def get_scenario_service() -> ScenarioService:
+    return ScenarioService(get_optimization_service())
+
+@_shared
+def get_sweep_service() -> SizingSweepService:
+    return SizingSweepService(get_optimization_service())
+
+@_shared
+def get_job_service() -> JobService:
+    return JobService(
+        get_optimization_service(), get_fleet_service(), max_workers=JOB_WORKERS, max_queue=JOB_QUEUE_SIZE,
+        time_limit=JOB_TIME_LIMIT, ttl=JOB_TTL, max_jobs=JOB_MAX_STORED, start_method=JOB_START_METHOD,
+    )
+
+def shutdown():
+    """Stop the solver workers and jobs of the services that were created, close the level history
+    and write the buffered telemetry."""
+    if get_job_service.built():
+        get_job_service().shutdown()
+    if get_solver_pool.built():
+        get_solver_pool().shutdown()
+    if get_fleet_service.built():
+        get_fleet_service().shutdown()
+    if get_level_store.built():
+        get_level_store().close()
+    if get_telemetry_service.built():
+        get_telemetry_service().flush()
+
+
+METRICS.gauge(
+    "hf_solver_queue_depth", "Solves waiting for a free solver worker",
+    lambda: get_solver_pool().queue_depth if get_solver_pool.built() else 0,
+)
+METRICS.gauge(
+    "hf_solver_pending", "Solves submitted and not yet finished",
+    lambda: get_solver_pool().pending if get_solver_pool.built() else 0,
+)
+METRICS.gauge(
+    "hf_result_cache_entries", "Entries in the result cache",
+    lambda: len(get_result_cache().entries) if get_result_cache.built() else 0,
+)
@@ -1,2 +1,29 @@
 class HydrogenFactoryException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class SolverPoolFullError(HydrogenFactoryException):
+    """Raised when the solver pool has no free worker and its queue is full."""
+    pass
+
+class SolverTimeoutError(HydrogenFactoryException):
+    """Raised when a solve does not finish within its time limit."""
+    pass
+
+class InfeasibleScheduleError(ValueError):
+    """Raised when the demand cannot be met within the production and storage limits.
+
+    A ValueError, so it is answered like every other failed optimization (400).
+
+    Attributes:
+    - step (int): First time step at which a constraint is violated.
+    - hour (float): Start of that step, in hours from the start of the horizon.
+    - constraint (str): 'demand' (demand exceeds production plus stored hydrogen) or
+      'max_capacity' (the storage level cannot be kept below the maximum capacity).
+    - amount (float): Size of the violation (kg).
+    """
+    def __init__(self, message: str, step: int, hour: float, constraint: str, amount: float):
+        super().__init__(message)
+        self.step = step
+        self.hour = hour
+        self.constraint = constraint
+        self.amount = amount
@@ -0,0 +1,238 @@
+import os
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+# Stage durations of the request being handled, for the Server-Timing header; None outside requests.
+_request_timings: ContextVar = ContextVar("request_timings", default=None)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        """Prometheus-style histogram with fixed buckets, one series per label combination.
+
+        Args:
+        - name (str): Metric name.
+        - help (str): Description shown in the exposition.
+        - labels (tuple[str]): Label names; observe() takes one value per label.
+        - buckets (tuple[float]): Upper bounds of the buckets, ascending.
+
+        Variables:
+        - self.series (dict): Maps label values to [per-bucket counts (last one is +Inf), sum].
+        - self.lock (threading.Lock): Guards self.series.
+        """
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        """Record one observation for the given label values."""
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self.series.items()]
+        for labels, counts, total in sorted(series):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), labels + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {total!r}")
+            lines.append(f"{self.name}_count{_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        """Prometheus-style counter, one value per label combination."""
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        """Increase the counter of the given label values."""
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            values = sorted(self.values.items())
+        lines.extend(f"{self.name}{_labels(self.labels, labels)} {value!r}" for labels, value in values)
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help: str, read):
+        """Gauge whose value is read from a callable when the metrics are rendered."""
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {float(self.read())!r}"]
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True):
+        """Collection of metrics rendered together in the Prometheus text format.
+
+        Args:
+        - enabled (bool): If False, timers do nothing; counters and gauges still work.
+
+        Variables:
+        - self.metrics (dict): Maps metric names to Histogram, Counter or Gauge instances.
+        """
+        self.enabled = enabled
+        self.metrics = {}
+
+    def histogram(self, name: str, help: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def counter(self, name: str, help: str, labels: tuple = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, read) -> Gauge:
+        """Register (or replace) a gauge read from the given callable."""
+        gauge = Gauge(name, help, read)
+        self.metrics[name] = gauge
+        return gauge
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        existing = self.metrics.setdefault(metric.name, metric)
+        if type(existing) is not type(metric):
+            raise ValueError(f"Metric {metric.name} is already registered with another type")
+        return existing
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "timing", "start")
+
+    def __init__(self, histogram: Histogram, labels: tuple, timing: str = None):
+        self.histogram = histogram
+        self.labels = labels
+        self.timing = timing
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = perf_counter() - self.start
+        self.histogram.observe(elapsed, *self.labels)
+        if self.timing is not None:
+            record_timing(self.timing, elapsed)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+METRICS = MetricsRegistry(enabled=os.getenv("HF_METRICS", "1") == "1")
+STAGE_SECONDS = METRICS.histogram(
+    "hf_stage_seconds", "Duration of request and optimization stages", ("stage",)
+)
+REQUEST_SECONDS = METRICS.histogram(
+    "hf_request_seconds", "Duration of HTTP requests until the response starts", ("method", "handler", "status")
+)
+SOLVER_RESULTS = METRICS.counter(
+    "hf_solver_results_total", "Schedule solves by solver path and outcome", ("path", "status")
+)
+TELEMETRY_SAMPLES = METRICS.counter(
+    "hf_telemetry_samples_total", "Telemetry samples received, by whether they were accepted or dropped", ("status",)
+)
+CONFIG_IO_SECONDS = METRICS.histogram(
+    "hf_config_io_seconds", "Duration of configuration repository writes", ("backend", "operation")
+)
+
+
+def timer(histogram: Histogram, *labels: str, timing: str = None):
+    """Context manager that observes its duration in histogram and optionally in the Server-Timing header.
+
+    Args:
+    - histogram (Histogram): Histogram to observe the duration in.
+    - *labels (str): Label values of the series.
+    - timing (str): Name under which the duration is added to the current request's Server-Timing.
+    """
+    if not METRICS.enabled:
+        return _NULL_TIMER
+    return _Timer(histogram, labels, timing)
+
+
+def stage(name: str):
+    """Context manager timing one stage of a request or optimization (hf_stage_seconds and Server-Timing)."""
+    if not METRICS.enabled:
+        return _NULL_TIMER
+    return _Timer(STAGE_SECONDS, (name,), name)
+
+
+def record_stage(name: str, seconds: float):
+    """Record a stage duration measured elsewhere."""
+    if METRICS.enabled:
+        STAGE_SECONDS.observe(seconds, name)
+        record_timing(name, seconds)
+
+
+def record_timing(name: str, seconds: float):
+    """Add a duration to the current request's Server-Timing entries, if a request is being handled."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def begin_request():
+    """Start collecting Server-Timing entries for the current request; returns (token, timings)."""
+    timings = {}
+    return _request_timings.set(timings), timings
+
+
+def end_request(token):
+    _request_timings.reset(token)
+
+
+def server_timing(timings: dict, total: float) -> str:
+    """Format stage durations (s) as a Server-Timing header value in milliseconds."""
+    entries = [f"{name};dur={seconds * 1e3:.3f}" for name, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1e3:.3f}")
+    return ", ".join(entries)
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
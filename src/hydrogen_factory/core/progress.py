@@ -0,0 +1,22 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Callback receiving (event, data) milestones of the solve running in this context; None if nobody listens.
+_listener: ContextVar = ContextVar("progress_listener", default=None)
+
+
+def report(event: str, **data):
+    """Report a solve milestone (e.g. 'built', 'incumbent') to the listener of the current context, if any."""
+    listener = _listener.get()
+    if listener is not None:
+        listener(event, data)
+
+
+@contextmanager
+def listen(callback):
+    """Send the milestones reported inside the block to callback(event, data)."""
+    token = _listener.set(callback)
+    try:
+        yield
+    finally:
+        _listener.reset(token)
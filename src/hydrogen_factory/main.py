@@ -1,14 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from hydrogen_factory.api.timing import ServerTimingMiddleware
 from hydrogen_factory.api.router import api_router
+from hydrogen_factory.core.config import shutdown
+from hydrogen_factory.core.metrics import METRICS
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown()
 
 app = FastAPI(
     title="HydrogenFactory Control API",
     description="API for controlling a hydrogen production factory",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+app.add_middleware(ServerTimingMiddleware)
 app.include_router(api_router, prefix="/api")
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to the HydrogenFactory Control API"}
\ No newline at end of file
+    return {"message": "Welcome to the HydrogenFactory Control API"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,42 @@
+from typing import ClassVar, Optional
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
+
+class ColumnarModel(BaseModel):
+    """Response model whose list fields named in SERIES can be sent as binary columns.
+
+    The arrays the lists were built from can be attached, so that binary responses are written
+    from them without converting the lists back.
+    """
+    _columns: Optional[dict] = PrivateAttr(None)
+
+    SERIES: ClassVar[tuple] = ()
+
+    def attach_columns(self, **columns: np.ndarray):
+        """Keep the NumPy arrays the per-step series were built from, for binary responses.
+
+        Args:
+        - **columns (np.ndarray): float64 array per series name; optional series may be None.
+
+        Returns:
+        - ColumnarModel: self.
+        """
+        self._columns = {name: array for name, array in columns.items() if array is not None}
+        return self
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """Return the per-step series as float64 arrays in SERIES order, without copies when attached."""
+        attached = self._columns or {}
+        return {
+            name: attached[name] if name in attached else np.asarray(getattr(self, name), dtype=np.float64)
+            for name in self.SERIES
+            if getattr(self, name) is not None
+        }
+
+    def __eq__(self, other) -> bool:
+        """Compare the field values only; attached arrays are a copy of the series."""
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+    def attached_bytes(self) -> int:
+        """Memory held by the attached arrays (bytes)."""
+        return sum(array.nbytes for array in (self._columns or {}).values())
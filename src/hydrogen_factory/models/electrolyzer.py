@@ -1,15 +1,45 @@
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict, model_serializer, model_validator
 
 class ElectrolyzerType(str, Enum):
     PEM = "PEM"
     ALKALINE = "ALKALINE"
 
+# Built-in part-load curves: (load as a fraction of capacity, efficiency relative to full load).
+# Efficiency peaks at part load, where the cell overpotentials are low, and drops at very low load,
+# where the balance of plant dominates; alkaline stacks peak later and cannot run as low.
+TYPE_EFFICIENCY_CURVES = {
+    ElectrolyzerType.PEM: ((0.05, 0.80), (0.1, 1.08), (0.25, 1.15), (0.5, 1.10), (0.75, 1.05), (1.0, 1.0)),
+    ElectrolyzerType.ALKALINE: ((0.15, 0.85), (0.25, 1.0), (0.5, 1.08), (0.75, 1.05), (1.0, 1.0)),
+}
+
+# Settings of the part-load model; left out of serialized configs while they keep their defaults.
+PART_LOAD_FIELDS = ("efficiency_curve", "type_curve", "min_load", "startup_cost")
+
+class EfficiencyPoint(BaseModel):
+    load: float = Field(..., gt=0, le=1, description="Load as a fraction of capacity")
+    efficiency: float = Field(..., gt=0, description="Efficiency at this load (kg H₂/kWh)")
+
 class ElectrolyzerConfig(BaseModel):
     electrolyzer_id: str = Field(..., description="Unique identifier for the electrolyzer")
     type: ElectrolyzerType = Field(..., description="Type of electrolyzer (PEM or ALKALINE)")
     capacity: float = Field(..., gt=0, description="Maximum power capacity (kW)")
-    efficiency: float = Field(0.02, gt=0, description="Constant efficiency (kg H₂/kWh)")
+    efficiency: float = Field(0.02, gt=0, description="Constant efficiency (kg H₂/kWh); the full-load efficiency with type_curve")
+    efficiency_curve: Optional[list[EfficiencyPoint]] = Field(
+        None, min_length=1,
+        description="Part-load efficiency curve, by increasing load and ending at load 1; replaces efficiency. "
+                    "Production is interpolated linearly between the points and zero load"
+    )
+    type_curve: bool = Field(
+        False, description="Use the built-in part-load curve of the electrolyzer type, scaled to efficiency at full load"
+    )
+    min_load: float = Field(
+        0.0, ge=0, lt=1, description="Minimum stable load while running, as a fraction of capacity"
+    )
+    startup_cost: float = Field(
+        0.0, ge=0, description="Cost of each start-up (€); the electrolyzer is off before the horizon"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -20,4 +50,42 @@ class ElectrolyzerConfig(BaseModel):
                 "efficiency": 0.02,
             }
         }
-    )
\ No newline at end of file
+    )
+
+    @model_validator(mode="after")
+    def check_curve(self):
+        if self.efficiency_curve is not None:
+            if self.type_curve:
+                raise ValueError("efficiency_curve and type_curve cannot be combined")
+            loads = [point.load for point in self.efficiency_curve]
+            if any(b <= a for a, b in zip(loads, loads[1:])) or loads[-1] != 1.0:
+                raise ValueError("efficiency_curve loads must increase and end at 1")
+        return self
+
+    @model_serializer(mode="wrap")
+    def omit_default_part_load(self, handler):
+        """Serialize without unused part-load settings, so constant-efficiency configs keep their shape."""
+        data = handler(self)
+        for name in PART_LOAD_FIELDS:
+            if getattr(self, name) == type(self).model_fields[name].default:
+                data.pop(name, None)
+        return data
+
+    @property
+    def part_load(self) -> bool:
+        """Whether the electrolyzer needs the part-load model instead of a constant efficiency."""
+        return (self.efficiency_curve is not None or self.type_curve
+                or self.min_load > 0 or self.startup_cost > 0)
+
+    def curve(self) -> tuple[list[float], list[float]]:
+        """Return the part-load curve as (loads, efficiencies in kg H₂/kWh), ending at full load."""
+        if self.efficiency_curve is not None:
+            return [p.load for p in self.efficiency_curve], [p.efficiency for p in self.efficiency_curve]
+        if self.type_curve:
+            points = TYPE_EFFICIENCY_CURVES[self.type]
+            return [load for load, _ in points], [self.efficiency * relative for _, relative in points]
+        return [1.0], [self.efficiency]
+
+class ElectrolyzerPage(BaseModel):
+    items: list[ElectrolyzerConfig] = Field(..., description="Electrolyzers on this page, ordered by ID")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page; null on the last page")
@@ -1,5 +1,6 @@
 from enum import Enum
-from pydantic import BaseModel, Field
+from typing import Annotated
+from pydantic import BaseModel, Field, ConfigDict
 
 class PowerSupplyType(str, Enum):
     PHOTOVOLTAIC = "PHOTOVOLTAIC"
@@ -10,12 +11,12 @@ class PowerSupplyConfig(BaseModel):
     supply_id: str = Field(..., description="Unique identifier for the power supply")
     type: PowerSupplyType = Field(..., description="Type of power supply")
     capacity: float = Field(..., gt=0, description="Maximum power capacity (kW)")
-    availability: list[float] = Field(
-        ..., min_items=24, max_items=24, description="Hourly availability (0 to 1) for 24 hours"
+    availability: list[Annotated[float, Field(ge=0, le=1)]] = Field(
+        ..., min_length=24, max_length=24, description="Hourly availability (0 to 1) for 24 hours"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "supply_id": "S1",
                 "type": "PHOTOVOLTAIC",
@@ -24,3 +25,4 @@ class PowerSupplyConfig(BaseModel):
                                  1.0, 0.9, 0.8, 0.6, 0.3, 0.1, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
             }
         }
+    )
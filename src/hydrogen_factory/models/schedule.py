@@ -1,20 +1,61 @@
-from pydantic import BaseModel, Field, ConfigDict
+from enum import Enum
+from typing import ClassVar, Literal, Optional, Union
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from hydrogen_factory.models.columnar import ColumnarModel
+from hydrogen_factory.models.electrolyzer import ElectrolyzerType
 import random
 
+MAX_HORIZON_STEPS = 100_000
+
 class OptimizationInput(BaseModel):
     electrolyzer_id: str = Field(..., description="ID of the electrolyzer to use")
     storage_id: str = Field(..., description="ID of the storage to use")
     electricity_prices: list[float] = Field(
         default_factory=lambda: [round(random.uniform(0.03, 0.10), 3) for _ in range(24)],
-        min_length=24,
-        max_length=24,
-        description="Hourly electricity prices (€/kWh), randomly generated between 0.03 and 0.10"
+        min_length=1,
+        max_length=MAX_HORIZON_STEPS,
+        description="Electricity price per time step (€/kWh), randomly generated between 0.03 and 0.10 for 24 steps"
     )
     hydrogen_demand: list[float] = Field(
         default_factory=lambda: [round(random.uniform(1.0, 5.0), 2) for _ in range(24)],
-        min_length=24,
-        max_length=24,
-        description="Hourly hydrogen demand (kg), randomly generated between 1.0 and 5.0"
+        min_length=1,
+        max_length=MAX_HORIZON_STEPS,
+        description="Hydrogen demand per time step (kg), randomly generated between 1.0 and 5.0 for 24 steps"
+    )
+    time_step_hours: float = Field(
+        1.0, gt=0, description="Duration of one time step (h), e.g. 0.25 for 15-minute resolution"
+    )
+    initial_storage_level: Optional[float] = Field(
+        None, ge=0, description="Storage level at the start of the horizon (kg); defaults to the latest level "
+                                "recorded for the storage at start_time (or now), or 0 without one"
+    )
+    start_time: Optional[float] = Field(
+        None, gt=0, description="Unix time (s) at which the first time step starts; the planned storage levels "
+                                "are then recorded in the storage's level history"
+    )
+    start_hour: float = Field(
+        0.0, ge=0, lt=24, description="Hour of the day at which the first time step starts; aligns power supply availability"
+    )
+    power_supply_ids: list[str] = Field(
+        default_factory=list,
+        description="Power supplies feeding the electrolyzer; photovoltaic/wind power is free up to its availability "
+                    "and grid power is limited to the listed GRID supplies. Empty means unlimited grid power"
+    )
+    time_limit: Optional[float] = Field(
+        None, gt=0, description="Solver time limit (s); defaults to the server's configured limit"
+    )
+    mip_gap: Optional[float] = Field(
+        None, ge=0, le=1, description="Relative MIP gap at which the MIP solver stops; defaults to the solver's own. "
+                                       "Only affects integer models"
+    )
+    unmet_demand_penalty: Optional[float] = Field(
+        None, gt=0, description="Allow unmet demand at this cost (€/kg) instead of failing when the demand cannot be "
+                                "met; the response then lists unmet_demand. The cost is not part of total_cost"
+    )
+    solver: Optional[Literal["dispatch", "highs", "cbc", "glpk"]] = Field(
+        None, description="Solver to use instead of the one picked by problem size: 'dispatch' (merit order, only "
+                          "for constant efficiency and non-negative prices), 'highs' (in-process), 'cbc' or 'glpk' "
+                          "(subprocess, GLPK only if installed)"
     )
 
     model_config = ConfigDict(
@@ -24,12 +65,307 @@ class OptimizationInput(BaseModel):
                 "storage_id": "S1",
                 "electricity_prices": [0.05] * 24,
                 "hydrogen_demand": [2.0] * 24,
+                "time_step_hours": 1.0,
             }
         }
     )
 
-class OptimizationOutput(BaseModel):
-    power_schedule: list[float] = Field(..., description="Hourly power input to electrolyzer (kW)")
-    hydrogen_produced: list[float] = Field(..., description="Hourly hydrogen production (kg)")
-    storage_levels: list[float] = Field(..., description="Hourly storage levels (kg)")
-    total_cost: float = Field(..., description="Total electricity cost (€)")
\ No newline at end of file
+    @model_validator(mode="after")
+    def check_horizon(self):
+        if len(self.electricity_prices) != len(self.hydrogen_demand):
+            raise ValueError("electricity_prices and hydrogen_demand must have the same length")
+        return self
+
+    @property
+    def horizon(self) -> int:
+        """Number of time steps in the horizon."""
+        return len(self.electricity_prices)
+
+class OptimizationOutput(ColumnarModel):
+    power_schedule: list[float] = Field(..., description="Power input to electrolyzer per time step (kW)")
+    hydrogen_produced: list[float] = Field(..., description="Hydrogen production per time step (kg)")
+    storage_levels: list[float] = Field(..., description="Storage level at the end of each time step (kg)")
+    total_cost: float = Field(..., description="Total electricity cost (€)")
+    grid_power: Optional[list[float]] = Field(
+        None, description="Power drawn from the grid per time step (kW), if power supplies were given"
+    )
+    starts: Optional[int] = Field(
+        None, description="Number of electrolyzer start-ups, for electrolyzers with a minimum load or start-up cost"
+    )
+    startup_cost: Optional[float] = Field(
+        None, description="Cost of the start-ups (€), in addition to total_cost"
+    )
+    unmet_demand: Optional[list[float]] = Field(
+        None, description="Demand left unmet per time step (kg), if unmet_demand_penalty was given"
+    )
+
+    SERIES: ClassVar[tuple] = ("power_schedule", "hydrogen_produced", "storage_levels", "grid_power", "unmet_demand")
+
+class ReplanInput(OptimizationInput):
+    steps_executed: int = Field(
+        0, ge=0, description="Time steps of the previous plan executed since it was made; the plan is shifted by this many steps"
+    )
+    frozen_steps: int = Field(
+        0, ge=0, description="Leading time steps that keep the shifted previous plan's power (already dispatched)"
+    )
+
+class ReplanOutput(OptimizationOutput):
+    reused_plan: bool = Field(..., description="Whether the shifted previous plan was still optimal and returned without solving")
+    frozen_steps: int = Field(..., description="Number of leading time steps taken from the previous plan")
+
+class BatchOptimizationResult(BaseModel):
+    index: int = Field(..., description="Position of the item in the submitted batch")
+    result: Optional[OptimizationOutput] = Field(None, description="Optimized schedule, if the item succeeded")
+    error: Optional[str] = Field(None, description="Error message, if the item failed")
+
+class FleetAssignment(BaseModel):
+    electrolyzer_id: str = Field(..., description="ID of the electrolyzer")
+    storage_id: str = Field(..., description="ID of the storage the electrolyzer feeds")
+
+class FleetOptimizationInput(BaseModel):
+    assignments: list[FleetAssignment] = Field(
+        ..., min_length=1, description="Electrolyzers in the fleet and the storage each of them feeds"
+    )
+    electricity_prices: list[float] = Field(
+        ..., min_length=1, max_length=MAX_HORIZON_STEPS, description="Electricity price per time step (€/kWh)"
+    )
+    hydrogen_demand: dict[str, list[float]] = Field(
+        ..., description="Hydrogen demand per time step (kg) for each storage ID in the assignments"
+    )
+    power_limit: float = Field(..., gt=0, description="Shared grid connection limit of the fleet (kW)")
+    time_step_hours: float = Field(
+        1.0, gt=0, description="Duration of one time step (h), e.g. 0.25 for 15-minute resolution"
+    )
+    method: Literal["joint", "decomposition"] = Field(
+        "joint",
+        description="'joint' solves the fleet as one LP; 'decomposition' coordinates per-storage subproblems "
+                    "by power-limit prices, solving them in parallel for large fleets"
+    )
+    max_iterations: int = Field(50, ge=1, le=1000, description="Maximum number of price-coordination rounds")
+    gap_tolerance: float = Field(
+        1e-3, ge=0, description="Stop once the relative gap between schedule cost and lower bound is below this"
+    )
+    time_limit: Optional[float] = Field(
+        None, gt=0, description="Solver time limit (s); defaults to the server's configured limit"
+    )
+    solver: Optional[Literal["highs", "cbc", "glpk"]] = Field(
+        None, description="Solver for the joint LP instead of the one picked by fleet size; decomposition "
+                          "always uses HiGHS"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "assignments": [
+                    {"electrolyzer_id": "E1", "storage_id": "S1"},
+                    {"electrolyzer_id": "E2", "storage_id": "S1"},
+                ],
+                "electricity_prices": [0.05] * 24,
+                "hydrogen_demand": {"S1": [4.0] * 24},
+                "power_limit": 1500.0,
+            }
+        }
+    )
+
+    @model_validator(mode="after")
+    def check_fleet(self):
+        electrolyzer_ids = [a.electrolyzer_id for a in self.assignments]
+        if len(set(electrolyzer_ids)) != len(electrolyzer_ids):
+            raise ValueError("Each electrolyzer can only be assigned once")
+        storage_ids = {a.storage_id for a in self.assignments}
+        if set(self.hydrogen_demand) != storage_ids:
+            raise ValueError("hydrogen_demand must have exactly one entry per assigned storage")
+        if any(len(d) != len(self.electricity_prices) for d in self.hydrogen_demand.values()):
+            raise ValueError("electricity_prices and hydrogen_demand must have the same length")
+        return self
+
+    @property
+    def horizon(self) -> int:
+        """Number of time steps in the horizon."""
+        return len(self.electricity_prices)
+
+class FleetOptimizationOutput(BaseModel):
+    power_schedules: dict[str, list[float]] = Field(..., description="Power input per electrolyzer per time step (kW)")
+    storage_levels: dict[str, list[float]] = Field(..., description="Level per storage at the end of each time step (kg)")
+    total_power: list[float] = Field(..., description="Total fleet power per time step (kW)")
+    total_cost: float = Field(..., description="Total electricity cost (€)")
+    lower_bound: float = Field(..., description="Lower bound on the optimal cost proven by the price coordination (€)")
+    iterations: int = Field(..., description="Number of price-coordination rounds used")
+
+MAX_SCENARIOS = 100_000
+
+class ScenarioInput(BaseModel):
+    electrolyzer_id: str = Field(..., description="ID of the electrolyzer to use")
+    storage_id: str = Field(..., description="ID of the storage to use")
+    scenarios: int = Field(100, ge=1, le=MAX_SCENARIOS, description="Number of sampled scenarios")
+    seed: Optional[int] = Field(None, ge=0, description="Seed of the scenario sampler; None samples a fresh set")
+    horizon_steps: int = Field(
+        24, ge=1, le=MAX_HORIZON_STEPS, description="Number of time steps when no forecasts are given"
+    )
+    electricity_prices: Optional[list[float]] = Field(
+        None, min_length=1, max_length=MAX_HORIZON_STEPS,
+        description="Price forecast per time step (€/kWh); scenarios scatter around it by price_volatility. "
+                    "If omitted, prices are drawn uniformly between price_min and price_max"
+    )
+    hydrogen_demand: Optional[list[float]] = Field(
+        None, min_length=1, max_length=MAX_HORIZON_STEPS,
+        description="Demand forecast per time step (kg); scenarios scatter around it by demand_volatility. "
+                    "If omitted, demand is drawn uniformly between demand_min and demand_max"
+    )
+    price_min: float = Field(0.03, description="Lower bound of uniformly drawn prices (€/kWh)")
+    price_max: float = Field(0.10, description="Upper bound of uniformly drawn prices (€/kWh)")
+    demand_min: float = Field(1.0, ge=0, description="Lower bound of uniformly drawn demand (kg)")
+    demand_max: float = Field(5.0, ge=0, description="Upper bound of uniformly drawn demand (kg)")
+    price_volatility: float = Field(
+        0.1, ge=0, description="Relative standard deviation of sampled prices around the forecast"
+    )
+    demand_volatility: float = Field(
+        0.1, ge=0, description="Relative standard deviation of sampled demand around the forecast (clipped at 0)"
+    )
+    quantiles: list[float] = Field(
+        default_factory=lambda: [0.05, 0.5, 0.95], min_length=1, description="Quantiles to report, each in [0, 1]"
+    )
+    time_step_hours: float = Field(
+        1.0, gt=0, description="Duration of one time step (h), e.g. 0.25 for 15-minute resolution"
+    )
+    initial_storage_level: float = Field(0.0, ge=0, description="Storage level at the start of the horizon (kg)")
+    start_hour: float = Field(
+        0.0, ge=0, lt=24, description="Hour of the day at which the first time step starts; aligns power supply availability"
+    )
+    power_supply_ids: list[str] = Field(
+        default_factory=list, description="Power supplies feeding the electrolyzer, as for a single optimization"
+    )
+    time_limit: Optional[float] = Field(
+        None, gt=0, description="Solver time limit per scenario (s); defaults to the server's configured limit"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "electrolyzer_id": "E1",
+                "storage_id": "S1",
+                "scenarios": 1000,
+                "seed": 42,
+                "electricity_prices": [0.05] * 24,
+                "price_volatility": 0.2,
+            }
+        }
+    )
+
+    @model_validator(mode="after")
+    def check_scenarios(self):
+        if self.price_min > self.price_max or self.demand_min > self.demand_max:
+            raise ValueError("Sampling ranges must have min <= max")
+        if any(not 0 <= q <= 1 for q in self.quantiles):
+            raise ValueError("quantiles must lie in [0, 1]")
+        forecasts = [f for f in (self.electricity_prices, self.hydrogen_demand) if f is not None]
+        if len({len(f) for f in forecasts}) > 1:
+            raise ValueError("electricity_prices and hydrogen_demand must have the same length")
+        return self
+
+    @property
+    def horizon(self) -> int:
+        """Number of time steps in the horizon, taken from the forecasts if given."""
+        for forecast in (self.electricity_prices, self.hydrogen_demand):
+            if forecast is not None:
+                return len(forecast)
+        return self.horizon_steps
+
+class ScenarioOutput(BaseModel):
+    scenarios: int = Field(..., description="Number of scenarios with a feasible schedule")
+    infeasible: int = Field(..., description="Number of scenarios whose demand could not be met")
+    quantiles: list[float] = Field(..., description="Reported quantiles")
+    expected_cost: float = Field(..., description="Mean total electricity cost over feasible scenarios (€)")
+    cost_quantiles: list[float] = Field(..., description="Total cost at each reported quantile (€)")
+    storage_level_quantiles: list[list[float]] = Field(
+        ..., description="Storage level per time step at each reported quantile (kg), one row per quantile"
+    )
+
+MAX_SWEEP_POINTS = 1000
+
+class SweepInput(BaseModel):
+    capacities: list[float] = Field(
+        ..., min_length=1, max_length=MAX_SWEEP_POINTS, description="Electrolyzer power capacities to evaluate (kW)"
+    )
+    storage_capacities: list[float] = Field(
+        ..., min_length=1, max_length=MAX_SWEEP_POINTS, description="Storage capacities to evaluate (kg)"
+    )
+    type: ElectrolyzerType = Field(ElectrolyzerType.PEM, description="Type of the swept electrolyzer")
+    efficiency: float = Field(0.02, gt=0, description="Constant efficiency of the swept electrolyzer (kg H₂/kWh)")
+    electricity_prices: list[float] = Field(
+        ..., min_length=1, max_length=MAX_HORIZON_STEPS, description="Electricity price per time step (€/kWh)"
+    )
+    hydrogen_demand: list[float] = Field(
+        ..., min_length=1, max_length=MAX_HORIZON_STEPS, description="Hydrogen demand per time step (kg)"
+    )
+    time_step_hours: float = Field(
+        1.0, gt=0, description="Duration of one time step (h), e.g. 0.25 for 15-minute resolution"
+    )
+    initial_storage_level: float = Field(0.0, ge=0, description="Storage level at the start of the horizon (kg)")
+    start_hour: float = Field(
+        0.0, ge=0, lt=24, description="Hour of the day at which the first time step starts; aligns power supply availability"
+    )
+    power_supply_ids: list[str] = Field(
+        default_factory=list, description="Power supplies feeding the electrolyzer, as for a single optimization"
+    )
+    time_limit: Optional[float] = Field(
+        None, gt=0, description="Solver time limit per grid point (s); defaults to the server's configured limit"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "capacities": [250.0, 500.0, 1000.0],
+                "storage_capacities": [25.0, 50.0, 100.0],
+                "efficiency": 0.02,
+                "electricity_prices": [0.05] * 24,
+                "hydrogen_demand": [2.0] * 24,
+            }
+        }
+    )
+
+    @model_validator(mode="after")
+    def check_sweep(self):
+        if len(self.electricity_prices) != len(self.hydrogen_demand):
+            raise ValueError("electricity_prices and hydrogen_demand must have the same length")
+        if any(value <= 0 for value in self.capacities + self.storage_capacities):
+            raise ValueError("capacities and storage_capacities must be positive")
+        return self
+
+    @property
+    def horizon(self) -> int:
+        """Number of time steps in the horizon."""
+        return len(self.electricity_prices)
+
+class SweepOutput(BaseModel):
+    capacities: list[float] = Field(..., description="Evaluated electrolyzer capacities (kW), one column each")
+    storage_capacities: list[float] = Field(..., description="Evaluated storage capacities (kg), one row each")
+    total_cost: list[list[Optional[float]]] = Field(
+        ..., description="Optimal electricity cost (€) per storage capacity (row) and electrolyzer capacity "
+                         "(column); null where the demand cannot be met"
+    )
+    solves: int = Field(..., description="Number of grid points that needed a solve; the rest reused a neighbour")
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class JobEvent(BaseModel):
+    event: str = Field(..., description="queued, running, built, incumbent, succeeded, failed or cancelled")
+    elapsed: float = Field(..., description="Seconds since the job was submitted")
+    data: dict = Field(default_factory=dict, description="Event details, e.g. the incumbent cost (€) or the error")
+
+class JobInfo(BaseModel):
+    job_id: str = Field(..., description="ID of the job")
+    kind: Literal["optimize", "fleet"] = Field(..., description="Type of optimization run by the job")
+    status: JobStatus = Field(..., description="Current state of the job")
+    created_at: float = Field(..., description="Submission time (Unix time, s)")
+    finished_at: Optional[float] = Field(None, description="Time the job finished (Unix time, s)")
+    progress: Optional[JobEvent] = Field(None, description="Latest event of the job")
+    result: Optional[Union[OptimizationOutput, FleetOptimizationOutput]] = Field(
+        None, description="Optimized schedule, once the job succeeded"
+    )
+    error: Optional[str] = Field(None, description="Error message, if the job failed")
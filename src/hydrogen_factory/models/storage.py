@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field, ConfigDict
+from typing import ClassVar, Literal, Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from hydrogen_factory.models.columnar import ColumnarModel
 
 class StorageConfig(BaseModel):
     storage_id: str = Field(..., description="Unique identifier for the storage")
@@ -11,4 +13,39 @@ class StorageConfig(BaseModel):
                 "max_capacity": 100.0,
             }
         }
-    )
\ No newline at end of file
+    )
+
+class StoragePage(BaseModel):
+    items: list[StorageConfig] = Field(..., description="Storage units on this page, ordered by ID")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page; null on the last page")
+
+class StorageLevels(ColumnarModel):
+    kind: Literal["planned", "measured"] = Field(
+        "measured", description="'measured' levels, or 'planned' ones; a new plan replaces the planned levels "
+                                "from its first time on"
+    )
+    times: list[float] = Field(..., description="Unix time (s) of each level, increasing")
+    levels: list[float] = Field(..., description="Storage level at each time (kg)")
+
+    SERIES: ClassVar[tuple] = ("times", "levels")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "kind": "measured",
+                "times": [1767225600.0, 1767229200.0],
+                "levels": [42.0, 40.5],
+            }
+        }
+    )
+
+    @model_validator(mode="after")
+    def check_lengths(self):
+        if len(self.times) != len(self.levels):
+            raise ValueError("times and levels must have the same length")
+        return self
+
+class StorageLevel(BaseModel):
+    time: float = Field(..., description="Unix time (s) of the level")
+    level: float = Field(..., description="Storage level (kg)")
+    kind: Literal["planned", "measured"] = Field(..., description="Whether the level was measured or planned")
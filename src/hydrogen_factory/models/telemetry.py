@@ -0,0 +1,47 @@
+from typing import Literal, Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+class TelemetryIngestResult(BaseModel):
+    accepted: int = Field(..., description="Samples buffered for storage and aggregation")
+    dropped: int = Field(..., description="Samples not newer than the electrolyzer's latest sample, which were ignored")
+
+class TelemetryAggregates(BaseModel):
+    electrolyzer_id: str = Field(..., description="ID of the electrolyzer")
+    resolution: Literal["minute", "hour"] = Field(..., description="Width of the aggregation buckets")
+    times: list[float] = Field(..., description="Start of each bucket (Unix time, s)")
+    counts: list[int] = Field(..., description="Number of samples in each bucket")
+    power: list[float] = Field(..., description="Mean power in each bucket (kW)")
+    hydrogen: list[float] = Field(..., description="Mean hydrogen production rate in each bucket (kg/h)")
+
+class CalibrationInput(BaseModel):
+    electrolyzer_ids: Optional[list[str]] = Field(
+        None, description="Electrolyzers to calibrate; defaults to all with telemetry"
+    )
+    start: Optional[float] = Field(None, description="First Unix time (s) of the samples to fit; defaults to all")
+    end: Optional[float] = Field(None, description="Unix time (s) up to which samples are fitted (exclusive)")
+    min_load: float = Field(
+        0.05, ge=0, lt=1, description="Samples below this load (fraction of capacity) are left out as standby"
+    )
+    apply: bool = Field(
+        False, description="Write the fitted efficiency into the electrolyzer configs, for use by the optimizer"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "electrolyzer_ids": ["E1"],
+                "min_load": 0.05,
+                "apply": True,
+            }
+        }
+    )
+
+class CalibrationResult(BaseModel):
+    electrolyzer_id: str = Field(..., description="ID of the electrolyzer")
+    samples: int = Field(..., description="Number of samples fitted")
+    scale: Optional[float] = Field(
+        None, description="Measured production relative to the configured efficiency (curve); null with too few samples"
+    )
+    efficiency: Optional[float] = Field(None, description="Fitted efficiency at full load (kg H₂/kWh)")
+    r_squared: Optional[float] = Field(None, description="Coefficient of determination of the fit")
+    applied: bool = Field(False, description="Whether the electrolyzer config was updated")
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pydantic import BaseModel
+from hydrogen_factory.services.config_repository import ConfigRepository
+
+class AssetCache:
+    def __init__(self, repository: ConfigRepository, section: str, model: type[BaseModel],
+                 max_entries: int = 10000, max_pages: int = 128):
+        """Initialize an LRU cache of one section's validated configs and their JSON encoding.
+
+        Reads of an asset otherwise validate a fresh pydantic model from the stored dict and
+        serialize it again. Here both are done once per asset, and list pages are assembled from
+        the cached per-asset JSON and kept as well, each with an ETag derived from its bytes, so a
+        repeated read (or a conditional one answered with 304) does no model or JSON work at all.
+
+        Args:
+        - repository (ConfigRepository): Store holding the configs (JSON or SQLite-backed).
+        - section (str): Section name, e.g. 'electrolyzers'.
+        - model (type[BaseModel]): Config model of the section, e.g. ElectrolyzerConfig.
+        - max_entries (int): Maximum number of cached assets.
+        - max_pages (int): Maximum number of cached list pages.
+
+        Variables:
+        - self.entries (OrderedDict): Maps asset ID to (model, JSON bytes, ETag), least recently used first.
+        - self.pages (OrderedDict): Maps (type, cursor, limit) to (JSON bytes, ETag), least recently used first.
+        - self.version (int): Incremented by invalidate(), so that entries built concurrently with a
+          configuration change are not stored.
+        - self.hits, self.misses (int): Counters over entries and pages.
+        """
+        self.repository = repository
+        self.section = section
+        self.model = model
+        self.max_entries = max_entries
+        self.max_pages = max_pages
+        self.entries = OrderedDict()
+        self.pages = OrderedDict()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: str, data: dict = None) -> tuple:
+        """Return (model, JSON bytes, ETag) of an asset, validating and encoding it on a miss.
+
+        Args:
+        - key (str): Asset ID.
+        - data (dict): Stored config data, if the caller already has it.
+
+        Raises:
+        - KeyError: If the asset does not exist.
+        """
+        cached, version = self._lookup(self.entries, key)
+        if cached is not None:
+            return cached
+        if data is None:
+            data = self.repository.section(self.section)[key]
+        config = self.model(**data)
+        body = config.model_dump_json().encode()
+        entry = (config, body, _etag(body))
+        self._store(self.entries, key, entry, version, self.max_entries)
+        return entry
+
+    def page(self, type: str = None, cursor: str = None, limit: int = 100) -> tuple[bytes, str]:
+        """Return the JSON bytes and ETag of one page of the section, ordered by asset ID.
+
+        The body is {"items": [...], "next_cursor": ...}; next_cursor is the ID of the page's last
+        asset when more assets follow (pass it as cursor to get the next page), else null.
+
+        Args:
+        - type (str): Only include configs whose 'type' field equals this value.
+        - cursor (str): Only include assets whose ID sorts after this one.
+        - limit (int): Maximum number of assets on the page.
+        """
+        query = (getattr(type, "value", type), cursor, limit)
+        cached, version = self._lookup(self.pages, query)
+        if cached is not None:
+            return cached
+        rows = self.repository.page(self.section, after=cursor, type=type, limit=limit + 1)
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        items = b",".join(self.get(key, data)[1] for key, data in rows[:limit])
+        body = b'{"items":[' + items + b'],"next_cursor":' + json.dumps(next_cursor).encode() + b"}"
+        entry = (body, _etag(body))
+        self._store(self.pages, query, entry, version, self.max_pages)
+        return entry
+
+    def invalidate(self, keys: list[str]):
+        """Drop the given assets and all list pages after a configuration change."""
+        with self.lock:
+            self.version += 1
+            for key in keys:
+                self.entries.pop(key, None)
+            self.pages.clear()
+
+    def _lookup(self, store: OrderedDict, key) -> tuple:
+        """Return (cached value or None, current version)."""
+        with self.lock:
+            entry = store.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                store.move_to_end(key)
+                self.hits += 1
+            return entry, self.version
+
+    def _store(self, store: OrderedDict, key, entry: tuple, version: int, limit: int):
+        with self.lock:
+            if version != self.version or limit <= 0:
+                return
+            store[key] = entry
+            store.move_to_end(key)
+            while len(store) > limit:
+                store.popitem(last=False)
+
+
+def _etag(body: bytes) -> str:
+    """Strong ETag of a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
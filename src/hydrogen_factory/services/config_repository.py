@@ -0,0 +1,219 @@
+import bisect
+import json
+import os
+import threading
+import uuid
+from hydrogen_factory.core.metrics import CONFIG_IO_SECONDS, timer
+
+class ConfigRepository:
+    def __init__(self, config_file: str = "config.json", compact_every: int = 1000, fsync: bool = False):
+        """Initialize the shared configuration store and recover its state from disk.
+
+        The in-memory state is authoritative. Every change is first appended to a write-ahead
+        log next to the snapshot file; the log is periodically compacted into a new snapshot
+        written to a temporary file and atomically renamed over the old one. Log records carry
+        the ID of the snapshot they apply to, so records already folded into a newer snapshot
+        (or left over after the snapshot was replaced externally) are ignored on recovery.
+
+        Args:
+        - config_file (str): Path to the JSON snapshot file.
+        - compact_every (int): Number of logged changes after which the log is compacted.
+        - fsync (bool): Also fsync every log append, so changes survive power loss and not
+          only process crashes. Snapshots are always fsynced before the rename.
+
+        Variables:
+        - self.wal_file (str): Path to the write-ahead log ('<config_file>.wal').
+        - self.state (dict): Section name (e.g. 'electrolyzers') to a dict of asset ID to config data.
+        - self.snapshot_id (str): ID of the current snapshot.
+        - self.pending (int): Changes logged since the last compaction.
+        - self.lock (threading.RLock): Serializes changes and compactions.
+
+        Raises:
+        - OSError: If the initial snapshot cannot be written.
+        """
+        self.config_file = config_file
+        self.wal_file = f"{config_file}.wal"
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.lock = threading.RLock()
+        with timer(CONFIG_IO_SECONDS, "json", "recover"):
+            self.state = self._recover()
+        self.snapshot_id = None
+        self.pending = 0
+        self.compact()
+
+    def section(self, name: str) -> dict:
+        """Return the live dict of configs for a section, creating it if needed.
+
+        Args:
+        - name (str): Section name, e.g. 'electrolyzers' or 'storages'.
+
+        Returns:
+        - dict: Asset ID to config data. Read-only for callers; change it through put().
+        """
+        with self.lock:
+            return self.state.setdefault(name, {})
+
+    def put(self, section: str, key: str, value: dict):
+        """Log a config change and apply it to the in-memory state.
+
+        Args:
+        - section (str): Section name.
+        - key (str): Asset ID.
+        - value (dict): Config data to store.
+
+        Raises:
+        - OSError: If appending to the log fails; the in-memory state is left unchanged.
+        """
+        self.put_many(section, [(key, value)])
+
+    def put_many(self, section: str, items: list):
+        """Log several config changes with a single append and apply them to the in-memory state.
+
+        Args:
+        - section (str): Section name.
+        - items (list[tuple[str, dict]]): (asset ID, config data) pairs.
+
+        Variables:
+        - record (str): JSON line appended to the write-ahead log. The whole batch is one line,
+          so after a crash it is recovered either completely or not at all.
+
+        Raises:
+        - OSError: If appending to the log fails; the in-memory state is left unchanged.
+        """
+        with self.lock:
+            if len(items) == 1:
+                record = {"snapshot": self.snapshot_id, "op": "put", "section": section,
+                          "key": items[0][0], "value": items[0][1]}
+            else:
+                record = {"snapshot": self.snapshot_id, "op": "put_many", "section": section,
+                          "items": [[key, value] for key, value in items]}
+            with timer(CONFIG_IO_SECONDS, "json", "append", timing="config_io"), open(self.wal_file, "a") as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            entries = self.state.setdefault(section, {})
+            for key, value in items:
+                entries[key] = value
+            self.pending += len(items)
+            if self.pending >= self.compact_every:
+                self.compact()
+
+    def existing_keys(self, section: str, keys: list[str]) -> list[str]:
+        """Return the keys of a section that are already stored."""
+        with self.lock:
+            entries = self.state.get(section, {})
+            return [key for key in keys if key in entries]
+
+    def find(self, section: str, type: str) -> list[dict]:
+        """Return all configs of a section with the given type (linear scan).
+
+        Args:
+        - section (str): Section name.
+        - type (str): Value of the configs' 'type' field.
+
+        Returns:
+        - list[dict]: Matching config data, ordered by asset ID.
+        """
+        with self.lock:
+            entries = self.state.get(section, {})
+            return [entries[key] for key in sorted(entries) if entries[key].get("type") == type]
+
+    def page(self, section: str, after: str = None, type: str = None, limit: int = 100) -> list[tuple[str, dict]]:
+        """Return configs of a section in asset ID order, for cursor pagination.
+
+        Args:
+        - section (str): Section name.
+        - after (str): Only return assets whose ID sorts after this one.
+        - type (str): Only return configs whose 'type' field equals this value.
+        - limit (int): Maximum number of configs returned.
+
+        Returns:
+        - list[tuple[str, dict]]: (asset ID, config data) pairs.
+        """
+        with self.lock:
+            entries = self.state.get(section, {})
+            keys = sorted(entries)
+            start = bisect.bisect_right(keys, after) if after is not None else 0
+            found = []
+            for key in keys[start:]:
+                if len(found) >= limit:
+                    break
+                if type is None or entries[key].get("type") == type:
+                    found.append((key, entries[key]))
+            return found
+
+    def compact(self):
+        """Write the full state to a new snapshot with temp-file + atomic rename, then truncate the log.
+
+        Variables:
+        - snapshot_id (str): Fresh ID stored in the snapshot and stamped on later log records.
+        - tmp_file (str): Temporary file the snapshot is written to before the rename.
+
+        Raises:
+        - OSError: If the snapshot cannot be written or renamed.
+        """
+        with self.lock, timer(CONFIG_IO_SECONDS, "json", "compact", timing="config_io"):
+            snapshot_id = uuid.uuid4().hex
+            tmp_file = f"{self.config_file}.tmp"
+            with open(tmp_file, "w") as f:
+                json.dump({**self.state, "_snapshot_id": snapshot_id}, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.config_file)
+            self._fsync_directory()
+            with open(self.wal_file, "w"):
+                pass
+            self.snapshot_id = snapshot_id
+            self.pending = 0
+
+    def _recover(self) -> dict:
+        """Load the snapshot and replay the log records that belong to it.
+
+        Returns:
+        - dict: Recovered state. A missing or invalid snapshot yields empty sections.
+
+        Variables:
+        - snapshot_id (str): ID stored in the snapshot; None for snapshots written by other tools.
+        """
+        try:
+            with open(self.config_file, "r") as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            snapshot = {}
+        snapshot_id = snapshot.pop("_snapshot_id", None)
+        state = {"electrolyzers": {}, "storages": {}, **snapshot}
+        if snapshot_id is None:
+            return state
+        try:
+            with open(self.wal_file, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append; nothing after it was acknowledged.
+                        break
+                    if record.get("snapshot") != snapshot_id:
+                        continue
+                    entries = state.setdefault(record["section"], {})
+                    if record.get("op") == "put":
+                        entries[record["key"]] = record["value"]
+                    elif record.get("op") == "put_many":
+                        entries.update((key, value) for key, value in record["items"])
+        except FileNotFoundError:
+            pass
+        return state
+
+    def _fsync_directory(self):
+        """Persist the rename itself; not supported on every platform."""
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.config_file)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
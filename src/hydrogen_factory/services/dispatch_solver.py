@@ -0,0 +1,217 @@
+import heapq
+import numpy as np
+
+EPS = 1e-9
+
+
+class _MaxSegmentTree:
+    def __init__(self, values: list[float]):
+        """Build a range-add / range-max segment tree over the given storage levels.
+
+        Args:
+        - values (list[float]): Initial storage level for each time step (kg).
+
+        Variables:
+        - self.size (int): Number of leaves, the next power of two >= len(values).
+        - self.maxv (list[float]): Maximum of each node's range, including the node's own pending add.
+        - self.lazy (list[float]): Amount added to the whole range of each node.
+        """
+        size = 1
+        while size < len(values):
+            size *= 2
+        self.size = size
+        self.maxv = [float("-inf")] * (2 * size)
+        self.lazy = [0.0] * (2 * size)
+        for i, value in enumerate(values):
+            self.maxv[size + i] = value
+        for node in range(size - 1, 0, -1):
+            self.maxv[node] = max(self.maxv[2 * node], self.maxv[2 * node + 1])
+
+    def add(self, lo: int, hi: int, value: float, node: int = 1, node_lo: int = 0, node_hi: int = None):
+        """Add value to every level in the inclusive range [lo, hi]."""
+        if node_hi is None:
+            node_hi = self.size - 1
+        if hi < node_lo or node_hi < lo:
+            return
+        if lo <= node_lo and node_hi <= hi:
+            self.maxv[node] += value
+            self.lazy[node] += value
+            return
+        mid = (node_lo + node_hi) // 2
+        self.add(lo, hi, value, 2 * node, node_lo, mid)
+        self.add(lo, hi, value, 2 * node + 1, mid + 1, node_hi)
+        self.maxv[node] = max(self.maxv[2 * node], self.maxv[2 * node + 1]) + self.lazy[node]
+
+    def max(self, lo: int, hi: int, node: int = 1, node_lo: int = 0, node_hi: int = None) -> float:
+        """Return the maximum level in the inclusive range [lo, hi]."""
+        if node_hi is None:
+            node_hi = self.size - 1
+        if hi < node_lo or node_hi < lo:
+            return float("-inf")
+        if lo <= node_lo and node_hi <= hi:
+            return self.maxv[node]
+        mid = (node_lo + node_hi) // 2
+        return max(
+            self.max(lo, hi, 2 * node, node_lo, mid),
+            self.max(lo, hi, 2 * node + 1, mid + 1, node_hi),
+        ) + self.lazy[node]
+
+    def rightmost_at_least(self, lo: int, hi: int, threshold: float,
+                           node: int = 1, node_lo: int = 0, node_hi: int = None) -> int:
+        """Return the last index in [lo, hi] whose level is >= threshold, or -1 if there is none."""
+        if node_hi is None:
+            node_hi = self.size - 1
+        if hi < node_lo or node_hi < lo or self.maxv[node] < threshold:
+            return -1
+        if node_lo == node_hi:
+            return node_lo
+        mid = (node_lo + node_hi) // 2
+        threshold -= self.lazy[node]
+        index = self.rightmost_at_least(lo, hi, threshold, 2 * node + 1, mid + 1, node_hi)
+        if index >= 0:
+            return index
+        return self.rightmost_at_least(lo, hi, threshold, 2 * node, node_lo, mid)
+
+
+def dispatch_fits(electricity_prices: list[float]) -> bool:
+    """Check whether the schedule problem can be solved by the merit-order dispatch.
+
+    Args:
+    - electricity_prices (list[float]): Electricity price per time step (€/kWh).
+
+    Returns:
+    - bool: True if every price is non-negative. With negative prices it can pay off to
+      produce hydrogen that is never consumed, which the greedy dispatch does not model.
+    """
+    return all(price >= 0 for price in electricity_prices)
+
+
+def solve_dispatch(electricity_prices: list[float], hydrogen_demand: list[float], P_max: float,
+                   eta: float, S_max: float, S_0: float = 0.0, dt: float = 1.0,
+                   renewable=None, grid_limit=None, unmet_penalty: float = None):
+    """Solve the single-electrolyzer / single-storage schedule in-process in O(T log T).
+
+    Args:
+    - electricity_prices (list[float]): Electricity price per time step (€/kWh), all >= 0.
+    - hydrogen_demand (list[float]): Hydrogen demand per time step (kg).
+    - P_max (float): Maximum power capacity of the electrolyzer (kW).
+    - eta (float): Electrolyzer efficiency (kg H₂/kWh).
+    - S_max (float): Maximum storage capacity (kg).
+    - S_0 (float): Initial storage level (kg).
+    - dt (float): Duration of one time step (h).
+    - renewable (np.ndarray): Free renewable power available per time step (kW). If given, grid
+      power is limited to grid_limit and the renewable power is used first in every step.
+    - grid_limit (np.ndarray): Grid power available per time step (kW), priced at electricity_prices.
+    - unmet_penalty (float): Cost of unmet demand (€/kg). If given, unmet demand is one more source
+      with the step's demand as capacity; on equal cost the dispatch takes the latest step first,
+      so it only ever covers its own step's demand.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray, np.ndarray]: Power schedule (kW), hydrogen produced (kg)
+      and storage levels (kg) for each time step.
+
+    Raises:
+    - ValueError: If the demand cannot be met within the production and storage limits.
+    """
+    T = len(electricity_prices)
+    if renewable is None:
+        costs, capacities = [electricity_prices], [[P_max * eta * dt] * T]
+    else:
+        renewable_power = np.minimum(renewable, P_max)
+        grid_power = np.minimum(P_max - renewable_power, grid_limit)
+        costs = [[0.0] * T, electricity_prices]
+        capacities = [(renewable_power * eta * dt).tolist(), (grid_power * eta * dt).tolist()]
+    sources = len(costs)
+    unmet = 0.0
+    if unmet_penalty is not None:
+        # Compare production and unmet demand per kg of hydrogen.
+        costs = [(np.asarray(cost, dtype=float) / eta).tolist() for cost in costs] + [[unmet_penalty] * T]
+        capacities = capacities + [np.maximum(np.asarray(hydrogen_demand, dtype=float), 0.0).tolist()]
+    produced = dispatch_sources(costs, capacities, hydrogen_demand, S_max, S_0)
+    if unmet_penalty is not None:
+        unmet = produced[sources]
+    hydrogen_produced = produced[:sources].sum(axis=0)
+    power_schedule = hydrogen_produced / (eta * dt)
+    storage_levels = np.clip(S_0 + np.cumsum(hydrogen_produced + unmet - np.asarray(hydrogen_demand)), 0.0, S_max)
+    return power_schedule, hydrogen_produced, storage_levels
+
+
+def dispatch_sources(costs: list, capacities: list, hydrogen_demand: list[float], S_max: float,
+                     S_0: float = 0.0) -> np.ndarray:
+    """Serve the demand of one storage from several production sources by merit-order dispatch.
+
+    The schedule LP is a min-cost flow on a path: each time step is fed by its production
+    sources (each with a cost per kg and a capacity in kg) and by the storage carried over
+    from the previous step (at most S_max kg), and drained by that step's demand.
+    With non-negative costs an optimal flow is obtained by serving the demand in
+    chronological order from the cheapest source at or before that step that still has
+    capacity and storage headroom on every step in between. Once a storage level hits
+    S_max it never drops again, so all steps up to it are permanently cut off from
+    later demand.
+
+    Args:
+    - costs (list[list[float]]): For each source, its non-negative cost per time step. Only the
+      ordering matters, so any unit proportional to €/kg works.
+    - capacities (list[list[float]]): For each source, the hydrogen it can produce per time step (kg).
+    - hydrogen_demand (list[float]): Hydrogen demand per time step (kg).
+    - S_max (float): Maximum storage capacity (kg).
+    - S_0 (float): Initial storage level (kg).
+
+    Returns:
+    - np.ndarray: Hydrogen produced by each source in each time step (kg), shape (sources, T).
+
+    Variables:
+    - residual (list[float]): Demand left after the initial stock has been used up.
+    - levels (_MaxSegmentTree): Storage levels caused by the flow assigned so far.
+    - heap (list[tuple]): Candidate (cost, -step, source) entries, latest step first on ties.
+    - barrier (int): Last step whose storage is full; production at or before it cannot reach later steps.
+
+    Raises:
+    - ValueError: If the demand cannot be met within the production and storage limits.
+    """
+    T = len(hydrogen_demand)
+
+    # The initial stock is free and consuming it early frees storage headroom, so use it first.
+    stock = S_0
+    residual = list(hydrogen_demand)
+    base = [0.0] * T
+    for t in range(T):
+        used = min(stock, residual[t])
+        stock -= used
+        residual[t] -= used
+        base[t] = stock
+        if stock > S_max + EPS:
+            raise ValueError("Optimization failed")
+
+    levels = _MaxSegmentTree(base)
+    caps = [list(capacity) for capacity in capacities]
+    produced = [[0.0] * T for _ in caps]
+    heap = []
+    barrier = -1
+
+    for t in range(T):
+        for k, cost in enumerate(costs):
+            if caps[k][t] > EPS:
+                heapq.heappush(heap, (cost[t], -t, k))
+        need = residual[t]
+        while need > EPS:
+            while heap:
+                _, s, k = heap[0]
+                s = -s
+                if s > barrier and produced[k][s] < caps[k][s] - EPS:
+                    break
+                heapq.heappop(heap)
+            else:
+                raise ValueError("Optimization failed")
+            amount = min(need, caps[k][s] - produced[k][s])
+            if s < t:
+                room = S_max - levels.max(s, t - 1)
+                if room <= EPS:
+                    barrier = levels.rightmost_at_least(s, t - 1, S_max - EPS)
+                    continue
+                amount = min(amount, room)
+                levels.add(s, t - 1, amount)
+            produced[k][s] += amount
+            need -= amount
+
+    return np.asarray(produced, dtype=float).reshape(len(caps), T)
@@ -1,25 +1,38 @@
-import json
-from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.services.asset_cache import AssetCache
+from hydrogen_factory.services.config_repository import ConfigRepository
 
 class ElectrolyzerService:
-    def __init__(self):
-        """Initialize the ElectrolyzerService with a configuration file path and load existing electrolyzer configs.
+    def __init__(self, repository: ConfigRepository = None, cache_entries: int = 10000):
+        """Initialize the ElectrolyzerService on top of the shared configuration repository.
+
+        Args:
+        - repository (ConfigRepository): Store shared with the other asset services (a ConfigRepository
+          or SqliteConfigRepository). If omitted, a repository on 'config.json' is created and
+          recovered for this service alone.
+        - cache_entries (int): Maximum number of validated configs kept in memory.
 
         Variables:
         - self.config_file (str): Path to the JSON configuration file ('config.json').
+        - self.repository (ConfigRepository): Authoritative in-memory state backed by a write-ahead log.
         - self.electrolyzers (dict): Dictionary mapping electrolyzer IDs to their configuration data.
+        - self.listeners (list): Callbacks invoked with the electrolyzer ID after a configuration change.
+        - self.cache (AssetCache): Validated configs, their JSON and encoded list pages.
 
         Raises:
         - ValueError: If loading the configuration file fails (e.g., file corruption).
         """
         self.config_file = "config.json"
+        self.listeners = []
         try:
-            self.electrolyzers = self._load_configs().get("electrolyzers", {})
+            self.repository = repository or ConfigRepository(self.config_file)
+            self.electrolyzers = self.repository.section("electrolyzers")
+            self.cache = AssetCache(self.repository, "electrolyzers", ElectrolyzerConfig, max_entries=cache_entries)
         except Exception as e:
             raise ValueError(f"Failed to initialize electrolyzers: {str(e)}")
 
     def configure(self, config: ElectrolyzerConfig):
-        """Configure a new electrolyzer and save it to the configuration file.
+        """Configure a new electrolyzer and log it to the configuration repository.
 
         Args:
         - config (ElectrolyzerConfig): Pydantic model containing electrolyzer configuration
@@ -30,15 +43,76 @@ class ElectrolyzerService:
         - self.electrolyzers (dict): Updated with the new electrolyzer configuration.
 
         Raises:
-        - ValueError: If the electrolyzer_id already exists or saving to config.json fails.
+        - ValueError: If the electrolyzer_id already exists or writing the change fails.
         """
-        if config.electrolyzer_id in self.electrolyzers:
-            raise ValueError("Electrolyzer ID already exists")
-        self.electrolyzers[config.electrolyzer_id] = config.model_dump()
-        try:
-            self._save_configs()
-        except Exception as e:
-            raise ValueError(f"Failed to save configuration: {str(e)}")
+        with self.repository.lock:
+            if config.electrolyzer_id in self.electrolyzers:
+                raise ValueError("Electrolyzer ID already exists")
+            try:
+                self.repository.put("electrolyzers", config.electrolyzer_id, config.model_dump())
+            except Exception as e:
+                raise ValueError(f"Failed to save configuration: {str(e)}")
+            self.cache.invalidate([config.electrolyzer_id])
+        for listener in self.listeners:
+            listener(config.electrolyzer_id)
+
+    def configure_bulk(self, configs: list[ElectrolyzerConfig]):
+        """Configure many new electrolyzers with a single write to the configuration repository.
+
+        Either all electrolyzers are configured or none is.
+
+        Args:
+        - configs (list[ElectrolyzerConfig]): Configurations to add.
+
+        Variables:
+        - ids (list[str]): IDs of the new electrolyzers, in request order.
+
+        Raises:
+        - ValueError: If an ID is repeated in the request or already exists, or writing the change fails.
+        """
+        ids = [config.electrolyzer_id for config in configs]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate Electrolyzer IDs in request")
+        with self.repository.lock:
+            existing = self.repository.existing_keys("electrolyzers", ids)
+            if existing:
+                raise ValueError(f"Electrolyzer ID already exists: {existing[0]}")
+            try:
+                self.repository.put_many("electrolyzers", [(config.electrolyzer_id, config.model_dump()) for config in configs])
+            except Exception as e:
+                raise ValueError(f"Failed to save configuration: {str(e)}")
+            self.cache.invalidate(ids)
+        for electrolyzer_id in ids:
+            for listener in self.listeners:
+                listener(electrolyzer_id)
+
+    def update(self, config: ElectrolyzerConfig):
+        """Replace the configuration of an existing electrolyzer (e.g., with a calibrated efficiency).
+
+        Args:
+        - config (ElectrolyzerConfig): New configuration; its electrolyzer_id must already exist.
+
+        Raises:
+        - ValueError: If the electrolyzer_id is not found or writing the change fails.
+        """
+        with self.repository.lock:
+            if config.electrolyzer_id not in self.electrolyzers:
+                raise ValueError("Electrolyzer ID not found")
+            try:
+                self.repository.put("electrolyzers", config.electrolyzer_id, config.model_dump())
+            except Exception as e:
+                raise ValueError(f"Failed to save configuration: {str(e)}")
+            self.cache.invalidate([config.electrolyzer_id])
+        for listener in self.listeners:
+            listener(config.electrolyzer_id)
+
+    def add_listener(self, listener):
+        """Register a callback invoked with the electrolyzer ID whenever an electrolyzer is configured.
+
+        Args:
+        - listener (callable): Function taking the electrolyzer_id (str).
+        """
+        self.listeners.append(listener)
 
     def get_config(self, electrolyzer_id: str) -> ElectrolyzerConfig:
         """Retrieve the configuration for a specific electrolyzer by its ID.
@@ -51,51 +125,50 @@ class ElectrolyzerService:
 
         Variables:
         - electrolyzer_id (str): The ID used to look up the electrolyzer.
-        - self.electrolyzers (dict): Source of the electrolyzer configuration data.
+        - self.cache (AssetCache): Source of the validated configuration; the returned model is
+          shared between callers and must not be modified.
 
         Raises:
         - ValueError: If the electrolyzer_id is not found in the stored configurations.
         """
-        if electrolyzer_id not in self.electrolyzers:
-            raise ValueError("Electrolyzer ID not found")
-        return ElectrolyzerConfig(**self.electrolyzers[electrolyzer_id])
+        return self._cached(electrolyzer_id)[0]
 
-    def _load_configs(self) -> dict:
-        """Load the configuration data from config.json.
+    def get_json(self, electrolyzer_id: str) -> tuple[bytes, str]:
+        """Retrieve the JSON encoding of an electrolyzer's configuration and its ETag.
 
-        Returns:
-        - dict: Configuration data containing 'electrolyzers' and 'storages' dictionaries.
-                Returns empty defaults if the file is missing or invalid.
+        Raises:
+        - ValueError: If the electrolyzer_id is not found in the stored configurations.
+        """
+        _, body, etag = self._cached(electrolyzer_id)
+        return body, etag
 
-        Variables:
-        - self.config_file (str): Path to the configuration file.
+    def list_json(self, type: ElectrolyzerType = None, cursor: str = None, limit: int = 100) -> tuple[bytes, str]:
+        """Retrieve one page of electrolyzers, ordered by ID, as JSON bytes and its ETag.
 
-        Raises:
-        - FileNotFoundError: Handled internally, returns default empty config.
-        - json.JSONDecodeError: Handled internally, returns default empty config.
+        Args:
+        - type (ElectrolyzerType): Only list electrolyzers of this type.
+        - cursor (str): next_cursor of the previous page; None starts at the first electrolyzer.
+        - limit (int): Maximum number of electrolyzers on the page.
+
+        Returns:
+        - tuple[bytes, str]: ElectrolyzerPage JSON and its ETag, cached until the next configuration change.
         """
+        return self.cache.page(type, cursor, limit)
+
+    def _cached(self, electrolyzer_id: str) -> tuple:
         try:
-            with open(self.config_file, "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"electrolyzers": {}, "storages": {}}
+            return self.cache.get(electrolyzer_id)
+        except KeyError:
+            raise ValueError("Electrolyzer ID not found")
 
-    def _save_configs(self):
-        """Save the current electrolyzer configurations to config.json.
+    def find_by_type(self, type: ElectrolyzerType) -> list[ElectrolyzerConfig]:
+        """Retrieve all electrolyzers of a given type.
 
-        Variables:
-        - configs (dict): Configuration data with 'electrolyzers' and 'storages' keys.
-        - self.electrolyzers (dict): Current electrolyzer configurations to save.
-        - self.config_file (str): Path to the configuration file.
+        Args:
+        - type (ElectrolyzerType): Electrolyzer type to look up (PEM or ALKALINE).
 
-        Raises:
-        - ValueError: If writing to config.json fails (e.g., permission denied).
+        Returns:
+        - list[ElectrolyzerConfig]: Matching electrolyzers, ordered by ID. Uses the type index
+          when the repository is SQLite-backed.
         """
-        configs = self._load_configs()
-        configs["electrolyzers"] = self.electrolyzers
-        configs["storages"] = configs.get("storages", {})
-        try:
-            with open(self.config_file, "w") as f:
-                json.dump(configs, f, indent=2)
-        except Exception as e:
-            raise ValueError(f"Failed to write to config.json: {str(e)}")
\ No newline at end of file
+        return [ElectrolyzerConfig(**data) for data in self.repository.find("electrolyzers", type)]
@@ -0,0 +1,82 @@
+import numpy as np
+from hydrogen_factory.core.exceptions import InfeasibleScheduleError
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig
+from hydrogen_factory.services.part_load import hydrogen_rate
+
+# Violations up to this size (kg) are left to the solvers' own tolerances.
+TOLERANCE = 1e-6
+
+
+def production_limits(electrolyzer: ElectrolyzerConfig, T: int, dt: float = 1.0, supply: tuple = None) -> np.ndarray:
+    """Return the most hydrogen the electrolyzer can produce in each time step (kg).
+
+    Args:
+    - electrolyzer (ElectrolyzerConfig): Electrolyzer, with its part-load curve if it has one.
+    - T (int): Number of time steps.
+    - dt (float): Duration of one time step (h).
+    - supply (tuple[np.ndarray, np.ndarray]): Renewable and grid power available per time step (kW),
+      which limit the power; None means unlimited grid power.
+    """
+    power = np.full(T, electrolyzer.capacity)
+    if supply is not None:
+        power = np.minimum(power, np.asarray(supply[0], dtype=float) + np.asarray(supply[1], dtype=float))
+    return hydrogen_rate(electrolyzer, power) * dt
+
+
+def check_feasibility(D_t, production, S_max: float, S_0: float = 0.0, dt: float = 1.0, shortage: bool = True):
+    """Reject a schedule input whose demand cannot be met, in O(T) and without building a model.
+
+    The storage levels reachable at the end of step t form an interval [low_t, high_t], with
+    high_t = min(S_max, high_{t-1} + production_t - D_t) and low_t = max(0, low_{t-1} - D_t) from
+    S_0. The input is feasible exactly when high_t >= 0 and low_t <= S_max in every step. Both
+    clipped recursions are cumulative sums: with X_t = sum_{j<=t} (production_j - D_j),
+    high_t = X_t + min(S_0, S_max - max_{k<=t} X_k) up to the first violation, and likewise
+    low_t with the demand alone. The check is exact for constant-efficiency electrolyzers; with
+    a minimum load it is necessary but not sufficient.
+
+    Args:
+    - D_t (list[float]): Hydrogen demand per time step (kg).
+    - production (np.ndarray): Most hydrogen that can be produced per time step (kg), see production_limits.
+    - S_max (float): Maximum storage capacity (kg).
+    - S_0 (float): Initial storage level (kg).
+    - dt (float): Duration of one time step (h), to report hours.
+    - shortage (bool): Check that the demand can be met; False when unmet demand is allowed.
+
+    Raises:
+    - InfeasibleScheduleError: At the first step that violates a constraint.
+    """
+    demand = np.asarray(D_t, dtype=float)
+    Y = -np.cumsum(demand)
+    low = Y + np.maximum(S_0, -np.minimum.accumulate(Y))
+    overflow = np.flatnonzero(low > S_max + TOLERANCE)
+
+    X = np.cumsum(np.asarray(production, dtype=float) - demand)
+    peak = np.maximum.accumulate(X)
+    high = X + np.minimum(S_0, S_max - peak)
+    short = np.flatnonzero(high < -TOLERANCE) if shortage else np.zeros(0, dtype=int)
+
+    if overflow.size and (not short.size or overflow[0] <= short[0]):
+        t = int(overflow[0])
+        amount = float(low[t] - S_max)
+        raise InfeasibleScheduleError(
+            f"Optimization failed: storage exceeds max_capacity at step {t} (hour {t * dt:g}) by {amount:.6g} kg, "
+            "even without production", t, t * dt, "max_capacity", amount,
+        )
+    if short.size:
+        t = int(short[0])
+        amount = float(-high[t])
+        # The deficit builds up from the horizon start, or from the last step that ended with a full storage.
+        start = 0 if S_0 <= S_max - peak[t] else int(np.argmax(X[:t + 1])) + 1
+        stock = "the initial storage level" if start == 0 else "a full storage"
+        raise InfeasibleScheduleError(
+            f"Optimization failed: demand cannot be met at step {t} (hour {t * dt:g}); demand from step {start} "
+            f"exceeds production at full capacity plus {stock} by {amount:.6g} kg", t, t * dt, "demand", amount,
+        )
+
+
+def unmet_demand(D_t, hydrogen_produced, storage_levels, S_0: float = 0.0) -> np.ndarray:
+    """Return the demand left unmet per time step (kg), from the storage balance of a schedule."""
+    levels = np.asarray(storage_levels, dtype=float)
+    previous = np.concatenate([[S_0], levels[:-1]])
+    unmet = np.asarray(D_t, dtype=float) - np.asarray(hydrogen_produced, dtype=float) + levels - previous
+    return np.where(unmet > TOLERANCE, unmet, 0.0)
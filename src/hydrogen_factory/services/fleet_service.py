@@ -0,0 +1,380 @@
+import os
+import time
+import numpy as np
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from hydrogen_factory.core.progress import report
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import FleetOptimizationInput, FleetOptimizationOutput
+from hydrogen_factory.services.electrolyzer_service import ElectrolyzerService
+from hydrogen_factory.services.storage_service import StorageService
+from hydrogen_factory.services.dispatch_solver import dispatch_fits, dispatch_sources
+from hydrogen_factory.services.matrix_lp import solve_fleet_lp
+from hydrogen_factory.services.solver_backends import get_backend
+from hydrogen_factory.services.solver_selector import SolverSelector
+from hydrogen_factory.services.solver_pool import SolverPool
+from hydrogen_factory.services.optimization_service import SOLVER_GRACE_SECONDS
+
+CAP_TOLERANCE = 1e-6
+REDUCED_COST_TOLERANCE = 1e-9
+OVERLOAD_PENALTY = 1e3
+STABILIZATION = 0.5
+
+def solve_storage_subproblem(prices, P_max, eta, demand, S_max: float, dt: float = 1.0, power_cap=None):
+    """Schedule all electrolyzers feeding one storage for the given (price-adjusted) electricity prices.
+
+    Electrolyzers with the same efficiency have the same cost per kg in every step, so they are
+    merged into one dispatch source and their power is split back in proportion to capacity.
+    Under a power cap the most efficient electrolyzers get the cap first, which is optimal because
+    within one step they deliver more hydrogen for the same energy.
+
+    Args:
+    - prices (np.ndarray): Non-negative electricity price per time step (€/kWh).
+    - P_max (np.ndarray): Maximum power capacity of each electrolyzer (kW).
+    - eta (np.ndarray): Efficiency of each electrolyzer (kg H₂/kWh).
+    - demand (np.ndarray): Hydrogen demand of the storage per time step (kg).
+    - S_max (float): Maximum storage capacity (kg).
+    - dt (float): Duration of one time step (h).
+    - power_cap (np.ndarray): Power available to these electrolyzers per time step (kW); None means no cap.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray]: Power schedule per electrolyzer (kW), shape (K, T), and
+      storage levels (kg) for each time step.
+
+    Raises:
+    - ValueError: If the demand cannot be met within the production, storage and power limits.
+    """
+    T = len(prices)
+    levels_eta = np.unique(eta)[::-1]
+    remaining = None if power_cap is None else np.asarray(power_cap, dtype=float)
+    costs, caps = [], []
+    for level in levels_eta:
+        cap_kw = np.full(T, P_max[eta == level].sum())
+        if remaining is not None:
+            cap_kw = np.clip(np.minimum(cap_kw, remaining), 0.0, None)
+            remaining = remaining - cap_kw
+        costs.append((prices / level).tolist())
+        caps.append((cap_kw * level * dt).tolist())
+    produced = dispatch_sources(costs, caps, demand.tolist(), S_max)
+
+    power = np.empty((len(P_max), T))
+    for level, source in zip(levels_eta, produced):
+        members = eta == level
+        power[members] = np.outer(P_max[members] / P_max[members].sum(), source / (level * dt))
+    levels = np.clip(np.cumsum(produced.sum(axis=0) - demand), 0.0, S_max)
+    return power, levels
+
+
+class FleetOptimizationService:
+    def __init__(self, electrolyzer_service: ElectrolyzerService, storage_service: StorageService,
+                 solver_pool: SolverPool = None, subproblem_workers: int = 1, parallel_threshold: int = 16,
+                 selector: SolverSelector = None):
+        """Initialize the FleetOptimizationService.
+
+        Args:
+        - electrolyzer_service (ElectrolyzerService): Service to retrieve electrolyzer configurations.
+        - storage_service (StorageService): Service to retrieve storage configurations.
+        - solver_pool (SolverPool): Pool that runs solves for optimize_async (defaults to a thread pool).
+        - subproblem_workers (int): Worker processes for solving per-storage subproblems in parallel;
+          1 solves them in the calling thread.
+        - parallel_threshold (int): Minimum number of storages before subproblems are sent to the workers.
+        - selector (SolverSelector): Picks the solver of the joint LP; defaults to automatic selection.
+
+        Variables:
+        - self.electrolyzer_service (ElectrolyzerService): Instance for accessing electrolyzer configs.
+        - self.storage_service (StorageService): Instance for accessing storage configs.
+        - self.solver_pool (SolverPool): Bounded pool used to keep solves off the event loop.
+        - self.subproblem_workers (int): Number of subproblem worker processes.
+        - self.parallel_threshold (int): Fleet size (in storages) at which subproblems go parallel.
+        - self.executor (ProcessPoolExecutor): Subproblem workers, created on first use.
+        - self.selector (SolverSelector): Solver selection for the joint LP.
+        """
+        self.electrolyzer_service = electrolyzer_service
+        self.storage_service = storage_service
+        self.solver_pool = solver_pool or SolverPool()
+        self.subproblem_workers = subproblem_workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.executor = None
+        self.selector = selector or SolverSelector()
+
+    def optimize(self, input: FleetOptimizationInput, time_limit: float = None) -> FleetOptimizationOutput:
+        """Co-schedule a fleet of electrolyzers and storages under a shared power limit.
+
+        Args:
+        - input (FleetOptimizationInput): Fleet, prices, per-storage demand and power limit.
+        - time_limit (float): Solver time limit (seconds); None means no limit.
+
+        Returns:
+        - FleetOptimizationOutput: Power schedule per electrolyzer and level per storage.
+
+        Raises:
+        - ValueError: If the optimization fails or an electrolyzer/storage ID is not found.
+        """
+        electrolyzers, storages = self._resolve(input)
+        return self.solve(input, electrolyzers, storages, time_limit)
+
+    async def optimize_async(self, input: FleetOptimizationInput) -> FleetOptimizationOutput:
+        """Optimize the fleet schedule on the solver pool without blocking the event loop.
+
+        Raises:
+        - ValueError: If the optimization fails or an electrolyzer/storage ID is not found.
+        - SolverPoolFullError: If the solver pool queue is full.
+        - SolverTimeoutError: If the solve exceeds its time limit.
+        """
+        electrolyzers, storages = self._resolve(input)
+        time_limit = input.time_limit if input.time_limit is not None else self.solver_pool.time_limit
+        if self.solver_pool.use_processes:
+            fn = partial(_solve_fleet_in_worker, self.selector)
+        else:
+            fn = self.solve
+        return await self.solver_pool.run(fn, input, electrolyzers, storages, time_limit,
+                                          time_limit=time_limit + SOLVER_GRACE_SECONDS)
+
+    def _resolve(self, input: FleetOptimizationInput):
+        """Look up the electrolyzer configs (in assignment order) and storage configs (by ID)."""
+        electrolyzers = [self.electrolyzer_service.get_config(a.electrolyzer_id) for a in input.assignments]
+        storages = {
+            storage_id: self.storage_service.get_config(storage_id)
+            for storage_id in dict.fromkeys(a.storage_id for a in input.assignments)
+        }
+        return electrolyzers, storages
+
+    def solve(self, input: FleetOptimizationInput, electrolyzers: list[ElectrolyzerConfig],
+              storages: dict[str, StorageConfig], time_limit: float = None) -> FleetOptimizationOutput:
+        """Optimize the fleet schedule for already resolved configs.
+
+        Electrolyzers feeding the same storage with the same efficiency are interchangeable, so they
+        are merged into one unit whose power is split back in proportion to capacity; a fleet of
+        identical stacks is only as large as its number of storages. The merged fleet is solved as
+        one matrix-form LP, with the solver the selector picks for the merged fleet's size or the one
+        the input requests, or, on request, by Dantzig-Wolfe decomposition over the storages (see
+        _solve_decomposed), whose master problem needs HiGHS' duals. Inputs with negative prices
+        always use the joint LP.
+
+        Args:
+        - input (FleetOptimizationInput): Fleet optimization inputs.
+        - electrolyzers (list[ElectrolyzerConfig]): Config of each assigned electrolyzer, in assignment order.
+        - storages (dict[str, StorageConfig]): Config per assigned storage ID.
+        - time_limit (float): Solver time limit (seconds); None means no limit.
+
+        Returns:
+        - FleetOptimizationOutput: The optimized fleet schedule.
+
+        Variables:
+        - units (dict): Merged unit index per (storage index, efficiency).
+        - unit_of (np.ndarray): Unit index of each electrolyzer.
+        - groups (list[tuple]): Per storage: (storage ID, unit indices, demand, capacity).
+
+        Raises:
+        - ValueError: If the optimization fails (e.g., infeasible problem), the requested solver is
+          unavailable or an electrolyzer has a part-load curve, minimum load or start-up cost, which
+          the fleet LP does not model.
+        """
+        for electrolyzer in electrolyzers:
+            if electrolyzer.part_load:
+                raise ValueError(f"Electrolyzer {electrolyzer.electrolyzer_id} has part-load settings, "
+                                 "which fleet optimization does not support")
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+        prices = np.asarray(input.electricity_prices, dtype=float)
+        storage_ids = list(storages)
+        storage_index = {storage_id: j for j, storage_id in enumerate(storage_ids)}
+        storage_of = [storage_index[a.storage_id] for a in input.assignments]
+        P_max = np.array([e.capacity for e in electrolyzers], dtype=float)
+
+        units = {}
+        unit_of = np.array([
+            units.setdefault((j, e.efficiency), len(units)) for j, e in zip(storage_of, electrolyzers)
+        ])
+        unit_P_max = np.bincount(unit_of, weights=P_max, minlength=len(units))
+        unit_eta = np.array([eta for _, eta in units])
+        unit_storage = np.array([j for j, _ in units])
+        groups = [
+            (
+                storage_id,
+                np.flatnonzero(unit_storage == j),
+                np.asarray(input.hydrogen_demand[storage_id], dtype=float),
+                storages[storage_id].max_capacity,
+            )
+            for j, storage_id in enumerate(storage_ids)
+        ]
+        fleet = (unit_P_max, unit_eta, unit_storage, groups)
+
+        if input.method == "decomposition" and dispatch_fits(input.electricity_prices):
+            unit_power, levels, lower_bound, iterations = self._solve_decomposed(input, prices, fleet, deadline)
+        else:
+            unit_power, levels, lower_bound, iterations = self._solve_joint(input, prices, fleet, deadline)
+
+        power = (P_max / unit_P_max[unit_of])[:, None] * unit_power[unit_of]
+        total_power = power.sum(axis=0)
+        cost = input.time_step_hours * float(prices @ total_power)
+        return FleetOptimizationOutput(
+            power_schedules={a.electrolyzer_id: p.tolist() for a, p in zip(input.assignments, power)},
+            storage_levels={storage_id: level.tolist() for storage_id, level in zip(storage_ids, levels)},
+            total_power=total_power.tolist(),
+            total_cost=cost,
+            lower_bound=min(cost, cost if lower_bound is None else lower_bound),
+            iterations=iterations,
+        )
+
+    def _solve_joint(self, input: FleetOptimizationInput, prices, fleet: tuple, deadline: float):
+        """Solve the merged fleet as one LP; returns (unit power, levels, None, 0)."""
+        unit_P_max, unit_eta, unit_storage, groups = fleet
+        backend = get_backend(self.selector.select(len(prices), assets=len(unit_P_max), override=input.solver))
+        time_limit = None if deadline is None else max(deadline - time.monotonic(), 0.1)
+        demand = np.array([d for _, _, d, _ in groups])
+        S_max = [s for _, _, _, s in groups]
+        power, levels = solve_fleet_lp(
+            prices, demand, unit_P_max, unit_eta, S_max, unit_storage, input.power_limit,
+            input.time_step_hours, time_limit, backend,
+        )
+        return power, list(levels), None, 0
+
+    def _solve_decomposed(self, input: FleetOptimizationInput, prices, fleet: tuple, deadline: float):
+        """Solve the merged fleet by Dantzig-Wolfe decomposition over the storages.
+
+        The shared power limit is priced out: for given prices of the limit every storage and its
+        units form an independent subproblem, solved exactly by the merit-order dispatch, so one
+        round costs M single-storage solves, which run in parallel for large fleets. The schedules
+        found so far are combined by a small master LP (one row per time step and per storage) whose
+        duals are the next round's prices. Rounds stop once the master's cost and the Lagrangian
+        lower bound are within gap_tolerance; a master that still overloads the limit when the
+        rounds run out falls back to the joint LP.
+
+        Returns:
+        - tuple: (unit power (kW), storage levels (kg), Lagrangian lower bound (€), rounds used).
+
+        Variables:
+        - columns (list[list[tuple]]): Per storage, the (power, levels) schedules generated so far.
+        - lam (np.ndarray): Master's price of the shared power limit per time step (€/kWh).
+        - mu (np.ndarray): Master dual of each storage's convexity row (€).
+        - center (np.ndarray): Prices that gave the best lower bound so far.
+        """
+        unit_P_max, unit_eta, _, groups = fleet
+        dt = input.time_step_hours
+        T = len(prices)
+        limit = np.full(T, input.power_limit)
+        # Overloading the limit costs far more than any schedule, so the master only uses the
+        # slack while its columns cannot fit under the limit yet.
+        penalty = OVERLOAD_PENALTY * (prices.max() + 1.0)
+        columns = [[] for _ in groups]
+        lam = center = np.zeros(T)
+        mu = np.full(len(groups), np.inf)
+        lower_bound = -np.inf
+        smoothing = 0.0
+        master = None
+        iteration = 0
+        for iteration in range(1, input.max_iterations + 1):
+            # Price the subproblems between the master's duals and the prices of the best lower
+            # bound so far (Wentges smoothing), which damps the oscillation of the master's duals.
+            separation = smoothing * center + (1.0 - smoothing) * lam
+            solutions = self._map_subproblems(prices + separation, unit_P_max, unit_eta, groups, dt)
+            lagrangian = -dt * float(separation @ limit)
+            added = 0
+            for j, (power, levels) in enumerate(solutions):
+                total = power.sum(axis=0)
+                lagrangian += dt * float((prices + separation) @ total)
+                reduced_cost = dt * float((prices + lam) @ total) - mu[j]
+                if reduced_cost < -REDUCED_COST_TOLERANCE * max(1.0, abs(mu[j]) if np.isfinite(mu[j]) else 1.0):
+                    columns[j].append((power, levels))
+                    added += 1
+            if lagrangian > lower_bound:
+                lower_bound, center = lagrangian, separation
+            if master is not None and not added:
+                if smoothing == 0.0:
+                    break
+                smoothing = 0.0
+                continue
+
+            master = _solve_master(columns, prices, limit, dt, penalty)
+            upper_bound, overload, lam, mu = master[0], master[1], master[3], master[4]
+            smoothing = STABILIZATION
+            if overload <= CAP_TOLERANCE:
+                report("incumbent", cost=upper_bound, iteration=iteration,
+                       lower_bound=float(lower_bound) if np.isfinite(lower_bound) else None)
+            if overload <= CAP_TOLERANCE and upper_bound - lower_bound <= input.gap_tolerance * max(1.0, abs(upper_bound)):
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+        overload, weights = master[1], master[2]
+        if overload > CAP_TOLERANCE:
+            return self._solve_joint(input, prices, fleet, deadline)
+
+        power = np.zeros((len(unit_P_max), T))
+        levels = []
+        for (_, members, _, _), group_columns, group_weights in zip(groups, columns, weights):
+            level = np.zeros(T)
+            for (column_power, column_levels), weight in zip(group_columns, group_weights):
+                power[members] += weight * column_power
+                level += weight * column_levels
+            levels.append(level)
+        return power, levels, lower_bound, iteration
+
+    def _map_subproblems(self, prices, P_max, eta, groups, dt: float) -> list:
+        """Solve the uncapped subproblem of every storage, in parallel for large fleets."""
+        args = [(prices, P_max[members], eta[members], demand, S_max, dt) for _, members, demand, S_max in groups]
+        if self.subproblem_workers > 1 and len(groups) >= self.parallel_threshold:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.subproblem_workers)
+            chunksize = max(1, len(args) // (4 * self.subproblem_workers))
+            return list(self.executor.map(_solve_subproblem_args, args, chunksize=chunksize))
+        return [solve_storage_subproblem(*a) for a in args]
+
+    def shutdown(self):
+        """Stop the subproblem workers, if they were started."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+def _solve_master(columns: list, prices, limit, dt: float, penalty: float):
+    """Find the cheapest convex combination of each storage's schedules under the power limit.
+
+    Args:
+    - columns (list[list[tuple]]): Per storage, the (power, levels) schedules generated so far.
+    - prices (np.ndarray): Electricity price per time step (€/kWh).
+    - limit (np.ndarray): Shared power limit per time step (kW).
+    - dt (float): Duration of one time step (h).
+    - penalty (float): Cost of exceeding the power limit (€/kWh).
+
+    Returns:
+    - tuple: (cost, overload, weights, lam, mu): the master's cost without the overload penalty (€),
+      the largest overload of the power limit (kW), the weight of each column per storage, the
+      price of the power limit per time step (€/kWh) and the dual of each storage's convexity row (€).
+
+    Raises:
+    - ValueError: If the master LP cannot be solved.
+    """
+    from scipy.optimize import linprog
+    T = len(prices)
+    totals = [power.sum(axis=0) for group in columns for power, _ in group]
+    sizes = [len(group) for group in columns]
+    n = len(totals)
+    c = np.concatenate([[dt * float(prices @ total) for total in totals], np.full(T, dt * penalty)])
+    A_ub = np.hstack([np.column_stack(totals), -np.identity(T)])
+    A_eq = np.zeros((len(columns), n + T))
+    A_eq[np.repeat(np.arange(len(columns)), sizes), np.arange(n)] = 1.0
+    result = linprog(c, A_ub=A_ub, b_ub=limit, A_eq=A_eq, b_eq=np.ones(len(columns)), bounds=(0, None),
+                     method="highs")
+    if result.status != 0:
+        raise ValueError("Optimization failed")
+    overload = result.x[n:]
+    weights = np.split(result.x[:n], np.cumsum(sizes)[:-1])
+    cost = float(result.fun) - dt * penalty * float(overload.sum())
+    return cost, float(overload.max()), weights, -result.ineqlin.marginals / dt, result.eqlin.marginals
+
+
+def _solve_subproblem_args(args: tuple):
+    return solve_storage_subproblem(*args)
+
+
+def _solve_fleet_in_worker(selector: SolverSelector, input: FleetOptimizationInput,
+                           electrolyzers: list[ElectrolyzerConfig], storages: dict[str, StorageConfig],
+                           time_limit: float = None) -> FleetOptimizationOutput:
+    """Solve a fleet schedule inside a solver pool worker process, with subproblems solved in sequence."""
+    service = FleetOptimizationService(None, None, solver_pool=_WORKER_SOLVER_POOL, selector=selector)
+    return service.solve(input, electrolyzers, storages, time_limit)
+
+
+_WORKER_SOLVER_POOL = SolverPool(max_workers=1)
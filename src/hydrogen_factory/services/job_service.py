@@ -0,0 +1,328 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from hydrogen_factory.core.exceptions import SolverPoolFullError
+from hydrogen_factory.core.progress import listen
+from hydrogen_factory.models.schedule import (
+    FleetOptimizationInput, JobEvent, JobInfo, JobStatus, OptimizationInput
+)
+from hydrogen_factory.services.optimization_service import (
+    OptimizationService, SOLVER_GRACE_SECONDS, _solve_in_worker
+)
+from hydrogen_factory.services.fleet_service import FleetOptimizationService, _solve_fleet_in_worker
+
+FINISHED = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+# Job processes start from a fresh interpreter (forkserver where available), never by forking the server.
+DEFAULT_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+class Job:
+    def __init__(self, kind: str, fn, args: tuple, time_limit: float, on_result=None):
+        """State of one asynchronous optimization job.
+
+        Args:
+        - kind (str): 'optimize' or 'fleet'.
+        - fn (callable): Picklable module function run in the job's process.
+        - args (tuple): Arguments of fn.
+        - time_limit (float): Solver time limit (seconds); the process is killed shortly after it.
+        - on_result (callable): Called with the result when the job succeeds (e.g. to cache it).
+
+        Variables:
+        - self.events (list[JobEvent]): Everything that happened to the job, in order.
+        - self.process (multiprocessing.Process): Process running the solve, once started.
+        - self.future (concurrent.futures.Future): Handle of the job on the worker pool.
+        - self.condition (threading.Condition): Guards the state and wakes up event subscribers.
+        """
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.fn = fn
+        self.args = args
+        self.time_limit = time_limit
+        self.on_result = on_result
+        self.status = JobStatus.QUEUED
+        self.created_at = time.time()
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.events = []
+        self.process = None
+        self.future = None
+        self.condition = threading.Condition()
+        self.add_event("queued")
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def add_event(self, event: str, **data):
+        with self.condition:
+            self.events.append(JobEvent(event=event, elapsed=time.time() - self.created_at, data=data))
+            self.condition.notify_all()
+
+    def finish(self, status: JobStatus, result=None, error: str = None) -> bool:
+        """Move the job to a final state; returns False if it had already finished."""
+        with self.condition:
+            if self.finished:
+                return False
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            self.add_event(status.value, **({"error": error} if error else {}))
+            return True
+
+    def wait(self, seen: int, timeout: float) -> tuple[list, bool]:
+        """Block until there are events after the first seen ones or the timeout passes.
+
+        Returns:
+        - tuple[list[JobEvent], bool]: The new events and whether the job has finished.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: len(self.events) > seen, timeout)
+            return self.events[seen:], self.finished
+
+    async def stream(self, keepalive: float = 15.0):
+        """Yield the job's events from the first one on as they happen, until the job finishes.
+
+        None is yielded whenever keepalive seconds pass without an event, so that streams can
+        send a heartbeat.
+        """
+        seen = 0
+        while True:
+            events, finished = await asyncio.to_thread(self.wait, seen, keepalive)
+            if not events:
+                yield None
+            for event in events:
+                yield event
+            seen += len(events)
+            if finished:
+                return
+
+    def info(self) -> JobInfo:
+        with self.condition:
+            return JobInfo(
+                job_id=self.job_id,
+                kind=self.kind,
+                status=self.status,
+                created_at=self.created_at,
+                finished_at=self.finished_at,
+                progress=self.events[-1],
+                result=self.result,
+                error=self.error,
+            )
+
+
+class JobService:
+    def __init__(self, optimization_service: OptimizationService, fleet_service: FleetOptimizationService,
+                 max_workers: int = None, max_queue: int = 32, time_limit: float = 600.0, ttl: float = 3600.0,
+                 max_jobs: int = 1024, start_method: str = None):
+        """Initialize the asynchronous job runner.
+
+        Every job runs in its own process so that cancellation and time limits can kill the solver
+        (including a CBC subprocess) instead of waiting for it. At most max_workers jobs run at
+        once; the worker threads only wait for their job's process and relay its progress.
+
+        Args:
+        - optimization_service (OptimizationService): Source of configs, solve paths and the result cache.
+        - fleet_service (FleetOptimizationService): Source of fleet configs.
+        - max_workers (int): Jobs running in parallel (defaults to the CPU count).
+        - max_queue (int): Jobs allowed to wait for a free worker.
+        - time_limit (float): Default solver time limit per job (seconds).
+        - ttl (float): Seconds a finished job stays available.
+        - max_jobs (int): Maximum number of jobs kept; the oldest finished jobs are dropped first.
+        - start_method (str): multiprocessing start method of the job processes; None uses
+          DEFAULT_START_METHOD. 'fork' is unsafe here: jobs start from a worker thread while other
+          threads may hold locks (metrics, caches, repositories) that the child would inherit held.
+
+        Variables:
+        - self.jobs (OrderedDict): Maps job ID to Job, oldest first.
+        - self.executor (ThreadPoolExecutor): Worker threads, created on first use.
+        - self.lock (threading.Lock): Guards self.jobs and self.executor.
+        """
+        self.optimization_service = optimization_service
+        self.fleet_service = fleet_service
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.time_limit = time_limit
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self.context = multiprocessing.get_context(start_method or DEFAULT_START_METHOD)
+        self.jobs = OrderedDict()
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def submit(self, input: OptimizationInput) -> JobInfo:
+        """Queue an optimization job; configs are looked up now, so unknown IDs fail right away.
+
+        A cached result completes the job immediately.
+
+        Raises:
+        - ValueError: If electrolyzer_id/storage_id/a power supply is not found, the requested solver
+          is unavailable or the demand cannot be met (InfeasibleScheduleError).
+        - SolverPoolFullError: If all workers are busy and the job queue is full.
+        """
+        service = self.optimization_service
+        electrolyzer = service.electrolyzer_service.get_config(input.electrolyzer_id)
+        storage = service.storage_service.get_config(input.storage_id)
+        supply = service.available_power(input)
+        input = service.resolve_initial_level(input, storage)
+        time_limit = input.time_limit if input.time_limit is not None else self.time_limit
+        service.solver_path(input, supply, electrolyzer)
+        service.check_feasibility(input, electrolyzer, storage, supply)
+        key, cached = service._cache_get(input, electrolyzer, storage, supply)
+        job = Job(
+            "optimize", partial(_solve_in_worker, service.selector),
+            (input, electrolyzer, storage, time_limit, supply), time_limit,
+            on_result=partial(self._on_result, key, input),
+        )
+        if cached is not None:
+            service.record_plan(input, cached)
+            job.finish(JobStatus.SUCCEEDED, result=cached)
+            return self._add(job, start=False).info()
+        return self._add(job).info()
+
+    def submit_fleet(self, input: FleetOptimizationInput) -> JobInfo:
+        """Queue a fleet optimization job.
+
+        Raises:
+        - ValueError: If an electrolyzer/storage ID is not found.
+        - SolverPoolFullError: If all workers are busy and the job queue is full.
+        """
+        electrolyzers, storages = self.fleet_service._resolve(input)
+        time_limit = input.time_limit if input.time_limit is not None else self.time_limit
+        job = Job("fleet", partial(_solve_fleet_in_worker, self.fleet_service.selector),
+                  (input, electrolyzers, storages, time_limit), time_limit)
+        return self._add(job).info()
+
+    def get(self, job_id: str) -> Job:
+        """Return the job with the given ID.
+
+        Raises:
+        - ValueError: If the job does not exist or has expired.
+        """
+        with self.lock:
+            self._evict()
+            job = self.jobs.get(job_id)
+        if job is None:
+            raise ValueError("Job ID not found")
+        return job
+
+    def cancel(self, job_id: str) -> JobInfo:
+        """Cancel a queued or running job and kill its solver; finished jobs are left as they are.
+
+        Raises:
+        - ValueError: If the job does not exist or has expired.
+        """
+        job = self.get(job_id)
+        with job.condition:
+            if job.finish(JobStatus.CANCELLED):
+                if job.future is not None:
+                    job.future.cancel()
+                if job.process is not None:
+                    _kill(job.process)
+        return job.info()
+
+    def shutdown(self):
+        """Cancel all unfinished jobs and stop the worker threads."""
+        with self.lock:
+            jobs = list(self.jobs.values())
+            executor, self.executor = self.executor, None
+        for job in jobs:
+            if not job.finished:
+                self.cancel(job.job_id)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _add(self, job: Job, start: bool = True) -> Job:
+        with self.lock:
+            self._evict()
+            if start:
+                active = sum(not j.finished for j in self.jobs.values())
+                if active >= self.max_workers + self.max_queue:
+                    raise SolverPoolFullError("Job queue is full, retry later")
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+                job.future = self.executor.submit(self._run, job)
+            self.jobs[job.job_id] = job
+        return job
+
+    def _on_result(self, key, input: OptimizationInput, result):
+        """Cache the result of an optimization job and record its planned storage levels."""
+        self.optimization_service._cache_put(key, input, result)
+        self.optimization_service.record_plan(input, result)
+
+    def _evict(self):
+        """Drop expired jobs, then the oldest finished jobs beyond max_jobs. Caller holds self.lock."""
+        now = time.time()
+        for job_id in [j.job_id for j in self.jobs.values() if j.finished and now - j.finished_at > self.ttl]:
+            del self.jobs[job_id]
+        excess = len(self.jobs) - self.max_jobs
+        if excess > 0:
+            for job_id in [j.job_id for j in self.jobs.values() if j.finished][:excess]:
+                del self.jobs[job_id]
+
+    def _run(self, job: Job):
+        """Run a job's process on a worker thread and relay its progress until it finishes."""
+        receiver, sender = self.context.Pipe(duplex=False)
+        with job.condition:
+            if job.finished:
+                return
+            job.process = self.context.Process(target=_run_job_process, args=(job.fn, job.args, sender), daemon=True)
+            job.process.start()
+            job.status = JobStatus.RUNNING
+        sender.close()
+        job.add_event("running")
+        deadline = time.monotonic() + job.time_limit + SOLVER_GRACE_SECONDS
+        try:
+            while not job.finished:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    job.finish(JobStatus.FAILED, error=f"Solver did not finish within {job.time_limit} seconds")
+                    break
+                if not receiver.poll(min(remaining, 1.0)):
+                    continue
+                message, payload = receiver.recv()
+                if message == "progress":
+                    job.add_event(payload[0], **payload[1])
+                elif message == "result":
+                    if job.finish(JobStatus.SUCCEEDED, result=payload) and job.on_result is not None:
+                        job.on_result(payload)
+                else:
+                    job.finish(JobStatus.FAILED, error=payload)
+        except (EOFError, OSError):
+            job.finish(JobStatus.FAILED, error="Solver process exited unexpectedly")
+        finally:
+            receiver.close()
+            _kill(job.process)
+            job.process.join()
+
+
+def _run_job_process(fn, args: tuple, sender):
+    """Entry point of a job process: run fn(*args) and send progress, then the result or error, to sender."""
+    # A process group of its own lets the parent kill solver subprocesses (CBC) together with this process.
+    if hasattr(os, "setsid"):
+        os.setsid()
+    try:
+        with listen(lambda event, data: sender.send(("progress", (event, data)))):
+            result = fn(*args)
+        sender.send(("result", result))
+    except Exception as e:
+        sender.send(("error", str(e) or type(e).__name__))
+    finally:
+        sender.close()
+
+
+def _kill(process):
+    """Kill a job process and its process group, if it is still running."""
+    if not process.is_alive():
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        process.kill()
@@ -0,0 +1,234 @@
+import os
+import threading
+from urllib.parse import quote
+import numpy as np
+
+# Column files grow by this many rows at a time, so that appends rarely extend and remap them.
+CHUNK_ROWS = 4096
+# The ring-buffer index holds the first time of each block of INDEX_BLOCK_ROWS rows for the last
+# INDEX_BLOCKS blocks (about 260k rows); older rows are found by binary search in the mapped times.
+INDEX_BLOCK_ROWS = 256
+INDEX_BLOCKS = 1024
+KINDS = ("planned", "measured")
+
+class LevelSeries:
+    def __init__(self, directory: str, block_rows: int = INDEX_BLOCK_ROWS, index_blocks: int = INDEX_BLOCKS):
+        """Open (or create) one time series of storage levels, stored as two memory-mapped column files.
+
+        The times (Unix time, s) and the levels (kg) are little-endian float64 files, preallocated
+        in CHUNK_ROWS steps and written in place through the maps. An append is O(1) and touches
+        only the pages it writes; the OS writes them back and may evict them, so resident memory
+        does not grow with the history. The row count is not stored: times are positive and
+        increasing and the preallocated rest of the file is zero, so it is found by binary search
+        on open.
+
+        Args:
+        - directory (str): Directory of the series; created on the first append.
+        - block_rows (int): Rows per block of the ring-buffer index.
+        - index_blocks (int): Number of recent blocks in the ring-buffer index.
+
+        Variables:
+        - self.count (int): Number of rows.
+        - self.times, self.levels (np.memmap): The mapped columns; None while the series is empty.
+        - self.index (np.ndarray): Ring buffer with the first time of block b at position b % index_blocks.
+        """
+        self.directory = directory
+        self.block_rows = block_rows
+        self.index = np.zeros(index_blocks)
+        self.times = self.levels = None
+        self.count = 0
+        capacity = os.path.getsize(self._path("time")) // 8 if os.path.exists(self._path("time")) else 0
+        if capacity:
+            self._map(capacity)
+            lo, hi = 0, capacity
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.times[mid] > 0:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            self.count = lo
+            self._rebuild_index()
+
+    def append(self, times: np.ndarray, levels: np.ndarray):
+        """Append rows after the last one.
+
+        Raises:
+        - ValueError: If the times are not positive and increasing, also relative to the last row.
+        """
+        if len(times) == 0:
+            return
+        if times[0] <= 0 or np.any(np.diff(times) <= 0) or (self.count and times[0] <= self.times[self.count - 1]):
+            raise ValueError("Level times must be positive and increasing")
+        end = self.count + len(times)
+        self._reserve(end)
+        # Levels first: the count is recovered from the times after a crash.
+        self.levels[self.count:end] = levels
+        self.times[self.count:end] = times
+        for block in range(-(-self.count // self.block_rows), (end - 1) // self.block_rows + 1):
+            self.index[block % len(self.index)] = self.times[block * self.block_rows]
+        self.count = end
+
+    def truncate(self, time: float):
+        """Drop the rows from the given time on.
+
+        Older blocks can move back into the index window, so the index is rebuilt.
+        """
+        row = self.find(time)
+        if row < self.count:
+            self.times[row:self.count] = 0.0
+            self.levels[row:self.count] = 0.0
+            self.count = row
+            self._rebuild_index()
+
+    def find(self, time: float, side: str = "left") -> int:
+        """Return the row at which time would be inserted, like numpy.searchsorted on the times.
+
+        Recent rows are located through the ring-buffer index and one block of the times; older
+        rows by binary search over the mapped times, which reads only O(log n) pages.
+        """
+        first, blocks = self._indexed_blocks()
+        if blocks == 0:
+            return 0
+        if first > 0 and time < self.index[first % len(self.index)]:
+            return int(np.searchsorted(self.times[:first * self.block_rows], time, side))
+        starts = self.index[np.arange(first, blocks) % len(self.index)]
+        start = (first + max(int(np.searchsorted(starts, time, "right")) - 1, 0)) * self.block_rows
+        block = self.times[start:min(start + self.block_rows, self.count)]
+        return start + int(np.searchsorted(block, time, side))
+
+    def read(self, start: float = None, end: float = None) -> tuple[np.ndarray, np.ndarray]:
+        """Return the times and levels in [start, end) as views on the mapped files (no copies)."""
+        if self.count == 0:
+            return np.zeros(0), np.zeros(0)
+        lo = 0 if start is None else self.find(start)
+        hi = self.count if end is None else max(self.find(end), lo)
+        return self.times[lo:hi], self.levels[lo:hi]
+
+    def last(self, at: float = None):
+        """Return (time, level) of the last row at or before at (the last row for None), or None."""
+        row = (self.count if at is None else self.find(at, "right")) - 1
+        if row < 0:
+            return None
+        return float(self.times[row]), float(self.levels[row])
+
+    def close(self):
+        """Write the mapped pages back and unmap the files."""
+        for column in (self.times, self.levels):
+            if column is not None:
+                column.flush()
+        self.times = self.levels = None
+
+    def _rebuild_index(self):
+        """Fill the ring-buffer index with the first time of every indexed block."""
+        first, blocks = self._indexed_blocks()
+        starts = self.times[first * self.block_rows:self.count:self.block_rows]
+        self.index[np.arange(first, blocks) % len(self.index)] = starts
+
+    def _indexed_blocks(self) -> tuple[int, int]:
+        """Return the first block held by the ring-buffer index and the number of blocks."""
+        blocks = -(-self.count // self.block_rows)
+        return max(blocks - len(self.index), 0), blocks
+
+    def _reserve(self, rows: int):
+        """Grow both files to hold at least rows rows, in whole chunks, and map them again."""
+        capacity = 0 if self.times is None else len(self.times)
+        if rows <= capacity:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        capacity = -(-rows // CHUNK_ROWS) * CHUNK_ROWS
+        for name in ("time", "level"):
+            with open(self._path(name), "ab") as f:
+                f.truncate(capacity * 8)
+        self._map(capacity)
+
+    def _map(self, capacity: int):
+        self.times = np.memmap(self._path("time"), dtype="<f8", mode="r+", shape=(capacity,))
+        self.levels = np.memmap(self._path("level"), dtype="<f8", mode="r+", shape=(capacity,))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.f8")
+
+
+class StorageLevelStore:
+    def __init__(self, directory: str):
+        """Initialize the per-storage history of planned and measured storage levels.
+
+        Each storage has a 'planned' and a 'measured' series (see LevelSeries) under
+        directory/<storage_id>/<kind>. Series are opened on first use.
+
+        Args:
+        - directory (str): Root directory of the history.
+
+        Variables:
+        - self.series (dict): Open LevelSeries per (storage_id, kind).
+        - self.lock (threading.Lock): Guards the series; reads only hold it while slicing.
+        """
+        self.directory = directory
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def record(self, storage_id: str, kind: str, times, levels):
+        """Record levels of a storage; a new plan replaces the planned levels from its first time on.
+
+        Args:
+        - storage_id (str): ID of the storage.
+        - kind (str): 'planned' or 'measured'.
+        - times (list[float]): Unix times (s), increasing and after the last measured time.
+        - levels (list[float]): Storage level at each time (kg).
+
+        Raises:
+        - ValueError: If the kind is unknown, the lengths differ or the times are not increasing.
+        """
+        times = np.asarray(times, dtype=float)
+        levels = np.asarray(levels, dtype=float)
+        if len(times) != len(levels):
+            raise ValueError("times and levels must have the same length")
+        with self.lock:
+            series = self._series(storage_id, kind)
+            if kind == "planned" and len(times):
+                series.truncate(times[0])
+            series.append(times, levels)
+
+    def read(self, storage_id: str, kind: str, start: float = None, end: float = None) -> tuple[np.ndarray, np.ndarray]:
+        """Return the times and levels of a series in [start, end), as views on the mapped files.
+
+        Raises:
+        - ValueError: If the kind is unknown.
+        """
+        with self.lock:
+            return self._series(storage_id, kind).read(start, end)
+
+    def latest(self, storage_id: str, at: float = None):
+        """Return (time, level, kind) of the latest level at or before at, or None.
+
+        A measurement wins over a plan for the same time; a later plan wins over an earlier
+        measurement, as it started from the state known then.
+        """
+        with self.lock:
+            found = [
+                (point[0], kind == "measured", point[1], kind)
+                for kind in KINDS
+                if (point := self._series(storage_id, kind).last(at)) is not None
+            ]
+        if not found:
+            return None
+        time, _, level, kind = max(found)
+        return time, level, kind
+
+    def close(self):
+        """Close all series."""
+        with self.lock:
+            for series in self.series.values():
+                series.close()
+            self.series.clear()
+
+    def _series(self, storage_id: str, kind: str) -> LevelSeries:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown level series: {kind}")
+        key = (storage_id, kind)
+        if key not in self.series:
+            # Dots are escaped too, so that no storage ID names a directory outside the store.
+            name = quote(storage_id, safe="").replace(".", "%2E")
+            self.series[key] = LevelSeries(os.path.join(self.directory, name, kind))
+        return self.series[key]
@@ -0,0 +1,236 @@
+import numpy as np
+from hydrogen_factory.core.metrics import stage
+from hydrogen_factory.core.progress import report
+from hydrogen_factory.services.solver_backends import HIGHS, SolverBackend
+
+# SciPy is imported inside the functions: it takes longer to import than the rest of the
+# application together and is only needed once an LP is built.
+
+def build_schedule_lp(C_t: list[float], D_t: list[float], P_max: float, eta: float, S_max: float,
+                      S_0: float = 0.0, dt: float = 1.0, unmet_penalty: float = None):
+    """Assemble the schedule LP directly as NumPy/SciPy-sparse arrays.
+
+    The variable vector is x = [P_0 .. P_{T-1}, S_0 .. S_{T-1}], with production substituted
+    into the storage balance, S_t - S_{t-1} - eta * dt * P_t == -D_t (plus S_0 for t = 0).
+
+    Args:
+    - C_t (list[float]): Electricity prices for each time step (€/kWh).
+    - D_t (list[float]): Hydrogen demand for each time step (kg).
+    - P_max (float): Maximum power capacity of the electrolyzer (kW).
+    - eta (float): Electrolyzer efficiency (kg H₂/kWh).
+    - S_max (float): Maximum storage capacity (kg).
+    - S_0 (float): Initial storage level (kg).
+    - dt (float): Duration of one time step (h).
+    - unmet_penalty (float): Cost of unmet demand (€/kg); if given, unmet-demand variables are
+      appended (see add_unmet_demand).
+
+    Returns:
+    - tuple: (c, A_eq, b_eq, bounds), where c (np.ndarray) is the cost vector, A_eq
+      (scipy.sparse.csr_matrix) and b_eq (np.ndarray) are the balance constraints, and bounds
+      (np.ndarray of shape (2T, 2)) holds the variable bounds.
+    """
+    import scipy.sparse as sp
+    T = len(C_t)
+    c = np.concatenate([np.asarray(C_t, dtype=float) * dt, np.zeros(T)])
+    identity = sp.identity(T, format="csr")
+    A_eq = sp.hstack([
+        -eta * dt * identity,
+        identity - sp.eye(T, k=-1, format="csr"),
+    ], format="csr")
+    b_eq = -np.asarray(D_t, dtype=float)
+    b_eq[0] += S_0
+    bounds = np.zeros((2 * T, 2))
+    bounds[:T, 1] = P_max
+    bounds[T:, 1] = S_max
+    if unmet_penalty is not None:
+        c, _, A_eq, bounds = add_unmet_demand(c, None, A_eq, bounds, D_t, unmet_penalty)
+    return c, A_eq, b_eq, bounds
+
+
+def add_unmet_demand(c, A_ub, A_eq, bounds, D_t: list[float], penalty: float):
+    """Append unmet-demand variables U_t to a schedule model, so that it is feasible for any demand.
+
+    U_t covers part of the demand in its own step, 0 <= U_t <= D_t, at the given penalty per kg.
+    The first T rows of A_eq must be the storage balances (... == -D_t), which U_t enters like
+    production.
+
+    Args:
+    - c, A_ub, A_eq, bounds: The model; A_ub may be None.
+    - D_t (list[float]): Hydrogen demand for each time step (kg).
+    - penalty (float): Cost of unmet demand (€/kg).
+
+    Returns:
+    - tuple: (c, A_ub, A_eq, bounds) with the T columns of U appended.
+    """
+    import scipy.sparse as sp
+    T = len(D_t)
+    slack = sp.vstack([-sp.identity(T, format="csr"), sp.csr_matrix((A_eq.shape[0] - T, T))], format="csr")
+    A_eq = sp.hstack([A_eq, slack], format="csr")
+    if A_ub is not None:
+        A_ub = sp.hstack([A_ub, sp.csr_matrix((A_ub.shape[0], T))], format="csr")
+    unmet_bounds = np.zeros((T, 2))
+    unmet_bounds[:, 1] = np.maximum(np.asarray(D_t, dtype=float), 0.0)
+    return np.concatenate([c, np.full(T, float(penalty))]), A_ub, A_eq, np.vstack([bounds, unmet_bounds])
+
+
+def solve_schedule_lp(C_t: list[float], D_t: list[float], P_max: float, eta: float, S_max: float,
+                      S_0: float = 0.0, dt: float = 1.0, time_limit: float = None,
+                      backend: SolverBackend = HIGHS, unmet_penalty: float = None):
+    """Solve the schedule LP, by default in-process with HiGHS, without PuLP objects or temporary files.
+
+    Args:
+    - C_t (list[float]): Electricity prices for each time step (€/kWh).
+    - D_t (list[float]): Hydrogen demand for each time step (kg).
+    - P_max (float): Maximum power capacity of the electrolyzer (kW).
+    - eta (float): Electrolyzer efficiency (kg H₂/kWh).
+    - S_max (float): Maximum storage capacity (kg).
+    - S_0 (float): Initial storage level (kg).
+    - dt (float): Duration of one time step (h).
+    - time_limit (float): Solver time limit (seconds); None means no limit.
+    - backend (SolverBackend): Solver for the LP.
+    - unmet_penalty (float): Cost of unmet demand (€/kg); None requires the demand to be met.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray, np.ndarray]: Power schedule (kW), hydrogen produced (kg)
+      and storage levels (kg) for each time step.
+
+    Raises:
+    - ValueError: If the optimization fails (e.g., infeasible problem or time limit reached).
+    """
+    T = len(C_t)
+    with stage("build"):
+        c, A_eq, b_eq, bounds = build_schedule_lp(C_t, D_t, P_max, eta, S_max, S_0, dt, unmet_penalty)
+    report("built", solver=backend.name, variables=len(c))
+    with stage("solve"):
+        x = backend.solve(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds, time_limit=time_limit)
+    power_schedule = x[:T]
+    return power_schedule, power_schedule * eta * dt, x[T:2 * T]
+
+
+
+def build_supplied_schedule_lp(C_t: list[float], D_t: list[float], P_max: float, eta: float, S_max: float,
+                               renewable, grid_limit, S_0: float = 0.0, dt: float = 1.0,
+                               unmet_penalty: float = None):
+    """Assemble the schedule LP for an electrolyzer fed by free renewable power and priced grid power.
+
+    Extends build_schedule_lp with grid variables: x = [P, S, G]. Only grid power is paid for,
+    G_t <= grid_limit_t, and the renewable share P_t - G_t must lie in [0, renewable_t].
+
+    Args:
+    - C_t, D_t, P_max, eta, S_max, S_0, dt, unmet_penalty: As in build_schedule_lp.
+    - renewable (np.ndarray): Free renewable power available per time step (kW).
+    - grid_limit (np.ndarray): Grid power available per time step (kW).
+
+    Returns:
+    - tuple: (c, A_ub, b_ub, A_eq, b_eq, bounds) in the form expected by scipy.optimize.linprog.
+    """
+    import scipy.sparse as sp
+    T = len(C_t)
+    c, A_eq, b_eq, bounds = build_schedule_lp(C_t, D_t, P_max, eta, S_max, S_0, dt)
+    c = np.concatenate([np.zeros(2 * T), np.asarray(C_t, dtype=float) * dt])
+    A_eq = sp.hstack([A_eq, sp.csr_matrix((T, T))], format="csr")
+    identity = sp.identity(T, format="csr")
+    zeros = sp.csr_matrix((T, T))
+    A_ub = sp.vstack([
+        sp.hstack([identity, zeros, -identity]),
+        sp.hstack([-identity, zeros, identity]),
+    ], format="csr")
+    b_ub = np.concatenate([np.asarray(renewable, dtype=float), np.zeros(T)])
+    grid_bounds = np.zeros((T, 2))
+    grid_bounds[:, 1] = grid_limit
+    bounds = np.vstack([bounds, grid_bounds])
+    if unmet_penalty is not None:
+        c, A_ub, A_eq, bounds = add_unmet_demand(c, A_ub, A_eq, bounds, D_t, unmet_penalty)
+    return c, A_ub, b_ub, A_eq, b_eq, bounds
+
+
+def solve_supplied_schedule_lp(C_t: list[float], D_t: list[float], P_max: float, eta: float, S_max: float,
+                               renewable, grid_limit, S_0: float = 0.0, dt: float = 1.0, time_limit: float = None,
+                               backend: SolverBackend = HIGHS, unmet_penalty: float = None):
+    """Solve the renewable/grid schedule LP, by default in-process with HiGHS.
+
+    Args:
+    - Same as build_supplied_schedule_lp, plus time_limit (float): Solver time limit (seconds),
+      and backend (SolverBackend): Solver for the LP.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Power schedule (kW), hydrogen produced (kg),
+      storage levels (kg) and grid power (kW) for each time step.
+
+    Raises:
+    - ValueError: If the optimization fails (e.g., infeasible problem or time limit reached).
+    """
+    T = len(C_t)
+    with stage("build"):
+        c, A_ub, b_ub, A_eq, b_eq, bounds = build_supplied_schedule_lp(
+            C_t, D_t, P_max, eta, S_max, renewable, grid_limit, S_0, dt, unmet_penalty
+        )
+    report("built", solver=backend.name, variables=len(c))
+    with stage("solve"):
+        x = backend.solve(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, time_limit=time_limit)
+    power_schedule = x[:T]
+    return power_schedule, power_schedule * eta * dt, x[T:2 * T], x[2 * T:3 * T]
+
+
+def build_fleet_lp(C_t: list[float], D_jt, P_max_i, eta_i, S_max_j, storage_of, L_t, dt: float = 1.0):
+    """Assemble the joint fleet LP: N electrolyzers feeding M storages under a shared power limit.
+
+    The variable vector is x = [P_{0,0} .. P_{N-1,T-1}, S_{0,0} .. S_{M-1,T-1}] (row-major per asset).
+    Every storage j has the balance S_jt - S_j,t-1 - sum_{i -> j} eta_i * dt * P_it == -D_jt, and the
+    fleet's total power is limited by sum_i P_it <= L_t. All storages start empty.
+
+    Args:
+    - C_t (list[float]): Electricity prices for each time step (€/kWh).
+    - D_jt (array-like): Hydrogen demand per storage and time step (kg), shape (M, T).
+    - P_max_i (array-like): Maximum power capacity of each electrolyzer (kW).
+    - eta_i (array-like): Efficiency of each electrolyzer (kg H₂/kWh).
+    - S_max_j (array-like): Maximum capacity of each storage (kg).
+    - storage_of (array-like): Index of the storage each electrolyzer feeds.
+    - L_t (array-like): Shared power limit for each time step (kW).
+    - dt (float): Duration of one time step (h).
+
+    Returns:
+    - tuple: (c, A_ub, b_ub, A_eq, b_eq, bounds) in the form expected by scipy.optimize.linprog.
+    """
+    import scipy.sparse as sp
+    D_jt = np.asarray(D_jt, dtype=float)
+    M, T = D_jt.shape
+    N = len(P_max_i)
+    c = np.concatenate([np.tile(np.asarray(C_t, dtype=float) * dt, N), np.zeros(M * T)])
+    identity = sp.identity(T, format="csr")
+    feeds = sp.csr_matrix(
+        (-np.asarray(eta_i, dtype=float) * dt, (np.asarray(storage_of), np.arange(N))), shape=(M, N)
+    )
+    A_eq = sp.hstack([
+        sp.kron(feeds, identity),
+        sp.kron(sp.identity(M), identity - sp.eye(T, k=-1)),
+    ], format="csr")
+    b_eq = -D_jt.ravel()
+    A_ub = sp.hstack([sp.kron(np.ones((1, N)), identity), sp.csr_matrix((T, M * T))], format="csr")
+    b_ub = np.broadcast_to(np.asarray(L_t, dtype=float), (T,)).copy()
+    bounds = np.zeros((N * T + M * T, 2))
+    bounds[:N * T, 1] = np.repeat(np.asarray(P_max_i, dtype=float), T)
+    bounds[N * T:, 1] = np.repeat(np.asarray(S_max_j, dtype=float), T)
+    return c, A_ub, b_ub, A_eq, b_eq, bounds
+
+
+def solve_fleet_lp(C_t: list[float], D_jt, P_max_i, eta_i, S_max_j, storage_of, L_t, dt: float = 1.0,
+                   time_limit: float = None, backend: SolverBackend = HIGHS):
+    """Solve the joint fleet LP, by default in-process with HiGHS.
+
+    Args:
+    - Same as build_fleet_lp, plus time_limit (float): Solver time limit (seconds); None means no
+      limit, and backend (SolverBackend): Solver for the LP.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray]: Power schedules (kW), shape (N, T), and storage levels (kg), shape (M, T).
+
+    Raises:
+    - ValueError: If the optimization fails (e.g., infeasible problem or time limit reached).
+    """
+    N = len(P_max_i)
+    M, T = np.shape(D_jt)
+    c, A_ub, b_ub, A_eq, b_eq, bounds = build_fleet_lp(C_t, D_jt, P_max_i, eta_i, S_max_j, storage_of, L_t, dt)
+    report("built", solver=backend.name, variables=len(c))
+    x = backend.solve(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, time_limit=time_limit)
+    return x[:N * T].reshape(N, T), x[N * T:].reshape(M, T)
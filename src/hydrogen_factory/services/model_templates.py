@@ -0,0 +1,169 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from hydrogen_factory.core.metrics import stage
+from hydrogen_factory.core.progress import report
+from hydrogen_factory.services.solver_backends import BACKENDS, PulpBackend
+
+# PuLP is imported when the first template is built: importing it loads all of its solver
+# interfaces, which the dispatch and HiGHS paths never need.
+
+class ScheduleModelTemplate:
+    def __init__(self, P_max: float, eta: float, S_max: float, T: int, dt: float = 1.0):
+        """Build the constraint structure of the schedule LP once for one electrolyzer/storage pair.
+
+        Only the objective (prices) and the balance right-hand sides (demand, initial level)
+        change between requests; they are filled in by solve(). Production is substituted
+        into the balance (H_t = eta * dt * P_t), which halves the model size, and every
+        expression is assembled from precomputed coefficient lists instead of PuLP operator
+        overloading, which dominates build time at long horizons.
+
+        Args:
+        - P_max (float): Maximum power capacity of the electrolyzer (kW).
+        - eta (float): Electrolyzer efficiency (kg H₂/kWh).
+        - S_max (float): Maximum storage capacity (kg).
+        - T (int): Number of time steps.
+        - dt (float): Duration of one time step (h).
+
+        Variables:
+        - self.model (LpProblem): The reusable PuLP model.
+        - self.P_t, self.S_t (list[LpVariable]): Power and storage variables.
+        - self.balance (list[LpConstraint]): Storage balance constraints, S_t - S_{t-1} - eta * dt * P_t == -D_t.
+        - self.solved (bool): Whether the variables hold a previous solution usable as a warm start.
+        - self.lock (threading.Lock): Held while the template is being solved.
+        """
+        from pulp import LpAffineExpression, LpConstraint, LpConstraintEQ, LpMinimize, LpProblem, LpVariable
+        self.T = T
+        self.dt = dt
+        self.yield_per_kw = eta * dt
+        self.model = LpProblem("Hydrogen_Optimization", LpMinimize)
+        self.P_t = [LpVariable(f"P_{t}", 0, P_max) for t in range(T)]
+        self.S_t = [LpVariable(f"S_{t}", 0.0, S_max) for t in range(T)]
+        previous = [None] + self.S_t[:-1]
+        self.balance = [
+            LpConstraint(
+                LpAffineExpression(
+                    [(S, 1.0), (P, -self.yield_per_kw)] + ([(S_prev, -1.0)] if S_prev is not None else [])
+                ),
+                LpConstraintEQ,
+                f"balance_{t}",
+                0.0,
+            )
+            for t, (P, S, S_prev) in enumerate(zip(self.P_t, self.S_t, previous))
+        ]
+        for constraint in self.balance:
+            self.model.addConstraint(constraint)
+        self.solved = False
+        self.lock = threading.Lock()
+
+    def solve(self, C_t: list[float], D_t: list[float], S_0: float = 0.0, time_limit: float = None,
+              mip_gap: float = None, backend: PulpBackend = None):
+        """Set prices and demand, solve with CBC (or another PuLP-driven solver) and return the schedule.
+
+        When the template has been solved before and the model is a MIP, the previous solution
+        is passed to CBC as a warm start. The command-line interface only accepts MIP starts, not
+        an LP basis, and writing the start file costs more than it saves on a pure LP.
+
+        Args:
+        - C_t (list[float]): Electricity prices for each time step (€/kWh).
+        - D_t (list[float]): Hydrogen demand for each time step (kg).
+        - S_0 (float): Initial storage level (kg).
+        - time_limit (float): CBC time limit (seconds); None means no limit.
+        - mip_gap (float): Relative MIP gap at which CBC stops; None uses CBC's default. No effect on LPs.
+        - backend (PulpBackend): Solver to run; None means CBC.
+
+        Returns:
+        - tuple[np.ndarray, np.ndarray, np.ndarray]: Power schedule (kW), hydrogen produced (kg)
+          and storage levels (kg) for each time step.
+
+        Raises:
+        - ValueError: If the optimization fails (e.g., infeasible problem).
+        """
+        from pulp import LpAffineExpression, LpStatusOptimal
+        backend = backend or BACKENDS["cbc"]
+        with stage("build"):
+            self.model.setObjective(LpAffineExpression(zip(self.P_t, (np.asarray(C_t) * self.dt).tolist())))
+            rhs = -np.asarray(D_t, dtype=float)
+            rhs[0] += S_0
+            for constraint, value in zip(self.balance, rhs.tolist()):
+                constraint.changeRHS(value)
+        report("built", solver=backend.name, variables=2 * self.T)
+
+        with stage("solve"):
+            self.model.solve(backend.command(time_limit, mip_gap, warm_start=self.solved and self.model.isMIP()))
+
+        if self.model.status != LpStatusOptimal:
+            self.solved = False
+            raise ValueError("Optimization failed")
+        self.solved = True
+
+        with stage("extract"):
+            power_schedule = np.fromiter((P.varValue for P in self.P_t), dtype=float, count=self.T)
+            storage_levels = np.fromiter((S.varValue for S in self.S_t), dtype=float, count=self.T)
+        return power_schedule, power_schedule * self.yield_per_kw, storage_levels
+
+
+class ModelTemplateCache:
+    def __init__(self, max_templates: int = 64):
+        """Initialize an LRU cache of schedule model templates.
+
+        Templates are keyed by the parameters that shape the model (P_max, eta, S_max, T, dt)
+        rather than by asset IDs, so a reconfigured asset never reuses a stale template.
+
+        Args:
+        - max_templates (int): Maximum number of templates kept.
+
+        Variables:
+        - self.templates (OrderedDict): Maps (P_max, eta, S_max, T, dt) to a ScheduleModelTemplate.
+        """
+        self.max_templates = max_templates
+        self.templates = OrderedDict()
+        self.lock = threading.Lock()
+
+    def solve(self, P_max: float, eta: float, S_max: float, C_t: list[float], D_t: list[float],
+              S_0: float = 0.0, time_limit: float = None, dt: float = 1.0, mip_gap: float = None,
+              backend: PulpBackend = None):
+        """Solve the schedule on a cached template, building it on first use.
+
+        If the cached template is busy with a concurrent solve, a throwaway template is used
+        instead of waiting for it.
+
+        Args:
+        - P_max (float): Maximum power capacity of the electrolyzer (kW).
+        - eta (float): Electrolyzer efficiency (kg H₂/kWh).
+        - S_max (float): Maximum storage capacity (kg).
+        - C_t (list[float]): Electricity prices for each time step (€/kWh).
+        - D_t (list[float]): Hydrogen demand for each time step (kg).
+        - S_0 (float): Initial storage level (kg).
+        - time_limit (float): CBC time limit (seconds); None means no limit.
+        - dt (float): Duration of one time step (h).
+        - mip_gap (float): Relative MIP gap at which CBC stops; None uses CBC's default.
+        - backend (PulpBackend): Solver to run; None means CBC.
+
+        Returns:
+        - tuple[np.ndarray, np.ndarray, np.ndarray]: Power schedule, hydrogen produced and storage levels.
+
+        Raises:
+        - ValueError: If the optimization fails (e.g., infeasible problem).
+        """
+        key = (P_max, eta, S_max, len(C_t), dt)
+        with self.lock:
+            template = self.templates.get(key)
+            if template is not None:
+                self.templates.move_to_end(key)
+        if template is None:
+            with stage("build"):
+                template = ScheduleModelTemplate(P_max, eta, S_max, len(C_t), dt)
+            with self.lock:
+                template = self.templates.setdefault(key, template)
+                while len(self.templates) > self.max_templates:
+                    self.templates.popitem(last=False)
+
+        if not template.lock.acquire(blocking=False):
+            with stage("build"):
+                template = ScheduleModelTemplate(P_max, eta, S_max, len(C_t), dt)
+            template.lock.acquire()
+        try:
+            return template.solve(C_t, D_t, S_0, time_limit, mip_gap, backend)
+        finally:
+            template.lock.release()
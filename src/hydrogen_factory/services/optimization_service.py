@@ -1,29 +1,101 @@
-from pulp import *
-from hydrogen_factory.models.schedule import OptimizationInput, OptimizationOutput
+import asyncio
+import time
+import numpy as np
+from functools import partial
+from pydantic import ValidationError
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import OptimizationInput, OptimizationOutput, BatchOptimizationResult
+from hydrogen_factory.core.exceptions import HydrogenFactoryException, SolverPoolFullError, SolverTimeoutError
+from hydrogen_factory.core.metrics import SOLVER_RESULTS, stage
 from hydrogen_factory.services.electrolyzer_service import ElectrolyzerService
 from hydrogen_factory.services.storage_service import StorageService
+from hydrogen_factory.services.power_supply_service import PowerSupplyService
+from hydrogen_factory.services.dispatch_solver import dispatch_fits, solve_dispatch
+from hydrogen_factory.services.solver_pool import SolverPool
+from hydrogen_factory.services.result_cache import ResultCache
+from hydrogen_factory.services.model_templates import ModelTemplateCache
+from hydrogen_factory.services.matrix_lp import solve_schedule_lp, solve_supplied_schedule_lp
+from hydrogen_factory.services.part_load import solve_part_load_schedule
+from hydrogen_factory.services.feasibility import check_feasibility, production_limits, unmet_demand
+from hydrogen_factory.services.solver_backends import HIGHS, SolverBackend, get_backend
+from hydrogen_factory.services.solver_selector import SolverSelector
+from hydrogen_factory.services.level_store import StorageLevelStore
+
+SOLVER_GRACE_SECONDS = 1.0
 
 class OptimizationService:
-    def __init__(self, electrolyzer_service: ElectrolyzerService, storage_service: StorageService):
+    def __init__(self, electrolyzer_service: ElectrolyzerService, storage_service: StorageService,
+                 use_dispatch: bool = True, solver_pool: SolverPool = None, result_cache: ResultCache = None,
+                 model_templates: ModelTemplateCache = None, lp_solver: str = "auto",
+                 power_supply_service: PowerSupplyService = None, selector: SolverSelector = None,
+                 level_store: StorageLevelStore = None):
         """Initialize the OptimizationService with dependencies for electrolyzer and storage services.
 
         Args:
         - electrolyzer_service (ElectrolyzerService): Service to retrieve electrolyzer configurations.
         - storage_service (StorageService): Service to retrieve storage configurations.
+        - use_dispatch (bool): Solve with the in-process merit-order dispatch whenever the input fits,
+          falling back to an LP solver otherwise.
+        - solver_pool (SolverPool): Pool that runs solves for optimize_async (defaults to a thread pool).
+        - result_cache (ResultCache): Cache of results for repeated inputs; None disables caching.
+          Entries are invalidated when a referenced electrolyzer or storage is configured.
+        - model_templates (ModelTemplateCache): Reusable PuLP models for CBC solves (defaults to a new cache).
+        - lp_solver (str): Solver for inputs the dispatch does not cover: 'auto' (chosen per problem by
+          size, see SolverSelector), 'highs' (matrix-form model solved in-process by HiGHS), 'cbc'
+          (PuLP model solved by the CBC executable) or 'glpk' (the same with GLPK, if installed).
+        - power_supply_service (PowerSupplyService): Service to retrieve power supply availability;
+          required for inputs with power_supply_ids.
+        - selector (SolverSelector): Solver selection; defaults to one built from use_dispatch and lp_solver.
+        - level_store (StorageLevelStore): History of storage levels; supplies omitted initial levels and
+          records the plans of inputs with a start_time. None disables both.
 
         Variables:
         - self.electrolyzer_service (ElectrolyzerService): Instance for accessing electrolyzer configs.
         - self.storage_service (StorageService): Instance for accessing storage configs.
+        - self.use_dispatch (bool): Whether the dispatch solver is preferred over the LP solvers.
+        - self.solver_pool (SolverPool): Bounded pool used to keep solves off the event loop.
+        - self.result_cache (ResultCache): Optional result cache.
+        - self.model_templates (ModelTemplateCache): PuLP model templates keyed by asset parameters and horizon.
+        - self.lp_solver (str): 'auto' or a backend name.
+        - self.power_supply_service (PowerSupplyService): Source of packed availability profiles.
+        - self.selector (SolverSelector): Picks the solver of each input.
+        - self.level_store (StorageLevelStore): Optional storage level history.
+
+        Raises:
+        - ValueError: If lp_solver is not 'auto', 'highs', 'cbc' or 'glpk'.
         """
+        self.selector = selector or SolverSelector(lp_solver, use_dispatch)
         self.electrolyzer_service = electrolyzer_service
         self.storage_service = storage_service
+        self.use_dispatch = self.selector.use_dispatch
+        self.solver_pool = solver_pool or SolverPool()
+        self.result_cache = result_cache
+        self.model_templates = model_templates or ModelTemplateCache()
+        self.lp_solver = self.selector.lp_solver
+        self.power_supply_service = power_supply_service
+        self.level_store = level_store
+        if result_cache is not None:
+            electrolyzer_service.add_listener(partial(result_cache.invalidate, "electrolyzer"))
+            storage_service.add_listener(partial(result_cache.invalidate, "storage"))
+
+    def optimize(self, input: OptimizationInput, time_limit: float = None) -> OptimizationOutput:
+        """Optimize the hydrogen production schedule over the input's horizon to minimize electricity costs.
 
-    def optimize(self, input: OptimizationInput) -> OptimizationOutput:
-        """Optimize the 24-hour hydrogen production schedule to minimize electricity costs.
+        The in-process dispatch solver is used when it is enabled and all prices are
+        non-negative; any other input is solved as an LP with the solver picked by the
+        selector, or the one the input requests. Electrolyzers with a part-load curve,
+        minimum load or start-up cost use the part-load model (see _optimize_part_load).
+        Inputs whose demand cannot be met are rejected by an O(T) check before any model
+        is built; with an unmet_demand_penalty the demand may instead be left unmet at that
+        cost, in the same single solve. An omitted initial storage level is the latest one in
+        the storage's level history, and with a start_time the planned levels are recorded
+        there, so that chained plans start from the level the previous one left.
 
         Args:
         - input (OptimizationInput): Pydantic model containing optimization inputs
           (electrolyzer_id, storage_id, electricity_prices, hydrogen_demand).
+        - time_limit (float): Solver time limit (seconds); None means no limit.
 
         Returns:
         - OptimizationOutput: Pydantic model containing the optimized schedule
@@ -32,64 +104,493 @@ class OptimizationService:
         Variables:
         - electrolyzer (ElectrolyzerConfig): Configuration of the specified electrolyzer.
         - storage (StorageConfig): Configuration of the specified storage.
-        - T (int): Number of time periods (24 hours).
-        - P_max (float): Maximum power capacity of the electrolyzer (kW).
-        - S_min (float): Minimum storage level (0.0 kg).
-        - S_max (float): Maximum storage capacity (kg).
-        - S_0 (float): Initial storage level (0.0 kg).
-        - C_t (list[float]): Electricity prices for each hour (€/kWh).
-        - D_t (list[float]): Hydrogen demand for each hour (kg).
-        - eta (float): Electrolyzer efficiency (kg H₂/kWh).
-        - model (LpProblem): PuLP linear programming model for optimization.
-        - P_t (list[LpVariable]): Power input variables for each hour (kW).
-        - H_t (list[LpVariable]): Hydrogen production variables for each hour (kg).
-        - S_t (list[LpVariable]): Storage level variables for each hour (kg).
-        - power_schedule (list[float]): Optimized power inputs for each hour.
-        - hydrogen_produced (list[float]): Optimized hydrogen production for each hour.
-        - storage_levels (list[float]): Optimized storage levels for each hour.
-        - total_cost (float): Total electricity cost for the schedule (€).
 
         Raises:
-        - ValueError: If the optimization fails (e.g., infeasible problem) or if
-          electrolyzer_id/storage_id is not found.
+        - InfeasibleScheduleError: If the demand cannot be met, naming the first violating step.
+        - ValueError: If the optimization fails, if electrolyzer_id/storage_id/a power supply
+          is not found or if the requested solver is unavailable or does not support the input.
+        """
+        with stage("lookup"):
+            electrolyzer = self.electrolyzer_service.get_config(input.electrolyzer_id)
+            storage = self.storage_service.get_config(input.storage_id)
+            supply = self.available_power(input)
+            input = self.resolve_initial_level(input, storage)
+        with stage("cache"):
+            key, cached = self._cache_get(input, electrolyzer, storage, supply)
+        if cached is not None:
+            self.record_plan(input, cached)
+            return cached
+        path = self.solver_path(input, supply, electrolyzer)
+        try:
+            result = self.solve(input, electrolyzer, storage, time_limit, supply)
+        except ValueError:
+            SOLVER_RESULTS.inc(path, "failed")
+            raise
+        SOLVER_RESULTS.inc(path, "optimal")
+        self._cache_put(key, input, result)
+        self.record_plan(input, result)
+        return result
+
+    async def optimize_async(self, input: OptimizationInput) -> OptimizationOutput:
+        """Optimize the schedule on the solver pool without blocking the event loop.
+
+        Config lookups happen on the calling thread; only the solve itself is handed to the pool.
+
+        Args:
+        - input (OptimizationInput): Pydantic model containing optimization inputs.
+
+        Returns:
+        - OptimizationOutput: Pydantic model containing the optimized schedule.
+
+        Raises:
+        - ValueError: If the optimization fails or electrolyzer_id/storage_id is not found.
+        - SolverPoolFullError: If the solver pool queue is full.
+        - SolverTimeoutError: If the solve exceeds its time limit.
+        """
+        with stage("lookup"):
+            electrolyzer = self.electrolyzer_service.get_config(input.electrolyzer_id)
+            storage = self.storage_service.get_config(input.storage_id)
+            supply = self.available_power(input)
+        return await self._solve_on_pool(input, electrolyzer, storage, supply)
+
+    async def optimize_batch(self, items: list):
+        """Optimize a batch of schedules in parallel, yielding each result as soon as it finishes.
+
+        Electrolyzer and storage configs are looked up once per distinct ID and shared by all
+        items. Invalid items, unknown IDs and failed solves are reported in the item's result
+        instead of aborting the batch. At most max_workers items are in flight at once, so a
+        batch never fills the solver queue on its own.
+
+        Args:
+        - items (list): Raw optimization inputs (dicts or OptimizationInput models).
+
+        Yields:
+        - BatchOptimizationResult: Result or error for one item, in completion order.
+
+        Variables:
+        - electrolyzers (dict): Config (or lookup error) per electrolyzer ID.
+        - storages (dict): Config (or lookup error) per storage ID.
+        - slots (asyncio.Semaphore): Limits the number of items submitted to the solver pool.
+        - tasks (list[asyncio.Task]): One task per batch item.
+        """
+        electrolyzers = {}
+        storages = {}
+        slots = asyncio.Semaphore(self.solver_pool.max_workers)
+
+        def lookup(cache: dict, get_config, key: str):
+            if key not in cache:
+                try:
+                    cache[key] = get_config(key)
+                except ValueError as e:
+                    cache[key] = e
+            if isinstance(cache[key], Exception):
+                raise cache[key]
+            return cache[key]
+
+        async def run_item(index: int, item) -> BatchOptimizationResult:
+            try:
+                input = OptimizationInput.model_validate(item)
+                electrolyzer = lookup(electrolyzers, self.electrolyzer_service.get_config, input.electrolyzer_id)
+                storage = lookup(storages, self.storage_service.get_config, input.storage_id)
+                supply = self.available_power(input)
+                async with slots:
+                    result = await self._solve_on_pool(input, electrolyzer, storage, supply)
+                return BatchOptimizationResult(index=index, result=result)
+            except ValidationError as e:
+                return BatchOptimizationResult(index=index, error=f"Invalid input: {e.errors()[0]['msg']}")
+            except (ValueError, HydrogenFactoryException) as e:
+                return BatchOptimizationResult(index=index, error=str(e))
+
+        tasks = [asyncio.ensure_future(run_item(index, item)) for index, item in enumerate(items)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _solve_on_pool(self, input: OptimizationInput, electrolyzer: ElectrolyzerConfig,
+                             storage: StorageConfig, supply: tuple = None) -> OptimizationOutput:
+        """Run solve() on the solver pool with the request's time limit, or the pool default.
+
+        The outcome is counted in hf_solver_results_total by solver path: optimal, failed,
+        timeout or rejected (queue full).
+        """
+        input = self.resolve_initial_level(input, storage)
+        with stage("cache"):
+            key, cached = self._cache_get(input, electrolyzer, storage, supply)
+        if cached is not None:
+            self.record_plan(input, cached)
+            return cached
+        time_limit = input.time_limit if input.time_limit is not None else self.solver_pool.time_limit
+        path = self.solver_path(input, supply, electrolyzer)
+        try:
+            # Rejected before the pool, so infeasible inputs never wait for a solver slot.
+            self.check_feasibility(input, electrolyzer, storage, supply)
+            with stage("pool"):
+                result = await self.solver_pool.run(self._solver_fn(), input, electrolyzer, storage, time_limit,
+                                                    supply, time_limit=time_limit + SOLVER_GRACE_SECONDS)
+        except ValueError:
+            SOLVER_RESULTS.inc(path, "failed")
+            raise
+        except SolverTimeoutError:
+            SOLVER_RESULTS.inc(path, "timeout")
+            raise
+        except SolverPoolFullError:
+            SOLVER_RESULTS.inc(path, "rejected")
+            raise
+        SOLVER_RESULTS.inc(path, "optimal")
+        self._cache_put(key, input, result)
+        self.record_plan(input, result)
+        return result
+
+    def available_power(self, input: OptimizationInput):
+        """Return the renewable and grid power available per time step, or None without power supplies.
+
+        Raises:
+        - ValueError: If a power supply is not found or no PowerSupplyService is configured.
+        """
+        if not input.power_supply_ids:
+            return None
+        if self.power_supply_service is None:
+            raise ValueError("Power supplies are not available")
+        return self.power_supply_service.available_power(
+            input.power_supply_ids, input.horizon, input.time_step_hours, input.start_hour
+        )
+
+    def resolve_initial_level(self, input: OptimizationInput, storage: StorageConfig) -> OptimizationInput:
+        """Return the input with its initial storage level filled in, if it was omitted.
+
+        The level is the latest one in the storage's level history at start_time (or now),
+        measured or planned, clipped to the storage capacity; 0 without a history.
+        """
+        if input.initial_storage_level is not None:
+            return input
+        latest = None
+        if self.level_store is not None:
+            at = time.time() if input.start_time is None else input.start_time
+            latest = self.level_store.latest(input.storage_id, at)
+        level = 0.0 if latest is None else min(max(latest[1], 0.0), storage.max_capacity)
+        return input.model_copy(update={"initial_storage_level": level})
+
+    def record_plan(self, input: OptimizationInput, result: OptimizationOutput):
+        """Record the planned storage levels at the end of each time step, for inputs with a start_time.
+
+        Raises:
+        - ValueError: If writing the level history fails.
+        """
+        if self.level_store is None or input.start_time is None:
+            return
+        with stage("levels"):
+            times = input.start_time + np.arange(1, input.horizon + 1) * (input.time_step_hours * 3600.0)
+            try:
+                self.level_store.record(input.storage_id, "planned", times, result.columns()["storage_levels"])
+            except OSError as e:
+                raise ValueError(f"Failed to record storage levels: {str(e)}")
+
+    def check_feasibility(self, input: OptimizationInput, electrolyzer: ElectrolyzerConfig, storage: StorageConfig,
+                          supply: tuple = None):
+        """Reject inputs whose demand cannot be met before any model is built (see feasibility.check_feasibility).
+
+        With an unmet_demand_penalty only the storage capacity is checked, since unmet demand is allowed.
+
+        Raises:
+        - InfeasibleScheduleError: With the first violating step and the violated constraint.
         """
-        electrolyzer = self.electrolyzer_service.get_config(input.electrolyzer_id)
-        storage = self.storage_service.get_config(input.storage_id)
+        with stage("check"):
+            check_feasibility(
+                input.hydrogen_demand,
+                production_limits(electrolyzer, input.horizon, input.time_step_hours, supply),
+                storage.max_capacity,
+                S_0=input.initial_storage_level,
+                dt=input.time_step_hours,
+                shortage=input.unmet_demand_penalty is None,
+            )
+
+    def _cache_get(self, input: OptimizationInput, electrolyzer: ElectrolyzerConfig, storage: StorageConfig,
+                   supply: tuple = None):
+        """Return (key, cached result); both are None when caching is disabled."""
+        if self.result_cache is None:
+            return None, None
+        key = ResultCache.make_key(input, electrolyzer, storage, supply)
+        return key, self.result_cache.get(key)
+
+    def _cache_put(self, key: str, input: OptimizationInput, result: OptimizationOutput):
+        if key is not None:
+            self.result_cache.put(key, result, input.electrolyzer_id, input.storage_id)
+
+    def solve(self, input: OptimizationInput, electrolyzer: ElectrolyzerConfig, storage: StorageConfig,
+              time_limit: float = None, supply: tuple = None) -> OptimizationOutput:
+        """Optimize the schedule for already resolved electrolyzer and storage configs.
+
+        An omitted initial storage level is 0 here; optimize() and optimize_async() take it from
+        the level history first (see resolve_initial_level).
+
+        Args:
+        - input (OptimizationInput): Pydantic model containing optimization inputs.
+        - electrolyzer (ElectrolyzerConfig): Configuration of the specified electrolyzer.
+        - storage (StorageConfig): Configuration of the specified storage.
+        - time_limit (float): Solver time limit (seconds); None means no limit.
+        - supply (tuple[np.ndarray, np.ndarray]): Free renewable and priced grid power available per
+          time step (kW), as returned by available_power; None means unlimited grid power.
 
-        T = 24
-        P_max = electrolyzer.capacity
-        S_min = 0.0
-        S_max = storage.max_capacity
-        S_0 = 0.0
-        C_t = input.electricity_prices
-        D_t = input.hydrogen_demand
-        eta = electrolyzer.efficiency
+        Returns:
+        - OptimizationOutput: Pydantic model containing the optimized schedule.
 
-        model = LpProblem("Hydrogen_Optimization", LpMinimize)
+        Raises:
+        - InfeasibleScheduleError: If the demand cannot be met (see check_feasibility).
+        - ValueError: If the optimization fails.
+        """
+        if input.initial_storage_level is None:
+            input = input.model_copy(update={"initial_storage_level": 0.0})
+        self.check_feasibility(input, electrolyzer, storage, supply)
+        path = self.solver_path(input, supply, electrolyzer)
+        if path == "dispatch":
+            return self._optimize_dispatch(input, electrolyzer, storage, supply)
+        backend = get_backend(path)
+        if electrolyzer.part_load:
+            return self._optimize_part_load(input, electrolyzer, storage, supply, time_limit, backend)
+        if supply is not None:
+            return self._optimize_supplied(input, electrolyzer, storage, supply, time_limit, backend)
+        if backend.in_process or input.unmet_demand_penalty is not None:
+            return self._optimize_matrix(input, electrolyzer, storage, time_limit, backend)
+        return self._optimize_template(input, electrolyzer, storage, time_limit, backend)
 
-        P_t = [LpVariable(f"P_{t}", 0, P_max) for t in range(T)]
-        H_t = [LpVariable(f"H_{t}", 0) for t in range(T)]
-        S_t = [LpVariable(f"S_{t}", S_min, S_max) for t in range(T)]
+    def solver_path(self, input: OptimizationInput, supply: tuple = None,
+                    electrolyzer: ElectrolyzerConfig = None) -> str:
+        """Return the solver solve() uses for the input: 'dispatch' or a backend name ('highs', 'cbc', 'glpk').
 
-        model += lpSum(C_t[t] * P_t[t] for t in range(T))
+        Raises:
+        - ValueError: If the input requests a solver that is unavailable or does not support it.
+        """
+        part_load = electrolyzer is not None and electrolyzer.part_load
+        return self.selector.select(
+            input.horizon,
+            integer=part_load,
+            dispatch_fits=not part_load and dispatch_fits(input.electricity_prices),
+            override=input.solver,
+        )
 
-        for t in range(T):
-            model += H_t[t] == eta * P_t[t]
-            model += S_t[t] == (S_0 if t == 0 else S_t[t-1]) + H_t[t] - D_t[t]
+    def _solver_fn(self):
+        """Return the callable the solver pool runs; worker processes get a picklable module function."""
+        if self.solver_pool.use_processes:
+            return partial(_solve_in_worker, self.selector)
+        return self.solve
+
+    def _optimize_dispatch(self, input: OptimizationInput, electrolyzer: ElectrolyzerConfig,
+                           storage: StorageConfig, supply: tuple = None) -> OptimizationOutput:
+        """Optimize the schedule in-process with the merit-order dispatch solver.
+
+        With power supplies, free renewable power and priced grid power are two dispatch sources per
+        step; the renewable power is always used first, so the grid covers the remainder.
+
+        Args:
+        - input (OptimizationInput): Optimization inputs with non-negative electricity prices.
+        - electrolyzer (ElectrolyzerConfig): Configuration of the specified electrolyzer.
+        - storage (StorageConfig): Configuration of the specified storage.
+        - supply (tuple[np.ndarray, np.ndarray]): Renewable and grid power available per time step, or None.
+
+        Returns:
+        - OptimizationOutput: The optimized schedule.
+
+        Raises:
+        - ValueError: If the demand cannot be met (infeasible problem).
+        """
+        with stage("solve"):
+            power_schedule, hydrogen_produced, storage_levels = solve_dispatch(
+                input.electricity_prices,
+                input.hydrogen_demand,
+                electrolyzer.capacity,
+                electrolyzer.efficiency,
+                storage.max_capacity,
+                S_0=input.initial_storage_level,
+                dt=input.time_step_hours,
+                renewable=None if supply is None else supply[0],
+                grid_limit=None if supply is None else supply[1],
+                unmet_penalty=input.unmet_demand_penalty,
+            )
+        grid_power = None if supply is None else np.maximum(power_schedule - supply[0], 0.0)
+        return self._output(input, power_schedule, hydrogen_produced, storage_levels, grid_power)
+
+    def _optimize_supplied(self, input: OptimizationInput, electrolyzer: ElectrolyzerConfig,
+                           storage: StorageConfig, supply: tuple, time_limit: float = None,
+                           backend: SolverBackend = HIGHS) -> OptimizationOutput:
+        """Optimize a schedule fed by power supplies as a matrix-form LP.
+
+        Args:
+        - input (OptimizationInput): Optimization inputs.
+        - electrolyzer (ElectrolyzerConfig): Configuration of the specified electrolyzer.
+        - storage (StorageConfig): Configuration of the specified storage.
+        - supply (tuple[np.ndarray, np.ndarray]): Renewable and grid power available per time step.
+        - time_limit (float): Solver time limit (seconds); None means no limit.
+        - backend (SolverBackend): Solver for the LP.
+
+        Returns:
+        - OptimizationOutput: The optimized schedule, including the grid power drawn.
+
+        Raises:
+        - ValueError: If the optimization fails (e.g., infeasible problem).
+        """
+        power_schedule, hydrogen_produced, storage_levels, grid_power = solve_supplied_schedule_lp(
+            input.electricity_prices,
+            input.hydrogen_demand,
+            electrolyzer.capacity,
+            electrolyzer.efficiency,
+            storage.max_capacity,
+            supply[0],
+            supply[1],
+            S_0=input.initial_storage_level,
+            dt=input.time_step_hours,
+            time_limit=time_limit,
+            backend=backend,
+            unmet_penalty=input.unmet_demand_penalty,
+        )
+        return self._output(input, power_schedule, hydrogen_produced, storage_levels, grid_power)
+
+    def _output(self, input: OptimizationInput, power_schedule, hydrogen_produced, storage_levels,
+                grid_power=None, starts: int = None, startup_cost: float = None) -> OptimizationOutput:
+        """Build the output; only grid power is paid for when it is given, otherwise all power is."""
+        with stage("extract"):
+            paid = power_schedule if grid_power is None else grid_power
+            unmet = None
+            if input.unmet_demand_penalty is not None:
+                unmet = unmet_demand(input.hydrogen_demand, hydrogen_produced, storage_levels,
+                                     input.initial_storage_level)
+            return OptimizationOutput(
+                power_schedule=power_schedule.tolist(),
+                hydrogen_produced=hydrogen_produced.tolist(),
+                storage_levels=storage_levels.tolist(),
+                total_cost=float(np.dot(input.electricity_prices, paid)) * input.time_step_hours,
+                grid_power=None if grid_power is None else grid_power.tolist(),
+                starts=starts,
+                startup_cost=startup_cost,
+                unmet_demand=None if unmet is None else unmet.tolist(),
+            ).attach_columns(
+                power_schedule=power_schedule,
+                hydrogen_produced=hydrogen_produced,
+                storage_levels=storage_levels,
+                grid_power=grid_power,
+                unmet_demand=unmet,
+            )
+
+    def _optimize_part_load(self, input: OptimizationInput, electrolyzer: ElectrolyzerConfig,
+                            storage: StorageConfig, supply: tuple = None, time_limit: float = None,
+                            backend: SolverBackend = HIGHS) -> OptimizationOutput:
+        """Optimize the schedule of an electrolyzer with a part-load curve, minimum load or start-up cost.
+
+        The model is solved as an LP and only becomes a MILP when the LP solution does not
+        already respect the curve and the on/off decisions (see solve_part_load_schedule), so concave
+        curves without a minimum load cost about as much as the constant-efficiency LP.
+
+        Args:
+        - input (OptimizationInput): Optimization inputs; mip_gap applies to the MILP.
+        - electrolyzer (ElectrolyzerConfig): Configuration of the specified electrolyzer.
+        - storage (StorageConfig): Configuration of the specified storage.
+        - supply (tuple[np.ndarray, np.ndarray]): Renewable and grid power available per time step, or None.
+        - time_limit (float): Solver time limit (seconds); None means no limit.
+        - backend (SolverBackend): Solver for the LP and the MILP.
+
+        Returns:
+        - OptimizationOutput: The optimized schedule, with the start-ups and their cost.
+
+        Raises:
+        - ValueError: If the optimization fails (e.g., infeasible problem).
+        """
+        power_schedule, hydrogen_produced, storage_levels, grid_power, starts = solve_part_load_schedule(
+            input.electricity_prices,
+            input.hydrogen_demand,
+            electrolyzer,
+            storage.max_capacity,
+            S_0=input.initial_storage_level,
+            dt=input.time_step_hours,
+            supply=supply,
+            time_limit=time_limit,
+            mip_gap=input.mip_gap,
+            backend=backend,
+            unmet_penalty=input.unmet_demand_penalty,
+        )
+        return self._output(input, power_schedule, hydrogen_produced, storage_levels, grid_power,
+                            starts=starts, startup_cost=starts * electrolyzer.startup_cost)
+
+    def _optimize_matrix(self, input: OptimizationInput, electrolyzer: ElectrolyzerConfig,
+                         storage: StorageConfig, time_limit: float = None,
+                         backend: SolverBackend = HIGHS) -> OptimizationOutput:
+        """Optimize the schedule as a matrix-form LP, by default solved in-process by HiGHS.
+
+        Args:
+        - input (OptimizationInput): Optimization inputs.
+        - electrolyzer (ElectrolyzerConfig): Configuration of the specified electrolyzer.
+        - storage (StorageConfig): Configuration of the specified storage.
+        - time_limit (float): Solver time limit (seconds); None means no limit.
+        - backend (SolverBackend): Solver for the LP.
+
+        Returns:
+        - OptimizationOutput: The optimized schedule.
+
+        Raises:
+        - ValueError: If the optimization fails (e.g., infeasible problem).
+        """
+        power_schedule, hydrogen_produced, storage_levels = solve_schedule_lp(
+            input.electricity_prices,
+            input.hydrogen_demand,
+            electrolyzer.capacity,
+            electrolyzer.efficiency,
+            storage.max_capacity,
+            S_0=input.initial_storage_level,
+            dt=input.time_step_hours,
+            time_limit=time_limit,
+            backend=backend,
+            unmet_penalty=input.unmet_demand_penalty,
+        )
+        return self._output(input, power_schedule, hydrogen_produced, storage_levels)
+
+    def _optimize_template(self, input: OptimizationInput, electrolyzer: ElectrolyzerConfig,
+                           storage: StorageConfig, time_limit: float = None,
+                           backend: SolverBackend = None) -> OptimizationOutput:
+        """Optimize the schedule with a subprocess solver (CBC unless given another) on a reusable PuLP model template.
+
+        Args:
+        - input (OptimizationInput): Optimization inputs.
+        - electrolyzer (ElectrolyzerConfig): Configuration of the specified electrolyzer.
+        - storage (StorageConfig): Configuration of the specified storage.
+        - time_limit (float): Solver time limit (seconds); None means no limit.
+        - backend (SolverBackend): PuLP-driven solver; None means CBC.
+
+        Returns:
+        - OptimizationOutput: The optimized schedule.
+
+        Variables:
+        - power_schedule (np.ndarray): Optimized power input for each time step (kW).
+        - hydrogen_produced (np.ndarray): Optimized hydrogen production for each time step (kg).
+        - storage_levels (np.ndarray): Optimized storage level for each time step (kg).
+
+        Raises:
+        - ValueError: If the optimization fails (e.g., infeasible problem).
+        """
+        power_schedule, hydrogen_produced, storage_levels = self.model_templates.solve(
+            electrolyzer.capacity,
+            electrolyzer.efficiency,
+            storage.max_capacity,
+            input.electricity_prices,
+            input.hydrogen_demand,
+            time_limit=time_limit,
+            S_0=input.initial_storage_level,
+            dt=input.time_step_hours,
+            mip_gap=input.mip_gap,
+            backend=backend,
+        )
+        return self._output(input, power_schedule, hydrogen_produced, storage_levels)
 
-        model.solve(PULP_CBC_CMD(msg=0))
 
-        if model.status != LpStatusOptimal:
-            raise ValueError("Optimization failed")
+def _solve_in_worker(selector: SolverSelector, input: OptimizationInput,
+                     electrolyzer: ElectrolyzerConfig, storage: StorageConfig,
+                     time_limit: float = None, supply: tuple = None) -> OptimizationOutput:
+    """Solve a schedule inside a solver pool worker process."""
+    service = OptimizationService(None, None, solver_pool=_WORKER_SOLVER_POOL,
+                                  model_templates=_WORKER_MODEL_TEMPLATES, selector=selector)
+    return service.solve(input, electrolyzer, storage, time_limit, supply)
 
-        power_schedule = [P_t[t].value() for t in range(T)]
-        hydrogen_produced = [H_t[t].value() for t in range(T)]
-        storage_levels = [S_t[t].value() for t in range(T)]
-        total_cost = sum(C_t[t] * P_t[t].value() for t in range(T))
 
-        return OptimizationOutput(
-            power_schedule=power_schedule,
-            hydrogen_produced=hydrogen_produced,
-            storage_levels=storage_levels,
-            total_cost=total_cost,
-        )
\ No newline at end of file
+# Worker processes keep their templates between solves.
+_WORKER_SOLVER_POOL = SolverPool(max_workers=1)
+_WORKER_MODEL_TEMPLATES = ModelTemplateCache()
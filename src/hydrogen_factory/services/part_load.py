@@ -0,0 +1,250 @@
+import numpy as np
+from hydrogen_factory.core.metrics import stage
+from hydrogen_factory.core.progress import report
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig
+from hydrogen_factory.services.solver_backends import HIGHS, SolverBackend
+
+# SciPy is imported inside the functions, as in matrix_lp.
+
+# Relative tolerance (of capacity) within which a relaxed solution counts as integral.
+INTEGRALITY_TOLERANCE = 1e-6
+
+
+def production_curve(electrolyzer: ElectrolyzerConfig) -> tuple[np.ndarray, np.ndarray]:
+    """Return the breakpoints of the hydrogen production rate over the operating range.
+
+    The rate is load * capacity * efficiency at every point of the electrolyzer's curve and is
+    interpolated linearly between them (and from zero at zero load). The operating range starts
+    at the minimum load, so the first breakpoint is the production rate at min_load (0 without one).
+
+    Args:
+    - electrolyzer (ElectrolyzerConfig): Electrolyzer with an optional curve and minimum load.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray]: Power (kW) and hydrogen production rate (kg/h) at each breakpoint.
+    """
+    loads, efficiencies = electrolyzer.curve()
+    power = np.concatenate([[0.0], np.asarray(loads) * electrolyzer.capacity])
+    rate = np.concatenate([[0.0], power[1:] * np.asarray(efficiencies)])
+    base = electrolyzer.min_load * electrolyzer.capacity
+    above = power > base
+    return np.concatenate([[base], power[above]]), np.concatenate([[np.interp(base, power, rate)], rate[above]])
+
+
+def hydrogen_rate(electrolyzer: ElectrolyzerConfig, power) -> np.ndarray:
+    """Return the hydrogen production rate (kg/h) at each given power (kW), following the part-load curve."""
+    loads, efficiencies = electrolyzer.curve()
+    points = np.concatenate([[0.0], np.asarray(loads) * electrolyzer.capacity])
+    rates = np.concatenate([[0.0], points[1:] * np.asarray(efficiencies)])
+    return np.interp(np.asarray(power, dtype=float), points, rates)
+
+
+def build_part_load_model(C_t: list[float], D_t: list[float], electrolyzer: ElectrolyzerConfig, S_max: float,
+                          S_0: float = 0.0, dt: float = 1.0, supply: tuple = None, integer: bool = False,
+                          unmet_penalty: float = None) -> dict:
+    """Assemble the schedule with a part-load curve, minimum load and start-up costs in matrix form.
+
+    Power is split into K segments of the production curve above the minimum load ("incremental"
+    formulation): P_t = base * u_t + sum_k d_kt with 0 <= d_kt <= w_k * u_t, and production is
+    H_t = rate(base) * u_t + sum_k slope_k * d_kt. The on/off variable u_t is only present with a
+    minimum load or a start-up cost; start-ups are y_t >= u_t - u_{t-1}, with the electrolyzer off
+    before the horizon. With integer=True, binaries z_kt make the segments fill in order
+    (d_kt >= w_k * z_kt and d_{k+1},t <= w_{k+1} * z_kt) and u_t is binary; this formulation's LP
+    relaxation is the convex hull of the curve, so the MILP stays tight.
+
+    Args:
+    - C_t (list[float]): Electricity prices for each time step (€/kWh).
+    - D_t (list[float]): Hydrogen demand for each time step (kg).
+    - electrolyzer (ElectrolyzerConfig): Electrolyzer with its curve, min_load and startup_cost.
+    - S_max (float): Maximum storage capacity (kg).
+    - S_0 (float): Initial storage level (kg).
+    - dt (float): Duration of one time step (h).
+    - supply (tuple[np.ndarray, np.ndarray]): Free renewable and priced grid power available per
+      time step (kW); adds grid variables G_t as in build_supplied_schedule_lp. None means all power is paid for.
+    - integer (bool): Build the MILP instead of its LP relaxation.
+    - unmet_penalty (float): Cost of unmet demand (€/kg); if given, adds unmet-demand variables U_t,
+      0 <= U_t <= D_t, as in add_unmet_demand.
+
+    Returns:
+    - dict: c, A_ub, b_ub, A_eq, b_eq, bounds (array of shape (n, 2)) and integrality (np.ndarray),
+      plus the column offsets of each variable block and the curve data needed to read the solution.
+    """
+    import scipy.sparse as sp
+    T = len(C_t)
+    power, rate = production_curve(electrolyzer)
+    widths = np.diff(power)
+    slopes = np.diff(rate) / widths
+    K = len(widths)
+    has_u = power[0] > 0 or electrolyzer.startup_cost > 0
+    has_y = electrolyzer.startup_cost > 0
+    has_z = integer and K > 1
+
+    offsets = {"d": 0}
+    n = K * T
+    for name, present, size in (("u", has_u, T), ("y", has_y, T), ("z", has_z, (K - 1) * T),
+                                ("S", True, T), ("G", supply is not None, T), ("U", unmet_penalty is not None, T)):
+        if present:
+            offsets[name] = n
+            n += size
+
+    def block(name: str, matrix, rows: int):
+        """Place matrix (rows x block width) in the columns of a variable block of a rows x n matrix."""
+        matrix = sp.csr_matrix(matrix)
+        parts = []
+        if offsets[name]:
+            parts.append(sp.csr_matrix((rows, offsets[name])))
+        parts.append(matrix)
+        if n - offsets[name] - matrix.shape[1]:
+            parts.append(sp.csr_matrix((rows, n - offsets[name] - matrix.shape[1])))
+        return sp.hstack(parts, format="csr")
+
+    identity = sp.identity(T, format="csr")
+    power_rows = block("d", sp.hstack([identity] * K), T)
+    production_rows = block("d", sp.hstack([slope * identity for slope in slopes]), T)
+    if has_u:
+        power_rows = power_rows + block("u", power[0] * identity, T)
+        production_rows = production_rows + block("u", rate[0] * identity, T)
+
+    prices = np.asarray(C_t, dtype=float) * dt
+    c = np.zeros(n)
+    if supply is None:
+        c += power_rows.T @ prices
+    else:
+        c[offsets["G"]:offsets["G"] + T] = prices
+    if has_y:
+        c[offsets["y"]:offsets["y"] + T] = electrolyzer.startup_cost
+    if unmet_penalty is not None:
+        c[offsets["U"]:] = unmet_penalty
+
+    A_eq = block("S", identity - sp.eye(T, k=-1, format="csr"), T) - dt * production_rows
+    if unmet_penalty is not None:
+        A_eq = A_eq - block("U", identity, T)
+    b_eq = -np.asarray(D_t, dtype=float)
+    b_eq[0] += S_0
+
+    A_ub, b_ub = [], []
+    if has_u:
+        for k in range(K):
+            A_ub.append(block("d", sp.hstack([identity if j == k else sp.csr_matrix((T, T)) for j in range(K)]), T)
+                        - block("u", widths[k] * identity, T))
+            b_ub.append(np.zeros(T))
+    if has_y:
+        A_ub.append(block("u", identity - sp.eye(T, k=-1, format="csr"), T) - block("y", identity, T))
+        b_ub.append(np.zeros(T))
+    if has_z:
+        for k in range(K - 1):
+            select = [sp.csr_matrix((T, T))] * K
+            filled = block("d", sp.hstack(select[:k] + [-identity] + select[k + 1:]), T)
+            following = block("d", sp.hstack(select[:k + 1] + [identity] + select[k + 2:]), T)
+            z_k = sp.hstack([sp.csr_matrix((T, k * T)), identity, sp.csr_matrix((T, (K - 2 - k) * T))])
+            A_ub.append(filled + block("z", widths[k] * z_k, T))
+            A_ub.append(following - block("z", widths[k + 1] * z_k, T))
+            b_ub.extend([np.zeros(T), np.zeros(T)])
+    if supply is not None:
+        grid = block("G", identity, T)
+        A_ub.extend([power_rows - grid, grid - power_rows])
+        b_ub.extend([np.asarray(supply[0], dtype=float), np.zeros(T)])
+
+    bounds = np.zeros((n, 2))
+    bounds[:K * T, 1] = np.repeat(widths, T)
+    for name, upper in (("u", 1.0), ("y", 1.0), ("z", 1.0), ("S", S_max)):
+        if name in offsets:
+            size = (K - 1) * T if name == "z" else T
+            bounds[offsets[name]:offsets[name] + size, 1] = upper
+    if supply is not None:
+        bounds[offsets["G"]:offsets["G"] + T, 1] = supply[1]
+    if unmet_penalty is not None:
+        bounds[offsets["U"]:, 1] = np.maximum(np.asarray(D_t, dtype=float), 0.0)
+    integrality = np.zeros(n)
+    if integer:
+        for name in ("u", "z"):
+            if name in offsets:
+                size = (K - 1) * T if name == "z" else T
+                integrality[offsets[name]:offsets[name] + size] = 1
+
+    return {
+        "c": c, "A_ub": sp.vstack(A_ub, format="csr") if A_ub else None,
+        "b_ub": np.concatenate(b_ub) if b_ub else None, "A_eq": A_eq, "b_eq": b_eq, "bounds": bounds,
+        "integrality": integrality, "offsets": offsets, "power_rows": power_rows,
+        "production_rows": production_rows, "widths": widths, "T": T, "K": K,
+    }
+
+
+def solve_part_load_schedule(C_t: list[float], D_t: list[float], electrolyzer: ElectrolyzerConfig, S_max: float,
+                             S_0: float = 0.0, dt: float = 1.0, supply: tuple = None, time_limit: float = None,
+                             mip_gap: float = None, backend: SolverBackend = HIGHS, unmet_penalty: float = None):
+    """Solve the part-load schedule, by default in-process with HiGHS, as an LP whenever that is exact.
+
+    The LP relaxation is solved first. If its solution already runs the electrolyzer fully on or
+    off in every step and fills the curve segments in order, it is feasible for the MILP and
+    therefore optimal; this is the usual outcome for concave curves without a minimum load, so
+    those stay as fast as the constant-efficiency LP. Otherwise the MILP is solved.
+
+    Args:
+    - C_t, D_t, electrolyzer, S_max, S_0, dt, supply, unmet_penalty: As in build_part_load_model.
+    - time_limit (float): Solver time limit per solve (seconds); None means no limit. A MILP stopped by
+      the limit returns its best solution.
+    - mip_gap (float): Relative MIP gap at which the solver stops; None uses the solver's default.
+    - backend (SolverBackend): Solver for the LP and the MILP.
+
+    Returns:
+    - tuple: Power schedule (kW), hydrogen produced (kg), storage levels (kg), grid power (kW, or None
+      without supply), each an np.ndarray per time step, and the number of start-ups (int).
+
+    Raises:
+    - ValueError: If the optimization fails (e.g., infeasible problem or time limit reached without a solution).
+    """
+    with stage("build"):
+        model = build_part_load_model(C_t, D_t, electrolyzer, S_max, S_0, dt, supply, unmet_penalty=unmet_penalty)
+    report("built", solver=backend.name, variables=len(model["c"]))
+    with stage("solve"):
+        x = backend.solve(model["c"], A_ub=model["A_ub"], b_ub=model["b_ub"], A_eq=model["A_eq"],
+                          b_eq=model["b_eq"], bounds=model["bounds"], time_limit=time_limit)
+    if not _exact(model, x, INTEGRALITY_TOLERANCE * electrolyzer.capacity):
+        model, x = _solve_milp(C_t, D_t, electrolyzer, S_max, S_0, dt, supply, time_limit, mip_gap, backend,
+                               unmet_penalty)
+    with stage("extract"):
+        return _solution(model, x, dt, supply is not None)
+
+
+def _solve_milp(C_t, D_t, electrolyzer, S_max, S_0, dt, supply, time_limit, mip_gap,
+                backend: SolverBackend, unmet_penalty: float = None) -> tuple[dict, np.ndarray]:
+    """Solve the MILP and return the model with its (best) solution."""
+    with stage("build"):
+        model = build_part_load_model(C_t, D_t, electrolyzer, S_max, S_0, dt, supply, integer=True,
+                                      unmet_penalty=unmet_penalty)
+    report("built", solver=f"{backend.name}-milp", variables=len(model["c"]),
+           integers=int(model["integrality"].sum()))
+    with stage("solve"):
+        x = backend.solve(model["c"], A_ub=model["A_ub"], b_ub=model["b_ub"], A_eq=model["A_eq"],
+                          b_eq=model["b_eq"], bounds=model["bounds"], integrality=model["integrality"],
+                          time_limit=time_limit, mip_gap=mip_gap)
+    return model, x
+
+
+def _exact(model: dict, x: np.ndarray, tolerance: float) -> bool:
+    """Whether a relaxed solution is on/off integral and fills the curve segments in order."""
+    T, K, offsets = model["T"], model["K"], model["offsets"]
+    if "u" in offsets:
+        u = x[offsets["u"]:offsets["u"] + T]
+        if np.any(np.minimum(u, 1.0 - u) > INTEGRALITY_TOLERANCE):
+            return False
+    d = x[:K * T].reshape(K, T)
+    widths = model["widths"][:, None]
+    return bool(np.all((d[1:] <= tolerance) | (d[:-1] >= widths[:-1] - tolerance)))
+
+
+def _solution(model: dict, x: np.ndarray, dt: float, supplied: bool):
+    T, offsets = model["T"], model["offsets"]
+    if "u" in offsets:
+        x = x.copy()
+        x[offsets["u"]:offsets["u"] + T] = np.round(x[offsets["u"]:offsets["u"] + T])
+    power_schedule = np.maximum(model["power_rows"] @ x, 0.0)
+    hydrogen_produced = np.maximum(model["production_rows"] @ x, 0.0) * dt
+    storage_levels = x[offsets["S"]:offsets["S"] + T]
+    grid_power = x[offsets["G"]:offsets["G"] + T] if supplied else None
+    starts = 0
+    if "u" in offsets:
+        on = x[offsets["u"]:offsets["u"] + T] > 0.5
+        starts = int(on[0]) + int(np.count_nonzero(on[1:] & ~on[:-1]))
+    return power_schedule, hydrogen_produced, storage_levels, grid_power, starts
@@ -0,0 +1,185 @@
+import threading
+import numpy as np
+from hydrogen_factory.models.power_supply import PowerSupplyConfig, PowerSupplyType
+from hydrogen_factory.services.config_repository import ConfigRepository
+
+HOURS_PER_DAY = 24
+
+class PowerSupplyService:
+    def __init__(self, repository: ConfigRepository = None):
+        """Initialize the PowerSupplyService on top of the shared configuration repository.
+
+        Args:
+        - repository (ConfigRepository): Store shared with the other asset services (a ConfigRepository
+          or SqliteConfigRepository). If omitted, a repository on 'config.json' is created and
+          recovered for this service alone.
+
+        Variables:
+        - self.config_file (str): Path to the JSON configuration file ('config.json').
+        - self.repository (ConfigRepository): Authoritative in-memory state backed by a write-ahead log.
+        - self.power_supplies (dict): Dictionary mapping supply IDs to their configuration data.
+        - self.profiles (dict): Maps supply IDs to (type, packed float32 array of the available power
+          per hour of the day in kW), computed once per supply.
+        - self.profiles_lock (threading.Lock): Guards self.profiles.
+        - self.listeners (list): Callbacks invoked with the supply ID after a configuration change.
+
+        Raises:
+        - ValueError: If loading the configuration file fails (e.g., file corruption).
+        """
+        self.config_file = "config.json"
+        self.listeners = []
+        self.profiles = {}
+        self.profiles_lock = threading.Lock()
+        try:
+            self.repository = repository or ConfigRepository(self.config_file)
+            self.power_supplies = self.repository.section("power_supplies")
+        except Exception as e:
+            raise ValueError(f"Failed to initialize power supplies: {str(e)}")
+
+    def configure(self, config: PowerSupplyConfig):
+        """Configure a new power supply and log it to the configuration repository.
+
+        Args:
+        - config (PowerSupplyConfig): Pydantic model containing power supply configuration
+          (supply_id, type, capacity, availability).
+
+        Variables:
+        - config.supply_id (str): Unique identifier for the power supply.
+        - self.power_supplies (dict): Updated with the new power supply configuration.
+        - self.profiles (dict): Updated with the packed availability profile.
+
+        Raises:
+        - ValueError: If the supply_id already exists or writing the change fails.
+        """
+        with self.repository.lock:
+            if config.supply_id in self.power_supplies:
+                raise ValueError("Power Supply ID already exists")
+            try:
+                self.repository.put("power_supplies", config.supply_id, config.model_dump())
+            except Exception as e:
+                raise ValueError(f"Failed to save configuration: {str(e)}")
+        with self.profiles_lock:
+            self.profiles[config.supply_id] = _pack_profile(config)
+        for listener in self.listeners:
+            listener(config.supply_id)
+
+    def configure_bulk(self, configs: list[PowerSupplyConfig]):
+        """Configure many new power supplies with a single write to the configuration repository.
+
+        Either all power supplies are configured or none is.
+
+        Args:
+        - configs (list[PowerSupplyConfig]): Configurations to add.
+
+        Variables:
+        - ids (list[str]): IDs of the new power supplies, in request order.
+
+        Raises:
+        - ValueError: If an ID is repeated in the request or already exists, or writing the change fails.
+        """
+        ids = [config.supply_id for config in configs]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate Power Supply IDs in request")
+        with self.repository.lock:
+            existing = self.repository.existing_keys("power_supplies", ids)
+            if existing:
+                raise ValueError(f"Power Supply ID already exists: {existing[0]}")
+            try:
+                self.repository.put_many("power_supplies", [(config.supply_id, config.model_dump()) for config in configs])
+            except Exception as e:
+                raise ValueError(f"Failed to save configuration: {str(e)}")
+        with self.profiles_lock:
+            for config in configs:
+                self.profiles[config.supply_id] = _pack_profile(config)
+        for supply_id in ids:
+            for listener in self.listeners:
+                listener(supply_id)
+
+    def add_listener(self, listener):
+        """Register a callback invoked with the supply ID whenever a power supply is configured.
+
+        Args:
+        - listener (callable): Function taking the supply_id (str).
+        """
+        self.listeners.append(listener)
+
+    def get_config(self, supply_id: str) -> PowerSupplyConfig:
+        """Retrieve the configuration for a specific power supply by its ID.
+
+        Args:
+        - supply_id (str): Unique identifier of the power supply to retrieve.
+
+        Returns:
+        - PowerSupplyConfig: Pydantic model containing the power supply's configuration.
+
+        Raises:
+        - ValueError: If the supply_id is not found in the stored configurations.
+        """
+        if supply_id not in self.power_supplies:
+            raise ValueError("Power Supply ID not found")
+        return PowerSupplyConfig(**self.power_supplies[supply_id])
+
+    def get_profile(self, supply_id: str):
+        """Return the supply's type and its available power per hour of the day.
+
+        The profile is packed into a float32 array the first time it is needed (or when the supply
+        is configured) and reused afterwards, so optimizations never rebuild it from the stored lists.
+
+        Args:
+        - supply_id (str): Unique identifier of the power supply.
+
+        Returns:
+        - tuple[PowerSupplyType, np.ndarray]: Supply type and available power per hour (kW), shape (24,).
+
+        Raises:
+        - ValueError: If the supply_id is not found in the stored configurations.
+        """
+        profile = self.profiles.get(supply_id)
+        if profile is None:
+            profile = _pack_profile(self.get_config(supply_id))
+            with self.profiles_lock:
+                self.profiles[supply_id] = profile
+        return profile
+
+    def available_power(self, supply_ids: list[str], T: int, dt: float = 1.0, start_hour: float = 0.0):
+        """Return the renewable and grid power available in each time step of a horizon.
+
+        Profiles are summed per hour of the day first, and the sum is then averaged over each step,
+        with the horizon starting at start_hour and wrapping around midnight.
+
+        Args:
+        - supply_ids (list[str]): IDs of the power supplies feeding the electrolyzer.
+        - T (int): Number of time steps.
+        - dt (float): Duration of one time step (h).
+        - start_hour (float): Hour of the day at which the first time step starts.
+
+        Returns:
+        - tuple[np.ndarray, np.ndarray]: Free photovoltaic/wind power and grid power (kW) available
+          per time step. The grid power is zero if no GRID supply is listed.
+
+        Raises:
+        - ValueError: If a supply_id is not found in the stored configurations.
+        """
+        renewable = np.zeros(HOURS_PER_DAY)
+        grid = np.zeros(HOURS_PER_DAY)
+        for supply_id in dict.fromkeys(supply_ids):
+            type, profile = self.get_profile(supply_id)
+            if type == PowerSupplyType.GRID:
+                grid += profile
+            else:
+                renewable += profile
+        return _average_per_step(renewable, T, dt, start_hour), _average_per_step(grid, T, dt, start_hour)
+
+
+def _pack_profile(config: PowerSupplyConfig):
+    profile = np.asarray(config.availability, dtype=np.float32) * np.float32(config.capacity)
+    profile.flags.writeable = False
+    return PowerSupplyType(config.type), profile
+
+
+def _average_per_step(hourly: np.ndarray, T: int, dt: float, start_hour: float = 0.0) -> np.ndarray:
+    """Average an hourly power profile (repeated daily) over each time step of the horizon."""
+    energy = np.concatenate([[0.0], np.cumsum(hourly)])
+    days, hours = np.divmod(start_hour + np.arange(T + 1) * dt, HOURS_PER_DAY)
+    cumulative = days * energy[-1] + np.interp(hours, np.arange(HOURS_PER_DAY + 1), energy)
+    return np.diff(cumulative) / dt
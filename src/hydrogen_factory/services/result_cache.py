@@ -0,0 +1,170 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import OptimizationInput, OptimizationOutput
+
+class ResultCache:
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300.0,
+                 clock=time.monotonic):
+        """Initialize an LRU + TTL cache of optimization results.
+
+        Args:
+        - max_entries (int): Maximum number of cached results; 0 disables the cache.
+        - max_bytes (int): Maximum estimated memory used by cached results (bytes).
+        - ttl (float): Time after which an entry expires (seconds).
+        - clock (callable): Monotonic time source, replaceable in tests.
+
+        Variables:
+        - self.entries (OrderedDict): Maps key to (expires_at, size, asset_refs, output), least recently used first.
+        - self.assets (dict): Maps (kind, asset_id) to the set of keys whose result depends on that asset.
+        - self.size (int): Estimated memory of all cached results (bytes).
+        - self.hits, self.misses, self.evictions, self.expirations, self.invalidations (int): Counters.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.assets = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(input: OptimizationInput, electrolyzer: ElectrolyzerConfig, storage: StorageConfig,
+                 supply: tuple = None) -> str:
+        """Hash the resolved configs and the price/demand vectors into a cache key.
+
+        Args:
+        - input (OptimizationInput): Optimization inputs; the price and demand vectors, the time step, the
+          initial storage level, the MIP gap, a requested solver and the unmet-demand penalty are used.
+        - electrolyzer (ElectrolyzerConfig): Resolved electrolyzer configuration.
+        - storage (StorageConfig): Resolved storage configuration.
+        - supply (tuple[np.ndarray, np.ndarray]): Renewable and grid power available per time step, if any.
+
+        Returns:
+        - str: Hex digest identifying the problem.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(electrolyzer.model_dump_json().encode())
+        digest.update(storage.model_dump_json().encode())
+        digest.update(np.asarray(input.electricity_prices, dtype=np.float64).tobytes())
+        digest.update(b"|")
+        digest.update(np.asarray(input.hydrogen_demand, dtype=np.float64).tobytes())
+        digest.update(np.float64(input.time_step_hours).tobytes())
+        digest.update(np.float64(input.initial_storage_level).tobytes())
+        if input.mip_gap is not None:
+            digest.update(b"gap" + np.float64(input.mip_gap).tobytes())
+        if input.solver is not None:
+            digest.update(b"solver" + input.solver.encode())
+        if input.unmet_demand_penalty is not None:
+            digest.update(b"unmet" + np.float64(input.unmet_demand_penalty).tobytes())
+        if supply is not None:
+            for available in supply:
+                digest.update(b"|")
+                digest.update(np.asarray(available, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Return a copy of the cached result for key, or None if it is missing or expired.
+
+        Every caller gets its own copy, so changing a returned result does not change later hits.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return entry[3].model_copy(deep=True)
+
+    def put(self, key: str, output: OptimizationOutput, electrolyzer_id: str, storage_id: str):
+        """Cache a result and evict least recently used entries until the limits are met.
+
+        Args:
+        - key (str): Key from make_key().
+        - output (OptimizationOutput): Result to cache; a copy is stored, so the caller may keep changing it.
+        - electrolyzer_id (str): Electrolyzer the result depends on.
+        - storage_id (str): Storage the result depends on.
+        """
+        if self.max_entries <= 0:
+            return
+        size = self._estimate_size(output)
+        if size > self.max_bytes:
+            return
+        asset_refs = (("electrolyzer", electrolyzer_id), ("storage", storage_id))
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (self.clock() + self.ttl, size, asset_refs, output.model_copy(deep=True))
+            self.size += size
+            for ref in asset_refs:
+                self.assets.setdefault(ref, set()).add(key)
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate(self, kind: str, asset_id: str):
+        """Drop every cached result that depends on the given asset.
+
+        Args:
+        - kind (str): Asset kind ('electrolyzer' or 'storage').
+        - asset_id (str): ID of the asset whose configuration changed.
+        """
+        with self.lock:
+            for key in list(self.assets.get((kind, asset_id), ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        """Drop all cached results, keeping the counters."""
+        with self.lock:
+            self.entries.clear()
+            self.assets.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        """Return the cache counters and current occupancy."""
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: str):
+        _, size, asset_refs, _ = self.entries.pop(key)
+        self.size -= size
+        for ref in asset_refs:
+            keys = self.assets.get(ref)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.assets[ref]
+
+    @staticmethod
+    def _estimate_size(output: OptimizationOutput) -> int:
+        """Estimate the memory held by a result: list slots plus boxed floats, attached arrays and fixed overhead."""
+        floats = len(output.power_schedule) + len(output.hydrogen_produced) + len(output.storage_levels) + 1
+        return 32 * floats + output.attached_bytes() + 512
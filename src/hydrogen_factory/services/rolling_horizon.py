@@ -0,0 +1,181 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from hydrogen_factory.models.schedule import OptimizationInput, ReplanInput, ReplanOutput
+from hydrogen_factory.services.optimization_service import OptimizationService
+from hydrogen_factory.services.part_load import hydrogen_rate
+from hydrogen_factory.services.feasibility import unmet_demand
+
+LEVEL_TOLERANCE = 1e-6
+
+class RollingHorizonService:
+    def __init__(self, optimization_service: OptimizationService, max_plans: int = 1024):
+        """Initialize the receding-horizon planner on top of the OptimizationService.
+
+        Args:
+        - optimization_service (OptimizationService): Service that solves the (remaining) horizon.
+        - max_plans (int): Maximum number of (electrolyzer, storage) pairs whose last plan is kept.
+
+        Variables:
+        - self.optimization_service (OptimizationService): Solver for re-plans.
+        - self.plans (OrderedDict): Maps (electrolyzer_id, storage_id) to the last plan, least recently
+          used first. A plan is a dict of NumPy arrays (prices, demand, power, hydrogen, levels, grid) plus
+          the initial level, time step, start hour and power supply IDs it was made for.
+        - self.lock (threading.Lock): Guards self.plans.
+        """
+        self.optimization_service = optimization_service
+        self.max_plans = max_plans
+        self.plans = OrderedDict()
+        self.lock = threading.Lock()
+        if optimization_service.electrolyzer_service is not None:
+            optimization_service.electrolyzer_service.add_listener(lambda electrolyzer_id: self.reset(electrolyzer_id, None))
+        if optimization_service.storage_service is not None:
+            optimization_service.storage_service.add_listener(lambda storage_id: self.reset(None, storage_id))
+
+    async def replan(self, input: ReplanInput) -> ReplanOutput:
+        """Re-optimize the schedule of an electrolyzer/storage pair from its current state.
+
+        The previous plan of the pair is shifted forward by steps_executed. If the new forecasts,
+        time step, power supplies and current storage level all match the shifted plan, it is still
+        optimal (principle of optimality) and is returned without solving. Otherwise the first
+        frozen_steps keep the shifted plan's power, the storage level is rolled forward through them
+        from the current level, and only the remaining steps are solved.
+
+        Args:
+        - input (ReplanInput): Forecasts from now on, the current storage level (initial_storage_level;
+          the latest recorded level if omitted), the number of steps executed since the last plan and
+          the number of frozen steps.
+
+        Returns:
+        - ReplanOutput: The new plan for the whole horizon.
+
+        Variables:
+        - shifted (dict): Previous plan without its executed steps, or None if there is no usable plan.
+        - frozen (int): Number of leading steps fixed to the shifted plan.
+
+        Raises:
+        - ValueError: If the current storage level exceeds the storage's max_capacity, the
+          optimization fails, the frozen steps cannot meet the demand from the current storage
+          level, or electrolyzer_id/storage_id/a power supply is not found.
+        - SolverPoolFullError: If the solver pool queue is full.
+        - SolverTimeoutError: If the solve exceeds its time limit.
+        """
+        service = self.optimization_service
+        electrolyzer = service.electrolyzer_service.get_config(input.electrolyzer_id)
+        storage = service.storage_service.get_config(input.storage_id)
+        input = service.resolve_initial_level(input, storage)
+        if input.initial_storage_level > storage.max_capacity + LEVEL_TOLERANCE:
+            raise ValueError(
+                f"initial_storage_level {input.initial_storage_level:g} exceeds the storage's max_capacity "
+                f"{storage.max_capacity:g}"
+            )
+        key = (input.electrolyzer_id, input.storage_id)
+        with self.lock:
+            plan = self.plans.get(key)
+        shifted = self._shift(plan, input)
+        prices = np.asarray(input.electricity_prices, dtype=float)
+        demand = np.asarray(input.hydrogen_demand, dtype=float)
+
+        if shifted is not None and self._still_optimal(shifted, input, prices, demand):
+            power, hydrogen, levels, grid = shifted["power"], shifted["hydrogen"], shifted["levels"], shifted["grid"]
+            result = self._output(input, power, hydrogen, levels, grid, reused_plan=True, frozen=0)
+        else:
+            frozen = 0 if shifted is None else min(input.frozen_steps, len(shifted["power"]), input.horizon)
+            power = shifted["power"][:frozen] if frozen else np.zeros(0)
+            hydrogen = hydrogen_rate(electrolyzer, power) * input.time_step_hours
+            levels = input.initial_storage_level + np.cumsum(hydrogen - demand[:frozen])
+            if np.any(levels < -LEVEL_TOLERANCE) or np.any(levels > storage.max_capacity + LEVEL_TOLERANCE):
+                raise ValueError("Frozen steps cannot meet the demand from the current storage level")
+            levels = np.clip(levels, 0.0, storage.max_capacity)
+            supply = service.available_power(input)
+            grid = None if supply is None else np.maximum(power - supply[0][:frozen], 0.0)
+
+            if frozen < input.horizon:
+                remaining = OptimizationInput(**{
+                    **input.model_dump(include=set(OptimizationInput.model_fields)),
+                    "electricity_prices": input.electricity_prices[frozen:],
+                    "hydrogen_demand": input.hydrogen_demand[frozen:],
+                    "initial_storage_level": float(levels[-1]) if frozen else input.initial_storage_level,
+                    "start_hour": (input.start_hour + frozen * input.time_step_hours) % 24,
+                    "start_time": None if input.start_time is None
+                    else input.start_time + frozen * input.time_step_hours * 3600.0,
+                })
+                tail = await service.optimize_async(remaining)
+                power = np.concatenate([power, tail.power_schedule])
+                hydrogen = np.concatenate([hydrogen, tail.hydrogen_produced])
+                levels = np.concatenate([levels, tail.storage_levels])
+                if grid is not None:
+                    grid = np.concatenate([grid, tail.grid_power])
+            result = self._output(input, power, hydrogen, levels, grid, reused_plan=False, frozen=frozen)
+
+        with self.lock:
+            self.plans[key] = {
+                "prices": prices,
+                "demand": demand,
+                "power": np.asarray(result.power_schedule),
+                "hydrogen": np.asarray(result.hydrogen_produced),
+                "levels": np.asarray(result.storage_levels),
+                "grid": None if result.grid_power is None else np.asarray(result.grid_power),
+                "initial_level": input.initial_storage_level,
+                "time_step_hours": input.time_step_hours,
+                "start_hour": input.start_hour,
+                "power_supply_ids": list(input.power_supply_ids),
+            }
+            self.plans.move_to_end(key)
+            while len(self.plans) > self.max_plans:
+                self.plans.popitem(last=False)
+        return result
+
+    def reset(self, electrolyzer_id: str = None, storage_id: str = None):
+        """Drop the stored plans that involve the given electrolyzer or storage."""
+        with self.lock:
+            for key in [k for k in self.plans if k[0] == electrolyzer_id or k[1] == storage_id]:
+                del self.plans[key]
+
+    def _shift(self, plan: dict, input: ReplanInput):
+        """Return the plan without its first steps_executed steps, or None if it does not apply."""
+        if plan is None or plan["time_step_hours"] != input.time_step_hours:
+            return None
+        k = input.steps_executed
+        if k >= len(plan["power"]):
+            return None
+        shifted = {name: plan[name][k:] for name in ("prices", "demand", "power", "hydrogen", "levels")}
+        shifted["grid"] = None if plan["grid"] is None else plan["grid"][k:]
+        shifted["initial_level"] = plan["levels"][k - 1] if k else plan["initial_level"]
+        shifted["start_hour"] = (plan["start_hour"] + k * plan["time_step_hours"]) % 24
+        shifted["power_supply_ids"] = plan["power_supply_ids"]
+        return shifted
+
+    def _still_optimal(self, shifted: dict, input: ReplanInput, prices: np.ndarray, demand: np.ndarray) -> bool:
+        """Whether the shifted plan solves the new input exactly: same data, same end, same starting level.
+
+        The start hour only matters when power supplies are used, as it aligns their daily profiles.
+        """
+        return (
+            len(shifted["power"]) == input.horizon
+            and np.array_equal(shifted["prices"], prices)
+            and np.array_equal(shifted["demand"], demand)
+            and shifted["power_supply_ids"] == list(input.power_supply_ids)
+            and (not input.power_supply_ids or abs(shifted["start_hour"] - input.start_hour) <= LEVEL_TOLERANCE)
+            and abs(shifted["initial_level"] - input.initial_storage_level) <= LEVEL_TOLERANCE
+        )
+
+    def _output(self, input: ReplanInput, power, hydrogen, levels, grid, reused_plan: bool,
+                frozen: int) -> ReplanOutput:
+        power, hydrogen, levels = (np.asarray(series, dtype=float) for series in (power, hydrogen, levels))
+        grid = None if grid is None else np.asarray(grid, dtype=float)
+        paid = power if grid is None else grid
+        unmet = None
+        if input.unmet_demand_penalty is not None:
+            unmet = unmet_demand(input.hydrogen_demand, hydrogen, levels, input.initial_storage_level)
+        return ReplanOutput(
+            power_schedule=power.tolist(),
+            hydrogen_produced=hydrogen.tolist(),
+            storage_levels=levels.tolist(),
+            total_cost=float(np.dot(input.electricity_prices, paid)) * input.time_step_hours,
+            grid_power=None if grid is None else grid.tolist(),
+            reused_plan=reused_plan,
+            frozen_steps=frozen,
+            unmet_demand=None if unmet is None else unmet.tolist(),
+        ).attach_columns(power_schedule=power, hydrogen_produced=hydrogen, storage_levels=levels, grid_power=grid,
+                         unmet_demand=unmet)
@@ -0,0 +1,142 @@
+import asyncio
+import math
+import numpy as np
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import OptimizationInput, ScenarioInput, ScenarioOutput
+from hydrogen_factory.services.optimization_service import OptimizationService, SOLVER_GRACE_SECONDS
+
+class ScenarioService:
+    def __init__(self, optimization_service: OptimizationService, chunks_per_worker: int = 4):
+        """Initialize the Monte Carlo scenario evaluation on top of the OptimizationService.
+
+        Args:
+        - optimization_service (OptimizationService): Service whose solver pool and solve paths are used.
+        - chunks_per_worker (int): Number of scenario chunks submitted per pool worker; more chunks
+          balance uneven solve times, fewer keep the per-chunk overhead low.
+
+        Variables:
+        - self.optimization_service (OptimizationService): Solver for the individual scenarios.
+        - self.chunks_per_worker (int): Scenario chunks per pool worker.
+        """
+        self.optimization_service = optimization_service
+        self.chunks_per_worker = chunks_per_worker
+
+    async def evaluate(self, input: ScenarioInput) -> ScenarioOutput:
+        """Sample price/demand scenarios, solve each of them and summarize the cost and storage risk.
+
+        Scenarios are sampled at once as (scenarios, T) arrays and split into chunks that run in
+        parallel on the solver pool. Every scenario is solved on its own (perfect foresight per
+        scenario), so the quantiles describe the spread of the optimal cost under uncertainty.
+
+        Args:
+        - input (ScenarioInput): Assets, sampling parameters and reported quantiles.
+
+        Returns:
+        - ScenarioOutput: Expected cost and cost/storage-level quantiles over the feasible scenarios.
+
+        Variables:
+        - prices (np.ndarray): Sampled electricity prices, shape (scenarios, T).
+        - demand (np.ndarray): Sampled hydrogen demand, shape (scenarios, T).
+        - costs (np.ndarray): Total cost per scenario, NaN where the scenario is infeasible.
+        - levels (np.ndarray): Storage levels per scenario, shape (scenarios, T).
+        - slots (asyncio.Semaphore): Limits the chunks submitted to the solver pool at once, so an
+          evaluation never fills the solver queue on its own.
+
+        Raises:
+        - ValueError: If no scenario is feasible or electrolyzer_id/storage_id/a power supply is not found.
+        - SolverPoolFullError: If the solver pool queue is full.
+        - SolverTimeoutError: If a chunk exceeds its time limit.
+        """
+        service = self.optimization_service
+        electrolyzer = service.electrolyzer_service.get_config(input.electrolyzer_id)
+        storage = service.storage_service.get_config(input.storage_id)
+        supply = service.available_power(input)
+        prices, demand = sample_scenarios(input)
+
+        pool = service.solver_pool
+        time_limit = input.time_limit if input.time_limit is not None else pool.time_limit
+        size = math.ceil(input.scenarios / (pool.max_workers * self.chunks_per_worker))
+        base = OptimizationInput(
+            electrolyzer_id=input.electrolyzer_id,
+            storage_id=input.storage_id,
+            electricity_prices=[0.0],
+            hydrogen_demand=[0.0],
+            time_step_hours=input.time_step_hours,
+            initial_storage_level=input.initial_storage_level,
+            start_hour=input.start_hour,
+            power_supply_ids=input.power_supply_ids,
+        )
+        slots = asyncio.Semaphore(pool.max_workers)
+
+        async def run_chunk(lo: int):
+            async with slots:
+                return await pool.run(
+                    _solve_scenarios, service._solver_fn(), base, prices[lo:lo + size], demand[lo:lo + size],
+                    electrolyzer, storage, time_limit, supply,
+                    time_limit=time_limit * min(size, input.scenarios - lo) + SOLVER_GRACE_SECONDS,
+                )
+
+        chunks = await asyncio.gather(*(run_chunk(lo) for lo in range(0, input.scenarios, size)))
+        costs = np.concatenate([chunk[0] for chunk in chunks])
+        levels = np.concatenate([chunk[1] for chunk in chunks])
+
+        feasible = ~np.isnan(costs)
+        if not feasible.any():
+            raise ValueError("Optimization failed")
+        return ScenarioOutput(
+            scenarios=int(feasible.sum()),
+            infeasible=int((~feasible).sum()),
+            quantiles=input.quantiles,
+            expected_cost=float(costs[feasible].mean()),
+            cost_quantiles=np.quantile(costs[feasible], input.quantiles).tolist(),
+            storage_level_quantiles=np.quantile(levels[feasible], input.quantiles, axis=0).tolist(),
+        )
+
+
+def sample_scenarios(input: ScenarioInput):
+    """Draw all price and demand scenarios at once.
+
+    Forecasts are scattered by normal noise with the given relative volatility; without a forecast,
+    values are drawn uniformly from the given range, like the defaults of OptimizationInput. Demand
+    is clipped at zero; prices may turn negative.
+
+    Args:
+    - input (ScenarioInput): Sampling parameters.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray]: Prices (€/kWh) and demand (kg), each of shape (scenarios, T).
+    """
+    rng = np.random.default_rng(input.seed)
+    shape = (input.scenarios, input.horizon)
+    if input.electricity_prices is None:
+        prices = rng.uniform(input.price_min, input.price_max, shape)
+    else:
+        forecast = np.asarray(input.electricity_prices, dtype=float)
+        prices = forecast * (1.0 + input.price_volatility * rng.standard_normal(shape))
+    if input.hydrogen_demand is None:
+        demand = rng.uniform(input.demand_min, input.demand_max, shape)
+    else:
+        forecast = np.asarray(input.hydrogen_demand, dtype=float)
+        demand = np.maximum(forecast * (1.0 + input.demand_volatility * rng.standard_normal(shape)), 0.0)
+    return prices, demand
+
+
+def _solve_scenarios(solve, base: OptimizationInput, prices: np.ndarray, demand: np.ndarray,
+                     electrolyzer: ElectrolyzerConfig, storage: StorageConfig, time_limit: float = None,
+                     supply: tuple = None):
+    """Solve a chunk of scenarios in a solver pool worker; infeasible scenarios get a NaN cost."""
+    costs = np.full(len(prices), np.nan)
+    levels = np.zeros(prices.shape)
+    for i in range(len(prices)):
+        input = base.model_copy(update={
+            "electricity_prices": prices[i].tolist(),
+            "hydrogen_demand": demand[i].tolist(),
+        })
+        try:
+            result = solve(input, electrolyzer, storage, time_limit, supply)
+        except ValueError:
+            continue
+        costs[i] = result.total_cost
+        levels[i] = result.storage_levels
+    return costs, levels
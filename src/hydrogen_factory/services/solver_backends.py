@@ -0,0 +1,156 @@
+import numpy as np
+
+# SciPy and PuLP are imported when a backend first solves, so that importing the backends
+# costs nothing (see matrix_lp).
+
+class SolverBackend:
+    """Solver for linear and mixed-integer models in the matrix form built by matrix_lp and part_load.
+
+    Attributes:
+    - name (str): Name used by the selector, in metrics, progress events and per-request overrides.
+    - in_process (bool): Whether the solver runs in this process; otherwise every solve starts a subprocess.
+    """
+    name = None
+    in_process = True
+
+    def available(self) -> bool:
+        """Whether the solver can be used on this machine."""
+        return True
+
+    def solve(self, c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, bounds=None, integrality=None,
+              time_limit: float = None, mip_gap: float = None) -> np.ndarray:
+        """Minimize c @ x subject to A_ub @ x <= b_ub, A_eq @ x == b_eq and the variable bounds.
+
+        Args:
+        - c (np.ndarray): Cost vector.
+        - A_ub, A_eq (scipy.sparse matrix): Inequality and equality constraint matrices, or None.
+        - b_ub, b_eq (np.ndarray): Their right-hand sides, or None.
+        - bounds (np.ndarray): Lower and upper bound of each variable, shape (n, 2).
+        - integrality (np.ndarray): 1 for integer variables, 0 for continuous ones; None for an LP.
+        - time_limit (float): Time limit (seconds); None means no limit. A MILP stopped by the limit
+          returns its best solution.
+        - mip_gap (float): Relative MIP gap at which the solver stops; None uses the solver's default.
+
+        Returns:
+        - np.ndarray: The solution x.
+
+        Raises:
+        - ValueError: If no solution was found (e.g., infeasible problem or time limit reached).
+        """
+        raise NotImplementedError
+
+
+class HighsBackend(SolverBackend):
+    """HiGHS through scipy.optimize (linprog for LPs, milp for MILPs), in-process and without files."""
+    name = "highs"
+
+    def solve(self, c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, bounds=None, integrality=None,
+              time_limit: float = None, mip_gap: float = None) -> np.ndarray:
+        if integrality is None or not np.any(integrality):
+            from scipy.optimize import linprog
+            options = {"time_limit": time_limit} if time_limit is not None else {}
+            result = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method="highs",
+                             options=options)
+            if result.status != 0:
+                raise ValueError("Optimization failed")
+            return result.x
+
+        from scipy.optimize import Bounds, LinearConstraint, milp
+        constraints = []
+        if A_eq is not None:
+            constraints.append(LinearConstraint(A_eq, b_eq, b_eq))
+        if A_ub is not None:
+            constraints.append(LinearConstraint(A_ub, -np.inf, b_ub))
+        options = {}
+        if time_limit is not None:
+            options["time_limit"] = time_limit
+        if mip_gap is not None:
+            options["mip_rel_gap"] = mip_gap
+        result = milp(c, constraints=constraints, integrality=integrality,
+                      bounds=Bounds(bounds[:, 0], bounds[:, 1]), options=options)
+        if result.x is None or result.status not in (0, 1):
+            raise ValueError("Optimization failed")
+        return result.x
+
+
+class PulpBackend(SolverBackend):
+    """Solver run by PuLP as a command-line subprocess; the matrix model is rebuilt as a PuLP model."""
+    in_process = False
+
+    def command(self, time_limit: float = None, mip_gap: float = None, warm_start: bool = False):
+        """Return the PuLP solver object for one solve."""
+        raise NotImplementedError
+
+    def available(self) -> bool:
+        return bool(self.command().available())
+
+    def solve(self, c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, bounds=None, integrality=None,
+              time_limit: float = None, mip_gap: float = None) -> np.ndarray:
+        from pulp import (
+            LpAffineExpression, LpConstraint, LpConstraintEQ, LpConstraintLE, LpMinimize, LpProblem,
+            LpStatusOptimal, LpVariable,
+        )
+        integer = np.zeros(len(c), dtype=bool) if integrality is None else np.asarray(integrality, dtype=bool)
+        x = [
+            LpVariable(f"x_{i}", _finite(lower), _finite(upper), cat="Integer" if integer[i] else "Continuous")
+            for i, (lower, upper) in enumerate(bounds.tolist())
+        ]
+        model = LpProblem("model", LpMinimize)
+        model.setObjective(LpAffineExpression([(x[i], float(c[i])) for i in np.flatnonzero(c)]))
+        for prefix, matrix, rhs, sense in (("ub", A_ub, b_ub, LpConstraintLE), ("eq", A_eq, b_eq, LpConstraintEQ)):
+            if matrix is None:
+                continue
+            matrix = matrix.tocsr()
+            indptr, indices, data = matrix.indptr, matrix.indices, matrix.data.tolist()
+            for row, value in enumerate(np.asarray(rhs, dtype=float).tolist()):
+                start, end = indptr[row], indptr[row + 1]
+                if start == end:
+                    continue
+                expression = LpAffineExpression([(x[j], a) for j, a in zip(indices[start:end], data[start:end])])
+                model.addConstraint(LpConstraint(expression, sense, f"{prefix}_{row}", value))
+        model.solve(self.command(time_limit, mip_gap))
+        if model.status != LpStatusOptimal:
+            raise ValueError("Optimization failed")
+        return np.fromiter((v.varValue or 0.0 for v in x), dtype=float, count=len(x))
+
+
+class CbcBackend(PulpBackend):
+    """The CBC executable bundled with PuLP."""
+    name = "cbc"
+
+    def command(self, time_limit: float = None, mip_gap: float = None, warm_start: bool = False):
+        from pulp import PULP_CBC_CMD
+        return PULP_CBC_CMD(msg=0, timeLimit=time_limit, gapRel=mip_gap, warmStart=warm_start)
+
+
+class GlpkBackend(PulpBackend):
+    """GLPK's glpsol executable, if it is installed (not a Python dependency)."""
+    name = "glpk"
+
+    def command(self, time_limit: float = None, mip_gap: float = None, warm_start: bool = False):
+        from pulp import GLPK_CMD
+        options = ["--mipgap", str(mip_gap)] if mip_gap is not None else []
+        return GLPK_CMD(msg=0, timeLimit=time_limit, options=options)
+
+
+HIGHS = HighsBackend()
+BACKENDS = {backend.name: backend for backend in (HIGHS, CbcBackend(), GlpkBackend())}
+
+
+def get_backend(name: str) -> SolverBackend:
+    """Return the backend with the given name.
+
+    Raises:
+    - ValueError: If the name is unknown or the solver is not installed.
+    """
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown solver: {name}")
+    if not backend.available():
+        raise ValueError(f"Solver {name} is not available")
+    return backend
+
+
+def _finite(bound: float):
+    """PuLP bound for a variable bound: None for an infinite one."""
+    return bound if np.isfinite(bound) else None
@@ -0,0 +1,103 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import perf_counter
+from hydrogen_factory.core.exceptions import SolverPoolFullError, SolverTimeoutError
+from hydrogen_factory.core.metrics import record_stage
+
+class SolverPool:
+    def __init__(self, max_workers: int = None, max_queue: int = 32, time_limit: float = 30.0,
+                 use_processes: bool = False):
+        """Initialize a bounded pool that runs blocking solves off the event loop.
+
+        Args:
+        - max_workers (int): Number of solves running in parallel (defaults to the CPU count).
+        - max_queue (int): Number of solves allowed to wait for a free worker.
+        - time_limit (float): Default solver time limit per request (seconds).
+        - use_processes (bool): Run solves in worker processes instead of threads.
+
+        Variables:
+        - self.executor: Executor created on first use.
+        - self.pending (int): Solves submitted and not yet finished, running or queued.
+        - self.lock (threading.Lock): Guards self.pending, which is decremented from worker callbacks.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.time_limit = time_limit
+        self.use_processes = use_processes
+        self.executor = None
+        self.pending = 0
+        self.lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of solves waiting for a free worker."""
+        return max(0, self.pending - self.max_workers)
+
+    async def run(self, fn, *args, time_limit: float = None):
+        """Run fn(*args) on the pool and wait for its result without blocking the event loop.
+
+        Args:
+        - fn (callable): Blocking function to run; must be picklable when use_processes is set.
+        - *args: Positional arguments passed to fn.
+        - time_limit (float): Seconds to wait for the result; None waits indefinitely.
+
+        Returns:
+        - The return value of fn.
+
+        Variables:
+        - future (concurrent.futures.Future): Handle of the submitted solve.
+
+        Raises:
+        - SolverPoolFullError: If all workers are busy and the queue is full.
+        - SolverTimeoutError: If the result is not available within time_limit.
+        - Any exception raised by fn.
+        """
+        with self.lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                raise SolverPoolFullError("Solver queue is full, retry later")
+            self.pending += 1
+        try:
+            if self.use_processes:
+                future = self._get_executor().submit(fn, *args)
+            else:
+                # Threads run in a copy of the caller's context, so their stages reach its Server-Timing.
+                context = contextvars.copy_context()
+                future = self._get_executor().submit(context.run, _run_timed, perf_counter(), fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is only released once the worker is actually done, even if the caller timed out.
+        future.add_done_callback(lambda _: self._release())
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), time_limit)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise SolverTimeoutError(f"Solver did not finish within {time_limit} seconds")
+
+    def shutdown(self):
+        """Shut down the executor, cancelling solves that have not started yet."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def _get_executor(self):
+        """Return the executor, creating it on first use."""
+        if self.executor is None:
+            if self.use_processes:
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="solver")
+        return self.executor
+
+    def _release(self):
+        with self.lock:
+            self.pending -= 1
+
+
+def _run_timed(submitted: float, fn, *args):
+    """Record how long a solve waited for a worker thread ('queue' stage), then run it."""
+    record_stage("queue", perf_counter() - submitted)
+    return fn(*args)
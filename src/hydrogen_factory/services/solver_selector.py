@@ -0,0 +1,74 @@
+import json
+import os
+from hydrogen_factory.services.solver_backends import BACKENDS, get_backend
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(__file__), "solver_thresholds.json")
+LP_SOLVERS = ("auto",) + tuple(BACKENDS)
+
+class SolverSelector:
+    def __init__(self, lp_solver: str = "auto", use_dispatch: bool = True, thresholds: dict = None):
+        """Initialize the selector that picks a solver for each problem from its size and features.
+
+        The dispatch is preferred whenever it covers the problem. For anything else, 'auto' picks
+        HiGHS in-process unless the calibrated thresholds say that a subprocess solver is faster
+        for a problem of this class and size, so small problems never pay for starting a process.
+
+        Args:
+        - lp_solver (str): 'auto', or the name of a backend ('highs', 'cbc', 'glpk') to use for
+          every problem the dispatch does not cover.
+        - use_dispatch (bool): Prefer the merit-order dispatch whenever the input fits.
+        - thresholds (dict): Per problem class ('lp', 'milp', 'fleet'), {"solver": name, "min_size": n}:
+          from a size (time steps times assets) of n on, the named solver beats HiGHS; min_size null
+          means it never does. Defaults to solver_thresholds.json, written by
+          benchmarks/calibrate_solvers.py.
+
+        Raises:
+        - ValueError: If lp_solver is unknown.
+        """
+        if lp_solver not in LP_SOLVERS:
+            raise ValueError(f"Unknown LP solver: {lp_solver}")
+        self.lp_solver = lp_solver
+        self.use_dispatch = use_dispatch
+        self.thresholds = load_thresholds() if thresholds is None else thresholds
+
+    def select(self, horizon: int, assets: int = 1, integer: bool = False, dispatch_fits: bool = False,
+               override: str = None) -> str:
+        """Return the solver for a problem: 'dispatch' or a backend name.
+
+        Args:
+        - horizon (int): Number of time steps.
+        - assets (int): Number of (merged) electrolyzers in the model; more than one is a fleet.
+        - integer (bool): Whether the model may need integer variables (part-load electrolyzers).
+        - dispatch_fits (bool): Whether the merit-order dispatch solves the problem exactly.
+        - override (str): Solver requested for this problem, bypassing the selection.
+
+        Raises:
+        - ValueError: If the requested solver is unknown, not installed or does not cover the problem.
+        """
+        if override is not None:
+            if override == "dispatch":
+                if not dispatch_fits:
+                    raise ValueError("The dispatch solver does not support this input")
+                return override
+            get_backend(override)
+            return override
+        if self.use_dispatch and dispatch_fits:
+            return "dispatch"
+        if self.lp_solver != "auto":
+            return self.lp_solver
+        kind = "fleet" if assets > 1 else "milp" if integer else "lp"
+        rule = self.thresholds.get(kind) or {}
+        backend = BACKENDS.get(rule.get("solver"))
+        min_size = rule.get("min_size")
+        if backend is not None and min_size is not None and horizon * assets >= min_size and backend.available():
+            return backend.name
+        return "highs"
+
+
+def load_thresholds(path: str = DEFAULT_THRESHOLDS) -> dict:
+    """Read the calibrated selection thresholds; a missing file means HiGHS for everything."""
+    try:
+        with open(path) as f:
+            return json.load(f)["thresholds"]
+    except FileNotFoundError:
+        return {}
@@ -0,0 +1,158 @@
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from hydrogen_factory.core.metrics import CONFIG_IO_SECONDS, timer
+
+class SqliteSection(MutableMapping):
+    def __init__(self, repository: "SqliteConfigRepository", name: str):
+        """Dict-like view of one section of a SqliteConfigRepository.
+
+        Lookups go straight to the primary-key index, so nothing is loaded into memory up front.
+
+        Args:
+        - repository (SqliteConfigRepository): Repository holding the data.
+        - name (str): Section name, e.g. 'electrolyzers'.
+        """
+        self.repository = repository
+        self.name = name
+
+    def __getitem__(self, key: str) -> dict:
+        row = self.repository.fetchone(
+            "SELECT data FROM assets WHERE section = ? AND key = ?", (self.name, key)
+        )
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __contains__(self, key) -> bool:
+        return self.repository.fetchone(
+            "SELECT 1 FROM assets WHERE section = ? AND key = ?", (self.name, key)
+        ) is not None
+
+    def __setitem__(self, key: str, value: dict):
+        self.repository.put(self.name, key, value)
+
+    def __delitem__(self, key: str):
+        with self.repository.lock:
+            if self.repository.connection.execute(
+                "DELETE FROM assets WHERE section = ? AND key = ?", (self.name, key)
+            ).rowcount == 0:
+                raise KeyError(key)
+            self.repository.connection.commit()
+
+    def __iter__(self):
+        rows = self.repository.fetchall("SELECT key FROM assets WHERE section = ? ORDER BY key", (self.name,))
+        return (row[0] for row in rows)
+
+    def __len__(self) -> int:
+        return self.repository.fetchone("SELECT COUNT(*) FROM assets WHERE section = ?", (self.name,))[0]
+
+
+class SqliteConfigRepository:
+    def __init__(self, db_file: str = "config.db"):
+        """Initialize an SQLite-backed configuration store for large asset fleets.
+
+        Offers the same interface as ConfigRepository. Assets are rows keyed by (section, key)
+        with a secondary index on (section, type), so lookups by ID or electrolyzer type stay
+        fast at any fleet size, and bulk writes run in a single transaction.
+
+        Args:
+        - db_file (str): Path to the SQLite database file.
+
+        Variables:
+        - self.connection (sqlite3.Connection): Connection shared by all threads, guarded by self.lock.
+        - self.lock (threading.RLock): Serializes access to the connection.
+        """
+        self.db_file = db_file
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(db_file, check_same_thread=False)
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS assets ("
+                "section TEXT NOT NULL, key TEXT NOT NULL, type TEXT, data TEXT NOT NULL, "
+                "PRIMARY KEY (section, key)) WITHOUT ROWID"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS assets_type ON assets (section, type)")
+            self.connection.commit()
+
+    def fetchone(self, sql: str, params: tuple = ()):
+        """Run a read query and fetch its first row, both under the connection lock."""
+        with self.lock:
+            return self.connection.execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params: tuple = ()) -> list:
+        """Run a read query and fetch all its rows, both under the connection lock."""
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def section(self, name: str) -> SqliteSection:
+        """Return a dict-like view of a section."""
+        return SqliteSection(self, name)
+
+    def put(self, section: str, key: str, value: dict):
+        """Insert or replace one config.
+
+        Raises:
+        - sqlite3.Error: If the write fails.
+        """
+        self.put_many(section, [(key, value)])
+
+    def put_many(self, section: str, items: list):
+        """Insert or replace many configs in one transaction.
+
+        Args:
+        - section (str): Section name.
+        - items (list[tuple[str, dict]]): (asset ID, config data) pairs.
+
+        Raises:
+        - sqlite3.Error: If the write fails; no item of the batch is stored.
+        """
+        rows = [(section, key, _type_value(value.get("type")), json.dumps(value)) for key, value in items]
+        with self.lock, timer(CONFIG_IO_SECONDS, "sqlite", "write", timing="config_io"), self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO assets (section, key, type, data) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def existing_keys(self, section: str, keys: list[str]) -> list[str]:
+        """Return the keys of a section that are already stored, querying in chunks."""
+        found = []
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            found.extend(row[0] for row in self.fetchall(
+                f"SELECT key FROM assets WHERE section = ? AND key IN ({placeholders})", (section, *chunk)
+            ))
+        return found
+
+    def find(self, section: str, type: str) -> list[dict]:
+        """Return all configs of a section with the given type, using the type index."""
+        rows = self.fetchall(
+            "SELECT data FROM assets WHERE section = ? AND type = ? ORDER BY key", (section, _type_value(type))
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def page(self, section: str, after: str = None, type: str = None, limit: int = 100) -> list[tuple[str, dict]]:
+        """Return configs of a section in asset ID order, seeking on the primary key from after."""
+        sql = "SELECT key, data FROM assets WHERE section = ?"
+        params = [section]
+        if after is not None:
+            sql += " AND key > ?"
+            params.append(after)
+        if type is not None:
+            sql += " AND type = ?"
+            params.append(_type_value(type))
+        rows = self.fetchall(sql + " ORDER BY key LIMIT ?", (*params, limit))
+        return [(key, json.loads(data)) for key, data in rows]
+
+    def compact(self):
+        """Checkpoint SQLite's own write-ahead log into the database file."""
+        with self.lock, timer(CONFIG_IO_SECONDS, "sqlite", "checkpoint", timing="config_io"):
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def _type_value(type):
+    """Store enum members (e.g. ElectrolyzerType.PEM) by their value."""
+    return getattr(type, "value", type)
@@ -1,25 +1,38 @@
-import json
 from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.services.asset_cache import AssetCache
+from hydrogen_factory.services.config_repository import ConfigRepository
 
 class StorageService:
-    def __init__(self):
-        """Initialize the StorageService with a configuration file path and load existing storage configs.
+    def __init__(self, repository: ConfigRepository = None, cache_entries: int = 10000):
+        """Initialize the StorageService on top of the shared configuration repository.
+
+        Args:
+        - repository (ConfigRepository): Store shared with the other asset services (a ConfigRepository
+          or SqliteConfigRepository). If omitted, a repository on 'config.json' is created and
+          recovered for this service alone.
+        - cache_entries (int): Maximum number of validated configs kept in memory.
 
         Variables:
         - self.config_file (str): Path to the JSON configuration file ('config.json').
+        - self.repository (ConfigRepository): Authoritative in-memory state backed by a write-ahead log.
         - self.storages (dict): Dictionary mapping storage IDs to their configuration data.
+        - self.listeners (list): Callbacks invoked with the storage ID after a configuration change.
+        - self.cache (AssetCache): Validated configs, their JSON and encoded list pages.
 
         Raises:
         - ValueError: If loading the configuration file fails (e.g., file corruption).
         """
         self.config_file = "config.json"
+        self.listeners = []
         try:
-            self.storages = self._load_configs().get("storages", {})
+            self.repository = repository or ConfigRepository(self.config_file)
+            self.storages = self.repository.section("storages")
+            self.cache = AssetCache(self.repository, "storages", StorageConfig, max_entries=cache_entries)
         except Exception as e:
             raise ValueError(f"Failed to initialize storages: {str(e)}")
 
     def configure(self, config: StorageConfig):
-        """Configure a new storage unit and save it to the configuration file.
+        """Configure a new storage unit and log it to the configuration repository.
 
         Args:
         - config (StorageConfig): Pydantic model containing storage configuration
@@ -30,15 +43,56 @@ class StorageService:
         - self.storages (dict): Updated with the new storage configuration.
 
         Raises:
-        - ValueError: If the storage_id already exists or saving to config.json fails.
+        - ValueError: If the storage_id already exists or writing the change fails.
         """
-        if config.storage_id in self.storages:
-            raise ValueError("Storage ID already exists")
-        self.storages[config.storage_id] = config.model_dump()
-        try:
-            self._save_configs()
-        except Exception as e:
-            raise ValueError(f"Failed to save configuration: {str(e)}")
+        with self.repository.lock:
+            if config.storage_id in self.storages:
+                raise ValueError("Storage ID already exists")
+            try:
+                self.repository.put("storages", config.storage_id, config.model_dump())
+            except Exception as e:
+                raise ValueError(f"Failed to save configuration: {str(e)}")
+            self.cache.invalidate([config.storage_id])
+        for listener in self.listeners:
+            listener(config.storage_id)
+
+    def configure_bulk(self, configs: list[StorageConfig]):
+        """Configure many new storage units with a single write to the configuration repository.
+
+        Either all storage units are configured or none is.
+
+        Args:
+        - configs (list[StorageConfig]): Configurations to add.
+
+        Variables:
+        - ids (list[str]): IDs of the new storage units, in request order.
+
+        Raises:
+        - ValueError: If an ID is repeated in the request or already exists, or writing the change fails.
+        """
+        ids = [config.storage_id for config in configs]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate Storage IDs in request")
+        with self.repository.lock:
+            existing = self.repository.existing_keys("storages", ids)
+            if existing:
+                raise ValueError(f"Storage ID already exists: {existing[0]}")
+            try:
+                self.repository.put_many("storages", [(config.storage_id, config.model_dump()) for config in configs])
+            except Exception as e:
+                raise ValueError(f"Failed to save configuration: {str(e)}")
+            self.cache.invalidate(ids)
+        for storage_id in ids:
+            for listener in self.listeners:
+                listener(storage_id)
+
+    def add_listener(self, listener):
+        """Register a callback invoked with the storage ID whenever a storage is configured.
+
+        Args:
+        - listener (callable): Function taking the storage_id (str).
+        """
+        self.listeners.append(listener)
 
     def get_config(self, storage_id: str) -> StorageConfig:
         """Retrieve the configuration for a specific storage unit by its ID.
@@ -51,51 +105,37 @@ class StorageService:
 
         Variables:
         - storage_id (str): The ID used to look up the storage unit.
-        - self.storages (dict): Source of the storage configuration data.
+        - self.cache (AssetCache): Source of the validated configuration; the returned model is
+          shared between callers and must not be modified.
 
         Raises:
         - ValueError: If the storage_id is not found in the stored configurations.
         """
-        if storage_id not in self.storages:
-            raise ValueError("Storage ID not found")
-        return StorageConfig(**self.storages[storage_id])
-
-    def _load_configs(self) -> dict:
-        """Load the configuration data from config.json.
+        return self._cached(storage_id)[0]
 
-        Returns:
-        - dict: Configuration data containing 'electrolyzers' and 'storages' dictionaries.
-                Returns empty defaults if the file is missing or invalid.
-
-        Variables:
-        - self.config_file (str): Path to the configuration file.
+    def get_json(self, storage_id: str) -> tuple[bytes, str]:
+        """Retrieve the JSON encoding of a storage unit's configuration and its ETag.
 
         Raises:
-        - FileNotFoundError: Handled internally, returns default empty config.
-        - json.JSONDecodeError: Handled internally, returns default empty config.
+        - ValueError: If the storage_id is not found in the stored configurations.
         """
-        try:
-            with open(self.config_file, "r") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"electrolyzers": {}, "storages": {}}
+        _, body, etag = self._cached(storage_id)
+        return body, etag
 
-    def _save_configs(self):
-        """Save the current storage configurations to config.json.
+    def list_json(self, cursor: str = None, limit: int = 100) -> tuple[bytes, str]:
+        """Retrieve one page of storage units, ordered by ID, as JSON bytes and its ETag.
 
-        Variables:
-        - configs (dict): Configuration data with 'electrolyzers' and 'storages' keys.
-        - self.storages (dict): Current storage configurations to save.
-        - self.config_file (str): Path to the configuration file.
+        Args:
+        - cursor (str): next_cursor of the previous page; None starts at the first storage unit.
+        - limit (int): Maximum number of storage units on the page.
 
-        Raises:
-        - ValueError: If writing to config.json fails (e.g., permission denied).
+        Returns:
+        - tuple[bytes, str]: StoragePage JSON and its ETag, cached until the next configuration change.
         """
-        configs = self._load_configs()
-        configs["storages"] = self.storages
-        configs["electrolyzers"] = configs.get("electrolyzers", {})
+        return self.cache.page(None, cursor, limit)
+
+    def _cached(self, storage_id: str) -> tuple:
         try:
-            with open(self.config_file, "w") as f:
-                json.dump(configs, f, indent=2)
-        except Exception as e:
-            raise ValueError(f"Failed to write to config.json: {str(e)}")
\ No newline at end of file
+            return self.cache.get(storage_id)
+        except KeyError:
+            raise ValueError("Storage ID not found")
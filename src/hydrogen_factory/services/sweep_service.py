@@ -0,0 +1,135 @@
+import asyncio
+import math
+import numpy as np
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import OptimizationInput, SweepInput, SweepOutput
+from hydrogen_factory.services.optimization_service import OptimizationService, SOLVER_GRACE_SECONDS
+
+FIT_TOLERANCE = 1e-9
+SWEEP_ELECTROLYZER_ID = "sweep"
+SWEEP_STORAGE_ID = "sweep"
+
+class SizingSweepService:
+    def __init__(self, optimization_service: OptimizationService):
+        """Initialize the sizing sweep on top of the OptimizationService.
+
+        Args:
+        - optimization_service (OptimizationService): Service whose solver pool, solve paths and
+          power supplies are used. No asset is looked up or stored.
+
+        Variables:
+        - self.optimization_service (OptimizationService): Solver for the individual grid points.
+        """
+        self.optimization_service = optimization_service
+
+    async def sweep(self, input: SweepInput) -> SweepOutput:
+        """Compute the optimal cost over a grid of electrolyzer and storage capacities.
+
+        Grid points are evaluated from the largest sizes down. A schedule that is optimal for a
+        larger electrolyzer or storage and still fits the smaller one is optimal for it too, so
+        such points reuse their neighbour's cost without a solve; likewise a point is infeasible
+        if a larger neighbour is. Storage rows are split into contiguous chunks that run in
+        parallel on the solver pool.
+
+        Args:
+        - input (SweepInput): Capacity grids, electrolyzer efficiency and the price/demand horizon.
+
+        Returns:
+        - SweepOutput: Cost surface in the requested grid order.
+
+        Variables:
+        - capacities (np.ndarray): Electrolyzer capacities, largest first.
+        - storages (np.ndarray): Storage capacities, largest first.
+        - costs (np.ndarray): Cost per (storage, capacity) in descending order, NaN where infeasible.
+
+        Raises:
+        - ValueError: If a power supply is not found.
+        - SolverPoolFullError: If the solver pool queue is full.
+        - SolverTimeoutError: If a chunk exceeds its time limit.
+        """
+        service = self.optimization_service
+        supply = service.available_power(input)
+        capacities = np.unique(input.capacities)[::-1]
+        storages = np.unique(input.storage_capacities)[::-1]
+
+        pool = service.solver_pool
+        time_limit = input.time_limit if input.time_limit is not None else pool.time_limit
+        size = math.ceil(len(storages) / pool.max_workers)
+        base = OptimizationInput(
+            electrolyzer_id=SWEEP_ELECTROLYZER_ID,
+            storage_id=SWEEP_STORAGE_ID,
+            electricity_prices=input.electricity_prices,
+            hydrogen_demand=input.hydrogen_demand,
+            time_step_hours=input.time_step_hours,
+            initial_storage_level=input.initial_storage_level,
+            start_hour=input.start_hour,
+            power_supply_ids=input.power_supply_ids,
+        )
+        chunks = await asyncio.gather(*(
+            pool.run(
+                _sweep_rows, service._solver_fn(), base, input.type, input.efficiency,
+                capacities, storages[lo:lo + size], time_limit, supply,
+                time_limit=time_limit * len(capacities) * len(storages[lo:lo + size]) + SOLVER_GRACE_SECONDS,
+            )
+            for lo in range(0, len(storages), size)
+        ))
+        costs = np.concatenate([chunk[0] for chunk in chunks])
+
+        rows = np.searchsorted(-storages, -np.asarray(input.storage_capacities))
+        columns = np.searchsorted(-capacities, -np.asarray(input.capacities))
+        surface = costs[np.ix_(rows, columns)]
+        return SweepOutput(
+            capacities=input.capacities,
+            storage_capacities=input.storage_capacities,
+            total_cost=[[None if np.isnan(cost) else float(cost) for cost in row] for row in surface],
+            solves=sum(chunk[1] for chunk in chunks),
+        )
+
+
+def _sweep_rows(solve, base: OptimizationInput, type: ElectrolyzerType, efficiency: float,
+                capacities: np.ndarray, storages: np.ndarray, time_limit: float = None, supply: tuple = None):
+    """Evaluate a block of the sizing grid in a solver pool worker, both axes in descending order.
+
+    Returns:
+    - tuple[np.ndarray, int]: Cost per (storage, capacity), NaN where infeasible, and the number of solves.
+
+    Variables:
+    - peaks (np.ndarray): Peak power and peak level of the optimal schedule of each grid point,
+      NaN where it was not solved. The point above (larger storage) and to the left (larger
+      electrolyzer) are the neighbours whose schedules may be reused.
+    - infeasible (np.ndarray): Grid points whose demand cannot be met.
+    """
+    costs = np.full((len(storages), len(capacities)), np.nan)
+    peaks = np.full((len(storages), len(capacities), 2), np.nan)
+    infeasible = np.zeros((len(storages), len(capacities)), dtype=bool)
+    solves = 0
+    for i, max_capacity in enumerate(storages):
+        storage = StorageConfig(storage_id=SWEEP_STORAGE_ID, max_capacity=float(max_capacity))
+        for j, capacity in enumerate(capacities):
+            neighbours = [(i - 1, j)] if i else []
+            if j:
+                neighbours.append((i, j - 1))
+            if any(infeasible[n] for n in neighbours):
+                infeasible[i, j] = True
+                continue
+            reusable = [
+                n for n in neighbours
+                if peaks[n][0] <= capacity + FIT_TOLERANCE and peaks[n][1] <= max_capacity + FIT_TOLERANCE
+            ]
+            if reusable:
+                costs[i, j] = costs[reusable[0]]
+                peaks[i, j] = peaks[reusable[0]]
+                continue
+            electrolyzer = ElectrolyzerConfig(
+                electrolyzer_id=SWEEP_ELECTROLYZER_ID, type=type, capacity=float(capacity), efficiency=efficiency,
+            )
+            solves += 1
+            try:
+                result = solve(base, electrolyzer, storage, time_limit, supply)
+            except ValueError:
+                infeasible[i, j] = True
+                continue
+            costs[i, j] = result.total_cost
+            peaks[i, j] = (max(result.power_schedule), max(result.storage_levels))
+    return costs, solves
@@ -0,0 +1,311 @@
+import os
+import threading
+import time
+from urllib.parse import quote, unquote
+import numpy as np
+from hydrogen_factory.core.metrics import TELEMETRY_SAMPLES, stage
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig
+from hydrogen_factory.models.telemetry import CalibrationInput, CalibrationResult, TelemetryAggregates
+from hydrogen_factory.services.electrolyzer_service import ElectrolyzerService
+from hydrogen_factory.services.part_load import hydrogen_rate
+
+# On-disk dtype of each raw column: times need float64, measurements fit in float32.
+RAW_COLUMNS = {"time": "<f8", "power": "<f4", "hydrogen": "<f4"}
+# Bucket width (s) and number of buckets kept per rolling aggregate: one day of minutes, 30 days of hours.
+RESOLUTIONS = {"minute": (60.0, 1440), "hour": (3600.0, 720)}
+MIN_CALIBRATION_SAMPLES = 60
+
+class RollingAggregates:
+    def __init__(self, width: float, buckets: int):
+        """Sample counts and sums per time bucket, for the last `buckets` buckets (a ring buffer).
+
+        Args:
+        - width (float): Bucket width (s).
+        - buckets (int): Number of buckets kept; bucket b is stored at slot b % buckets.
+        """
+        self.width = width
+        self.bucket = np.full(buckets, -1, dtype=np.int64)
+        self.count = np.zeros(buckets, dtype=np.int64)
+        self.power = np.zeros(buckets)
+        self.hydrogen = np.zeros(buckets)
+
+    def add(self, times: np.ndarray, power: np.ndarray, hydrogen: np.ndarray):
+        """Add samples with increasing times, newer than all samples added before."""
+        ids = np.floor(times / self.width).astype(np.int64)
+        buckets, first = np.unique(ids, return_index=True)
+        counts = np.diff(np.append(first, len(ids)))
+        power_sums = np.add.reduceat(power, first)
+        hydrogen_sums = np.add.reduceat(hydrogen, first)
+        keep = slice(-len(self.bucket), None)
+        buckets, counts, power_sums, hydrogen_sums = buckets[keep], counts[keep], power_sums[keep], hydrogen_sums[keep]
+        slots = buckets % len(self.bucket)
+        stale = self.bucket[slots] != buckets
+        self.bucket[slots[stale]] = buckets[stale]
+        self.count[slots[stale]] = 0
+        self.power[slots[stale]] = 0.0
+        self.hydrogen[slots[stale]] = 0.0
+        self.count[slots] += counts
+        self.power[slots] += power_sums
+        self.hydrogen[slots] += hydrogen_sums
+
+    def read(self, start: float = None, end: float = None) -> tuple:
+        """Return the bucket start times, counts, mean power and mean hydrogen in [start, end), by time.
+
+        Only the last `buckets` buckets up to the newest one count; older slots that no newer bucket
+        has overwritten yet are left out.
+        """
+        times = self.bucket * self.width
+        valid = (self.bucket >= 0) & (self.bucket > self.bucket.max() - len(self.bucket))
+        if start is not None:
+            valid &= times + self.width > start
+        if end is not None:
+            valid &= times < end
+        slots = np.flatnonzero(valid)
+        slots = slots[np.argsort(self.bucket[slots])]
+        counts = self.count[slots]
+        return times[slots], counts, self.power[slots] / counts, self.hydrogen[slots] / counts
+
+
+class TelemetryService:
+    def __init__(self, electrolyzer_service: ElectrolyzerService, directory: str, flush_samples: int = 100_000,
+                 flush_interval: float = 5.0):
+        """Initialize the ingestion, storage and calibration of electrolyzer telemetry.
+
+        Samples (time in Unix s, power in kW, hydrogen production rate in kg/h) are buffered in
+        memory per electrolyzer and appended in bulk to one raw file per column under
+        directory/<electrolyzer_id>. A buffer is written once it holds flush_samples samples,
+        and all buffers once flush_interval has passed since the last write. The minute and hour
+        aggregates are updated on ingestion, from the whole batch at once.
+
+        Args:
+        - electrolyzer_service (ElectrolyzerService): Source of the electrolyzer configs; calibrated
+          efficiencies are written back through it.
+        - directory (str): Root directory of the raw telemetry files.
+        - flush_samples (int): Buffered samples of one electrolyzer that trigger a write.
+        - flush_interval (float): Seconds after which all buffers are written on the next ingestion.
+
+        Variables:
+        - self.buffers (dict): Lists of (time, power, hydrogen) arrays waiting to be written, per electrolyzer.
+        - self.buffered (dict): Number of buffered samples per electrolyzer.
+        - self.last_time (dict): Time of the latest sample per electrolyzer; older samples are dropped.
+          Read from the last stored row when an electrolyzer first sends samples after a restart.
+        - self.aggregates (dict): RollingAggregates per electrolyzer and resolution.
+        - self.lock (threading.Lock): Guards the buffers, aggregates and files.
+        """
+        self.electrolyzer_service = electrolyzer_service
+        self.directory = directory
+        self.flush_samples = flush_samples
+        self.flush_interval = flush_interval
+        self.buffers = {}
+        self.buffered = {}
+        self.last_time = {}
+        self.aggregates = {}
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+
+    def ingest(self, samples: dict) -> tuple[int, int]:
+        """Buffer and aggregate telemetry samples.
+
+        Samples are sorted by time per electrolyzer; samples that are not newer than the
+        electrolyzer's latest one (late or repeated) are dropped.
+
+        Args:
+        - samples (dict): (time, power, hydrogen) arrays per electrolyzer ID.
+
+        Returns:
+        - tuple[int, int]: Number of accepted and dropped samples.
+
+        Raises:
+        - ValueError: If an electrolyzer is not found or a time is not finite; nothing is ingested then.
+        """
+        for electrolyzer_id, (times, _, _) in samples.items():
+            self.electrolyzer_service.get_config(electrolyzer_id)
+            if not np.all(np.isfinite(times)):
+                raise ValueError("Telemetry times must be finite")
+        accepted = dropped = 0
+        with self.lock:
+            for electrolyzer_id, (times, power, hydrogen) in samples.items():
+                order = np.argsort(times, kind="stable")
+                times, power, hydrogen = times[order], power[order], hydrogen[order]
+                if electrolyzer_id not in self.last_time:
+                    self.last_time[electrolyzer_id] = self._last_stored_time(electrolyzer_id)
+                keep = times > self.last_time[electrolyzer_id]
+                keep[1:] &= np.diff(times) > 0
+                if not keep.all():
+                    times, power, hydrogen = times[keep], power[keep], hydrogen[keep]
+                dropped += len(keep) - len(times)
+                if len(times) == 0:
+                    continue
+                accepted += len(times)
+                self.last_time[electrolyzer_id] = times[-1]
+                self.buffers.setdefault(electrolyzer_id, []).append((times, power, hydrogen))
+                self.buffered[electrolyzer_id] = self.buffered.get(electrolyzer_id, 0) + len(times)
+                if electrolyzer_id not in self.aggregates:
+                    self.aggregates[electrolyzer_id] = {name: RollingAggregates(*r) for name, r in RESOLUTIONS.items()}
+                for aggregates in self.aggregates[electrolyzer_id].values():
+                    aggregates.add(times, power, hydrogen)
+                if self.buffered[electrolyzer_id] >= self.flush_samples:
+                    self._flush(electrolyzer_id)
+            if time.monotonic() - self.last_flush >= self.flush_interval:
+                for electrolyzer_id in list(self.buffers):
+                    self._flush(electrolyzer_id)
+                self.last_flush = time.monotonic()
+        TELEMETRY_SAMPLES.inc("accepted", amount=accepted)
+        TELEMETRY_SAMPLES.inc("dropped", amount=dropped)
+        return accepted, dropped
+
+    def flush(self):
+        """Write all buffered samples to the raw files."""
+        with self.lock:
+            for electrolyzer_id in list(self.buffers):
+                self._flush(electrolyzer_id)
+            self.last_flush = time.monotonic()
+
+    def read(self, electrolyzer_id: str, start: float = None, end: float = None) -> tuple:
+        """Return the raw (time, power, hydrogen) samples in [start, end), from the files and the buffer."""
+        with self.lock:
+            chunks = [self._read_files(electrolyzer_id, start, end)]
+            for times, power, hydrogen in self.buffers.get(electrolyzer_id, []):
+                lo = 0 if start is None else np.searchsorted(times, start)
+                hi = len(times) if end is None else np.searchsorted(times, end)
+                chunks.append((times[lo:hi], power[lo:hi], hydrogen[lo:hi]))
+        return tuple(np.concatenate([chunk[i] for chunk in chunks]).astype(float) for i in range(3))
+
+    def aggregated(self, electrolyzer_id: str, resolution: str, start: float = None,
+                   end: float = None) -> TelemetryAggregates:
+        """Return the rolling minute or hour aggregates of an electrolyzer.
+
+        Raises:
+        - ValueError: If the resolution is unknown or the electrolyzer has no telemetry.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        with self.lock:
+            if electrolyzer_id not in self.aggregates:
+                raise ValueError("No telemetry for this electrolyzer")
+            times, counts, power, hydrogen = self.aggregates[electrolyzer_id][resolution].read(start, end)
+        return TelemetryAggregates(
+            electrolyzer_id=electrolyzer_id, resolution=resolution, times=times.tolist(), counts=counts.tolist(),
+            power=power.tolist(), hydrogen=hydrogen.tolist(),
+        )
+
+    def calibrate(self, electrolyzer_id: str, start: float = None, end: float = None, min_load: float = 0.05,
+                  apply: bool = False) -> CalibrationResult:
+        """Fit the effective efficiency of an electrolyzer to its measured hydrogen production.
+
+        The configured production curve r(P) (see part_load.hydrogen_rate) is scaled by the factor
+        k that minimizes sum (h - k * r(P))^2 over the samples at or above min_load, i.e.
+        k = sum(h * r) / sum(r^2). The fitted efficiency is k times the configured full-load
+        efficiency; with apply, the config's efficiency (and efficiency curve) are scaled by k, so
+        the optimizer plans with the measured performance.
+
+        Args:
+        - electrolyzer_id (str): ID of the electrolyzer.
+        - start, end (float): Unix time range [start, end) of the samples; None for all stored ones.
+        - min_load (float): Samples below this fraction of capacity (standby, ramps) are left out.
+        - apply (bool): Update the electrolyzer config with the fitted efficiency.
+
+        Returns:
+        - CalibrationResult: The fit; scale and efficiency are None with fewer than
+          MIN_CALIBRATION_SAMPLES samples.
+
+        Raises:
+        - ValueError: If the electrolyzer is not found or updating its config fails.
+        """
+        electrolyzer = self.electrolyzer_service.get_config(electrolyzer_id)
+        _, power, hydrogen = self.read(electrolyzer_id, start, end)
+        fitted = power >= min_load * electrolyzer.capacity
+        power, hydrogen = power[fitted], hydrogen[fitted]
+        model = hydrogen_rate(electrolyzer, power)
+        if len(power) < MIN_CALIBRATION_SAMPLES or not np.any(model > 0):
+            return CalibrationResult(electrolyzer_id=electrolyzer_id, samples=len(power))
+        scale = float(np.dot(hydrogen, model) / np.dot(model, model))
+        residual = float(np.sum((hydrogen - scale * model) ** 2))
+        spread = float(np.sum((hydrogen - hydrogen.mean()) ** 2))
+        if apply:
+            self.electrolyzer_service.update(scaled(electrolyzer, scale))
+        return CalibrationResult(
+            electrolyzer_id=electrolyzer_id,
+            samples=len(power),
+            scale=scale,
+            efficiency=scale * electrolyzer.curve()[1][-1],
+            r_squared=1.0 - residual / spread if spread > 0 else None,
+            applied=apply,
+        )
+
+    def calibrate_many(self, input: CalibrationInput) -> list[CalibrationResult]:
+        """Calibrate the requested electrolyzers, or all with telemetry, one after another.
+
+        Raises:
+        - ValueError: If an electrolyzer is not found or updating its config fails.
+        """
+        ids = input.electrolyzer_ids if input.electrolyzer_ids is not None else self.electrolyzer_ids()
+        with stage("calibrate"):
+            return [
+                self.calibrate(electrolyzer_id, input.start, input.end, input.min_load, input.apply)
+                for electrolyzer_id in ids
+            ]
+
+    def electrolyzer_ids(self) -> list[str]:
+        """IDs of the electrolyzers with telemetry since startup or on disk."""
+        with self.lock:
+            ids = set(self.aggregates)
+        if os.path.isdir(self.directory):
+            ids.update(unquote(name) for name in os.listdir(self.directory))
+        return sorted(ids)
+
+    def _flush(self, electrolyzer_id: str):
+        """Append the buffered samples of one electrolyzer to its raw files (lock held)."""
+        chunks = self.buffers.pop(electrolyzer_id, [])
+        self.buffered.pop(electrolyzer_id, None)
+        if not chunks:
+            return
+        directory = self._path(electrolyzer_id)
+        with stage("telemetry_flush"):
+            os.makedirs(directory, exist_ok=True)
+            paths = [os.path.join(directory, f"{name}.{dtype[1:]}") for name, dtype in RAW_COLUMNS.items()]
+            # Measurements first, so that a partly written flush leaves times as the shortest column;
+            # all columns are cut back to the whole rows of the time file before appending.
+            rows = os.path.getsize(paths[0]) // 8 if os.path.exists(paths[0]) else 0
+            for i, (path, dtype) in reversed(list(enumerate(zip(paths, RAW_COLUMNS.values())))):
+                column = np.concatenate([chunk[i] for chunk in chunks]).astype(dtype)
+                with open(path, "ab") as f:
+                    f.truncate(rows * np.dtype(dtype).itemsize)
+                    f.write(column.tobytes())
+
+    def _last_stored_time(self, electrolyzer_id: str) -> float:
+        """Return the time of the last row in the raw files, or -inf without stored samples (lock held)."""
+        path = os.path.join(self._path(electrolyzer_id), f"time.{RAW_COLUMNS['time'][1:]}")
+        rows = os.path.getsize(path) // 8 if os.path.exists(path) else 0
+        if rows == 0:
+            return -np.inf
+        return float(np.fromfile(path, dtype=RAW_COLUMNS["time"], count=1, offset=(rows - 1) * 8)[0])
+
+    def _read_files(self, electrolyzer_id: str, start: float = None, end: float = None) -> tuple:
+        """Return the samples in [start, end) from the raw files (lock held)."""
+        directory = self._path(electrolyzer_id)
+        paths = [os.path.join(directory, f"{name}.{dtype[1:]}") for name, dtype in RAW_COLUMNS.items()]
+        if not os.path.exists(paths[0]) or os.path.getsize(paths[0]) == 0:
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+        times = np.memmap(paths[0], dtype=RAW_COLUMNS["time"], mode="r")
+        lo = 0 if start is None else int(np.searchsorted(times, start))
+        hi = len(times) if end is None else int(np.searchsorted(times, end))
+        columns = [times[lo:hi]]
+        for path, dtype in zip(paths[1:], list(RAW_COLUMNS.values())[1:]):
+            columns.append(np.memmap(path, dtype=dtype, mode="r")[lo:hi])
+        return tuple(columns)
+
+    def _path(self, electrolyzer_id: str) -> str:
+        # Dots are escaped too, so that no electrolyzer ID names a directory outside the store.
+        return os.path.join(self.directory, quote(electrolyzer_id, safe="").replace(".", "%2E"))
+
+
+def scaled(electrolyzer: ElectrolyzerConfig, scale: float) -> ElectrolyzerConfig:
+    """Return the config with its efficiency (and efficiency curve) multiplied by scale."""
+    config = electrolyzer.model_dump()
+    config["efficiency"] = electrolyzer.efficiency * scale
+    if electrolyzer.efficiency_curve is not None:
+        config["efficiency_curve"] = [
+            {"load": point.load, "efficiency": point.efficiency * scale} for point in electrolyzer.efficiency_curve
+        ]
+    return ElectrolyzerConfig.model_validate(config)
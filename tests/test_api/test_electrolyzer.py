@@ -53,4 +53,54 @@ def test_configure_electrolyzer_invalid_capacity():
     }
     response = client.post("/api/electrolyzer/configure", json=payload)
     assert response.status_code == 422
-    assert "greater than 0" in response.json()["detail"][0]["msg"]
\ No newline at end of file
+    assert "greater than 0" in response.json()["detail"][0]["msg"]
+
+def test_configure_electrolyzer_bulk():
+    payload = [
+        {"electrolyzer_id": "EBULK1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02},
+        {"electrolyzer_id": "EBULK2", "type": "ALKALINE", "capacity": 500.0, "efficiency": 0.018},
+    ]
+    response = client.post("/api/electrolyzer/configure/bulk", json=payload)
+    assert response.status_code == 200
+    assert response.json() == payload
+    response = client.post("/api/electrolyzer/configure/bulk", json=payload[:1])
+    assert response.status_code == 400
+    assert "Electrolyzer ID already exists" in response.json()["detail"]
+
+def test_list_and_get_electrolyzers():
+    payload = [
+        {"electrolyzer_id": "ELIST1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02},
+        {"electrolyzer_id": "ELIST2", "type": "ALKALINE", "capacity": 500.0, "efficiency": 0.018},
+    ]
+    client.post("/api/electrolyzer/configure/bulk", json=payload)
+    response = client.get("/api/electrolyzer/ELIST2")
+    assert response.status_code == 200
+    assert response.json() == payload[1]
+    assert client.get("/api/electrolyzer/ELIST9").status_code == 404
+
+    items = []
+    cursor = None
+    while True:
+        page = client.get("/api/electrolyzer", params={"limit": 1, **({"cursor": cursor} if cursor else {})}).json()
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert [item for item in items if item["electrolyzer_id"].startswith("ELIST")] == payload
+    alkaline = client.get("/api/electrolyzer", params={"type": "ALKALINE"}).json()["items"]
+    assert payload[1] in alkaline and payload[0] not in alkaline
+
+def test_list_electrolyzers_not_modified():
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EETAG1", "type": "PEM", "capacity": 10.0})
+    response = client.get("/api/electrolyzer")
+    etag = response.headers["ETag"]
+    not_modified = client.get("/api/electrolyzer", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+    assert client.get("/api/electrolyzer/EETAG1", headers={"If-None-Match": "*"}).status_code == 304
+
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EETAG2", "type": "PEM", "capacity": 10.0})
+    response = client.get("/api/electrolyzer", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+import pytest
+import json
+from fastapi.testclient import TestClient
+from hydrogen_factory.main import app
+from hydrogen_factory.core.metrics import MetricsRegistry
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def reset_config_json():
+    """Reset config.json before each test to ensure a clean state."""
+    try:
+        with open("config.json", "w") as f:
+            json.dump({"electrolyzers": {}, "storages": {}}, f)
+    except Exception as e:
+        pytest.fail(f"Failed to reset config.json: {str(e)}")
+    yield
+
+def test_server_timing_header_lists_stages():
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EMT1", "type": "PEM", "capacity": 1000.0})
+    client.post("/api/storage/configure", json={"storage_id": "SMT1", "max_capacity": 100.0})
+    response = client.post("/api/schedule/optimize", json={
+        "electrolyzer_id": "EMT1", "storage_id": "SMT1",
+        "electricity_prices": [0.05, 0.03], "hydrogen_demand": [1.0, 1.0],
+    })
+    assert response.status_code == 200
+    stages = [entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")]
+    for stage in ("validate", "lookup", "solve", "extract", "endpoint", "serialize", "total"):
+        assert stage in stages
+
+def test_metrics_endpoint():
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EMT2", "type": "PEM", "capacity": 1000.0})
+    client.post("/api/storage/configure", json={"storage_id": "SMT2", "max_capacity": 100.0})
+    client.post("/api/schedule/optimize", json={
+        "electrolyzer_id": "EMT2", "storage_id": "SMT2",
+        "electricity_prices": [0.05], "hydrogen_demand": [100.0],
+    })
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert '# TYPE hf_stage_seconds histogram' in text
+    assert 'hf_stage_seconds_bucket{stage="solve",le="+Inf"}' in text
+    assert 'hf_solver_results_total{path="dispatch",status="failed"}' in text
+    assert 'hf_request_seconds_count{method="POST",handler="optimize_schedule",status="400"}' in text
+    assert 'hf_config_io_seconds_count{backend="json",operation="append"}' in text
+    assert "hf_solver_queue_depth 0.0" in text
+
+def test_histogram_rendering():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("h", "help text", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "a")
+    histogram.observe(0.5, "a")
+    histogram.observe(5.0, "a")
+    counter = registry.counter("c", "counted", ("path",))
+    counter.inc('x"y')
+    assert registry.render().splitlines() == [
+        "# HELP h help text",
+        "# TYPE h histogram",
+        'h_bucket{stage="a",le="0.1"} 1',
+        'h_bucket{stage="a",le="1.0"} 2',
+        'h_bucket{stage="a",le="+Inf"} 3',
+        'h_sum{stage="a"} 5.55',
+        'h_count{stage="a"} 3',
+        "# HELP c counted",
+        "# TYPE c counter",
+        'c{path="x\\"y"} 1.0',
+    ]
@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+import pytest
+from fastapi.testclient import TestClient
+from hydrogen_factory.main import app
+
+client = TestClient(app)
+
+PV_PAYLOAD = {
+    "supply_id": "PV_API_1",
+    "type": "PHOTOVOLTAIC",
+    "capacity": 400.0,
+    "availability": [0.0] * 6 + [0.5] * 12 + [0.0] * 6,
+}
+
+def test_configure_power_supply():
+    response = client.post("/api/power-supply/configure", json=PV_PAYLOAD)
+    assert response.status_code == 200
+    assert response.json() == PV_PAYLOAD
+
+    response = client.post("/api/power-supply/configure", json=PV_PAYLOAD)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Power Supply ID already exists"
+
+def test_configure_power_supply_invalid_availability():
+    payload = dict(PV_PAYLOAD, supply_id="PV_API_2", availability=[0.5] * 23)
+    assert client.post("/api/power-supply/configure", json=payload).status_code == 422
+    payload = dict(PV_PAYLOAD, supply_id="PV_API_2", availability=[1.5] * 24)
+    assert client.post("/api/power-supply/configure", json=payload).status_code == 422
+
+def test_optimize_with_power_supplies():
+    client.post("/api/electrolyzer/configure", json={
+        "electrolyzer_id": "EPS1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02
+    })
+    client.post("/api/storage/configure", json={"storage_id": "SPS1", "max_capacity": 100.0})
+    response = client.post("/api/power-supply/configure/bulk", json=[
+        dict(PV_PAYLOAD, supply_id="PV_API_3"),
+        {"supply_id": "G_API_3", "type": "GRID", "capacity": 200.0, "availability": [1.0] * 24},
+    ])
+    assert response.status_code == 200
+    payload = {
+        "electrolyzer_id": "EPS1",
+        "storage_id": "SPS1",
+        "electricity_prices": [0.05] * 24,
+        "hydrogen_demand": [3.0] * 24,
+        "power_supply_ids": ["PV_API_3", "G_API_3"],
+    }
+    response = client.post("/api/schedule/optimize", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert sum(data["grid_power"]) == pytest.approx(1200.0)
+    assert data["total_cost"] == pytest.approx(60.0)
+
+    payload["power_supply_ids"] = ["X_UNKNOWN"]
+    response = client.post("/api/schedule/optimize", json=payload)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Power Supply ID not found"
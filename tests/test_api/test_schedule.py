@@ -6,6 +6,7 @@ import pytest
 import json
 from fastapi.testclient import TestClient
 from hydrogen_factory.main import app
+from hydrogen_factory.api.encoding import COLUMNAR, decode_columnar, negotiate
 from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
 from hydrogen_factory.models.storage import StorageConfig
 
@@ -48,6 +49,41 @@ def test_optimize_schedule_success():
     assert len(result["storage_levels"]) == 24
     assert isinstance(result["total_cost"], float)
 
+def test_optimize_schedule_response_formats():
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EC1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02})
+    client.post("/api/storage/configure", json={"storage_id": "SC1", "max_capacity": 100.0})
+    payload = {
+        "electrolyzer_id": "EC1",
+        "storage_id": "SC1",
+        "electricity_prices": [0.05, 0.10, 0.02, 0.08],
+        "hydrogen_demand": [5.0, 10.0, 5.0, 10.0],
+    }
+    expected = client.post("/api/schedule/optimize", json=payload).json()
+
+    response = client.post("/api/schedule/optimize", json=payload, headers={"Accept": COLUMNAR})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == f"{COLUMNAR}; dtype=float64"
+    decoded = decode_columnar(response.content)
+    assert decoded["total_cost"] == expected["total_cost"]
+    for name in ("power_schedule", "hydrogen_produced", "storage_levels"):
+        assert decoded[name].tolist() == expected[name]
+    assert "grid_power" not in decoded
+
+    response = client.post("/api/schedule/optimize", json=payload, headers={"Accept": f"{COLUMNAR};dtype=float32"})
+    decoded = decode_columnar(response.content)
+    assert decoded["power_schedule"].dtype == "float32"
+    assert decoded["power_schedule"] == pytest.approx(expected["power_schedule"], rel=1e-6)
+
+    response = client.post("/api/schedule/optimize", json=payload, headers={"Accept": f"{COLUMNAR};dtype=int8"})
+    assert response.status_code == 400
+
+def test_negotiate_response_format():
+    assert negotiate(None) == ("application/json", {})
+    assert negotiate("text/html, */*") == ("application/json", {})
+    assert negotiate(f"application/json;q=0.5, {COLUMNAR};dtype=float32") == (COLUMNAR, {"dtype": "float32"})
+    assert negotiate(f"{COLUMNAR};q=0.2, application/json;q=0.9") == ("application/json", {})
+    assert negotiate(f"{COLUMNAR};q=0") == ("application/json", {})
+
 def test_optimize_schedule_missing_electrolyzer():
     optimize_payload = {
         "electrolyzer_id": "E999",
@@ -64,4 +100,198 @@ def test_optimize_schedule_missing_storage():
     }
     response = client.post("/api/schedule/optimize", json=optimize_payload)
     assert response.status_code == 400
-    assert "Storage ID not found" in response.json()["detail"]
\ No newline at end of file
+    assert "Storage ID not found" in response.json()["detail"]
+
+def test_optimize_schedule_solver_override():
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EO1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02})
+    client.post("/api/storage/configure", json={"storage_id": "SO1", "max_capacity": 100.0})
+    payload = {
+        "electrolyzer_id": "EO1",
+        "storage_id": "SO1",
+        "electricity_prices": [0.05, -0.01, 0.02, 0.08],
+        "hydrogen_demand": [5.0, 10.0, 5.0, 10.0],
+    }
+    highs = client.post("/api/schedule/optimize", json={**payload, "solver": "highs"})
+    cbc = client.post("/api/schedule/optimize", json={**payload, "solver": "cbc"})
+    assert highs.status_code == cbc.status_code == 200
+    assert cbc.json()["total_cost"] == pytest.approx(highs.json()["total_cost"], rel=1e-6)
+
+    response = client.post("/api/schedule/optimize", json={**payload, "solver": "dispatch"})
+    assert response.status_code == 400
+    assert "dispatch solver does not support" in response.json()["detail"]
+    assert client.post("/api/schedule/optimize", json={**payload, "solver": "gurobi"}).status_code == 422
+
+def test_optimize_schedule_infeasible_and_unmet_demand():
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EU1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02})
+    client.post("/api/storage/configure", json={"storage_id": "SU1", "max_capacity": 100.0})
+    payload = {
+        "electrolyzer_id": "EU1",
+        "storage_id": "SU1",
+        "electricity_prices": [0.05, 0.03, 0.04],
+        "hydrogen_demand": [5.0, 40.0, 5.0],
+    }
+    response = client.post("/api/schedule/optimize", json=payload)
+    assert response.status_code == 400
+    assert "demand cannot be met at step 1 (hour 1)" in response.json()["detail"]
+    assert "by 5 kg" in response.json()["detail"]
+
+    response = client.post("/api/schedule/optimize", json={**payload, "unmet_demand_penalty": 50.0})
+    assert response.status_code == 200
+    assert response.json()["unmet_demand"] == pytest.approx([0.0, 5.0, 0.0], abs=1e-6)
+
+def test_optimize_schedule_solver_pool_full(monkeypatch):
+    from hydrogen_factory.core.config import get_optimization_service
+    pool = get_optimization_service().solver_pool
+    monkeypatch.setattr(pool, "max_workers", 0)
+    monkeypatch.setattr(pool, "max_queue", 0)
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EP1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02})
+    client.post("/api/storage/configure", json={"storage_id": "SP1", "max_capacity": 100.0})
+    optimize_payload = {
+        "electrolyzer_id": "EP1",
+        "storage_id": "SP1"
+    }
+    response = client.post("/api/schedule/optimize", json=optimize_payload)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_optimize_schedule_batch_streams_results_and_inline_errors():
+    client.post("/api/electrolyzer/configure", json={
+        "electrolyzer_id": "EB1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02
+    })
+    client.post("/api/storage/configure", json={"storage_id": "SB1", "max_capacity": 100.0})
+    items = [
+        {"electrolyzer_id": "EB1", "storage_id": "SB1", "electricity_prices": [0.05] * 24, "hydrogen_demand": [2.0] * 24},
+        {"electrolyzer_id": "EB1", "storage_id": "S999"},
+        {"electrolyzer_id": "EB1", "storage_id": "SB1", "electricity_prices": [0.05] * 3},
+        {"electrolyzer_id": "EB1", "storage_id": "SB1"},
+    ]
+    response = client.post("/api/schedule/optimize/batch", json=items)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = sorted((json.loads(line) for line in response.text.splitlines()), key=lambda item: item["index"])
+    assert [line["index"] for line in lines] == [0, 1, 2, 3]
+    assert lines[0]["result"]["total_cost"] == pytest.approx(0.05 * 100.0 * 24)
+    assert "Storage ID not found" in lines[1]["error"]
+    assert lines[2]["error"].startswith("Invalid input")
+    assert len(lines[3]["result"]["power_schedule"]) == 24
+
+def test_optimize_fleet_schedule():
+    client.post("/api/electrolyzer/configure/bulk", json=[
+        {"electrolyzer_id": "EF1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02},
+        {"electrolyzer_id": "EF2", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02},
+    ])
+    client.post("/api/storage/configure", json={"storage_id": "SF1", "max_capacity": 100.0})
+    payload = {
+        "assignments": [
+            {"electrolyzer_id": "EF1", "storage_id": "SF1"},
+            {"electrolyzer_id": "EF2", "storage_id": "SF1"},
+        ],
+        "electricity_prices": [0.05, 0.10],
+        "hydrogen_demand": {"SF1": [20.0, 20.0]},
+        "power_limit": 1500.0,
+    }
+    response = client.post("/api/schedule/optimize/fleet", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_power"] == pytest.approx([1500.0, 500.0])
+    assert data["total_cost"] == pytest.approx(0.05 * 1500.0 + 0.10 * 500.0)
+
+    payload["assignments"][1]["electrolyzer_id"] = "E999"
+    response = client.post("/api/schedule/optimize/fleet", json=payload)
+    assert response.status_code == 400
+
+def test_replan_schedule():
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "ER1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02})
+    client.post("/api/storage/configure", json={"storage_id": "SR1", "max_capacity": 100.0})
+    payload = {
+        "electrolyzer_id": "ER1",
+        "storage_id": "SR1",
+        "electricity_prices": [0.05, 0.10, 0.02, 0.08],
+        "hydrogen_demand": [10.0, 10.0, 10.0, 10.0],
+    }
+    response = client.post("/api/schedule/replan", json=payload)
+    assert response.status_code == 200
+    first = response.json()
+    assert first["reused_plan"] is False
+
+    payload.update({
+        "electricity_prices": payload["electricity_prices"][1:],
+        "hydrogen_demand": payload["hydrogen_demand"][1:],
+        "initial_storage_level": first["storage_levels"][0],
+        "steps_executed": 1,
+    })
+    response = client.post("/api/schedule/replan", json=payload)
+    assert response.status_code == 200
+    assert response.json()["reused_plan"] is True
+    assert response.json()["power_schedule"] == pytest.approx(first["power_schedule"][1:])
+
+    response = client.post("/api/schedule/replan", json=payload, headers={"Accept": COLUMNAR})
+    decoded = decode_columnar(response.content)
+    assert isinstance(decoded["reused_plan"], bool)
+    assert decoded["frozen_steps"] == 0
+    assert len(decoded["power_schedule"]) == 3
+
+    payload["electrolyzer_id"] = "E999"
+    response = client.post("/api/schedule/replan", json=payload)
+    assert response.status_code == 400
+
+def test_evaluate_scenarios():
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EM1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02})
+    client.post("/api/storage/configure", json={"storage_id": "SM1", "max_capacity": 100.0})
+    payload = {"electrolyzer_id": "EM1", "storage_id": "SM1", "scenarios": 50, "seed": 11}
+    response = client.post("/api/schedule/scenarios", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["scenarios"] == 50
+    assert data["cost_quantiles"][0] <= data["cost_quantiles"][1] <= data["cost_quantiles"][2]
+    assert client.post("/api/schedule/scenarios", json=payload).json() == data
+
+    payload["storage_id"] = "S999"
+    response = client.post("/api/schedule/scenarios", json=payload)
+    assert response.status_code == 400
+
+def test_sweep_sizing():
+    payload = {
+        "capacities": [50.0, 1000.0],
+        "storage_capacities": [100.0],
+        "electricity_prices": [0.05, 0.10],
+        "hydrogen_demand": [2.0, 2.0],
+    }
+    response = client.post("/api/schedule/sweep", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_cost"][0][0] is None
+    assert data["total_cost"][0][1] == pytest.approx(0.05 * 200.0)
+
+    payload["power_supply_ids"] = ["P999"]
+    response = client.post("/api/schedule/sweep", json=payload)
+    assert response.status_code == 400
+
+def test_optimization_job_lifecycle():
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EJ1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02})
+    client.post("/api/storage/configure", json={"storage_id": "SJ1", "max_capacity": 100.0})
+    payload = {
+        "electrolyzer_id": "EJ1",
+        "storage_id": "SJ1",
+        "electricity_prices": [0.05, -0.01, 0.02, 0.08],
+        "hydrogen_demand": [5.0, 10.0, 5.0, 10.0],
+    }
+    response = client.post("/api/schedule/jobs", json=payload)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    response = client.get(f"/api/schedule/jobs/{job_id}/events")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [line[len("event: "):] for line in response.text.splitlines() if line.startswith("event: ")]
+    assert events[0] == "queued"
+    assert events[-1] == "succeeded"
+
+    data = client.get(f"/api/schedule/jobs/{job_id}").json()
+    assert data["status"] == "succeeded"
+    assert data["result"] == client.post("/api/schedule/optimize", json=payload).json()
+    assert client.delete(f"/api/schedule/jobs/{job_id}").json()["status"] == "succeeded"
+
+    assert client.get("/api/schedule/jobs/unknown").status_code == 404
+    assert client.delete("/api/schedule/jobs/unknown").status_code == 404
+    payload["storage_id"] = "S999"
+    assert client.post("/api/schedule/jobs", json=payload).status_code == 400
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src"))
+
+# Budgets for `python -X importtime -c "import hydrogen_factory.main"`, in microseconds. The own
+# budget covers the application's modules (mostly pydantic model and route creation); the total
+# includes FastAPI and NumPy and is generous enough for slow CI machines.
+OWN_IMPORT_BUDGET_US = 250_000
+TOTAL_IMPORT_BUDGET_US = 3_000_000
+DEFERRED_MODULES = ("scipy", "pulp")
+
+
+def import_times(tmp_path, code: str = "import hydrogen_factory.main"):
+    """Run code with -X importtime in a fresh interpreter and return ({module: (self, cumulative)}, stdout)."""
+    env = {**os.environ, "PYTHONPATH": SRC, "HF_CONFIG_FILE": str(tmp_path / "config.json")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, cwd=tmp_path, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times, result.stdout
+
+
+def test_import_defers_solvers(tmp_path):
+    times, _ = import_times(tmp_path)
+    assert "hydrogen_factory.main" in times
+    for module in DEFERRED_MODULES:
+        assert module not in times
+
+
+def test_import_time_budget(tmp_path):
+    times, _ = import_times(tmp_path)
+    own = sum(self_us for module, (self_us, _) in times.items() if module.startswith("hydrogen_factory"))
+    assert own < OWN_IMPORT_BUDGET_US
+    assert times["hydrogen_factory.main"][1] < TOTAL_IMPORT_BUDGET_US
+
+
+def test_import_builds_no_services(tmp_path):
+    _, stdout = import_times(tmp_path, (
+        "import hydrogen_factory.main\n"
+        "from hydrogen_factory.core import config\n"
+        "print(config.get_config_repository.built(), config.get_solver_pool.built())\n"
+    ))
+    assert stdout.split() == ["False", "False"]
+    assert not (tmp_path / "config.json").exists()
+
+
+def test_services_share_one_repository():
+    from hydrogen_factory.core import config
+    repository = config.get_config_repository()
+    assert config.get_electrolyzer_service().repository is repository
+    assert config.get_storage_service().repository is repository
+    assert config.get_optimization_service().electrolyzer_service is config.get_electrolyzer_service()
+    assert config.get_rolling_horizon_service().optimization_service is config.get_optimization_service()
@@ -47,4 +47,56 @@ def test_configure_storage_invalid_capacity():
     }
     response = client.post("/api/storage/configure", json=payload)
     assert response.status_code == 422
-    assert "greater than 0" in response.json()["detail"][0]["msg"]
\ No newline at end of file
+    assert "greater than 0" in response.json()["detail"][0]["msg"]
+
+def test_configure_storage_bulk():
+    payload = [
+        {"storage_id": "SBULK1", "max_capacity": 100.0},
+        {"storage_id": "SBULK2", "max_capacity": 50.0},
+    ]
+    response = client.post("/api/storage/configure/bulk", json=payload)
+    assert response.status_code == 200
+    assert response.json() == payload
+
+def test_list_and_get_storages():
+    client.post("/api/storage/configure", json={"storage_id": "SLIST1", "max_capacity": 20.0})
+    response = client.get("/api/storage/SLIST1")
+    assert response.json() == {"storage_id": "SLIST1", "max_capacity": 20.0}
+    assert client.get("/api/storage/SLIST9").status_code == 404
+    response = client.get("/api/storage", params={"cursor": "SLIST0"})
+    assert response.json()["items"][0]["storage_id"] == "SLIST1"
+    assert client.get("/api/storage", headers={"If-None-Match": response.headers["ETag"]},
+                      params={"cursor": "SLIST0"}).status_code == 304
+
+def test_storage_level_history(tmp_path, monkeypatch):
+    from hydrogen_factory.api.encoding import decode_columnar
+    from hydrogen_factory.core.config import get_level_store
+    monkeypatch.setattr(get_level_store(), "directory", str(tmp_path))
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "EL1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02})
+    client.post("/api/storage/configure", json={"storage_id": "SL1", "max_capacity": 100.0})
+    start = 1767225600.0
+
+    response = client.post("/api/storage/SL1/levels", json={"times": [start - 3600.0, start], "levels": [40.0, 30.0]})
+    assert response.status_code == 204
+    assert client.post("/api/storage/SL1/levels", json={"times": [start], "levels": [1.0]}).status_code == 400
+    assert client.post("/api/storage/SL1/levels", json={"times": [start], "levels": []}).status_code == 422
+    assert client.post("/api/storage/missing/levels", json={"times": [start], "levels": [1.0]}).status_code == 404
+
+    # The optimization starts from the measured level and records its plan.
+    response = client.post("/api/schedule/optimize", json={
+        "electrolyzer_id": "EL1", "storage_id": "SL1", "start_time": start,
+        "electricity_prices": [0.05, 0.05], "hydrogen_demand": [10.0, 10.0],
+    })
+    assert response.status_code == 200
+    assert response.json()["storage_levels"] == pytest.approx([20.0, 10.0])
+    response = client.get("/api/storage/SL1/levels", params={"kind": "planned"})
+    assert response.json() == {"kind": "planned", "times": [start + 3600.0, start + 7200.0], "levels": [20.0, 10.0]}
+    response = client.get("/api/storage/SL1/levels/latest", params={"at": start + 4000.0})
+    assert response.json() == {"time": start + 3600.0, "level": 20.0, "kind": "planned"}
+
+    response = client.get("/api/storage/SL1/levels", params={"start": start},
+                          headers={"Accept": "application/vnd.hydrogen-factory.columnar"})
+    decoded = decode_columnar(response.content)
+    assert decoded["times"].tolist() == [start] and decoded["levels"].tolist() == [30.0]
+    assert decoded["kind"] == "measured"
+    assert client.get("/api/storage/SL1/levels/latest", params={"at": start - 7200.0}).status_code == 404
@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+import pytest
+import json
+import numpy as np
+from fastapi.testclient import TestClient
+from hydrogen_factory.main import app
+from hydrogen_factory.api.encoding import TELEMETRY, encode_telemetry_frame
+from hydrogen_factory.core.config import get_telemetry_service
+
+client = TestClient(app)
+START = 1767225600.0
+
+@pytest.fixture(autouse=True)
+def telemetry_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_telemetry_service(), "directory", str(tmp_path))
+
+def test_ingest_aggregate_and_calibrate():
+    client.post("/api/electrolyzer/configure", json={"electrolyzer_id": "TEL1", "type": "PEM", "capacity": 1000.0, "efficiency": 0.02})
+    power = np.linspace(100.0, 1000.0, 120)
+    times = START + np.arange(120.0)
+    lines = "\n".join(
+        json.dumps({"electrolyzer_id": "TEL1", "time": t, "power": p, "hydrogen": 0.95 * 0.02 * p})
+        for t, p in zip(times[:60], power[:60])
+    )
+    response = client.post("/api/telemetry/ingest", content=lines, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 60, "dropped": 0}
+
+    frame = encode_telemetry_frame("TEL1", times[55:], power[55:], 0.95 * 0.02 * power[55:])
+    response = client.post("/api/telemetry/ingest", content=frame, headers={"Content-Type": TELEMETRY})
+    assert response.json() == {"accepted": 60, "dropped": 5}
+    assert client.post("/api/telemetry/ingest", content=frame[:-1], headers={"Content-Type": TELEMETRY}).status_code == 400
+    missing = encode_telemetry_frame("missing", [START], [1.0], [1.0])
+    assert client.post("/api/telemetry/ingest", content=missing, headers={"Content-Type": TELEMETRY}).status_code == 400
+
+    response = client.get("/api/telemetry/TEL1/aggregates", params={"resolution": "minute"})
+    assert response.status_code == 200
+    assert response.json()["times"] == [START, START + 60.0]
+    assert response.json()["counts"] == [60, 60]
+    assert client.get("/api/telemetry/TEL1/aggregates", params={"resolution": "day"}).status_code == 422
+    assert client.get("/api/telemetry/missing/aggregates").status_code == 404
+
+    response = client.post("/api/telemetry/calibrate", json={"electrolyzer_ids": ["TEL1"], "apply": True})
+    assert response.status_code == 200
+    result = response.json()[0]
+    assert result["samples"] == 120 and result["applied"]
+    assert result["efficiency"] == pytest.approx(0.019)
+    assert client.get("/api/electrolyzer/TEL1").json()["efficiency"] == pytest.approx(0.019)
+    assert client.post("/api/telemetry/calibrate", json={"electrolyzer_ids": ["missing"]}).status_code == 400
@@ -0,0 +1,26 @@
+import pytest
+from unittest.mock import MagicMock
+from hydrogen_factory.services.optimization_service import OptimizationService
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.storage import StorageConfig
+
+@pytest.fixture
+def make_optimization_service():
+    """
+    Factory for an OptimizationService on mocked electrolyzer and storage services.
+
+    The factory takes the capacity of the default PEM electrolyzer "E1" (or a whole
+    electrolyzer config), the max_capacity of storage "S1" and any OptimizationService
+    keyword arguments. The mocks are reachable as service.electrolyzer_service and
+    service.storage_service.
+    """
+    def make(capacity: float = 1000.0, max_capacity: float = 40.0, electrolyzer: ElectrolyzerConfig = None,
+             **kwargs) -> OptimizationService:
+        electrolyzer_service = MagicMock()
+        storage_service = MagicMock()
+        electrolyzer_service.get_config.return_value = electrolyzer or ElectrolyzerConfig(
+            electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=capacity, efficiency=0.02,
+        )
+        storage_service.get_config.return_value = StorageConfig(storage_id="S1", max_capacity=max_capacity)
+        return OptimizationService(electrolyzer_service, storage_service, **kwargs)
+    return make
@@ -0,0 +1,50 @@
+import pytest
+import json
+from hydrogen_factory.services.config_repository import ConfigRepository
+from hydrogen_factory.services.electrolyzer_service import ElectrolyzerService
+from hydrogen_factory.services.storage_service import StorageService
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.storage import StorageConfig
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"electrolyzers": {}, "storages": {}}))
+    return str(path)
+
+def test_services_share_repository_without_losing_writes(config_file):
+    repository = ConfigRepository(config_file)
+    electrolyzer_service = ElectrolyzerService(repository)
+    storage_service = StorageService(repository)
+    electrolyzer_service.configure(ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0))
+    storage_service.configure(StorageConfig(storage_id="S1", max_capacity=100.0))
+
+    recovered = ConfigRepository(config_file)
+    assert set(recovered.section("electrolyzers")) == {"E1"}
+    assert set(recovered.section("storages")) == {"S1"}
+
+def test_put_appends_to_log_until_compaction(config_file):
+    repository = ConfigRepository(config_file, compact_every=3)
+    snapshot = open(config_file).read()
+    repository.put("storages", "S1", {"storage_id": "S1", "max_capacity": 1.0})
+    repository.put("storages", "S2", {"storage_id": "S2", "max_capacity": 2.0})
+    assert open(config_file).read() == snapshot
+    assert len(open(repository.wal_file).readlines()) == 2
+
+    repository.put("storages", "S3", {"storage_id": "S3", "max_capacity": 3.0})
+    assert open(repository.wal_file).read() == ""
+    assert set(json.load(open(config_file))["storages"]) == {"S1", "S2", "S3"}
+
+def test_recovery_ignores_torn_tail_and_stale_log(config_file):
+    repository = ConfigRepository(config_file)
+    repository.put("storages", "S1", {"storage_id": "S1", "max_capacity": 1.0})
+    with open(repository.wal_file, "a") as f:
+        f.write('{"snapshot": "')
+    assert set(ConfigRepository(config_file).section("storages")) == {"S1"}
+
+    # A snapshot replaced by another tool invalidates log records written against the old one.
+    repository = ConfigRepository(config_file)
+    repository.put("storages", "S2", {"storage_id": "S2", "max_capacity": 2.0})
+    with open(config_file, "w") as f:
+        json.dump({"electrolyzers": {}, "storages": {}}, f)
+    assert ConfigRepository(config_file).section("storages") == {}
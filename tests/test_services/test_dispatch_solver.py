@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+from unittest.mock import patch
+from hydrogen_factory.services.dispatch_solver import dispatch_fits, solve_dispatch
+from hydrogen_factory.models.schedule import OptimizationInput
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("capacity,max_capacity", [(1000.0, 100.0), (300.0, 100.0), (1000.0, 6.0), (260.0, 8.0)])
+def test_dispatch_matches_cbc_cost(make_optimization_service, seed, capacity, max_capacity):
+    rng = np.random.default_rng(seed)
+    input = OptimizationInput(
+        electrolyzer_id="E1",
+        storage_id="S1",
+        electricity_prices=rng.uniform(0.03, 0.10, 24).round(3).tolist(),
+        hydrogen_demand=rng.uniform(1.0, 5.0, 24).round(2).tolist(),
+    )
+    try:
+        expected = make_optimization_service(capacity, max_capacity, use_dispatch=False).optimize(input)
+    except ValueError:
+        with pytest.raises(ValueError, match="Optimization failed"):
+            make_optimization_service(capacity, max_capacity, use_dispatch=True).optimize(input)
+        return
+    result = make_optimization_service(capacity, max_capacity, use_dispatch=True).optimize(input)
+    assert result.total_cost == pytest.approx(expected.total_cost, rel=1e-6, abs=1e-6)
+    assert max(result.power_schedule) <= capacity + 1e-6
+    assert min(result.storage_levels) >= -1e-6
+    assert max(result.storage_levels) <= max_capacity + 1e-6
+
+def test_dispatch_respects_storage_headroom():
+    prices = [0.01] + [0.10] * 3
+    demand = [0.0, 5.0, 5.0, 5.0]
+    power, hydrogen, levels = solve_dispatch(prices, demand, P_max=1000.0, eta=0.02, S_max=7.0)
+    # Only 7 kg can be carried out of the cheap hour; the rest is produced just in time.
+    assert hydrogen[0] == pytest.approx(7.0)
+    assert float(np.dot(prices, power)) == pytest.approx(0.01 * 350.0 + 0.10 * 400.0)
+    assert levels.max() <= 7.0 + 1e-9
+
+def test_dispatch_infeasible_demand():
+    with pytest.raises(ValueError, match="Optimization failed"):
+        solve_dispatch([0.05] * 3, [1.0, 1.0, 50.0], P_max=100.0, eta=0.02, S_max=100.0)
+
+def test_negative_prices_fall_back_to_cbc(make_optimization_service):
+    assert not dispatch_fits([0.05, -0.01])
+    service = make_optimization_service(1000.0, 100.0, use_dispatch=True)
+    input = OptimizationInput(
+        electrolyzer_id="E1",
+        storage_id="S1",
+        electricity_prices=[-0.01] + [0.05] * 23,
+        hydrogen_demand=[2.0] * 24,
+    )
+    with patch.object(service, "_optimize_dispatch") as dispatch:
+        result = service.optimize(input)
+    dispatch.assert_not_called()
+    assert result.storage_levels[0] == pytest.approx(18.0)
+
+@pytest.mark.parametrize("time_step_hours", [0.25, 0.5])
+def test_dispatch_matches_cbc_cost_on_long_horizon(make_optimization_service, time_step_hours):
+    rng = np.random.default_rng(3)
+    T = int(7 * 24 / time_step_hours)
+    input = OptimizationInput(
+        electrolyzer_id="E1",
+        storage_id="S1",
+        electricity_prices=rng.uniform(0.03, 0.10, T).round(3).tolist(),
+        hydrogen_demand=(rng.uniform(1.0, 5.0, T) * time_step_hours).round(3).tolist(),
+        time_step_hours=time_step_hours,
+    )
+    expected = make_optimization_service(300.0, 20.0, use_dispatch=False).optimize(input)
+    result = make_optimization_service(300.0, 20.0, use_dispatch=True).optimize(input)
+    assert len(result.power_schedule) == T
+    assert result.total_cost == pytest.approx(expected.total_cost, rel=1e-6)
+    assert sum(result.hydrogen_produced) == pytest.approx(sum(result.power_schedule) * 0.02 * time_step_hours)
+
+def test_horizon_lengths_must_match():
+    with pytest.raises(ValueError, match="same length"):
+        OptimizationInput(electrolyzer_id="E1", storage_id="S1",
+                          electricity_prices=[0.05] * 96, hydrogen_demand=[1.0] * 24)
@@ -44,4 +44,14 @@ def test_get_electrolyzer_config_success(electrolyzer_service):
 
 def test_get_electrolyzer_config_not_found(electrolyzer_service):
     with pytest.raises(ValueError, match="Electrolyzer ID not found"):
-        electrolyzer_service.get_config("E999")
\ No newline at end of file
+        electrolyzer_service.get_config("E999")
+
+def test_get_config_is_validated_once(electrolyzer_service):
+    config = ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0)
+    electrolyzer_service.electrolyzers["E1"] = config.model_dump()
+    first = electrolyzer_service.get_config("E1")
+    assert electrolyzer_service.get_config("E1") is first
+    body, etag = electrolyzer_service.get_json("E1")
+    assert ElectrolyzerConfig.model_validate_json(body) == config
+    assert electrolyzer_service.get_json("E1") == (body, etag)
+    assert electrolyzer_service.cache.misses == 1
@@ -0,0 +1,95 @@
+import pytest
+import numpy as np
+from hydrogen_factory.core.exceptions import InfeasibleScheduleError
+from hydrogen_factory.core.progress import listen
+from hydrogen_factory.services.feasibility import check_feasibility, production_limits
+from hydrogen_factory.services.matrix_lp import solve_schedule_lp
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.schedule import OptimizationInput
+
+ELECTROLYZER = ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0, efficiency=0.02)
+
+def test_check_pinpoints_shortage():
+    # 20 kg per step at full capacity; steps 0..3 need 20 kg more than they can make from 5 kg.
+    production = np.full(5, 20.0)
+    with pytest.raises(InfeasibleScheduleError, match="step 3 \\(hour 1.5\\).*from step 0.*by 20 kg") as error:
+        check_feasibility([10.0, 20.0, 20.0, 55.0, 0.0], production, 100.0, S_0=5.0, dt=0.5)
+    assert (error.value.step, error.value.hour, error.value.constraint) == (3, 1.5, "demand")
+    assert error.value.amount == pytest.approx(20.0)
+    assert isinstance(error.value, ValueError)
+
+    # A full storage after step 1 caps what can be carried forward.
+    with pytest.raises(InfeasibleScheduleError, match="step 3.*from step 2.*a full storage by 10 kg"):
+        check_feasibility([0.0, 0.0, 20.0, 50.0], production[:4], 20.0)
+    check_feasibility([0.0, 0.0, 20.0, 50.0], production[:4], 30.0)
+
+def test_check_pinpoints_overflow():
+    with pytest.raises(InfeasibleScheduleError, match="exceeds max_capacity at step 0") as error:
+        check_feasibility([1.0, 1.0], np.full(2, 20.0), 10.0, S_0=15.0)
+    assert error.value.constraint == "max_capacity"
+    assert error.value.amount == pytest.approx(4.0)
+    # Unmet demand does not help against an overfull storage.
+    with pytest.raises(InfeasibleScheduleError, match="max_capacity"):
+        check_feasibility([1.0, 1.0], np.full(2, 20.0), 10.0, S_0=15.0, shortage=False)
+    check_feasibility([100.0], np.full(1, 20.0), 10.0, shortage=False)
+
+def test_check_agrees_with_lp():
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        T = int(rng.integers(1, 12))
+        prices = rng.uniform(0.01, 0.1, T)
+        demand = rng.uniform(0.0, 30.0, T).round(1)
+        S_max, S_0 = float(rng.uniform(5.0, 60.0)), float(rng.uniform(0.0, 30.0))
+        try:
+            solve_schedule_lp(prices, demand, 1000.0, 0.02, S_max, S_0=min(S_0, S_max))
+            solved = True
+        except ValueError:
+            solved = False
+        try:
+            check_feasibility(demand, production_limits(ELECTROLYZER, T), S_max, S_0=min(S_0, S_max))
+            checked = True
+        except InfeasibleScheduleError:
+            checked = False
+        assert solved == checked
+
+def test_service_rejects_before_building(make_optimization_service):
+    service = make_optimization_service()
+    events = []
+    with listen(lambda event, data: events.append(event)):
+        with pytest.raises(InfeasibleScheduleError, match="Optimization failed: demand cannot be met at step 1"):
+            service.optimize(OptimizationInput(electrolyzer_id="E1", storage_id="S1", electricity_prices=[0.05, -0.01],
+                                               hydrogen_demand=[10.0, 40.0]))
+    assert "built" not in events
+
+@pytest.mark.parametrize("prices,solver", [
+    ([0.08, 0.02, 0.05, 0.03], None),
+    ([0.08, 0.02, 0.05, 0.03], "highs"),
+    ([0.08, 0.02, 0.05, 0.03], "cbc"),
+    ([0.08, -0.01, 0.05, 0.03], None),
+])
+def test_unmet_demand_penalty(make_optimization_service, prices, solver):
+    service = make_optimization_service()
+    demand = [30.0, 10.0, 30.0, 20.0]
+    result = service.optimize(OptimizationInput(electrolyzer_id="E1", storage_id="S1", electricity_prices=prices,
+                                                hydrogen_demand=demand, unmet_demand_penalty=100.0, solver=solver))
+    # 20 kg per step at most: step 0 leaves 10 kg unmet, the later steps run at full capacity to meet the rest.
+    assert result.unmet_demand == pytest.approx([10.0, 0.0, 0.0, 0.0], abs=1e-6)
+    assert sum(result.hydrogen_produced) == pytest.approx(sum(demand) - 10.0, abs=1e-6)
+
+    # Above the cost of production (0.08 / 0.02 = 4 €/kg) nothing is left unmet that can be made.
+    cheap = service.optimize(OptimizationInput(electrolyzer_id="E1", storage_id="S1", electricity_prices=prices,
+                                               hydrogen_demand=[5.0] * 4, unmet_demand_penalty=3.0, solver=solver))
+    assert cheap.unmet_demand[0] == pytest.approx(5.0, abs=1e-6)
+    assert cheap.power_schedule[0] == pytest.approx(0.0, abs=1e-6)
+
+def test_unmet_demand_penalty_part_load(make_optimization_service):
+    electrolyzer = ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0,
+                                      type_curve=True, min_load=0.2, startup_cost=10.0)
+    service = make_optimization_service(electrolyzer=electrolyzer)
+    production = production_limits(electrolyzer, 1)[0]
+    result = service.optimize(OptimizationInput(
+        electrolyzer_id="E1", storage_id="S1", electricity_prices=[0.05, 0.05],
+        hydrogen_demand=[production + 5.0, 1.0], unmet_demand_penalty=1000.0, mip_gap=0.0,
+    ))
+    assert result.unmet_demand[0] == pytest.approx(5.0, abs=1e-5)
+    assert result.unmet_demand[1] == pytest.approx(0.0, abs=1e-6)
@@ -0,0 +1,160 @@
+import pytest
+import numpy as np
+from pydantic import ValidationError
+from hydrogen_factory.services.fleet_service import FleetOptimizationService, solve_storage_subproblem
+from hydrogen_factory.services.matrix_lp import solve_fleet_lp
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import FleetOptimizationInput
+
+def make_fleet(seed, n_electrolyzers=6, n_storages=2, T=24, limit_share=0.5, method="joint"):
+    rng = np.random.default_rng(seed)
+    electrolyzers = [
+        ElectrolyzerConfig(
+            electrolyzer_id=f"E{i}", type=ElectrolyzerType.PEM,
+            capacity=float(rng.choice([500.0, 1000.0])), efficiency=float(rng.choice([0.018, 0.02])),
+        )
+        for i in range(n_electrolyzers)
+    ]
+    storages = {
+        f"S{j}": StorageConfig(storage_id=f"S{j}", max_capacity=float(rng.uniform(20.0, 200.0)))
+        for j in range(n_storages)
+    }
+    demand = {}
+    for j in range(n_storages):
+        production = sum(e.capacity * e.efficiency for e in electrolyzers[j::n_storages])
+        demand[f"S{j}"] = (rng.uniform(0.2, 0.5, T) * production).round(2).tolist()
+    input = FleetOptimizationInput(
+        assignments=[
+            {"electrolyzer_id": e.electrolyzer_id, "storage_id": f"S{i % n_storages}"}
+            for i, e in enumerate(electrolyzers)
+        ],
+        electricity_prices=rng.uniform(0.03, 0.10, T).round(3).tolist(),
+        hydrogen_demand=demand,
+        power_limit=limit_share * sum(e.capacity for e in electrolyzers),
+        method=method,
+    )
+    return input, electrolyzers, storages
+
+def joint_lp_cost(input, electrolyzers, storages):
+    storage_ids = list(storages)
+    power, _ = solve_fleet_lp(
+        input.electricity_prices,
+        [input.hydrogen_demand[s] for s in storage_ids],
+        [e.capacity for e in electrolyzers],
+        [e.efficiency for e in electrolyzers],
+        [s.max_capacity for s in storages.values()],
+        [storage_ids.index(a.storage_id) for a in input.assignments],
+        input.power_limit,
+    )
+    return float(np.dot(input.electricity_prices, power.sum(axis=0)))
+
+def check_schedule(input, electrolyzers, storages, result):
+    """Check power bounds, the shared limit and every storage balance."""
+    total = np.zeros(input.horizon)
+    production = {storage_id: np.zeros(input.horizon) for storage_id in storages}
+    for assignment, electrolyzer in zip(input.assignments, electrolyzers):
+        power = np.asarray(result.power_schedules[assignment.electrolyzer_id])
+        assert np.all(power >= -1e-6) and np.all(power <= electrolyzer.capacity + 1e-6)
+        total += power
+        production[assignment.storage_id] += power * electrolyzer.efficiency * input.time_step_hours
+    assert np.all(total <= input.power_limit + 1e-6)
+    assert result.total_power == pytest.approx(total.tolist(), abs=1e-6)
+    for storage_id, storage in storages.items():
+        levels = np.cumsum(production[storage_id] - np.asarray(input.hydrogen_demand[storage_id]))
+        assert np.all(levels >= -1e-6) and np.all(levels <= storage.max_capacity + 1e-6)
+        assert result.storage_levels[storage_id] == pytest.approx(levels.tolist(), abs=1e-5)
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("limit_share", [1.0, 0.5, 0.35])
+def test_fleet_joint_matches_unmerged_lp(seed, limit_share):
+    input, electrolyzers, storages = make_fleet(seed, limit_share=limit_share)
+    service = FleetOptimizationService(None, None)
+    try:
+        expected = joint_lp_cost(input, electrolyzers, storages)
+    except ValueError:
+        with pytest.raises(ValueError):
+            service.solve(input, electrolyzers, storages)
+        return
+    result = service.solve(input, electrolyzers, storages)
+    assert result.total_cost == pytest.approx(expected, rel=1e-6)
+    assert result.lower_bound == result.total_cost
+    check_schedule(input, electrolyzers, storages, result)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_fleet_decomposition_within_gap(seed):
+    input, electrolyzers, storages = make_fleet(seed, n_electrolyzers=8, n_storages=4, method="decomposition")
+    input.gap_tolerance = 1e-3
+    input.max_iterations = 200
+    result = FleetOptimizationService(None, None).solve(input, electrolyzers, storages)
+    expected = joint_lp_cost(input, electrolyzers, storages)
+    assert result.iterations >= 1
+    assert result.lower_bound <= expected + 1e-6
+    assert result.total_cost == pytest.approx(expected, rel=2e-3)
+    check_schedule(input, electrolyzers, storages, result)
+
+def test_fleet_decomposition_uncapped_needs_one_round():
+    input, electrolyzers, storages = make_fleet(0, limit_share=1.0, method="decomposition")
+    result = FleetOptimizationService(None, None).solve(input, electrolyzers, storages)
+    assert result.iterations == 1
+    assert result.total_cost == pytest.approx(result.lower_bound)
+
+def test_fleet_shutdown_stops_subproblem_workers():
+    input, electrolyzers, storages = make_fleet(0, n_storages=2, method="decomposition")
+    service = FleetOptimizationService(None, None, subproblem_workers=2, parallel_threshold=1)
+    service.shutdown()
+    service.solve(input, electrolyzers, storages)
+    assert service.executor is not None
+    service.shutdown()
+    assert service.executor is None
+    service.shutdown()
+
+def test_fleet_decomposition_falls_back_to_joint_for_negative_prices():
+    input, electrolyzers, storages = make_fleet(1, method="decomposition")
+    input.electricity_prices[3] = -0.02
+    result = FleetOptimizationService(None, None).solve(input, electrolyzers, storages)
+    assert result.iterations == 0
+    assert result.total_cost == pytest.approx(joint_lp_cost(input, electrolyzers, storages), rel=1e-6)
+
+def test_fleet_splits_merged_stacks_by_capacity():
+    electrolyzers = [
+        ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0, efficiency=0.02),
+        ElectrolyzerConfig(electrolyzer_id="E2", type=ElectrolyzerType.PEM, capacity=500.0, efficiency=0.02),
+    ]
+    storages = {"S1": StorageConfig(storage_id="S1", max_capacity=100.0)}
+    input = FleetOptimizationInput(
+        assignments=[{"electrolyzer_id": "E1", "storage_id": "S1"}, {"electrolyzer_id": "E2", "storage_id": "S1"}],
+        electricity_prices=[0.05, 0.10],
+        hydrogen_demand={"S1": [15.0, 15.0]},
+        power_limit=1500.0,
+    )
+    result = FleetOptimizationService(None, None).solve(input, electrolyzers, storages)
+    assert result.power_schedules["E1"] == pytest.approx([1000.0, 0.0])
+    assert result.power_schedules["E2"] == pytest.approx([500.0, 0.0])
+    assert result.total_cost == pytest.approx(0.05 * 1500.0)
+
+def test_storage_subproblem_prefers_efficient_stack_under_cap():
+    power, levels = solve_storage_subproblem(
+        np.array([0.05, 0.05]), np.array([100.0, 100.0]), np.array([0.01, 0.02]),
+        np.array([2.0, 2.0]), 10.0, power_cap=np.array([150.0, 150.0]),
+    )
+    assert power[1] == pytest.approx([100.0, 100.0])
+    assert power[0] == pytest.approx([0.0, 0.0])
+    assert levels == pytest.approx([0.0, 0.0])
+
+def test_fleet_infeasible_power_limit():
+    input, electrolyzers, storages = make_fleet(0, limit_share=0.05)
+    with pytest.raises(ValueError, match="Optimization failed"):
+        FleetOptimizationService(None, None).solve(input, electrolyzers, storages)
+
+def test_fleet_input_validation():
+    with pytest.raises(ValidationError, match="one entry per assigned storage"):
+        FleetOptimizationInput(
+            assignments=[{"electrolyzer_id": "E1", "storage_id": "S1"}],
+            electricity_prices=[0.05], hydrogen_demand={"S2": [1.0]}, power_limit=100.0,
+        )
+    with pytest.raises(ValidationError, match="assigned once"):
+        FleetOptimizationInput(
+            assignments=[{"electrolyzer_id": "E1", "storage_id": "S1"}, {"electrolyzer_id": "E1", "storage_id": "S2"}],
+            electricity_prices=[0.05], hydrogen_demand={"S1": [1.0], "S2": [1.0]}, power_limit=100.0,
+        )
@@ -0,0 +1,126 @@
+import asyncio
+import time
+import pytest
+from hydrogen_factory.core.exceptions import SolverPoolFullError
+from hydrogen_factory.services.fleet_service import FleetOptimizationService
+from hydrogen_factory.services.job_service import Job, JobService
+from hydrogen_factory.services.result_cache import ResultCache
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.schedule import FleetOptimizationInput, JobStatus, OptimizationInput
+
+PRICES = [0.08, 0.03, 0.09, 0.04, 0.12, 0.02, 0.07, 0.05]
+DEMAND = [6.0, 8.0, 5.0, 9.0, 7.0, 4.0, 8.0, 6.0]
+
+@pytest.fixture
+def make_service(make_optimization_service):
+    def make(**kwargs) -> JobService:
+        optimization_service = make_optimization_service(use_dispatch=False, lp_solver="highs",
+                                                         result_cache=ResultCache())
+        electrolyzer_service = optimization_service.electrolyzer_service
+        electrolyzer_service.get_config.side_effect = lambda electrolyzer_id: ElectrolyzerConfig(
+            electrolyzer_id=electrolyzer_id, type=ElectrolyzerType.PEM, capacity=1000.0, efficiency=0.02,
+        )
+        fleet_service = FleetOptimizationService(electrolyzer_service, optimization_service.storage_service)
+        return JobService(optimization_service, fleet_service, **kwargs)
+    return make
+
+def wait_until_finished(job: Job, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.finished
+
+def test_optimization_job_reports_progress_and_result(make_service):
+    service = make_service()
+    input = OptimizationInput(electrolyzer_id="E1", storage_id="S1", electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    info = service.submit(input)
+    assert info.status in (JobStatus.QUEUED, JobStatus.RUNNING)
+    job = service.get(info.job_id)
+    wait_until_finished(job)
+
+    info = job.info()
+    assert info.status == JobStatus.SUCCEEDED
+    assert info.result.total_cost == pytest.approx(service.optimization_service.optimize(input).total_cost)
+    assert [e.event for e in job.events] == ["queued", "running", "built", "succeeded"]
+    assert job.events[2].data["solver"] == "highs"
+
+    # The result went to the result cache, so the same input completes without a process.
+    cached = service.submit(input)
+    assert cached.status == JobStatus.SUCCEEDED
+    service.shutdown()
+
+def test_optimization_job_in_spawned_process(make_service):
+    service = make_service(start_method="spawn")
+    input = OptimizationInput(electrolyzer_id="E1", storage_id="S1", electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    job = service.get(service.submit(input).job_id)
+    wait_until_finished(job, timeout=60.0)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result.total_cost == pytest.approx(service.optimization_service.optimize(input).total_cost)
+    # Without a configured start method, job processes are never forked from the server.
+    assert make_service().context.get_start_method() != "fork"
+    service.shutdown()
+
+def test_fleet_job_reports_incumbents(make_service):
+    service = make_service()
+    input = FleetOptimizationInput(
+        assignments=[{"electrolyzer_id": f"E{i}", "storage_id": "S1"} for i in range(2)],
+        electricity_prices=PRICES,
+        hydrogen_demand={"S1": [20.0] * len(PRICES)},
+        power_limit=1500.0,
+        method="decomposition",
+    )
+    job = service.get(service.submit_fleet(input).job_id)
+    wait_until_finished(job)
+    assert job.status == JobStatus.SUCCEEDED
+    incumbents = [e for e in job.events if e.event == "incumbent"]
+    assert incumbents
+    assert incumbents[-1].data["cost"] == pytest.approx(job.result.total_cost, rel=1e-6)
+    service.shutdown()
+
+def test_cancel_kills_running_job(make_service):
+    service = make_service()
+    job = service._add(Job("optimize", time.sleep, (60,), 60.0))
+    deadline = time.monotonic() + 10
+    while job.process is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    info = service.cancel(job.job_id)
+    assert info.status == JobStatus.CANCELLED
+    job.process.join(5)
+    assert not job.process.is_alive()
+    assert service.cancel(job.job_id).status == JobStatus.CANCELLED
+    service.shutdown()
+
+def test_job_exceeding_time_limit_fails(make_service, monkeypatch):
+    monkeypatch.setattr("hydrogen_factory.services.job_service.SOLVER_GRACE_SECONDS", 0.0)
+    service = make_service()
+    job = service._add(Job("optimize", time.sleep, (60,), 0.2))
+    wait_until_finished(job, timeout=10)
+    assert job.status == JobStatus.FAILED
+    assert "did not finish" in job.error
+    service.shutdown()
+
+def test_job_queue_is_bounded(make_service):
+    service = make_service(max_workers=1, max_queue=0)
+    service._add(Job("optimize", time.sleep, (60,), 60.0))
+    with pytest.raises(SolverPoolFullError):
+        service._add(Job("optimize", time.sleep, (60,), 60.0))
+    service.shutdown()
+
+def test_finished_jobs_expire(make_service):
+    service = make_service(ttl=0.0)
+    job = service._add(Job("optimize", time.sleep, (0,), 10.0))
+    wait_until_finished(job)
+    time.sleep(0.01)
+    with pytest.raises(ValueError, match="Job ID not found"):
+        service.get(job.job_id)
+    service.shutdown()
+
+def test_stream_yields_events_until_finished(make_service):
+    service = make_service()
+    job = service._add(Job("optimize", time.sleep, (0.2,), 10.0))
+
+    async def collect():
+        return [event.event async for event in job.stream(keepalive=0.05) if event is not None]
+
+    assert asyncio.run(collect()) == ["queued", "running", "succeeded"]
+    service.shutdown()
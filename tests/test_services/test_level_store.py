@@ -0,0 +1,86 @@
+import pytest
+import numpy as np
+from hydrogen_factory.services import level_store
+from hydrogen_factory.services.level_store import LevelSeries, StorageLevelStore
+from hydrogen_factory.models.schedule import OptimizationInput
+
+DAY = 86400.0
+
+def test_series_appends_reads_and_reopens(tmp_path, monkeypatch):
+    monkeypatch.setattr(level_store, "CHUNK_ROWS", 8)
+    series = LevelSeries(str(tmp_path / "s"), block_rows=4, index_blocks=3)
+    times = np.arange(1.0, 51.0)
+    for chunk in np.array_split(np.arange(50), 7):
+        series.append(times[chunk], times[chunk] * 2)
+    assert series.count == 50
+    assert len(series.times) == 56
+
+    # Ring-indexed (recent) and binary-searched (old) rows give the same answers as searchsorted.
+    for time in (0.5, 1.0, 7.5, 20.0, 38.0, 41.5, 50.0, 60.0):
+        for side in ("left", "right"):
+            assert series.find(time, side) == np.searchsorted(times, time, side)
+    read_times, read_levels = series.read(10.0, 45.0)
+    assert np.shares_memory(read_times, series.times) and np.shares_memory(read_levels, series.levels)
+    assert read_times.tolist() == list(np.arange(10.0, 45.0))
+    assert series.last(12.5) == (12.0, 24.0)
+    assert series.last(0.5) is None
+
+    with pytest.raises(ValueError, match="increasing"):
+        series.append(np.array([50.0]), np.array([1.0]))
+    series.truncate(30.5)
+    assert series.last() == (30.0, 60.0)
+    # Truncating brings older blocks back into the index window.
+    for time in (3.5, 10.5, 17.0, 29.5, 30.0, 31.0):
+        assert series.find(time) == np.searchsorted(times[:30], time)
+    assert series.last(3.5) == (3.0, 6.0)
+    series.close()
+
+    reopened = LevelSeries(str(tmp_path / "s"), block_rows=4, index_blocks=3)
+    assert reopened.count == 30
+    assert reopened.find(25.0) == 24
+    reopened.append(np.array([31.0]), np.array([0.0]))
+    assert reopened.last() == (31.0, 0.0)
+
+def test_store_latest_and_plan_replacement(tmp_path):
+    store = StorageLevelStore(str(tmp_path))
+    store.record("S/1", "planned", [10.0, 20.0, 30.0], [5.0, 6.0, 7.0])
+    store.record("S/1", "measured", [15.0], [4.0])
+    assert store.latest("S/1", 17.0) == (15.0, 4.0, "measured")
+    assert store.latest("S/1", 25.0) == (20.0, 6.0, "planned")
+    store.record("S/1", "measured", [20.0], [3.0])
+    assert store.latest("S/1", 25.0) == (20.0, 3.0, "measured")
+
+    # A new plan replaces the planned levels from its first time on.
+    store.record("S/1", "planned", [20.0, 25.0], [8.0, 9.0])
+    assert store.read("S/1", "planned")[1].tolist() == [5.0, 8.0, 9.0]
+    assert store.latest("other") is None
+    with pytest.raises(ValueError, match="Unknown level series"):
+        store.read("S/1", "forecast")
+    store.close()
+    assert (tmp_path / "S%2F1" / "planned" / "time.f8").exists()
+    assert StorageLevelStore(str(tmp_path)).read("S/1", "measured")[1].tolist() == [4.0, 3.0]
+
+def test_chained_plans_carry_the_storage_level(make_optimization_service, tmp_path):
+    store = StorageLevelStore(str(tmp_path))
+    service = make_optimization_service(level_store=store)
+
+    # Day 1 draws on the stored hydrogen instead of buying power; day 2 starts from what is left.
+    day1 = service.optimize(OptimizationInput(electrolyzer_id="E1", storage_id="S1", start_time=DAY,
+                                              initial_storage_level=30.0, electricity_prices=[0.09, 0.08, 0.01],
+                                              hydrogen_demand=[5.0, 5.0, 5.0]))
+    assert day1.storage_levels[-1] == pytest.approx(15.0)
+    times, levels = store.read("S1", "planned")
+    assert times.tolist() == [DAY + 3600.0, DAY + 7200.0, DAY + 10800.0]
+    assert levels.tolist() == pytest.approx(day1.storage_levels)
+
+    day2 = OptimizationInput(electrolyzer_id="E1", storage_id="S1", start_time=DAY + 10800.0,
+                             electricity_prices=[0.09, 0.09], hydrogen_demand=[5.0, 5.0])
+    assert service.resolve_initial_level(day2, service.storage_service.get_config()).initial_storage_level == \
+        pytest.approx(day1.storage_levels[-1])
+    store.record("S1", "measured", [DAY + 10000.0, DAY + 10800.0], [20.0, 12.0])
+    assert service.resolve_initial_level(day2, service.storage_service.get_config()).initial_storage_level == 12.0
+    result = service.optimize(day2)
+    assert result.storage_levels[0] == pytest.approx(12.0 + result.hydrogen_produced[0] - 5.0)
+    # An explicit level wins over the history.
+    explicit = day2.model_copy(update={"initial_storage_level": 0.0})
+    assert service.resolve_initial_level(explicit, service.storage_service.get_config()) is explicit
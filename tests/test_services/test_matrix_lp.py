@@ -0,0 +1,41 @@
+import pytest
+import numpy as np
+from hydrogen_factory.services.matrix_lp import build_schedule_lp, solve_schedule_lp
+from hydrogen_factory.services.model_templates import ScheduleModelTemplate
+
+def test_build_schedule_lp_shapes():
+    c, A_eq, b_eq, bounds = build_schedule_lp([0.05] * 4, [1.0] * 4, 100.0, 0.02, 10.0, S_0=2.0, dt=0.5)
+    assert c.shape == (8,)
+    assert A_eq.shape == (4, 8)
+    assert A_eq.nnz == 4 + 4 + 3
+    assert b_eq.tolist() == [1.0, -1.0, -1.0, -1.0]
+    assert bounds[:4, 1].tolist() == [100.0] * 4
+    assert bounds[4:, 1].tolist() == [10.0] * 4
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matrix_lp_matches_pulp_path(seed):
+    rng = np.random.default_rng(seed)
+    T = 96
+    prices = rng.uniform(-0.02, 0.10, T).round(3).tolist()
+    demand = rng.uniform(0.2, 1.2, T).round(2).tolist()
+    power, hydrogen, levels = solve_schedule_lp(prices, demand, 300.0, 0.02, 15.0, S_0=3.0, dt=0.25)
+    expected, _, _ = ScheduleModelTemplate(300.0, 0.02, 15.0, T, 0.25).solve(prices, demand, S_0=3.0)
+    assert np.dot(prices, power) == pytest.approx(np.dot(prices, expected), rel=1e-6, abs=1e-9)
+    assert levels == pytest.approx(3.0 + np.cumsum(hydrogen - np.asarray(demand)), abs=1e-6)
+
+def test_matrix_lp_infeasible():
+    with pytest.raises(ValueError, match="Optimization failed"):
+        solve_schedule_lp([0.05] * 24, [50.0] * 24, 100.0, 0.02, 10.0)
+
+def test_optimization_service_highs_path_matches_cbc(make_optimization_service):
+    from hydrogen_factory.models.schedule import OptimizationInput
+
+    input = OptimizationInput(
+        electrolyzer_id="E1",
+        storage_id="S1",
+        electricity_prices=[-0.01, 0.08] * 12,
+        hydrogen_demand=[2.0] * 24,
+    )
+    highs = make_optimization_service(max_capacity=100.0, lp_solver="highs").optimize(input)
+    cbc = make_optimization_service(max_capacity=100.0, lp_solver="cbc").optimize(input)
+    assert highs.total_cost == pytest.approx(cbc.total_cost, rel=1e-6)
@@ -0,0 +1,37 @@
+import pytest
+import numpy as np
+from hydrogen_factory.services.model_templates import ModelTemplateCache
+from hydrogen_factory.services.dispatch_solver import solve_dispatch
+
+def test_template_is_reused_per_asset_parameters_and_horizon():
+    cache = ModelTemplateCache()
+    cache.solve(1000.0, 0.02, 100.0, [0.05] * 24, [2.0] * 24)
+    template = cache.templates[(1000.0, 0.02, 100.0, 24, 1.0)]
+    cache.solve(1000.0, 0.02, 100.0, [0.06] * 24, [3.0] * 24)
+    assert cache.templates[(1000.0, 0.02, 100.0, 24, 1.0)] is template
+    cache.solve(1000.0, 0.02, 50.0, [0.05] * 24, [2.0] * 24)
+    assert len(cache.templates) == 2
+
+def test_reused_template_matches_fresh_solution():
+    cache = ModelTemplateCache()
+    rng = np.random.default_rng(7)
+    for _ in range(5):
+        prices = rng.uniform(0.03, 0.10, 24).round(3).tolist()
+        demand = rng.uniform(1.0, 5.0, 24).round(2).tolist()
+        power, hydrogen, levels = cache.solve(300.0, 0.02, 10.0, prices, demand)
+        expected_power, _, _ = solve_dispatch(prices, demand, 300.0, 0.02, 10.0)
+        assert np.dot(prices, power) == pytest.approx(np.dot(prices, expected_power), rel=1e-6)
+        assert levels[-1] == pytest.approx(sum(hydrogen) - sum(demand), abs=1e-6)
+
+def test_template_recovers_after_infeasible_solve():
+    cache = ModelTemplateCache()
+    with pytest.raises(ValueError, match="Optimization failed"):
+        cache.solve(100.0, 0.02, 10.0, [0.05] * 24, [50.0] * 24)
+    power, _, _ = cache.solve(100.0, 0.02, 10.0, [0.05] * 24, [1.0] * 24)
+    assert sum(power) == pytest.approx(24 * 50.0)
+
+def test_lru_limit():
+    cache = ModelTemplateCache(max_templates=1)
+    cache.solve(1000.0, 0.02, 100.0, [0.05] * 24, [2.0] * 24)
+    cache.solve(1000.0, 0.02, 50.0, [0.05] * 24, [2.0] * 24)
+    assert list(cache.templates) == [(1000.0, 0.02, 50.0, 24, 1.0)]
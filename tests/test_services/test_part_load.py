@@ -0,0 +1,111 @@
+import pytest
+import numpy as np
+from pydantic import ValidationError
+from hydrogen_factory.core.progress import listen
+from hydrogen_factory.services.part_load import hydrogen_rate, production_curve, solve_part_load_schedule
+from hydrogen_factory.services.matrix_lp import solve_schedule_lp
+from hydrogen_factory.services.fleet_service import FleetOptimizationService
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.schedule import FleetOptimizationInput, OptimizationInput
+
+CONCAVE_CURVE = [{"load": 0.25, "efficiency": 0.024}, {"load": 0.5, "efficiency": 0.022}, {"load": 1.0, "efficiency": 0.02}]
+
+def make_electrolyzer(**kwargs) -> ElectrolyzerConfig:
+    return ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0, **kwargs)
+
+def make_problem(seed: int, T: int = 48):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.02, 0.10, T).round(3).tolist(), rng.uniform(3.0, 12.0, T).round(2).tolist()
+
+def solve(electrolyzer, prices, demand, **kwargs):
+    """Solve and return the result plus the solvers reported as 'built'."""
+    solvers = []
+    with listen(lambda event, data: solvers.append(data["solver"])):
+        result = solve_part_load_schedule(prices, demand, electrolyzer, 150.0, **kwargs)
+    return result, solvers
+
+def test_curve_validation():
+    with pytest.raises(ValidationError, match="end at 1"):
+        make_electrolyzer(efficiency_curve=[{"load": 0.5, "efficiency": 0.02}])
+    with pytest.raises(ValidationError, match="cannot be combined"):
+        make_electrolyzer(efficiency_curve=CONCAVE_CURVE, type_curve=True)
+    assert not make_electrolyzer().part_load
+    assert "min_load" not in make_electrolyzer().model_dump()
+    assert make_electrolyzer(min_load=0.1).model_dump()["min_load"] == 0.1
+
+def test_production_curve_starts_at_min_load():
+    power, rate = production_curve(make_electrolyzer(efficiency_curve=CONCAVE_CURVE, min_load=0.1))
+    assert power.tolist() == [100.0, 250.0, 500.0, 1000.0]
+    assert rate == pytest.approx([2.4, 6.0, 11.0, 20.0])
+    assert hydrogen_rate(make_electrolyzer(), [0.0, 500.0]) == pytest.approx([0.0, 10.0])
+
+@pytest.mark.parametrize("seed", range(3))
+def test_constant_efficiency_matches_schedule_lp(seed):
+    prices, demand = make_problem(seed)
+    (power, hydrogen, levels, grid, starts), solvers = solve(make_electrolyzer(), prices, demand)
+    expected, _, _ = solve_schedule_lp(prices, demand, 1000.0, 0.02, 150.0)
+    assert np.dot(prices, power) == pytest.approx(np.dot(prices, expected), rel=1e-6)
+    assert solvers == ["highs"] and grid is None and starts == 0
+
+@pytest.mark.parametrize("seed", range(3))
+def test_concave_curve_stays_lp(seed):
+    prices, demand = make_problem(seed)
+    electrolyzer = make_electrolyzer(efficiency_curve=CONCAVE_CURVE)
+    (power, hydrogen, levels, _, _), solvers = solve(electrolyzer, prices, demand)
+    assert solvers == ["highs"]
+    assert hydrogen == pytest.approx(hydrogen_rate(electrolyzer, power), abs=1e-6)
+    assert levels == pytest.approx(np.cumsum(hydrogen - np.asarray(demand)), abs=1e-6)
+    # Running at part load is more efficient, so the curve makes the schedule cheaper.
+    constant, _, _ = solve_schedule_lp(prices, demand, 1000.0, 0.02, 150.0)
+    assert np.dot(prices, power) < np.dot(prices, constant)
+
+def test_min_load_and_startup_cost():
+    prices, demand = make_problem(0, T=24)
+    electrolyzer = make_electrolyzer(type_curve=True, min_load=0.2)
+    (power, hydrogen, levels, _, starts), _ = solve(electrolyzer, prices, demand, mip_gap=0.0)
+    assert np.all((power <= 1e-6) | (power >= 200.0 - 1e-6))
+    assert hydrogen == pytest.approx(hydrogen_rate(electrolyzer, power), abs=1e-6)
+    assert np.all(levels >= -1e-6)
+
+    costly = make_electrolyzer(type_curve=True, min_load=0.2, startup_cost=1000.0)
+    (power, _, _, _, costly_starts), solvers = solve(costly, prices, demand, mip_gap=0.0)
+    assert solvers == ["highs", "highs-milp"]
+    assert costly_starts == 1 < starts
+    on = power > 1e-6
+    assert np.count_nonzero(on[1:] & ~on[:-1]) + on[0] == 1
+
+def test_non_concave_curve_uses_milp():
+    # The PEM curve is convex below 10 % load, where efficiency drops; without a minimum load the
+    # relaxation runs there on the curve's hull, which only the MILP can rule out.
+    prices, demand = make_problem(0, T=24)
+    electrolyzer = make_electrolyzer(type_curve=True)
+    (power, hydrogen, _, _, _), solvers = solve(electrolyzer, prices, demand)
+    assert solvers == ["highs", "highs-milp"]
+    assert hydrogen == pytest.approx(hydrogen_rate(electrolyzer, power), abs=1e-6)
+
+def test_negative_prices_do_not_waste_power():
+    # The relaxation could draw power on a low-slope segment just to be paid for it; the MILP keeps
+    # production on the curve.
+    electrolyzer = make_electrolyzer(efficiency_curve=CONCAVE_CURVE)
+    prices = [-0.05, 0.08, -0.02, 0.09]
+    (power, hydrogen, _, _, _), _ = solve(electrolyzer, prices, [2.0] * 4)
+    assert hydrogen == pytest.approx(hydrogen_rate(electrolyzer, power), abs=1e-6)
+
+def test_optimization_service_part_load_path(make_optimization_service):
+    electrolyzer = make_electrolyzer(type_curve=True, min_load=0.1, startup_cost=25.0)
+    service = make_optimization_service(electrolyzer=electrolyzer, max_capacity=150.0)
+    prices, demand = make_problem(1, T=24)
+    input = OptimizationInput(electrolyzer_id="E1", storage_id="S1", electricity_prices=prices, hydrogen_demand=demand)
+    assert service.solver_path(input, None, electrolyzer) == "highs"
+    result = service.optimize(input)
+    assert result.starts >= 1
+    assert result.startup_cost == pytest.approx(25.0 * result.starts)
+    assert result.total_cost == pytest.approx(np.dot(prices, result.power_schedule))
+
+    fleet = FleetOptimizationService(service.electrolyzer_service, service.storage_service)
+    fleet_input = FleetOptimizationInput(
+        assignments=[{"electrolyzer_id": "E1", "storage_id": "S1"}],
+        electricity_prices=prices, hydrogen_demand={"S1": demand}, power_limit=1000.0,
+    )
+    with pytest.raises(ValueError, match="part-load"):
+        fleet.optimize(fleet_input)
@@ -0,0 +1,126 @@
+import pytest
+import numpy as np
+from hydrogen_factory.services.power_supply_service import PowerSupplyService
+from hydrogen_factory.services.config_repository import ConfigRepository
+from hydrogen_factory.services.dispatch_solver import solve_dispatch
+from hydrogen_factory.services.matrix_lp import solve_supplied_schedule_lp
+from hydrogen_factory.models.power_supply import PowerSupplyConfig, PowerSupplyType
+from hydrogen_factory.models.schedule import OptimizationInput
+
+PV_AVAILABILITY = [0.0] * 6 + [0.5] * 12 + [0.0] * 6
+
+@pytest.fixture
+def power_supply_service(tmp_path):
+    return PowerSupplyService(ConfigRepository(str(tmp_path / "config.json")))
+
+def make_supply(supply_id, type, capacity, availability=None):
+    return PowerSupplyConfig(
+        supply_id=supply_id, type=type, capacity=capacity, availability=availability or [1.0] * 24
+    )
+
+def test_configure_power_supply_success(power_supply_service):
+    config = make_supply("PV1", PowerSupplyType.PHOTOVOLTAIC, 400.0, PV_AVAILABILITY)
+    power_supply_service.configure(config)
+    assert power_supply_service.get_config("PV1") == config
+    type, profile = power_supply_service.get_profile("PV1")
+    assert type == PowerSupplyType.PHOTOVOLTAIC
+    assert profile.dtype == np.float32
+    assert profile.tolist() == [0.0] * 6 + [200.0] * 12 + [0.0] * 6
+
+def test_configure_power_supply_duplicate_id(power_supply_service):
+    config = make_supply("G1", PowerSupplyType.GRID, 100.0)
+    power_supply_service.configure(config)
+    with pytest.raises(ValueError, match="Power Supply ID already exists"):
+        power_supply_service.configure(config)
+    with pytest.raises(ValueError, match="Power Supply ID already exists: G1"):
+        power_supply_service.configure_bulk([make_supply("G2", PowerSupplyType.GRID, 1.0), config])
+    with pytest.raises(ValueError, match="Power Supply ID not found"):
+        power_supply_service.get_config("G2")
+
+def test_get_power_supply_not_found(power_supply_service):
+    with pytest.raises(ValueError, match="Power Supply ID not found"):
+        power_supply_service.get_profile("X1")
+
+def test_profiles_are_packed_once_and_survive_restart(tmp_path):
+    repository = ConfigRepository(str(tmp_path / "config.json"))
+    PowerSupplyService(repository).configure(make_supply("W1", PowerSupplyType.WIND, 100.0))
+    service = PowerSupplyService(ConfigRepository(str(tmp_path / "config.json")))
+    assert service.profiles == {}
+    first = service.get_profile("W1")[1]
+    assert service.get_profile("W1")[1] is first
+    assert not first.flags.writeable
+
+def test_available_power_sums_and_averages_per_step(power_supply_service):
+    power_supply_service.configure_bulk([
+        make_supply("PV1", PowerSupplyType.PHOTOVOLTAIC, 400.0, PV_AVAILABILITY),
+        make_supply("W1", PowerSupplyType.WIND, 100.0),
+        make_supply("G1", PowerSupplyType.GRID, 50.0),
+    ])
+    renewable, grid = power_supply_service.available_power(["PV1", "W1", "G1", "PV1"], 30, 1.0)
+    assert renewable.tolist() == ([100.0] * 6 + [300.0] * 12 + [100.0] * 6 + [100.0] * 6)
+    assert grid.tolist() == [50.0] * 30
+    renewable, grid = power_supply_service.available_power(["PV1"], 8, 2.0)
+    assert renewable.tolist() == [0.0, 0.0, 0.0, 200.0, 200.0, 200.0, 200.0, 200.0]
+    assert grid.tolist() == [0.0] * 8
+    renewable, _ = power_supply_service.available_power(["PV1"], 2, 0.25)
+    assert renewable.tolist() == [0.0, 0.0]
+
+@pytest.mark.parametrize("seed", range(6))
+def test_supplied_dispatch_matches_lp(seed):
+    rng = np.random.default_rng(seed)
+    T = 48
+    prices = rng.uniform(0.03, 0.10, T).round(3)
+    demand = rng.uniform(1.0, 5.0, T).round(2)
+    renewable = rng.uniform(0.0, 300.0, T) * (rng.random(T) < 0.5)
+    grid = np.full(T, 150.0)
+    try:
+        expected = solve_supplied_schedule_lp(prices, demand, 400.0, 0.02, 30.0, renewable, grid)
+    except ValueError:
+        with pytest.raises(ValueError):
+            solve_dispatch(prices.tolist(), demand.tolist(), 400.0, 0.02, 30.0, renewable=renewable, grid_limit=grid)
+        return
+    power, _, levels = solve_dispatch(prices.tolist(), demand.tolist(), 400.0, 0.02, 30.0,
+                                      renewable=renewable, grid_limit=grid)
+    assert np.all(power <= np.minimum(renewable + grid, 400.0) + 1e-6)
+    grid_power = np.maximum(power - renewable, 0.0)
+    assert prices @ grid_power == pytest.approx(prices @ expected[3], rel=1e-6, abs=1e-9)
+
+def test_optimization_service_uses_power_supplies(make_optimization_service, power_supply_service):
+    power_supply_service.configure_bulk([
+        make_supply("PV1", PowerSupplyType.PHOTOVOLTAIC, 400.0, PV_AVAILABILITY),
+        make_supply("G1", PowerSupplyType.GRID, 200.0),
+    ])
+    input = OptimizationInput(
+        electrolyzer_id="E1", storage_id="S1", electricity_prices=[0.05] * 24, hydrogen_demand=[3.0] * 24,
+        power_supply_ids=["PV1", "G1"],
+    )
+    # Hours 0-5 need 18 kg from the grid. From hour 6 the 200 kW of PV give 4 kg/h, and the
+    # 12 kg surplus covers 12 of the 18 kg needed after sunset, so 6 kg more come from the grid.
+    for use_dispatch in (True, False):
+        service = make_optimization_service(max_capacity=100.0, use_dispatch=use_dispatch,
+                                            power_supply_service=power_supply_service)
+        result = service.optimize(input)
+        assert sum(result.grid_power) == pytest.approx(24.0 / 0.02)
+        assert result.total_cost == pytest.approx(0.05 * 24.0 / 0.02)
+        assert np.all(np.asarray(result.grid_power) <= 200.0 + 1e-6)
+        assert np.all(np.asarray(result.power_schedule) - result.grid_power <= 200.0 * np.sign(PV_AVAILABILITY) + 1e-6)
+
+    input.power_supply_ids = ["PV1"]
+    with pytest.raises(ValueError, match="Optimization failed"):
+        make_optimization_service(max_capacity=100.0, power_supply_service=power_supply_service).optimize(input)
+    with pytest.raises(ValueError, match="Power supplies are not available"):
+        make_optimization_service(max_capacity=100.0).optimize(input)
+
+def test_supplied_lp_buys_grid_at_negative_prices(make_optimization_service, power_supply_service):
+    power_supply_service.configure_bulk([
+        make_supply("W1", PowerSupplyType.WIND, 500.0),
+        make_supply("G1", PowerSupplyType.GRID, 100.0),
+    ])
+    input = OptimizationInput(
+        electrolyzer_id="E1", storage_id="S1", electricity_prices=[-0.01] * 4, hydrogen_demand=[1.0] * 4,
+        power_supply_ids=["W1", "G1"],
+    )
+    service = make_optimization_service(capacity=200.0, max_capacity=100.0, power_supply_service=power_supply_service)
+    result = service.optimize(input)
+    assert result.grid_power == pytest.approx([100.0] * 4)
+    assert result.total_cost == pytest.approx(-0.01 * 400.0)
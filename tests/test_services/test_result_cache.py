@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock, patch
+from hydrogen_factory.services.result_cache import ResultCache
+from hydrogen_factory.services.optimization_service import OptimizationService
+from hydrogen_factory.services.electrolyzer_service import ElectrolyzerService
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import OptimizationInput, OptimizationOutput
+
+ELECTROLYZER = ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0, efficiency=0.02)
+STORAGE = StorageConfig(storage_id="S1", max_capacity=100.0)
+
+def make_input(price=0.05):
+    return OptimizationInput(
+        electrolyzer_id="E1",
+        storage_id="S1",
+        electricity_prices=[price] * 24,
+        hydrogen_demand=[2.0] * 24,
+    )
+
+def make_output():
+    return OptimizationOutput(power_schedule=[1.0] * 24, hydrogen_produced=[1.0] * 24,
+                              storage_levels=[0.0] * 24, total_cost=1.0)
+
+def test_cached_results_are_copies():
+    cache = ResultCache()
+    output = make_output()
+    cache.put("k", output, "E1", "S1")
+    assert cache.get("k") is not output
+    # Changing the stored or a returned result leaves the cached one intact.
+    output.power_schedule.append(1.0)
+    cache.get("k").hydrogen_produced[0] = -1.0
+    assert cache.get("k") == make_output()
+
+def test_key_depends_on_configs_and_vectors():
+    key = ResultCache.make_key(make_input(), ELECTROLYZER, STORAGE)
+    assert key == ResultCache.make_key(make_input(), ELECTROLYZER, STORAGE)
+    assert key != ResultCache.make_key(make_input(0.06), ELECTROLYZER, STORAGE)
+    assert key != ResultCache.make_key(make_input(), ELECTROLYZER, StorageConfig(storage_id="S1", max_capacity=50.0))
+
+def test_get_put_and_ttl_expiry():
+    now = [0.0]
+    cache = ResultCache(ttl=10.0, clock=lambda: now[0])
+    output = make_output()
+    assert cache.get("k") is None
+    cache.put("k", output, "E1", "S1")
+    assert cache.get("k") == output
+    now[0] = 11.0
+    assert cache.get("k") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["entries"]) == (1, 2, 1, 0)
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.get("a")
+        cache.put(key, make_output(), "E1", "S1")
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    size = ResultCache._estimate_size(make_output())
+    cache = ResultCache(max_bytes=2 * size)
+    for key in ("a", "b", "c"):
+        cache.put(key, make_output(), "E1", "S1")
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] <= 2 * size
+
+def test_invalidate_on_configure():
+    cache = ResultCache()
+    electrolyzer_service = ElectrolyzerService()
+    OptimizationService(electrolyzer_service, MagicMock(), result_cache=cache)
+    cache.put("k1", make_output(), "E1", "S1")
+    cache.put("k2", make_output(), "E2", "S1")
+    electrolyzer_service.configure(ELECTROLYZER)
+    assert cache.get("k1") is None
+    assert cache.get("k2") is not None
+    assert cache.stats()["invalidations"] == 1
+
+def test_optimize_reuses_cached_result(make_optimization_service):
+    service = make_optimization_service(max_capacity=100.0, result_cache=ResultCache())
+    with patch.object(service, "solve", wraps=service.solve) as solve:
+        first = service.optimize(make_input())
+        second = service.optimize(make_input())
+    assert solve.call_count == 1
+    assert first == second
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+import numpy as np
+from hydrogen_factory.services.rolling_horizon import RollingHorizonService
+from hydrogen_factory.models.schedule import OptimizationInput, ReplanInput
+
+PRICES = [0.08, 0.03, 0.09, 0.04, 0.12, 0.02, 0.07, 0.05] * 3
+DEMAND = [6.0, 8.0, 5.0, 9.0, 7.0, 4.0, 8.0, 6.0] * 3
+
+@pytest.fixture
+def service(make_optimization_service):
+    return RollingHorizonService(make_optimization_service())
+
+def replan(service, **fields):
+    return asyncio.run(service.replan(ReplanInput(electrolyzer_id="E1", storage_id="S1", **fields)))
+
+def test_replan_without_previous_plan_solves_full_horizon(service):
+    result = replan(service, electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    expected = service.optimization_service.optimize(
+        OptimizationInput(electrolyzer_id="E1", storage_id="S1", electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    )
+    assert not result.reused_plan
+    assert result.frozen_steps == 0
+    assert result.total_cost == pytest.approx(expected.total_cost)
+
+def test_replan_reuses_shifted_plan_when_forecasts_hold(service):
+    first = replan(service, electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    result = replan(
+        service, electricity_prices=PRICES[3:], hydrogen_demand=DEMAND[3:],
+        initial_storage_level=first.storage_levels[2], steps_executed=3,
+    )
+    assert result.reused_plan
+    assert result.power_schedule == pytest.approx(first.power_schedule[3:])
+    assert result.storage_levels == pytest.approx(first.storage_levels[3:])
+
+def test_replan_from_new_state_matches_cold_solve(service):
+    replan(service, electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    prices = PRICES[2:] + [0.06, 0.06]
+    demand = DEMAND[2:] + [5.0, 5.0]
+    result = replan(
+        service, electricity_prices=prices, hydrogen_demand=demand,
+        initial_storage_level=12.5, steps_executed=2,
+    )
+    expected = service.optimization_service.optimize(OptimizationInput(
+        electrolyzer_id="E1", storage_id="S1", electricity_prices=prices, hydrogen_demand=demand,
+        initial_storage_level=12.5,
+    ))
+    assert not result.reused_plan
+    assert result.total_cost == pytest.approx(expected.total_cost)
+
+def test_replan_keeps_frozen_steps(service):
+    first = replan(service, electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    prices = list(PRICES[1:])
+    prices[5] = 0.01
+    result = replan(
+        service, electricity_prices=prices, hydrogen_demand=DEMAND[1:],
+        initial_storage_level=first.storage_levels[0], steps_executed=1, frozen_steps=2,
+    )
+    assert result.frozen_steps == 2
+    assert result.power_schedule[:2] == pytest.approx(first.power_schedule[1:3])
+    levels = first.storage_levels[0] + np.cumsum(np.asarray(result.hydrogen_produced) - np.asarray(DEMAND[1:]))
+    assert result.storage_levels == pytest.approx(levels.tolist(), abs=1e-6)
+    assert np.all(levels >= -1e-6) and np.all(levels <= 40.0 + 1e-6)
+    assert result.total_cost == pytest.approx(float(np.dot(prices, result.power_schedule)))
+
+def test_replan_frozen_steps_infeasible_from_current_level(service):
+    first = replan(service, electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    demand = list(DEMAND[1:])
+    demand[0] = first.hydrogen_produced[1] + 50.0
+    with pytest.raises(ValueError, match="Frozen steps cannot meet the demand"):
+        replan(
+            service, electricity_prices=PRICES[1:], hydrogen_demand=demand,
+            initial_storage_level=0.0, steps_executed=1, frozen_steps=1,
+        )
+
+def test_replan_rejects_level_above_capacity(service):
+    replan(service, electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    with pytest.raises(ValueError, match="exceeds the storage's max_capacity"):
+        replan(
+            service, electricity_prices=PRICES[1:], hydrogen_demand=DEMAND[1:],
+            initial_storage_level=41.0, steps_executed=1,
+        )
+    with pytest.raises(ValueError, match="exceeds the storage's max_capacity"):
+        replan(service, electricity_prices=PRICES, hydrogen_demand=DEMAND, initial_storage_level=100.0)
+
+def test_replan_reset_drops_plan(service):
+    replan(service, electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    service.reset("E1", None)
+    result = replan(service, electricity_prices=PRICES, hydrogen_demand=DEMAND)
+    assert not result.reused_plan
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+import numpy as np
+from pydantic import ValidationError
+from hydrogen_factory.services.scenario_service import ScenarioService, sample_scenarios
+from hydrogen_factory.services.solver_pool import SolverPool
+from hydrogen_factory.models.schedule import OptimizationInput, ScenarioInput
+
+@pytest.fixture
+def service(make_optimization_service):
+    return ScenarioService(make_optimization_service(max_capacity=100.0, solver_pool=SolverPool(max_workers=2)))
+
+def test_sample_scenarios_is_seeded_and_vectorized():
+    input = ScenarioInput(electrolyzer_id="E1", storage_id="S1", scenarios=50, seed=7, horizon_steps=12)
+    prices, demand = sample_scenarios(input)
+    assert prices.shape == demand.shape == (50, 12)
+    assert np.all((prices >= 0.03) & (prices <= 0.10))
+    assert np.all((demand >= 1.0) & (demand <= 5.0))
+    again = sample_scenarios(input)
+    assert np.array_equal(prices, again[0]) and np.array_equal(demand, again[1])
+
+def test_sample_scenarios_around_forecast():
+    input = ScenarioInput(
+        electrolyzer_id="E1", storage_id="S1", scenarios=20000, seed=1,
+        electricity_prices=[0.05, 0.10], hydrogen_demand=[2.0, 4.0], price_volatility=0.2, demand_volatility=0.0,
+    )
+    prices, demand = sample_scenarios(input)
+    assert prices.mean(axis=0) == pytest.approx([0.05, 0.10], rel=0.01)
+    assert prices.std(axis=0) == pytest.approx([0.01, 0.02], rel=0.05)
+    assert np.all(demand == [2.0, 4.0])
+
+def test_evaluate_matches_individual_solves(service):
+    input = ScenarioInput(electrolyzer_id="E1", storage_id="S1", scenarios=30, seed=3, quantiles=[0.0, 0.5, 1.0])
+    result = asyncio.run(service.evaluate(input))
+    prices, demand = sample_scenarios(input)
+    costs = [
+        service.optimization_service.optimize(OptimizationInput(
+            electrolyzer_id="E1", storage_id="S1",
+            electricity_prices=prices[i].tolist(), hydrogen_demand=demand[i].tolist(),
+        )).total_cost
+        for i in range(30)
+    ]
+    assert result.scenarios == 30 and result.infeasible == 0
+    assert result.expected_cost == pytest.approx(np.mean(costs))
+    assert result.cost_quantiles == pytest.approx([min(costs), np.median(costs), max(costs)])
+    assert len(result.storage_level_quantiles) == 3
+    assert all(len(row) == 24 for row in result.storage_level_quantiles)
+
+def test_evaluate_counts_infeasible_scenarios(service):
+    input = ScenarioInput(
+        electrolyzer_id="E1", storage_id="S1", scenarios=200, seed=5,
+        hydrogen_demand=[19.0, 19.0], demand_volatility=0.1,
+    )
+    result = asyncio.run(service.evaluate(input))
+    assert result.infeasible > 0
+    assert result.scenarios + result.infeasible == 200
+
+def test_evaluate_all_infeasible(service):
+    input = ScenarioInput(
+        electrolyzer_id="E1", storage_id="S1", scenarios=5, hydrogen_demand=[50.0], demand_volatility=0.0,
+    )
+    with pytest.raises(ValueError, match="Optimization failed"):
+        asyncio.run(service.evaluate(input))
+
+def test_scenario_input_validation():
+    with pytest.raises(ValidationError, match="min <= max"):
+        ScenarioInput(electrolyzer_id="E1", storage_id="S1", price_min=0.2, price_max=0.1)
+    with pytest.raises(ValidationError, match="quantiles"):
+        ScenarioInput(electrolyzer_id="E1", storage_id="S1", quantiles=[1.5])
+    with pytest.raises(ValidationError, match="same length"):
+        ScenarioInput(electrolyzer_id="E1", storage_id="S1", electricity_prices=[0.05], hydrogen_demand=[1.0, 2.0])
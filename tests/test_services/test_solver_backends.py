@@ -0,0 +1,121 @@
+import pytest
+import numpy as np
+from hydrogen_factory.core.progress import listen
+from hydrogen_factory.services.solver_backends import BACKENDS, get_backend
+from hydrogen_factory.services.solver_selector import SolverSelector, load_thresholds
+from hydrogen_factory.services.matrix_lp import build_schedule_lp
+from hydrogen_factory.services.part_load import build_part_load_model
+from hydrogen_factory.services.fleet_service import FleetOptimizationService
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import FleetOptimizationInput, OptimizationInput
+
+PRICES = [0.08, -0.01, 0.09, 0.04, 0.12, 0.02, 0.07, 0.05]
+DEMAND = [6.0, 8.0, 5.0, 9.0, 7.0, 4.0, 8.0, 6.0]
+THRESHOLDS = {"lp": {"solver": "cbc", "min_size": 1000}, "milp": {"solver": "cbc", "min_size": 100},
+              "fleet": {"solver": None, "min_size": None}}
+
+def make_input(prices=PRICES, **kwargs) -> OptimizationInput:
+    return OptimizationInput(electrolyzer_id="E1", storage_id="S1", electricity_prices=prices,
+                             hydrogen_demand=DEMAND, **kwargs)
+
+def built_solvers(fn, *args, **kwargs):
+    solvers = []
+    with listen(lambda event, data: event == "built" and solvers.append(data["solver"])):
+        result = fn(*args, **kwargs)
+    return result, solvers
+
+@pytest.mark.parametrize("name", ["highs", "cbc"])
+def test_backends_solve_lp_and_milp(name):
+    backend = get_backend(name)
+    c, A_eq, b_eq, bounds = build_schedule_lp(PRICES, DEMAND, 1000.0, 0.02, 40.0)
+    x = backend.solve(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds)
+    expected = get_backend("highs").solve(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds)
+    assert c @ x == pytest.approx(c @ expected, rel=1e-6)
+
+    electrolyzer = ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0,
+                                      type_curve=True, min_load=0.2, startup_cost=10.0)
+    model = build_part_load_model(np.abs(PRICES), DEMAND, electrolyzer, 40.0, integer=True)
+    args = {key: model[key] for key in ("A_ub", "b_ub", "A_eq", "b_eq", "bounds", "integrality")}
+    x = backend.solve(model["c"], mip_gap=0.0, **args)
+    assert np.allclose(x[model["integrality"] == 1], np.round(x[model["integrality"] == 1]), atol=1e-6)
+    expected = get_backend("highs").solve(model["c"], mip_gap=0.0, **args)
+    assert model["c"] @ x == pytest.approx(model["c"] @ expected, rel=1e-6)
+
+def test_backend_infeasible_and_unknown():
+    c, A_eq, b_eq, bounds = build_schedule_lp(PRICES, [1000.0] * len(PRICES), 1000.0, 0.02, 40.0)
+    for name in ("highs", "cbc"):
+        with pytest.raises(ValueError, match="Optimization failed"):
+            get_backend(name).solve(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds)
+    with pytest.raises(ValueError, match="Unknown solver"):
+        get_backend("gurobi")
+
+def test_selector_rules(monkeypatch):
+    selector = SolverSelector(thresholds=THRESHOLDS)
+    assert selector.select(24, dispatch_fits=True) == "dispatch"
+    assert selector.select(24) == "highs"
+    assert selector.select(2000) == "cbc"
+    assert selector.select(99, integer=True) == "highs"
+    assert selector.select(100, integer=True) == "cbc"
+    assert selector.select(24, assets=100) == "highs"
+    assert selector.select(2000, override="highs") == "highs"
+    assert SolverSelector("cbc", use_dispatch=False).select(24, dispatch_fits=True) == "cbc"
+    with pytest.raises(ValueError, match="does not support"):
+        selector.select(24, override="dispatch")
+    with pytest.raises(ValueError, match="Unknown LP solver"):
+        SolverSelector("gurobi")
+
+    # A calibrated solver that is not installed falls back to HiGHS; requesting it is an error.
+    monkeypatch.setattr(BACKENDS["cbc"], "available", lambda: False)
+    assert selector.select(2000) == "highs"
+    with pytest.raises(ValueError, match="not available"):
+        selector.select(24, override="cbc")
+
+def test_shipped_thresholds_keep_small_problems_in_process():
+    selector = SolverSelector(thresholds=load_thresholds())
+    assert set(load_thresholds()) == {"lp", "milp", "fleet"}
+    for kwargs in ({}, {"integer": True}, {"assets": 8}):
+        assert selector.select(24, **kwargs) == "highs"
+
+def test_service_honours_solver_override(make_optimization_service):
+    service = make_optimization_service()
+    results = {}
+    for solver in ("highs", "cbc"):
+        results[solver], solvers = built_solvers(service.optimize, make_input(solver=solver))
+        assert solvers == [solver]
+    assert results["cbc"].total_cost == pytest.approx(results["highs"].total_cost, rel=1e-6)
+
+    prices = np.abs(PRICES).tolist()
+    _, solvers = built_solvers(service.optimize, make_input(prices, solver="cbc"))
+    assert solvers == ["cbc"]
+    with pytest.raises(ValueError, match="does not support"):
+        service.optimize(make_input(solver="dispatch"))
+
+def test_part_load_on_cbc(make_optimization_service):
+    electrolyzer = ElectrolyzerConfig(electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0,
+                                      type_curve=True, min_load=0.2, startup_cost=10.0)
+    service = make_optimization_service(electrolyzer=electrolyzer)
+    highs = service.optimize(make_input(mip_gap=0.0))
+    cbc, solvers = built_solvers(service.optimize, make_input(mip_gap=0.0, solver="cbc"))
+    assert solvers[-1] == "cbc-milp"
+    assert cbc.total_cost + cbc.startup_cost == pytest.approx(highs.total_cost + highs.startup_cost, rel=1e-6)
+    with pytest.raises(ValueError, match="does not support"):
+        service.optimize(make_input(np.abs(PRICES).tolist(), solver="dispatch"))
+
+def test_fleet_joint_lp_override():
+    electrolyzers = [
+        ElectrolyzerConfig(electrolyzer_id=f"E{i}", type=ElectrolyzerType.PEM, capacity=1000.0, efficiency=eta)
+        for i, eta in enumerate((0.018, 0.02))
+    ]
+    storages = {"S1": StorageConfig(storage_id="S1", max_capacity=40.0)}
+    costs = {}
+    for solver in ("highs", "cbc"):
+        input = FleetOptimizationInput(
+            assignments=[{"electrolyzer_id": e.electrolyzer_id, "storage_id": "S1"} for e in electrolyzers],
+            electricity_prices=PRICES, hydrogen_demand={"S1": [20.0] * len(PRICES)}, power_limit=1500.0,
+            solver=solver,
+        )
+        result, solvers = built_solvers(FleetOptimizationService(None, None).solve, input, electrolyzers, storages)
+        assert solvers == [solver]
+        costs[solver] = result.total_cost
+    assert costs["cbc"] == pytest.approx(costs["highs"], rel=1e-6)
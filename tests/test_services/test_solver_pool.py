@@ -0,0 +1,55 @@
+import pytest
+import asyncio
+import threading
+from hydrogen_factory.services.solver_pool import SolverPool
+from hydrogen_factory.core.exceptions import SolverPoolFullError, SolverTimeoutError
+from hydrogen_factory.models.schedule import OptimizationInput
+
+def test_run_returns_result():
+    pool = SolverPool(max_workers=2)
+    assert asyncio.run(pool.run(sum, [1, 2, 3])) == 6
+    assert pool.pending == 0
+    pool.shutdown()
+
+def test_run_rejects_when_queue_full():
+    pool = SolverPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(SolverPoolFullError):
+            await pool.run(release.wait)
+        assert pool.queue_depth == 1
+        release.set()
+        await asyncio.gather(*running)
+
+    asyncio.run(scenario())
+    assert pool.pending == 0
+    pool.shutdown()
+
+def test_run_times_out_and_keeps_slot_until_worker_finishes():
+    pool = SolverPool(max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        with pytest.raises(SolverTimeoutError):
+            await pool.run(release.wait, time_limit=0.05)
+        with pytest.raises(SolverPoolFullError):
+            await pool.run(release.wait)
+        release.set()
+
+    asyncio.run(scenario())
+    pool.shutdown()
+
+def test_optimize_async_uses_pool(make_optimization_service):
+    service = make_optimization_service(max_capacity=100.0, solver_pool=SolverPool(max_workers=1))
+    input = OptimizationInput(
+        electrolyzer_id="E1",
+        storage_id="S1",
+        electricity_prices=[0.05] * 24,
+        hydrogen_demand=[2.0] * 24,
+    )
+    result = asyncio.run(service.optimize_async(input))
+    assert result == service.optimize(input)
+    service.solver_pool.shutdown()
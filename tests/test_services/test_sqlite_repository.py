@@ -0,0 +1,88 @@
+import json
+import pytest
+from hydrogen_factory.services.sqlite_repository import SqliteConfigRepository
+from hydrogen_factory.services.electrolyzer_service import ElectrolyzerService
+from hydrogen_factory.services.storage_service import StorageService
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.storage import StorageConfig
+
+@pytest.fixture
+def repository(tmp_path):
+    return SqliteConfigRepository(str(tmp_path / "config.db"))
+
+def make_electrolyzer(i):
+    return ElectrolyzerConfig(
+        electrolyzer_id=f"E{i}",
+        type=ElectrolyzerType.PEM if i % 2 else ElectrolyzerType.ALKALINE,
+        capacity=100.0 + i,
+    )
+
+def test_configure_and_get_config(repository):
+    service = ElectrolyzerService(repository)
+    config = make_electrolyzer(1)
+    service.configure(config)
+    assert service.get_config("E1") == config
+    assert "E1" in service.electrolyzers
+    with pytest.raises(ValueError, match="Electrolyzer ID already exists"):
+        service.configure(config)
+    with pytest.raises(ValueError, match="Electrolyzer ID not found"):
+        service.get_config("E999")
+
+def test_configure_bulk_and_find_by_type(repository, tmp_path):
+    service = ElectrolyzerService(repository)
+    service.configure_bulk([make_electrolyzer(i) for i in range(1000)])
+    assert len(service.electrolyzers) == 1000
+    pem = service.find_by_type(ElectrolyzerType.PEM)
+    assert len(pem) == 500
+    assert all(config.type == ElectrolyzerType.PEM for config in pem)
+
+    reopened = ElectrolyzerService(SqliteConfigRepository(str(tmp_path / "config.db")))
+    assert reopened.get_config("E999") == make_electrolyzer(999)
+
+def test_configure_bulk_is_all_or_nothing(repository):
+    service = StorageService(repository)
+    service.configure(StorageConfig(storage_id="S1", max_capacity=10.0))
+    with pytest.raises(ValueError, match="Storage ID already exists: S1"):
+        service.configure_bulk([StorageConfig(storage_id="S2", max_capacity=10.0),
+                                StorageConfig(storage_id="S1", max_capacity=10.0)])
+    with pytest.raises(ValueError, match="Duplicate Storage IDs"):
+        service.configure_bulk([StorageConfig(storage_id="S3", max_capacity=10.0)] * 2)
+    assert list(service.storages) == ["S1"]
+
+def test_list_json_pages_by_cursor_and_type(repository):
+    service = ElectrolyzerService(repository)
+    service.configure_bulk([make_electrolyzer(i) for i in range(1, 6)])
+    body, etag = service.list_json(limit=2)
+    page = json.loads(body)
+    assert [e["electrolyzer_id"] for e in page["items"]] == ["E1", "E2"]
+    assert page["next_cursor"] == "E2"
+    page = json.loads(service.list_json(cursor="E2", limit=2)[0])
+    assert [e["electrolyzer_id"] for e in page["items"]] == ["E3", "E4"]
+    page = json.loads(service.list_json(cursor="E4", limit=2)[0])
+    assert [e["electrolyzer_id"] for e in page["items"]] == ["E5"]
+    assert page["next_cursor"] is None
+    page = json.loads(service.list_json(ElectrolyzerType.PEM)[0])
+    assert [e["electrolyzer_id"] for e in page["items"]] == ["E1", "E3", "E5"]
+
+    # Repeated reads are served from the cache; a configure drops the cached pages.
+    assert service.list_json(limit=2) == (body, etag)
+    service.configure(make_electrolyzer(0))
+    body, new_etag = service.list_json(limit=2)
+    assert new_etag != etag
+    assert json.loads(body)["items"][0]["electrolyzer_id"] == "E0"
+
+def test_concurrent_reads_and_writes(repository):
+    from concurrent.futures import ThreadPoolExecutor
+    section = repository.section("electrolyzers")
+    repository.put_many("electrolyzers", [(f"E{i}", make_electrolyzer(i).model_dump()) for i in range(200)])
+
+    def work(i):
+        repository.put("electrolyzers", f"N{i}", make_electrolyzer(i).model_dump())
+        assert section[f"E{i % 200}"]["capacity"] == 100.0 + i % 200
+        assert f"N{i}" in section
+        return len(repository.find("electrolyzers", ElectrolyzerType.PEM)), len(repository.page("electrolyzers", limit=50))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(work, range(400)))
+    assert all(count >= 100 and page == 50 for count, page in results)
+    assert len(section) == 600
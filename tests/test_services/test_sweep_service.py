@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+import numpy as np
+from pydantic import ValidationError
+from hydrogen_factory.services.optimization_service import OptimizationService
+from hydrogen_factory.services.sweep_service import SizingSweepService
+from hydrogen_factory.services.solver_pool import SolverPool
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.storage import StorageConfig
+from hydrogen_factory.models.schedule import OptimizationInput, SweepInput
+
+def brute_force(service, input):
+    base = OptimizationInput(
+        electrolyzer_id="E", storage_id="S",
+        electricity_prices=input.electricity_prices, hydrogen_demand=input.hydrogen_demand,
+    )
+    surface = []
+    for max_capacity in input.storage_capacities:
+        row = []
+        for capacity in input.capacities:
+            electrolyzer = ElectrolyzerConfig(
+                electrolyzer_id="E", type=ElectrolyzerType.PEM, capacity=capacity, efficiency=input.efficiency,
+            )
+            try:
+                row.append(service.solve(base, electrolyzer, StorageConfig(storage_id="S", max_capacity=max_capacity)).total_cost)
+            except ValueError:
+                row.append(None)
+        surface.append(row)
+    return surface
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("use_dispatch", [True, False])
+def test_sweep_matches_individual_solves(seed, use_dispatch):
+    rng = np.random.default_rng(seed)
+    service = OptimizationService(None, None, use_dispatch=use_dispatch, lp_solver="highs",
+                                  solver_pool=SolverPool(max_workers=2))
+    input = SweepInput(
+        capacities=rng.permutation(np.linspace(150.0, 1200.0, 8)).tolist(),
+        storage_capacities=rng.permutation(np.linspace(5.0, 80.0, 7)).tolist(),
+        electricity_prices=rng.uniform(-0.01, 0.10, 24).round(3).tolist(),
+        hydrogen_demand=rng.uniform(1.0, 6.0, 24).round(2).tolist(),
+    )
+    result = asyncio.run(SizingSweepService(service).sweep(input))
+    expected = brute_force(service, input)
+    assert result.capacities == input.capacities
+    assert result.storage_capacities == input.storage_capacities
+    for row, expected_row in zip(result.total_cost, expected):
+        assert [cost is None for cost in row] == [cost is None for cost in expected_row]
+        assert [cost for cost in row if cost is not None] == pytest.approx(
+            [cost for cost in expected_row if cost is not None], rel=1e-6, abs=1e-9
+        )
+    assert result.solves < len(input.capacities) * len(input.storage_capacities)
+
+def test_sweep_reuses_unconstrained_schedules():
+    service = OptimizationService(None, None)
+    input = SweepInput(
+        capacities=[1000.0, 2000.0, 3000.0],
+        storage_capacities=[500.0, 1000.0],
+        electricity_prices=[0.05, 0.10, 0.02],
+        hydrogen_demand=[2.0, 2.0, 2.0],
+    )
+    result = asyncio.run(SizingSweepService(service).sweep(input))
+    assert result.solves == 1
+    assert np.asarray(result.total_cost) == pytest.approx(np.full((2, 3), 0.05 * 200.0 + 0.02 * 100.0))
+
+def test_sweep_input_validation():
+    with pytest.raises(ValidationError, match="positive"):
+        SweepInput(capacities=[0.0], storage_capacities=[10.0], electricity_prices=[0.05], hydrogen_demand=[1.0])
+    with pytest.raises(ValidationError, match="same length"):
+        SweepInput(capacities=[10.0], storage_capacities=[10.0], electricity_prices=[0.05], hydrogen_demand=[1.0, 1.0])
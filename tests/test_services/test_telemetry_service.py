@@ -0,0 +1,128 @@
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+from hydrogen_factory.api.encoding import TELEMETRY, decode_telemetry, encode_telemetry_frame
+from hydrogen_factory.models.electrolyzer import ElectrolyzerConfig, ElectrolyzerType
+from hydrogen_factory.models.telemetry import CalibrationInput
+from hydrogen_factory.services.telemetry_service import RollingAggregates, TelemetryService
+
+START = 1767225600.0
+
+@pytest.fixture
+def electrolyzer_service():
+    service = MagicMock()
+    service.get_config.return_value = ElectrolyzerConfig(
+        electrolyzer_id="E1", type=ElectrolyzerType.PEM, capacity=1000.0, efficiency=0.02,
+    )
+    return service
+
+def test_decode_ndjson_and_binary_frames():
+    body = (b'{"electrolyzer_id": "E1", "time": 1.0, "power": 10.0, "hydrogen": 0.2}\n'
+            b'{"electrolyzer_id": "E1", "time": [2.0, 3.0], "power": [20.0, 30.0], "hydrogen": [0.4, 0.6]}\n\n')
+    times, power, hydrogen = decode_telemetry(body)["E1"]
+    assert times.tolist() == [1.0, 2.0, 3.0] and power.tolist() == [10.0, 20.0, 30.0]
+
+    frames = encode_telemetry_frame("E1", [1.0, 2.0], [10.0, 20.0], [0.2, 0.4]) + \
+        encode_telemetry_frame("E2", [5.0], [50.0], [1.0]) + encode_telemetry_frame("E1", [3.0], [30.0], [0.6])
+    decoded = decode_telemetry(frames, f"{TELEMETRY}; version=1")
+    assert decoded["E1"][2].tolist() == [0.2, 0.4, 0.6]
+    assert decoded["E2"][0].tolist() == [5.0]
+
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_telemetry(frames[:-8], TELEMETRY)
+    with pytest.raises(ValueError, match="Invalid telemetry line"):
+        decode_telemetry(b'{"electrolyzer_id": "E1", "time": 1.0}')
+    with pytest.raises(ValueError, match="same length"):
+        decode_telemetry(b'{"electrolyzer_id": "E1", "time": [1.0, 2.0], "power": [1.0], "hydrogen": [1.0]}')
+    with pytest.raises(ValueError, match="Unsupported"):
+        decode_telemetry(b"", "text/csv")
+
+def test_rolling_aggregates_keep_the_latest_buckets():
+    aggregates = RollingAggregates(60.0, 3)
+    times = np.arange(0.0, 300.0, 15.0)
+    aggregates.add(times[:10], np.full(10, 2.0), times[:10])
+    aggregates.add(times[10:], np.full(10, 4.0), times[10:])
+    starts, counts, power, hydrogen = aggregates.read()
+    assert starts.tolist() == [120.0, 180.0, 240.0]
+    assert counts.tolist() == [4, 4, 4]
+    assert power.tolist() == [3.0, 4.0, 4.0]
+    assert hydrogen.tolist() == [142.5, 202.5, 262.5]
+    assert aggregates.read(start=200.0, end=240.0)[0].tolist() == [180.0]
+
+def test_rolling_aggregates_drop_buckets_older_than_the_window():
+    aggregates = RollingAggregates(60.0, 1440)
+    aggregates.add(np.array([30.0]), np.array([1.0]), np.array([0.1]))
+    aggregates.add(np.array([6e6]), np.array([2.0]), np.array([0.2]))
+    starts, counts, power, _ = aggregates.read()
+    assert starts.tolist() == [6e6]
+    assert counts.tolist() == [1] and power.tolist() == [2.0]
+    assert aggregates.read(end=60.0)[0].tolist() == []
+
+def test_ingest_drops_late_samples_and_flushes(tmp_path, electrolyzer_service):
+    service = TelemetryService(electrolyzer_service, str(tmp_path), flush_samples=5, flush_interval=3600.0)
+    times = START + np.array([3.0, 1.0, 2.0, 2.0])
+    assert service.ingest({"E1": (times, np.ones(4), np.ones(4))}) == (3, 1)
+    assert service.ingest({"E1": (START + np.array([2.5, 4.0]), np.ones(2), np.ones(2))}) == (1, 1)
+    assert not (tmp_path / "E1").exists()
+
+    service.ingest({"E1": (START + np.array([5.0, 6.0]), np.full(2, 2.0), np.full(2, 2.0))})
+    assert (tmp_path / "E1" / "time.f8").stat().st_size == 6 * 8
+    assert (tmp_path / "E1" / "power.f4").stat().st_size == 6 * 4
+    service.ingest({"E1": (START + np.array([7.0]), np.ones(1), np.ones(1))})
+    times, power, _ = service.read("E1", START + 2.0, START + 7.5)
+    assert times.tolist() == (START + np.arange(2.0, 8.0)).tolist()
+    assert power.tolist() == [1.0, 1.0, 1.0, 2.0, 2.0, 1.0]
+
+    service.flush()
+    restarted = TelemetryService(electrolyzer_service, str(tmp_path))
+    assert len(restarted.read("E1")[0]) == 7
+    # After a restart, samples already on disk are still recognized as repeated.
+    assert restarted.ingest({"E1": (START + np.arange(1.0, 9.0), np.ones(8), np.ones(8))}) == (1, 7)
+    assert np.all(np.diff(restarted.read("E1")[0]) > 0)
+    assert restarted.electrolyzer_ids() == ["E1"]
+    aggregates = service.aggregated("E1", "minute")
+    assert aggregates.counts == [7] and aggregates.power == pytest.approx([9.0 / 7])
+    with pytest.raises(ValueError, match="No telemetry"):
+        TelemetryService(electrolyzer_service, str(tmp_path)).aggregated("E1", "hour")
+
+    electrolyzer_service.get_config.side_effect = ValueError("Electrolyzer ID not found")
+    with pytest.raises(ValueError, match="not found"):
+        service.ingest({"E9": (np.array([START]), np.ones(1), np.ones(1))})
+
+def test_flush_drops_rows_of_an_interrupted_flush(tmp_path, electrolyzer_service):
+    service = TelemetryService(electrolyzer_service, str(tmp_path), flush_samples=2)
+    service.ingest({"E1": (START + np.array([1.0, 2.0]), np.array([1.0, 2.0]), np.array([0.1, 0.2]))})
+    # A crash after writing the measurements (and part of a time) of the next flush.
+    with open(tmp_path / "E1" / "power.f4", "ab") as f:
+        f.write(np.array([9.0, 9.0], dtype="<f4").tobytes())
+    with open(tmp_path / "E1" / "time.f8", "ab") as f:
+        f.write(b"\x00" * 4)
+    restarted = TelemetryService(electrolyzer_service, str(tmp_path), flush_samples=2)
+    restarted.ingest({"E1": (START + np.array([3.0, 4.0]), np.array([3.0, 4.0]), np.array([0.3, 0.4]))})
+    times, power, hydrogen = restarted.read("E1")
+    assert times.tolist() == (START + np.arange(1.0, 5.0)).tolist()
+    assert power.tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert (tmp_path / "E1" / "power.f4").stat().st_size == 4 * 4
+
+def test_calibration_fits_the_measured_efficiency(tmp_path, electrolyzer_service):
+    service = TelemetryService(electrolyzer_service, str(tmp_path))
+    rng = np.random.default_rng(0)
+    times = START + np.arange(600.0)
+    power = rng.uniform(0.0, 1000.0, 600)
+    # The stack produces 10 % less than configured; standby samples carry only noise.
+    hydrogen = 0.9 * 0.02 * power + rng.normal(0.0, 0.05, 600)
+    hydrogen[power < 50.0] = 0.3
+    service.ingest({"E1": (times, power, hydrogen)})
+
+    result = service.calibrate_many(CalibrationInput(electrolyzer_ids=["E1"], apply=True))[0]
+    assert result.scale == pytest.approx(0.9, rel=1e-3)
+    assert result.efficiency == pytest.approx(0.018, rel=1e-3)
+    assert result.r_squared > 0.99 and result.applied
+    assert result.samples == int(np.sum(power >= 50.0))
+    updated = electrolyzer_service.update.call_args[0][0]
+    assert updated.electrolyzer_id == "E1" and updated.efficiency == pytest.approx(0.018, rel=1e-3)
+
+    # Too few samples in the window: no fit, nothing applied.
+    sparse = service.calibrate("E1", start=START, end=START + 10.0, apply=True)
+    assert sparse.scale is None and not sparse.applied
+    assert electrolyzer_service.update.call_count == 1